@@ -339,20 +339,57 @@ IECore::DataPtr IECoreUSD::DataAlgo::fromUSD( const pxr::UsdAttribute &attribute
 namespace
 {
 
+// Allows a VtArray to reference the storage of Cortex data, keeping the
+// data alive until the last VtArray referencing it is destroyed.
+class DataArraySource : public Vt_ArrayForeignDataSource
+{
+
+	public :
+
+		DataArraySource( const IECore::Data *data )
+			:	Vt_ArrayForeignDataSource( &DataArraySource::detached ), m_data( data )
+		{
+		}
+
+	private :
+
+		static void detached( Vt_ArrayForeignDataSource *self )
+		{
+			delete static_cast<DataArraySource *>( self );
+		}
+
+		IECore::ConstDataPtr m_data;
+
+};
+
 struct VtValueFromData
 {
 
+	// Bitwise equivalent types don't need converting, so we make a VtArray that
+	// shares the Cortex storage rather than copying it. VtArray never modifies
+	// foreign data in place, instead making a copy the first time it is written
+	// to. And we reference a copy of `data` rather than `data` itself, so
+	// that modifications to `data` will also be made to a copy, and not be
+	// seen by the VtArray.
 	template<typename T>
 	VtValue operator()( const IECore::TypedData<vector<T>> *data, bool arrayRequired, typename std::enable_if<CortexTypeTraits<T>::BitwiseEquivalent>::type *enabler = nullptr ) const
 	{
 		using USDType = typename CortexTypeTraits<T>::USDType;
 		using ArrayType = VtArray<USDType>;
-		ArrayType array;
-		array.assign(
-			reinterpret_cast<const USDType *>( data->readable().data() ),
-			reinterpret_cast<const USDType *>( data->readable().data() + data->readable().size() )
+		if( data->readable().empty() )
+		{
+			return VtValue( ArrayType() );
+		}
+
+		typename IECore::TypedData<vector<T>>::ConstPtr dataCopy = data->copy();
+		const vector<T> &v = dataCopy->readable();
+		return VtValue(
+			ArrayType(
+				new DataArraySource( dataCopy.get() ),
+				const_cast<USDType *>( reinterpret_cast<const USDType *>( v.data() ) ),
+				v.size()
+			)
 		);
-		return VtValue( array );
 	}
 
 	template<typename T>
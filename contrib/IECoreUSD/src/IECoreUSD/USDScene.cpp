@@ -42,6 +42,7 @@
 #include "IECoreScene/ShaderNetwork.h"
 
 #include "IECore/LRUCache.h"
+#include "IECore/MemoryGovernor.h"
 #include "IECore/MessageHandler.h"
 #include "IECore/SimpleTypedData.h"
 #include "IECore/VectorTypedData.h"
@@ -514,7 +515,7 @@ struct ShaderNetworkCacheGetterKey : public pxr::UsdShadeOutput
 	}
 };
 
-class ShaderNetworkCache : public LRUCache<pxr::SdfPath, IECoreScene::ConstShaderNetworkPtr, LRUCachePolicy::Parallel, ShaderNetworkCacheGetterKey>
+class ShaderNetworkCache : public LRUCache<pxr::SdfPath, IECoreScene::ConstShaderNetworkPtr, LRUCachePolicy::Parallel, ShaderNetworkCacheGetterKey>, public MemoryGovernor::Client
 {
 
 	public :
@@ -522,6 +523,22 @@ class ShaderNetworkCache : public LRUCache<pxr::SdfPath, IECoreScene::ConstShade
 		ShaderNetworkCache( size_t maxBytes )
 			:	LRUCache<pxr::SdfPath, IECoreScene::ConstShaderNetworkPtr, LRUCachePolicy::Parallel, ShaderNetworkCacheGetterKey>( getter, maxBytes )
 		{
+			MemoryGovernor::registerClient( this, "USDScene::ShaderNetworkCache" );
+		}
+
+		~ShaderNetworkCache() override
+		{
+			MemoryGovernor::deregisterClient( this );
+		}
+
+		size_t memoryUsage() const override
+		{
+			return currentCost();
+		}
+
+		void reduceMemoryUsage( size_t memoryUsage ) override
+		{
+			limitCost( memoryUsage );
 		}
 
 	private :
@@ -749,7 +766,14 @@ class USDScene::IO : public RefCounted
 
 		IECoreScene::ConstShaderNetworkPtr readShaderNetwork( const pxr::UsdShadeOutput &output )
 		{
-			return m_shaderNetworkCache.get( output );
+			const size_t memoryUsage = m_shaderNetworkCache.currentCost();
+			IECoreScene::ConstShaderNetworkPtr result = m_shaderNetworkCache.get( output );
+			const size_t newMemoryUsage = m_shaderNetworkCache.currentCost();
+			if( newMemoryUsage > memoryUsage )
+			{
+				MemoryGovernor::memoryAdded( newMemoryUsage - memoryUsage );
+			}
+			return result;
 		}
 
 		inline int uniqueId()
@@ -35,6 +35,7 @@
 import unittest
 import imath
 
+import pxr.Gf
 import pxr.Sdf
 
 import IECore
@@ -87,6 +88,30 @@ class DataAlgoTest( unittest.TestCase ) :
 		] :
 			self.assertEqual( IECoreUSD.DataAlgo.toUSD( data ), value )
 
+	def testToUSDCopyOnWrite( self ) :
+
+		# Arrays of bitwise equivalent types share storage with the
+		# Cortex data, so we must check that modifications to one are
+		# not visible in the other.
+
+		data = IECore.V3fVectorData( [ imath.V3f( i ) for i in range( 0, 100 ) ] )
+		value = IECoreUSD.DataAlgo.toUSD( data )
+		self.assertEqual( list( value ), [ pxr.Gf.Vec3f( i ) for i in range( 0, 100 ) ] )
+
+		data[0] = imath.V3f( -1 )
+		self.assertEqual( value[0], pxr.Gf.Vec3f( 0 ) )
+
+		value[1] = pxr.Gf.Vec3f( -1 )
+		self.assertEqual( data[1], imath.V3f( 1 ) )
+
+		# And the USD array must remain valid after the Cortex
+		# data is destroyed.
+
+		del data
+		self.assertEqual( list( value ), [ pxr.Gf.Vec3f( 0 ), pxr.Gf.Vec3f( -1 ) ] + [ pxr.Gf.Vec3f( i ) for i in range( 2, 100 ) ] )
+
+		self.assertEqual( list( IECoreUSD.DataAlgo.toUSD( IECore.FloatVectorData() ) ), [] )
+
 	def testToFromInternalName( self ) :
 
 		a = "a-name(that-is-bad)"
@@ -36,6 +36,9 @@
 #include "IECore/VectorOps.h"
 #include "IECore/VectorTraits.h"
 
+#include "tbb/parallel_invoke.h"
+#include "tbb/task_arena.h"
+
 #include <algorithm>
 #include <cassert>
 
@@ -168,50 +171,16 @@ unsigned char BoundedKDTree<BoundIterator>::majorAxis( PermutationConstIterator
 	return major;
 }
 
-template<class BoundIterator>
-void BoundedKDTree<BoundIterator>::bound( NodeIndex nodeIndex  )
-{
-	assert( nodeIndex < m_nodes.size() );
-
-	Node &node = m_nodes[nodeIndex];
-
-	assert( BoxTraits<Bound>::isEmpty( node.bound() ) );
-
-	if( node.isLeaf() )
-	{
-		BoundIterator *permLast = node.permLast();
-		for( BoundIterator *perm = node.permFirst(); perm!=permLast; perm++ )
-		{
-			boxExtend( node.bound(), **perm );
-		}
-	}
-	else
-	{
-		assert( node.isBranch() );
-
-		assert( lowChildIndex( nodeIndex ) < m_nodes.size() );
-		assert( highChildIndex( nodeIndex ) < m_nodes.size() );
-
-		bound( lowChildIndex( nodeIndex ) );
-		bound( highChildIndex( nodeIndex ) );
-		boxExtend( node.bound(), m_nodes[lowChildIndex( nodeIndex )].bound() );
-		boxExtend( node.bound(), m_nodes[highChildIndex( nodeIndex )].bound() );
-	}
-}
-
-
 template<class BoundIterator>
 void BoundedKDTree<BoundIterator>::build( NodeIndex nodeIndex, PermutationIterator permFirst, PermutationIterator permLast )
 {
-	// make room for the new node
-	if( nodeIndex>=m_nodes.size() )
-	{
-		m_nodes.resize( nodeIndex+1 );
-	}
+	// Ranges larger than this have their subtrees built in parallel.
+	const typename Permutation::difference_type minParallelSize = 4096;
 
 	assert( nodeIndex < m_nodes.size() );
 
 	Node &node = m_nodes[nodeIndex];
+	assert( BoxTraits<Bound>::isEmpty( node.bound() ) );
 
 	if( permLast - permFirst > m_maxLeafSize )
 	{
@@ -222,13 +191,37 @@ void BoundedKDTree<BoundIterator>::build( NodeIndex nodeIndex, PermutationIterat
 		// insert node
 		node.makeBranch( cutAxis );
 
-		build( lowChildIndex( nodeIndex ), permFirst, permMid );
-		build( highChildIndex( nodeIndex ), permMid, permLast );
+		// The two halves are disjoint, and their nodes have already
+		// been allocated, so they can be built concurrently.
+		const NodeIndex lowIndex = lowChildIndex( nodeIndex );
+		const NodeIndex highIndex = highChildIndex( nodeIndex );
+		if( permLast - permFirst > minParallelSize )
+		{
+			tbb::parallel_invoke(
+				[this, lowIndex, permFirst, permMid] { build( lowIndex, permFirst, permMid ); },
+				[this, highIndex, permMid, permLast] { build( highIndex, permMid, permLast ); }
+			);
+		}
+		else
+		{
+			build( lowIndex, permFirst, permMid );
+			build( highIndex, permMid, permLast );
+		}
+
+		boxExtend( node.bound(), m_nodes[lowIndex].bound() );
+		boxExtend( node.bound(), m_nodes[highIndex].bound() );
 	}
 	else
 	{
 		// leaf node
 		node.makeLeaf( permFirst, permLast );
+
+		BoundIterator *perm = node.permFirst();
+		BoundIterator *permEnd = node.permLast();
+		for( ; perm != permEnd; perm++ )
+		{
+			boxExtend( node.bound(), **perm );
+		}
 	}
 }
 
@@ -256,9 +249,23 @@ void BoundedKDTree<BoundIterator>::init( BoundIterator first, BoundIterator last
 		m_perm[i++] = it;
 	}
 
-	/// \todo Can we reserve() enough space for m_nodes before doing this?
-	build( rootIndex(), m_perm.begin(), m_perm.end() );
-	bound( rootIndex() );
+	// Because the tree is balanced, the node with the highest index
+	// is found by always following the high child, which receives the
+	// larger half of any odd-sized range. Allocating all the nodes up
+	// front allows `build()` to process subtrees in parallel.
+	NodeIndex maxIndex = rootIndex();
+	for( size_t n = m_perm.size(); n > (size_t)m_maxLeafSize; n -= n / 2 )
+	{
+		maxIndex = highChildIndex( maxIndex );
+	}
+	m_nodes.clear();
+	m_nodes.resize( maxIndex + 1 );
+
+	tbb::this_task_arena::isolate(
+		[this] {
+			build( rootIndex(), m_perm.begin(), m_perm.end() );
+		}
+	);
 }
 
 template<class BoundIterator>
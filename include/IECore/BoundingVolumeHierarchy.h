@@ -0,0 +1,173 @@
+//////////////////////////////////////////////////////////////////////////
+//
+//  Copyright (c) 2026, Image Engine Design Inc. All rights reserved.
+//
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//
+//     * Redistributions of source code must retain the above copyright
+//       notice, this list of conditions and the following disclaimer.
+//
+//     * Redistributions in binary form must reproduce the above copyright
+//       notice, this list of conditions and the following disclaimer in the
+//       documentation and/or other materials provided with the distribution.
+//
+//     * Neither the name of Image Engine Design nor the names of any
+//       other contributors to this software may be used to endorse or
+//       promote products derived from this software without specific prior
+//       written permission.
+//
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//////////////////////////////////////////////////////////////////////////
+
+#ifndef IECORE_BOUNDINGVOLUMEHIERARCHY_H
+#define IECORE_BOUNDINGVOLUMEHIERARCHY_H
+
+#include "IECore/BoxTraits.h"
+#include "IECore/Export.h"
+
+IECORE_PUSH_DEFAULT_VISIBILITY
+#include "Imath/ImathBox.h"
+IECORE_POP_DEFAULT_VISIBILITY
+
+#include <cstdint>
+#include <vector>
+
+namespace IECore
+{
+
+/// Builds a bounding volume hierarchy of bounded volumes to permit fast
+/// intersection tests. Unlike the BoundedKDTree, which always splits at the
+/// median, the hierarchy is partitioned using the surface area heuristic,
+/// which typically results in far fewer nodes being visited by ray queries.
+/// The nodes are stored in a single flat array in depth-first order, such
+/// that the first child of a branch immediately follows it, and the index of
+/// the second child is stored in the branch itself.
+/// \ingroup mathGroup
+template<class BoundIterator>
+class BoundingVolumeHierarchy
+{
+	public:
+
+		typedef BoundIterator Iterator;
+		typedef typename std::iterator_traits<BoundIterator>::value_type Bound;
+		typedef typename BoxTraits<Bound>::BaseType BaseType;
+		class Node;
+		typedef std::vector<Node> NodeVector;
+		typedef uint32_t NodeIndex;
+
+		/// Constructs an uninitialised hierarchy - you must call init() before
+		/// using it.
+		BoundingVolumeHierarchy();
+
+		/// Creates a hierarchy for the fast searching of bounds.
+		/// Note that the hierarchy does not own the passed bounds -
+		/// it is up to you to ensure that they remain valid and
+		/// unchanged as long as the BoundingVolumeHierarchy is in use.
+		BoundingVolumeHierarchy( BoundIterator first, BoundIterator last, int maxLeafSize=4 );
+
+		/// Builds the hierarchy for the specified bounds - the iterator range
+		/// must remain valid and unchanged as long as the hierarchy is in use.
+		/// This method can be called again to rebuild the hierarchy at any time.
+		/// \threading This can't be called while other threads are
+		/// making queries.
+		void init( BoundIterator first, BoundIterator last, int maxLeafSize=4 );
+
+		/// Populates the passed vector of iterators with the bounds which intersect "b". Returns the number of bounds found.
+		/// \threading May be called by multiple concurrent threads provided they each use a different vector for the result.
+		template<typename S>
+		unsigned int intersectingBounds( const S &b, std::vector<BoundIterator> &bounds ) const;
+
+		/// Returns the number of nodes in the hierarchy.
+		inline NodeIndex numNodes() const;
+
+		/// Returns the length of the longest path from the root to a leaf,
+		/// which may be used to size the stack for a traversal.
+		inline unsigned depth() const;
+
+		/// Retrieve the node associated with a given index
+		inline const Node &node( NodeIndex index ) const;
+
+		/// Returns the index for the root node
+		inline static NodeIndex rootIndex();
+
+		/// Retrieve the index of the first child of a branch node
+		inline static NodeIndex firstChildIndex( NodeIndex index );
+
+		/// Retrieve the index of the second child of a branch node
+		inline NodeIndex secondChildIndex( NodeIndex index ) const;
+
+		/// Returns the range of bounds contained in a leaf node.
+		inline const BoundIterator *permFirst( const Node &node ) const;
+		inline const BoundIterator *permLast( const Node &node ) const;
+
+	private:
+
+		typedef std::vector<BoundIterator> Permutation;
+		typedef typename Permutation::iterator PermutationIterator;
+
+		static double halfArea( const Bound &bound );
+		PermutationIterator split( PermutationIterator permFirst, PermutationIterator permLast, const Bound &centroidBound, unsigned char &axis ) const;
+
+		Permutation m_perm;
+		NodeVector m_nodes;
+		int m_maxLeafSize;
+		unsigned m_depth;
+
+};
+
+template<class BoundIterator>
+class BoundingVolumeHierarchy<BoundIterator>::Node
+{
+	public :
+
+		/// Must be default constructible for use as element within std::vector
+		Node();
+
+		inline bool isLeaf() const;
+
+		inline bool isBranch() const;
+
+		/// The axis used to partition the children of a branch node.
+		/// Rays travelling in the negative direction along this axis
+		/// will typically find the closest intersection sooner by
+		/// visiting the second child first.
+		inline unsigned char splitAxis() const;
+
+		/// The number of bounds in a leaf node.
+		inline unsigned numBounds() const;
+
+		inline const Bound &bound() const;
+
+	private :
+
+		friend class BoundingVolumeHierarchy<BoundIterator>;
+
+		Bound m_bound;
+		// For leaf nodes, the offset of the first bound in the permutation.
+		// For branch nodes, the index of the second child.
+		uint32_t m_offset;
+		uint16_t m_count;
+		unsigned char m_axis;
+};
+
+typedef BoundingVolumeHierarchy<std::vector<Imath::Box2f>::const_iterator> Box2fBVH;
+typedef BoundingVolumeHierarchy<std::vector<Imath::Box3f>::const_iterator> Box3fBVH;
+
+} // namespace IECore
+
+#include "IECore/BoundingVolumeHierarchy.inl"
+
+#endif // IECORE_BOUNDINGVOLUMEHIERARCHY_H
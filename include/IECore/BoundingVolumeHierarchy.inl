@@ -0,0 +1,424 @@
+//////////////////////////////////////////////////////////////////////////
+//
+//  Copyright (c) 2026, Image Engine Design Inc. All rights reserved.
+//
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//
+//     * Redistributions of source code must retain the above copyright
+//       notice, this list of conditions and the following disclaimer.
+//
+//     * Redistributions in binary form must reproduce the above copyright
+//       notice, this list of conditions and the following disclaimer in the
+//       documentation and/or other materials provided with the distribution.
+//
+//     * Neither the name of Image Engine Design nor the names of any
+//       other contributors to this software may be used to endorse or
+//       promote products derived from this software without specific prior
+//       written permission.
+//
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//////////////////////////////////////////////////////////////////////////
+
+#ifndef IECORE_BOUNDINGVOLUMEHIERARCHY_INL
+#define IECORE_BOUNDINGVOLUMEHIERARCHY_INL
+
+#include "IECore/BoxOps.h"
+#include "IECore/VectorOps.h"
+#include "IECore/VectorTraits.h"
+
+#include <algorithm>
+#include <cassert>
+#include <limits>
+
+namespace IECore
+{
+
+//////////////////////////////////////////////////////////////////////////
+// Node
+//////////////////////////////////////////////////////////////////////////
+
+template<class BoundIterator>
+BoundingVolumeHierarchy<BoundIterator>::Node::Node() : m_offset( 0 ), m_count( 0 ), m_axis( 255 )
+{
+	BoxTraits<Bound>::makeEmpty( m_bound );
+}
+
+template<class BoundIterator>
+bool BoundingVolumeHierarchy<BoundIterator>::Node::isLeaf() const
+{
+	return m_axis == 255;
+}
+
+template<class BoundIterator>
+bool BoundingVolumeHierarchy<BoundIterator>::Node::isBranch() const
+{
+	return m_axis != 255;
+}
+
+template<class BoundIterator>
+unsigned char BoundingVolumeHierarchy<BoundIterator>::Node::splitAxis() const
+{
+	assert( isBranch() );
+	return m_axis;
+}
+
+template<class BoundIterator>
+unsigned BoundingVolumeHierarchy<BoundIterator>::Node::numBounds() const
+{
+	assert( isLeaf() );
+	return m_count;
+}
+
+template<class BoundIterator>
+const typename BoundingVolumeHierarchy<BoundIterator>::Bound &BoundingVolumeHierarchy<BoundIterator>::Node::bound() const
+{
+	return m_bound;
+}
+
+//////////////////////////////////////////////////////////////////////////
+// BoundingVolumeHierarchy
+//////////////////////////////////////////////////////////////////////////
+
+template<class BoundIterator>
+BoundingVolumeHierarchy<BoundIterator>::BoundingVolumeHierarchy()
+	:	m_maxLeafSize( 4 ), m_depth( 0 )
+{
+}
+
+template<class BoundIterator>
+BoundingVolumeHierarchy<BoundIterator>::BoundingVolumeHierarchy( BoundIterator first, BoundIterator last, int maxLeafSize )
+	:	m_maxLeafSize( 4 ), m_depth( 0 )
+{
+	init( first, last, maxLeafSize );
+}
+
+template<class BoundIterator>
+void BoundingVolumeHierarchy<BoundIterator>::init( BoundIterator first, BoundIterator last, int maxLeafSize )
+{
+	// Leaf sizes are stored in 16 bits, but there is no benefit
+	// in leaves anywhere near that large.
+	m_maxLeafSize = std::max( 1, std::min( maxLeafSize, 255 ) );
+
+	m_perm.resize( last - first );
+	size_t i = 0;
+	for( BoundIterator it = first; it != last; ++it )
+	{
+		m_perm[i++] = it;
+	}
+
+	m_nodes.clear();
+	m_nodes.reserve( std::max<size_t>( 1, 2 * m_perm.size() ) );
+	m_depth = 0;
+
+	// We build using an explicit stack rather than recursion, because
+	// the surface area heuristic doesn't guarantee a balanced hierarchy.
+	// Pushing the second child before the first ensures that the first
+	// child is always built immediately after its parent.
+
+	struct Task
+	{
+		PermutationIterator first;
+		PermutationIterator last;
+		// Parent to be updated with the index of this node,
+		// if this is a second child.
+		NodeIndex parent;
+		unsigned depth;
+	};
+
+	const NodeIndex noParent = std::numeric_limits<NodeIndex>::max();
+	std::vector<Task> stack = { { m_perm.begin(), m_perm.end(), noParent, 0 } };
+	while( !stack.empty() )
+	{
+		const Task task = stack.back();
+		stack.pop_back();
+
+		const NodeIndex nodeIndex = m_nodes.size();
+		m_nodes.push_back( Node() );
+		if( task.parent != noParent )
+		{
+			m_nodes[task.parent].m_offset = nodeIndex;
+		}
+		m_depth = std::max( m_depth, task.depth );
+
+		Node &node = m_nodes.back();
+		Bound centroidBound;
+		BoxTraits<Bound>::makeEmpty( centroidBound );
+		for( PermutationIterator it = task.first; it != task.last; ++it )
+		{
+			boxExtend( node.m_bound, **it );
+			boxExtend( centroidBound, boxCenter( **it ) );
+		}
+
+		unsigned char axis = 0;
+		PermutationIterator mid = split( task.first, task.last, centroidBound, axis );
+		if( mid == task.first )
+		{
+			node.m_offset = task.first - m_perm.begin();
+			node.m_count = task.last - task.first;
+		}
+		else
+		{
+			node.m_axis = axis;
+			stack.push_back( { mid, task.last, nodeIndex, task.depth + 1 } );
+			stack.push_back( { task.first, mid, noParent, task.depth + 1 } );
+		}
+	}
+}
+
+template<class BoundIterator>
+double BoundingVolumeHierarchy<BoundIterator>::halfArea( const Bound &bound )
+{
+	if( BoxTraits<Bound>::isEmpty( bound ) )
+	{
+		return 0.0;
+	}
+
+	const BaseType size = boxSize( bound );
+	const unsigned dimensions = VectorTraits<BaseType>::dimensions();
+	if( dimensions < 3 )
+	{
+		// Perimeter, which is the equivalent measure in 2d.
+		double result = 0.0;
+		for( unsigned i = 0; i < dimensions; ++i )
+		{
+			result += vecGet( size, i );
+		}
+		return result;
+	}
+
+	double result = 0.0;
+	for( unsigned i = 0; i < dimensions; ++i )
+	{
+		for( unsigned j = i + 1; j < dimensions; ++j )
+		{
+			result += (double)vecGet( size, i ) * vecGet( size, j );
+		}
+	}
+	return result;
+}
+
+template<class BoundIterator>
+typename BoundingVolumeHierarchy<BoundIterator>::PermutationIterator BoundingVolumeHierarchy<BoundIterator>::split( PermutationIterator permFirst, PermutationIterator permLast, const Bound &centroidBound, unsigned char &axis ) const
+{
+	const size_t size = permLast - permFirst;
+	if( size <= (size_t)m_maxLeafSize )
+	{
+		// Leaf
+		return permFirst;
+	}
+
+	// Evaluate the surface area heuristic for splits between
+	// equally sized bins along each axis, and choose the cheapest.
+
+	static const int numBins = 16;
+	struct Bin
+	{
+		Bin() : count( 0 ) { BoxTraits<Bound>::makeEmpty( bound ); }
+		Bound bound;
+		size_t count;
+	};
+
+	const BaseType centroidMin = BoxTraits<Bound>::min( centroidBound );
+	const BaseType centroidSize = boxSize( centroidBound );
+
+	double bestCost = std::numeric_limits<double>::max();
+	int bestBin = 0;
+	axis = 0;
+
+	for( unsigned a = 0; a < VectorTraits<BaseType>::dimensions(); ++a )
+	{
+		const double extent = vecGet( centroidSize, a );
+		if( extent <= 0.0 )
+		{
+			continue;
+		}
+
+		const double scale = numBins / extent;
+		auto binIndex = [&]( const Bound &b ) {
+			const int i = (int)( ( vecGet( boxCenter( b ), a ) - vecGet( centroidMin, a ) ) * scale );
+			return std::max( 0, std::min( i, numBins - 1 ) );
+		};
+
+		Bin bins[numBins];
+		for( PermutationIterator it = permFirst; it != permLast; ++it )
+		{
+			Bin &bin = bins[binIndex( **it )];
+			bin.count++;
+			boxExtend( bin.bound, **it );
+		}
+
+		// Sweep from the right to find the cost of everything above each split,
+		// then from the left to find the total cost.
+
+		double rightArea[numBins];
+		size_t rightCount[numBins];
+		Bound accumulated;
+		BoxTraits<Bound>::makeEmpty( accumulated );
+		size_t count = 0;
+		for( int i = numBins - 1; i > 0; --i )
+		{
+			boxExtend( accumulated, bins[i].bound );
+			count += bins[i].count;
+			rightArea[i] = halfArea( accumulated );
+			rightCount[i] = count;
+		}
+
+		BoxTraits<Bound>::makeEmpty( accumulated );
+		count = 0;
+		for( int i = 1; i < numBins; ++i )
+		{
+			boxExtend( accumulated, bins[i-1].bound );
+			count += bins[i-1].count;
+			if( !count || !rightCount[i] )
+			{
+				continue;
+			}
+			const double cost = count * halfArea( accumulated ) + rightCount[i] * rightArea[i];
+			if( cost < bestCost )
+			{
+				bestCost = cost;
+				bestBin = i;
+				axis = a;
+			}
+		}
+	}
+
+	if( bestCost == std::numeric_limits<double>::max() )
+	{
+		// All the centres coincide, so no spatial split is possible.
+		// Split in half to keep the leaves small.
+		return permFirst + size / 2;
+	}
+
+	const double scale = numBins / (double)vecGet( centroidSize, axis );
+	PermutationIterator mid = std::partition(
+		permFirst, permLast,
+		[&]( BoundIterator it ) {
+			const int i = (int)( ( vecGet( boxCenter( *it ), axis ) - vecGet( centroidMin, axis ) ) * scale );
+			return std::max( 0, std::min( i, numBins - 1 ) ) < bestBin;
+		}
+	);
+
+	if( mid == permFirst || mid == permLast )
+	{
+		// Shouldn't be possible, since we only consider splits with
+		// bounds on both sides, but guard against an infinite loop.
+		return permFirst + size / 2;
+	}
+
+	return mid;
+}
+
+template<class BoundIterator>
+typename BoundingVolumeHierarchy<BoundIterator>::NodeIndex BoundingVolumeHierarchy<BoundIterator>::numNodes() const
+{
+	return m_nodes.size();
+}
+
+template<class BoundIterator>
+unsigned BoundingVolumeHierarchy<BoundIterator>::depth() const
+{
+	return m_depth;
+}
+
+template<class BoundIterator>
+const typename BoundingVolumeHierarchy<BoundIterator>::Node &BoundingVolumeHierarchy<BoundIterator>::node( NodeIndex index ) const
+{
+	assert( index < m_nodes.size() );
+	return m_nodes[index];
+}
+
+template<class BoundIterator>
+typename BoundingVolumeHierarchy<BoundIterator>::NodeIndex BoundingVolumeHierarchy<BoundIterator>::rootIndex()
+{
+	return 0;
+}
+
+template<class BoundIterator>
+typename BoundingVolumeHierarchy<BoundIterator>::NodeIndex BoundingVolumeHierarchy<BoundIterator>::firstChildIndex( NodeIndex index )
+{
+	return index + 1;
+}
+
+template<class BoundIterator>
+typename BoundingVolumeHierarchy<BoundIterator>::NodeIndex BoundingVolumeHierarchy<BoundIterator>::secondChildIndex( NodeIndex index ) const
+{
+	assert( m_nodes[index].isBranch() );
+	return m_nodes[index].m_offset;
+}
+
+template<class BoundIterator>
+const BoundIterator *BoundingVolumeHierarchy<BoundIterator>::permFirst( const Node &node ) const
+{
+	assert( node.isLeaf() );
+	return m_perm.data() + node.m_offset;
+}
+
+template<class BoundIterator>
+const BoundIterator *BoundingVolumeHierarchy<BoundIterator>::permLast( const Node &node ) const
+{
+	assert( node.isLeaf() );
+	return m_perm.data() + node.m_offset + node.m_count;
+}
+
+template<class BoundIterator>
+template<typename S>
+unsigned int BoundingVolumeHierarchy<BoundIterator>::intersectingBounds( const S &b, std::vector<BoundIterator> &bounds ) const
+{
+	bounds.clear();
+	if( m_nodes.empty() )
+	{
+		return 0;
+	}
+
+	std::vector<NodeIndex> stack;
+	stack.reserve( m_depth + 1 );
+	stack.push_back( rootIndex() );
+	while( !stack.empty() )
+	{
+		const NodeIndex nodeIndex = stack.back();
+		stack.pop_back();
+
+		const Node &node = m_nodes[nodeIndex];
+		if( !boxIntersects( node.bound(), b ) )
+		{
+			continue;
+		}
+
+		if( node.isLeaf() )
+		{
+			const BoundIterator *last = permLast( node );
+			for( const BoundIterator *perm = permFirst( node ); perm != last; ++perm )
+			{
+				if( boxIntersects( **perm, b ) )
+				{
+					bounds.push_back( *perm );
+				}
+			}
+		}
+		else
+		{
+			stack.push_back( secondChildIndex( nodeIndex ) );
+			stack.push_back( firstChildIndex( nodeIndex ) );
+		}
+	}
+
+	return bounds.size();
+}
+
+} // namespace IECore
+
+#endif // IECORE_BOUNDINGVOLUMEHIERARCHY_INL
@@ -40,6 +40,9 @@
 
 #include "boost/function.hpp"
 
+#include <atomic>
+#include <memory>
+
 namespace IECore
 {
 
@@ -54,6 +57,8 @@ class ComputationCache : public RefCounted
 		typedef ObjectPool::StoreMode StoreMode;
 		typedef boost::function<IECore::ConstObjectPtr ( const T & )> ComputeFn;
 		typedef boost::function<IECore::MurmurHash ( const T & )> HashFn;
+		typedef boost::function<size_t ( const Object * )> CostFn;
+		typedef boost::function<size_t ( const T & )> CategoryFn;
 
 		IE_CORE_DECLAREMEMBERPTR( ComputationCache )
 
@@ -63,6 +68,12 @@ class ComputationCache : public RefCounted
 		/// \param maxResults Limits the number of computation results this cache will hold.
 		/// \param objectPool Allows overriding the ObjectPool instance to be used for holding the resulting computed objects.
 		ComputationCache( ComputeFn computeFn, HashFn hashFn, size_t maxResults = 10000, ObjectPoolPtr objectPool = ObjectPool::defaultObjectPool() );
+		/// Constructs a cache where each computation result is priced by the given cost function, rather than
+		/// counting as a single computation. For instance, using Object::memoryUsage() as the cost function allows
+		/// the cache to be limited in bytes rather than in number of computations.
+		/// \param costFn Functor that returns the cost of a computation result.
+		/// \param maxCost Limits the total cost of the computation results this cache will hold.
+		ComputationCache( ComputeFn computeFn, HashFn hashFn, CostFn costFn, size_t maxCost, ObjectPoolPtr objectPool = ObjectPool::defaultObjectPool() );
 
 		~ComputationCache() override;
 
@@ -79,8 +90,33 @@ class ComputationCache : public RefCounted
 		void setMaxComputations( size_t maxComputations );
 
 		/// Returns the number of stored computations
+		/// (or their total cost if a cost function is in use).
 		size_t cachedComputations() const;
 
+		struct Statistics
+		{
+			/// Number of calls to get() which found the result in the cache.
+			size_t hits;
+			/// Number of calls to get() which did not find the result in the cache.
+			size_t misses;
+			/// Number of computations removed from the cache, either to satisfy
+			/// the maximum cost, or by erase() and clear().
+			size_t evictions;
+		};
+
+		/// Returns statistics accumulated since construction, or since the
+		/// last call to resetStatistics().
+		Statistics statistics() const;
+		void resetStatistics();
+
+		/// Assigns each computation to one of `numCategories` categories, for which
+		/// separate statistics are kept in addition to the overall statistics. The
+		/// category function must return a value less than `numCategories`. Must be
+		/// called before the cache is first used.
+		void setStatisticsCategories( CategoryFn categoryFn, size_t numCategories );
+		/// Returns the statistics for a single category.
+		Statistics statistics( size_t category ) const;
+
 		/// Enum used to specify behavior when retrieving computation results from the cache.
 		typedef enum {
 			ThrowIfMissing = 0,
@@ -105,13 +141,46 @@ class ComputationCache : public RefCounted
 
 		ComputeFn m_computeFn;
 		HashFn m_hashFn;
+		CostFn m_costFn;
+
+		// We store the category alongside the object hash, so that
+		// evictions can be attributed to the right category.
+		struct CacheValue
+		{
+			CacheValue() : category( 0 ) {}
+			CacheValue( const MurmurHash &objectHash, size_t category ) : objectHash( objectHash ), category( category ) {}
 
-		typedef IECore::LRUCache<MurmurHash, MurmurHash> Cache;
+			MurmurHash objectHash;
+			size_t category;
+		};
+
+		typedef IECore::LRUCache<MurmurHash, CacheValue> Cache;
 		Cache m_cache;
 
 		ObjectPoolPtr m_objectPool;
 
-		static MurmurHash cacheGetter( const MurmurHash &h, size_t &cost );
+		struct AtomicStatistics
+		{
+			AtomicStatistics() : hits( 0 ), misses( 0 ), evictions( 0 ) {}
+
+			std::atomic<size_t> hits;
+			std::atomic<size_t> misses;
+			std::atomic<size_t> evictions;
+		};
+
+		AtomicStatistics m_statistics;
+		CategoryFn m_categoryFn;
+		size_t m_numCategories;
+		std::unique_ptr<AtomicStatistics[]> m_categoryStatistics;
+
+		size_t cost( const Object *obj ) const;
+		size_t category( const T &args ) const;
+
+		void hit( size_t category );
+		void miss( size_t category );
+		void removalCallback( const MurmurHash &computationHash, const CacheValue &value );
+
+		static CacheValue cacheGetter( const MurmurHash &h, size_t &cost );
 };
 
 
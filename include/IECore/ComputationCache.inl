@@ -35,6 +35,7 @@
 #ifndef IECORE_COMPUTATIONCACHE_INL
 #define IECORE_COMPUTATIONCACHE_INL
 
+#include "IECore/Exception.h"
 #include "IECore/MessageHandler.h"
 
 namespace IECore
@@ -42,7 +43,17 @@ namespace IECore
 
 template< typename T >
 ComputationCache<T>::ComputationCache( ComputeFn computeFn, HashFn hashFn, size_t maxResults, ObjectPoolPtr objectPool ) :
-	m_computeFn(computeFn), m_hashFn(hashFn), m_cache( &ComputationCache<T>::cacheGetter, maxResults), m_objectPool(objectPool)
+	m_computeFn(computeFn), m_hashFn(hashFn),
+	m_cache( &ComputationCache<T>::cacheGetter, [this]( const MurmurHash &computationHash, const CacheValue &value ) { removalCallback( computationHash, value ); }, maxResults ),
+	m_objectPool(objectPool), m_numCategories( 0 )
+{
+}
+
+template< typename T >
+ComputationCache<T>::ComputationCache( ComputeFn computeFn, HashFn hashFn, CostFn costFn, size_t maxCost, ObjectPoolPtr objectPool ) :
+	m_computeFn(computeFn), m_hashFn(hashFn), m_costFn(costFn),
+	m_cache( &ComputationCache<T>::cacheGetter, [this]( const MurmurHash &computationHash, const CacheValue &value ) { removalCallback( computationHash, value ); }, maxCost ),
+	m_objectPool(objectPool), m_numCategories( 0 )
 {
 }
 
@@ -82,15 +93,64 @@ size_t ComputationCache<T>::cachedComputations() const
 	return m_cache.currentCost();
 }
 
+template< typename T >
+typename ComputationCache<T>::Statistics ComputationCache<T>::statistics() const
+{
+	Statistics result;
+	result.hits = m_statistics.hits;
+	result.misses = m_statistics.misses;
+	result.evictions = m_statistics.evictions;
+	return result;
+}
+
+template< typename T >
+void ComputationCache<T>::resetStatistics()
+{
+	m_statistics.hits = 0;
+	m_statistics.misses = 0;
+	m_statistics.evictions = 0;
+	for( size_t i = 0; i < m_numCategories; ++i )
+	{
+		m_categoryStatistics[i].hits = 0;
+		m_categoryStatistics[i].misses = 0;
+		m_categoryStatistics[i].evictions = 0;
+	}
+}
+
+template< typename T >
+void ComputationCache<T>::setStatisticsCategories( CategoryFn categoryFn, size_t numCategories )
+{
+	m_categoryFn = categoryFn;
+	m_numCategories = numCategories;
+	m_categoryStatistics.reset( new AtomicStatistics[numCategories] );
+}
+
+template< typename T >
+typename ComputationCache<T>::Statistics ComputationCache<T>::statistics( size_t category ) const
+{
+	if( category >= m_numCategories )
+	{
+		throw InvalidArgumentException( "ComputationCache::statistics : Invalid category" );
+	}
+
+	Statistics result;
+	result.hits = m_categoryStatistics[category].hits;
+	result.misses = m_categoryStatistics[category].misses;
+	result.evictions = m_categoryStatistics[category].evictions;
+	return result;
+}
+
 template< typename T >
 ConstObjectPtr ComputationCache<T>::get( const T &args, ComputationCache::MissingBehaviour missingBehaviour )
 {
 	ConstObjectPtr obj(nullptr);
 	MurmurHash computationHash = m_hashFn(args);
-	MurmurHash objectHash = m_cache.get(computationHash);
+	const size_t computationCategory = category( args );
+	MurmurHash objectHash = m_cache.get(computationHash).objectHash;
 
 	if ( objectHash == MurmurHash() )
 	{
+		miss( computationCategory );
 		/// don't know the computation hash... check the missing behaviour
 		if ( missingBehaviour == ThrowIfMissing )
 		{
@@ -103,15 +163,20 @@ ConstObjectPtr ComputationCache<T>::get( const T &args, ComputationCache::Missin
 		obj = m_computeFn(args);
 		if ( obj )
 		{
-			m_cache.set( computationHash, obj->hash(), 1 );
+			m_cache.set( computationHash, CacheValue( obj->hash(), computationCategory ), cost( obj.get() ) );
 			obj = m_objectPool->store( obj.get(), ObjectPool::StoreReference );
 		}
 	}
 	else
 	{
 		obj = m_objectPool->retrieve(objectHash);
-		if ( !obj )
+		if ( obj )
+		{
+			hit( computationCategory );
+		}
+		else
 		{
+			miss( computationCategory );
 			/// the computation result was not in the object pool.... check the missing behavour
 			if ( missingBehaviour == ThrowIfMissing )
 			{
@@ -129,7 +194,7 @@ ConstObjectPtr ComputationCache<T>::get( const T &args, ComputationCache::Missin
 				if ( h != objectHash )
 				{
 					/// the computation returned a different object for some reason, so we have to update the hash
-					m_cache.set( computationHash, h, 1 );
+					m_cache.set( computationHash, CacheValue( h, computationCategory ), cost( obj.get() ) );
 					msg( Msg::Warning, "ComputationCache::get", "Inconsistent hash detected." );
 				}
 			}
@@ -145,15 +210,61 @@ void ComputationCache<T>::set( const T &args, const Object *obj, StoreMode store
 	if ( obj )
 	{
 		m_objectPool->store(obj, storeMode);
-		m_cache.set( computationHash, obj->hash(), 1 );
+		m_cache.set( computationHash, CacheValue( obj->hash(), category( args ) ), cost( obj ) );
+	}
+}
+
+template< typename T >
+size_t ComputationCache<T>::cost( const Object *obj ) const
+{
+	return m_costFn ? m_costFn( obj ) : 1;
+}
+
+template< typename T >
+size_t ComputationCache<T>::category( const T &args ) const
+{
+	return m_categoryFn ? m_categoryFn( args ) : 0;
+}
+
+template< typename T >
+void ComputationCache<T>::hit( size_t category )
+{
+	m_statistics.hits++;
+	if( category < m_numCategories )
+	{
+		m_categoryStatistics[category].hits++;
+	}
+}
+
+template< typename T >
+void ComputationCache<T>::miss( size_t category )
+{
+	m_statistics.misses++;
+	if( category < m_numCategories )
+	{
+		m_categoryStatistics[category].misses++;
+	}
+}
+
+template< typename T >
+void ComputationCache<T>::removalCallback( const MurmurHash &computationHash, const CacheValue &value )
+{
+	// ignore the placeholders registered by cacheGetter()
+	if( value.objectHash != MurmurHash() )
+	{
+		m_statistics.evictions++;
+		if( value.category < m_numCategories )
+		{
+			m_categoryStatistics[value.category].evictions++;
+		}
 	}
 }
 
 template< typename T >
-MurmurHash ComputationCache<T>::cacheGetter( const MurmurHash &h, size_t &cost )
+typename ComputationCache<T>::CacheValue ComputationCache<T>::cacheGetter( const MurmurHash &h, size_t &cost )
 {
 	cost = 1;
-	return MurmurHash();
+	return CacheValue();
 }
 
 template< typename T >
@@ -59,6 +59,11 @@ class IECORE_API FileIndexedIO : public StreamIndexedIO
 		/// 	"compressor" : String [ 'blosclz' | 'lz4' | 'lz4hc' | 'snappy' | 'zlib']
 		///		"compressionLevel" : Int [ 0 = no compression, 9 = max compression ]
 		///		"maxCompressedBlockSize" : UInt [ size of compression block ]
+		///		"memoryMapped" : Bool [ map the file into memory when opened for Read. Defaults
+		///			to true if the IECORE_FILEINDEXEDIO_MEMORYMAPPED environment variable is "1" ]
+		///		"pipelinedWrites" : Bool [ compress data on the TBB thread pool when writing, while
+		///			the calling thread stores it in the file in the original order. Defaults to
+		///			true if the IECORE_STREAMINDEXEDIO_PIPELINEDWRITES environment variable is "1" ]
 		FileIndexedIO(const std::string &path, const IndexedIO::EntryIDList &root, IndexedIO::OpenMode mode, const CompoundData *options = nullptr);
 
 		~FileIndexedIO() override;
@@ -35,10 +35,14 @@
 #ifndef IE_CORE_FILESEQUENCEFUNCTIONS_H
 #define IE_CORE_FILESEQUENCEFUNCTIONS_H
 
+#include "IECore/Canceller.h"
 #include "IECore/Export.h"
 #include "IECore/FileSequence.h"
 #include "IECore/FrameList.h"
 
+#include <functional>
+#include <limits>
+
 namespace IECore
 {
 
@@ -58,6 +62,22 @@ IECORE_API void ls( const std::string &path, std::vector< FileSequencePtr > &seq
 /// Attempts to find a sequence matching the given sequence template (e.g. with at least one '#' character).
 IECORE_API void ls( const std::string &sequencePath, FileSequencePtr &sequence, size_t minSequenceSize = 2 );
 
+/// Function called by lsRecursive() for each directory containing sequences. The
+/// sequences have file names relative to the directory.
+using LsRecursiveFunction = std::function<void ( const std::string &directory, std::vector<FileSequencePtr> &sequences )>;
+
+/// Finds all sequences with at least minSequenceSize elements in the given directory
+/// and its subdirectories, passing them to `function` one directory at a time.
+/// Subdirectories are scanned in parallel, so directories are visited in no particular
+/// order, but calls to `function` are serialised. Directories up to `maxDepth` levels
+/// below `path` are scanned. Symbolic links to directories are scanned, but their
+/// subdirectories are only scanned if `followLinks` is true. Directories which can't
+/// be read are ignored.
+IECORE_API void lsRecursive(
+	const std::string &path, const LsRecursiveFunction &function, size_t minSequenceSize = 2,
+	bool followLinks = false, size_t maxDepth = std::numeric_limits<size_t>::max(), const Canceller *canceller = nullptr
+);
+
 /// Returns a FrameList instance that "best" represents the specified list of integer
 /// frame numbers. This function attempts to be intelligent and uses a CompoundFrameList
 /// of FrameRange objects to represent the specified frames compactly.
@@ -134,6 +134,32 @@ IECORE_API void copy(const IndexedIO *src, IndexedIO *dst );
 /// This function is used for performance monitoring
 IECORE_API FileStats<size_t> parallelReadAll( const IndexedIO *src );
 
+/// Determines the order in which `repack()` lays out data in the destination.
+enum class RepackOrder
+{
+	/// Hierarchy is visited depth first, with the files of each directory
+	/// written before its subdirectories. All samples of a location are
+	/// therefore contiguous.
+	DepthFirst,
+	/// Entries named by an integer sample index (as written by SceneCache)
+	/// are grouped by sample, so that all data for sample 0 comes first,
+	/// followed by all data for sample 1 and so on. Sample directories are
+	/// written in their entirety along with their sample. All other data
+	/// is written first, in depth first order.
+	TimeMajor
+};
+
+/// Copies 'src' to 'dst', writing data blocks in the specified order. When 'dst' is
+/// a newly created StreamIndexedIO, the result contains no free pages and blocks are
+/// stored contiguously in read order, with identical blocks deduplicated as usual.
+/// Data is recompressed using the compression options 'dst' was opened with.
+IECORE_API void repack( const IndexedIO *src, IndexedIO *dst, RepackOrder order = RepackOrder::DepthFirst );
+/// Convenience overload which repacks the file at 'srcFileName' into 'dstFileName',
+/// which may be the same file. 'options' are passed when opening the destination
+/// and may be used to choose a different "compressor" or "compressionLevel" (see
+/// FileIndexedIO). When they are not specified, those of the source are used.
+IECORE_API void repack( const std::string &srcFileName, const std::string &dstFileName, RepackOrder order = RepackOrder::DepthFirst, const CompoundData *options = nullptr );
+
 template<typename T>
 inline std::ostream &operator <<( std::ostream &s, const FileStats<T> &stats)
 {
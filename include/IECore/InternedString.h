@@ -46,6 +46,8 @@
 #endif
 
 #include <string>
+#include <string_view>
+#include <vector>
 
 /// May be used to detect the existence of the
 /// InternedString( const char *, size_t length )
@@ -101,7 +103,15 @@ class IECORE_API InternedString
 		inline const std::string &string() const;
 		inline const char *c_str() const;
 
+		/// Interns `count` strings in a single operation, storing the results
+		/// in `result`. This is more efficient than constructing InternedStrings
+		/// individually, because the internal table is locked fewer times.
+		static void intern( const std::string_view *values, size_t count, InternedString *result );
+		static std::vector<InternedString> intern( const std::vector<std::string> &values );
+
 		static size_t numUniqueStrings();
+		/// Returns an approximation of the memory used by the internal table.
+		static size_t memoryUsage();
 
 	private :
 
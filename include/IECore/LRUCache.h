@@ -136,6 +136,11 @@ class LRUCache : private boost::noncopyable
 		/// Returns the current cost of all cached items.
 		Cost currentCost() const;
 
+		/// Removes the least recently accessed items until the current cost is
+		/// at or below the specified limit. Unlike setMaxCost(), this does not
+		/// prevent the cache from growing again afterwards.
+		void limitCost( Cost cost );
+
 	private :
 
 		// Data
@@ -193,10 +198,6 @@ class LRUCache : private boost::noncopyable
 		// cost.
 		bool eraseInternal( const Key &key, CacheEntry &cacheEntry );
 
-		// Removes items from the cache until the current cost is
-		// at or below the specified limit.
-		void limitCost( Cost cost );
-
 		static void nullRemovalCallback( const Key &key, const Value &value );
 
 };
@@ -0,0 +1,126 @@
+//////////////////////////////////////////////////////////////////////////
+//
+//  Copyright (c) 2026, Image Engine Design Inc. All rights reserved.
+//
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//
+//     * Redistributions of source code must retain the above copyright
+//       notice, this list of conditions and the following disclaimer.
+//
+//     * Redistributions in binary form must reproduce the above copyright
+//       notice, this list of conditions and the following disclaimer in the
+//       documentation and/or other materials provided with the distribution.
+//
+//     * Neither the name of Image Engine Design nor the names of any
+//       other contributors to this software may be used to endorse or
+//       promote products derived from this software without specific prior
+//       written permission.
+//
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//////////////////////////////////////////////////////////////////////////
+
+#ifndef IECORE_MEMORYGOVERNOR_H
+#define IECORE_MEMORYGOVERNOR_H
+
+#include "IECore/CompoundData.h"
+#include "IECore/Export.h"
+
+#include <string>
+
+namespace IECore
+{
+
+/// \addtogroup environmentGroup
+///
+/// <b>IECORE_MEMORYGOVERNOR_MEMORY</b><br>
+/// Used to specify the initial value for MemoryGovernor::getMaxMemoryUsage(),
+/// in megabytes. Defaults to 0, meaning that no global limit is applied.
+
+/// The MemoryGovernor applies a single memory limit across all the caches
+/// which register with it. Each cache still applies its own limit, but
+/// when the combined usage of all caches exceeds the global limit, memory is
+/// reclaimed from every cache in proportion to its usage divided by its priority.
+/// Caches with a higher priority therefore retain their contents for longer.
+///
+/// All ObjectPools are registered automatically, and since ComputationCache
+/// and CachedReader store their results in an ObjectPool, they are governed by
+/// association.
+///
+/// \ingroup utilityGroup
+class IECORE_API MemoryGovernor
+{
+
+	public :
+
+		/// Interface to be implemented by caches wishing to
+		/// be governed.
+		class IECORE_API Client
+		{
+
+			public :
+
+				virtual ~Client();
+
+				/// Must return the current memory usage in bytes.
+				virtual size_t memoryUsage() const = 0;
+				/// Must discard cached items until the memory usage is at
+				/// or below the specified number of bytes.
+				virtual void reduceMemoryUsage( size_t memoryUsage ) = 0;
+
+		};
+
+		/// Registers a client under the given name. Several clients may share
+		/// the same name, in which case their memory usage is reported together.
+		/// Priority must be greater than 0, and the default cache priority is 1.
+		static void registerClient( Client *client, const std::string &name, float priority = 1.0f );
+		/// Must be called before the client is destroyed.
+		static void deregisterClient( Client *client );
+
+		/// Changes the priority of a registered client. Priority must be
+		/// greater than 0.
+		static void setPriority( Client *client, float priority );
+		static float getPriority( const Client *client );
+		/// Changes the priority of all clients registered under the given name.
+		static void setPriority( const std::string &name, float priority );
+		/// Returns the priority of the clients registered under the given name.
+		/// If they have differing priorities, the highest is returned.
+		static float getPriority( const std::string &name );
+
+		/// The maximum combined memory usage for all clients, in bytes.
+		/// A value of 0 disables the global limit.
+		static size_t getMaxMemoryUsage();
+		static void setMaxMemoryUsage( size_t maxMemoryUsage );
+
+		/// Returns the combined memory usage of all clients.
+		static size_t memoryUsage();
+		/// Returns the memory usage for each client name, as UInt64Data.
+		static CompoundDataPtr clientMemoryUsage();
+
+		/// Reclaims memory from the clients if their combined usage exceeds
+		/// the limit. This queries the usage of every client, so clients
+		/// should call memoryAdded() rather than calling this directly.
+		static void enforce();
+		/// Should be called by clients after they have grown by the specified
+		/// number of bytes. The MemoryGovernor keeps a running estimate of the
+		/// combined usage, and only calls enforce() when the estimate exceeds
+		/// the limit, so this is cheap to call frequently.
+		static void memoryAdded( size_t memoryUsage );
+
+};
+
+} // namespace IECore
+
+#endif // IECORE_MEMORYGOVERNOR_H
@@ -79,6 +79,28 @@ class IECORE_API MurmurHash
 		template<typename T>
 		inline MurmurHash &append( const T *data, size_t numElements );
 
+		/// Appends an array of values using a tree hash. The array is divided
+		/// into fixed size chunks which are hashed in parallel, and the hashes
+		/// of the chunks are then appended in order. This is much faster than
+		/// `append()` for large arrays, but gives a different result.
+		template<typename T>
+		inline MurmurHash &appendTree( const T *data, size_t numElements );
+
+		/// Appended to every tree hash, and incremented whenever the tree hash
+		/// algorithm changes. This ensures that tree hashes never match those
+		/// from a different version, or those computed by `append()`.
+		static constexpr uint64_t treeHashVersion = 1;
+
+		/// Vectors occupying at least this many bytes are hashed with `appendTree()`
+		/// rather than `append()`. This applies to `append( std::vector )` and therefore
+		/// to the hashes of all VectorTypedData. The default of 0 disables tree hashing,
+		/// so that hashes match those of previous versions. A different default may be
+		/// specified using the IECORE_MURMURHASH_TREE_THRESHOLD environment variable.
+		/// Since the threshold changes the results of hashing, it should be set before
+		/// any hashes are computed.
+		static void setTreeHashThreshold( size_t bytes );
+		static size_t treeHashThreshold();
+
 		inline const MurmurHash &operator = ( const MurmurHash &other );
 
 		inline bool operator == ( const MurmurHash &other ) const;
@@ -111,6 +133,11 @@ class IECORE_API MurmurHash
 		// so that we could support endian-independence in future.
 		inline void appendRaw( const void *data, size_t bytes, int elementSize );
 
+		// Does the work for `appendTree()`. `chunkHasher` hashes the elements in
+		// the range `[begin, end)`, and is called concurrently for each chunk.
+		typedef MurmurHash (*ChunkHasher)( const void *data, size_t begin, size_t end );
+		void appendTreeInternal( const void *data, size_t numElements, size_t elementSize, ChunkHasher chunkHasher );
+
 		uint64_t m_h1;
 		uint64_t m_h2;
 
@@ -189,6 +189,20 @@ inline MurmurHash &MurmurHash::append( const T *data, size_t numElements )
 	return *this;
 }
 
+template<typename T>
+inline MurmurHash &MurmurHash::appendTree( const T *data, size_t numElements )
+{
+	appendTreeInternal(
+		data, numElements, sizeof( T ),
+		[] ( const void *data, size_t begin, size_t end ) {
+			MurmurHash h;
+			h.append( static_cast<const T *>( data ) + begin, end - begin );
+			return h;
+		}
+	);
+	return *this;
+}
+
 template<typename T>
 inline void MurmurHash::appendInternal( const T &data, typename std::enable_if<std::is_arithmetic<T>::value>::type *enabler )
 {
@@ -353,7 +367,15 @@ inline void murmurHashAppend( MurmurHash &h, const Imath::Box<T> &data )
 template<typename T>
 inline void murmurHashAppend( IECore::MurmurHash &h, const std::vector<T> &data )
 {
-	h.append( data.data(), data.size() );
+	const size_t threshold = MurmurHash::treeHashThreshold();
+	if( threshold && data.size() * sizeof( T ) >= threshold )
+	{
+		h.appendTree( data.data(), data.size() );
+	}
+	else
+	{
+		h.append( data.data(), data.size() );
+	}
 }
 
 // vector<bool> is a special case because we can't get a pointer to the internal data,
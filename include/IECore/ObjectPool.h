@@ -41,6 +41,8 @@
 
 #include "boost/shared_ptr.hpp"
 
+#include <string>
+
 namespace IECore
 {
 
@@ -64,6 +66,9 @@ class IECORE_API ObjectPool : public RefCounted
 		IE_CORE_DECLAREMEMBERPTR( ObjectPool );
 
 		ObjectPool( size_t maxMemory );
+		/// Constructs a pool which reports its memory usage to the
+		/// MemoryGovernor under the specified name, rather than as "ObjectPool".
+		ObjectPool( size_t maxMemory, const std::string &memoryGovernorName );
 		~ObjectPool() override;
 
 		// Clears all the objects in the pool
@@ -81,6 +86,11 @@ class IECORE_API ObjectPool : public RefCounted
 		/// Returns the current memory cost of items held in the pool
 		size_t memoryUsage() const;
 
+		/// The priority of the pool when the MemoryGovernor reclaims
+		/// memory. See MemoryGovernor::registerClient().
+		void setMemoryGovernorPriority( float priority );
+		float getMemoryGovernorPriority() const;
+
 		/// Returns true if the object with the given hash is in the pool.
 		/// Note: this function doesn't garantee that retrieve() will return an object in a multi-threaded application.
 		bool contains( const MurmurHash &hash ) const;
@@ -176,6 +176,11 @@ class IECORE_API StreamIndexedIO : public IndexedIO
 				/// see 'setInput'
 				void read( char *buffer, size_t size, size_t pos);
 
+				/// Returns a pointer to 'size' bytes at 'pos' offset in the file if
+				/// the file has been memory mapped, or nullptr otherwise. The pointer
+				/// remains valid for the lifetime of the StreamFile.
+				const char *mappedData( size_t size, size_t pos ) const;
+
 				void seekg( size_t pos, std::ios_base::seekdir dir );
 				void seekp( size_t pos, std::ios_base::seekdir dir );
 				void read( char *buffer, size_t size );
@@ -205,6 +210,9 @@ class IECORE_API StreamIndexedIO : public IndexedIO
 				/// Called during construction of derived classes. Assigns a stream and tells if the stream is empty.
 				/// Optionally provide a filename to use for lock free reading
 				void setInput( std::iostream *stream, bool emptyFile, const std::string& fileName );
+				/// As above, but additionally requests that the file be memory mapped so that
+				/// reads can be satisfied directly from the mapping.
+				void setInput( std::iostream *stream, bool emptyFile, const std::string& fileName, bool memoryMapped );
 
 				IndexedIO::OpenMode m_openmode;
 				std::iostream *m_stream;
@@ -49,6 +49,19 @@ namespace IECoreImage
 /// This client class works synchronously.
 /// It forwards all parameters to the server and also includes one called "clientPID" to help grouping AOVs from the same render.
 /// You must set the parameter 'remoteDisplayType' with a registered display driver to be instantiated in the server side.
+///
+/// The following optional parameters control how image data is transferred :
+///
+/// - "displayCompression" (StringData) : The name of a blosc compressor ("lz4", "zstd" etc)
+///   used to compress buckets before sending them to the server.
+/// - "displayCompressionLevel" (IntData) : Compression level from 0-9. Defaults to 1.
+/// - "displaySharedMemorySize" (IntData) : Size in bytes of a shared memory buffer used to
+///   transfer buckets when connected to the server via a loopback address. Defaults to 64MB,
+///   and 0 disables shared memory entirely. Shared memory is never used for other addresses.
+///
+/// These transports are negotiated with the server, falling back to plain socket messages
+/// when the server doesn't support them or is on another host. These parameters are not
+/// forwarded to the server.
 /// \ingroup renderingGroup
 class IECOREIMAGE_API ClientDisplayDriver : public DisplayDriver
 {
@@ -72,6 +85,17 @@ class IECOREIMAGE_API ClientDisplayDriver : public DisplayDriver
 
 		bool acceptsRepeatedData() const override;
 
+		enum Transport
+		{
+			Socket = 0,
+			Compressed = 1,
+			SharedMemory = 2
+		};
+
+		/// Returns the number of buckets sent to the server using
+		/// the specified transport.
+		size_t bucketsSent( Transport transport ) const;
+
 		void imageData( const Imath::Box2i &box, const float *data, size_t dataSize ) override;
 
 		void imageClose() override;
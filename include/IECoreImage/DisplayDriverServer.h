@@ -53,7 +53,9 @@ namespace IECoreImage
 /// Server class that receives images from ClientDisplayDriver connections and forwards the data to local display drivers.
 /// The type of the local display drivers is defined by the 'remoteDisplayType' parameter.
 ///
-/// The server object creates a thread to control the socket connection. The thread dies when the object is destroyed.
+/// The server object creates a pool of threads to service the socket connections. The threads die when the object is destroyed.
+/// Messages from each client are handled in order, but messages from different clients may be handled concurrently
+/// when more than one thread is used, in which case the local display drivers must not share state without synchronisation.
 /// \ingroup renderingGroup
 class IECOREIMAGE_API DisplayDriverServer : public IECore::RunTimeTyped
 {
@@ -73,9 +75,15 @@ class IECOREIMAGE_API DisplayDriverServer : public IECore::RunTimeTyped
 		/// automatically. Call `portNumber()` after construction
 		/// to retrieve the actual number.
 		DisplayDriverServer( Port portNumber = 0 );
+		/// As above, but with `numThreads` specifying the number of
+		/// threads used to receive data from clients, allowing several
+		/// renders to stream buckets concurrently. A value of 0 uses
+		/// one thread per hardware thread.
+		DisplayDriverServer( Port portNumber, size_t numThreads );
 		~DisplayDriverServer() override;
 
 		Port portNumber();
+		size_t numThreads() const;
 
 		/// Used to artificially limit the available ports.
 		/// Automated port selection (via `portNumber = 0`) will
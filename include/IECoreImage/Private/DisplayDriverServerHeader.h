@@ -44,14 +44,30 @@ namespace IECoreImage
 * 7 bytes long:
 * [0] - magic number ( 0x82 )
 * [1] - protocol version ( 1 )
-* [2] - message type ( imageOpen, imageData, imageClose )
+* [2] - message type ( imageOpen, imageData, imageClose, ... )
 * [3-6] - length of following data block.
+*
+* Clients may request additional transports for the image data by passing
+* a "displayTransports" CompoundData parameter to imageOpen, containing
+* "compression" and/or "sharedMemoryName" StringData. Servers which
+* understand this remove it from the parameters and respond with two bytes
+* rather than one in the acceptsRepeatedData reply, the second holding the
+* TransportFlags that were accepted. Clients which don't send the parameter
+* always receive a single byte, as do all clients of older servers, which
+* then fall back to imageData messages. Shared memory is only accepted from
+* clients connected via a loopback address. The additional messages are
+* only sent once accepted :
+*
+* imageDataCompressed : Box2i followed by a blosc compressed buffer of floats.
+* imageDataShared : Box2i followed by the uint64 position and size of the
+* floats within the DisplayDriverSharedMemory ring buffer.
 */
 class DisplayDriverServerHeader
 {
 	public:
 
-		enum MessageType { imageOpen = 1, imageData = 2, imageClose = 3, exception = 4 };
+		enum MessageType { imageOpen = 1, imageData = 2, imageClose = 3, exception = 4, imageDataCompressed = 5, imageDataShared = 6 };
+		enum TransportFlags { compressionAccepted = 1, sharedMemoryAccepted = 2 };
 
 		static const unsigned char headerLength = 7;
 		static const unsigned char magicNumber = 0x82;
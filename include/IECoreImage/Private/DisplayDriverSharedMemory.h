@@ -0,0 +1,120 @@
+//////////////////////////////////////////////////////////////////////////
+//
+//  Copyright (c) 2026, Image Engine Design Inc. All rights reserved.
+//
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//
+//     * Redistributions of source code must retain the above copyright
+//       notice, this list of conditions and the following disclaimer.
+//
+//     * Redistributions in binary form must reproduce the above copyright
+//       notice, this list of conditions and the following disclaimer in the
+//       documentation and/or other materials provided with the distribution.
+//
+//     * Neither the name of Image Engine Design nor the names of any
+//       other contributors to this software may be used to endorse or
+//       promote products derived from this software without specific prior
+//       written permission.
+//
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//////////////////////////////////////////////////////////////////////////
+
+#ifndef IECOREIMAGE_DISPLAYDRIVERSHAREDMEMORY
+#define IECOREIMAGE_DISPLAYDRIVERSHAREDMEMORY
+
+#include "boost/interprocess/mapped_region.hpp"
+#include "boost/interprocess/shared_memory_object.hpp"
+
+#include <cstdint>
+#include <string>
+
+namespace IECoreImage
+{
+
+/* Ring buffer in shared memory, used to transfer bucket data from a
+* ClientDisplayDriver to a DisplayDriverServer running on the same host.
+* The client copies each bucket into the buffer and sends its location over
+* the socket in an `imageDataShared` message. The server reads the bucket
+* directly from the buffer and then releases the space for reuse.
+*
+* Positions are monotonically increasing byte counts, and are mapped into
+* the buffer modulo its capacity. Buckets never straddle the end of the
+* buffer - the client skips to the start instead.
+*/
+class DisplayDriverSharedMemory
+{
+	public :
+
+		/// Creates a new segment with a unique name. Used by the client.
+		DisplayDriverSharedMemory( size_t capacity );
+		/// Opens the segment created by a client. Used by the server.
+		/// Throws if the segment doesn't exist, which is the case if
+		/// the client is on another host, or if it wasn't created by
+		/// DisplayDriverSharedMemory.
+		DisplayDriverSharedMemory( const std::string &name );
+		~DisplayDriverSharedMemory();
+
+		DisplayDriverSharedMemory( const DisplayDriverSharedMemory &other ) = delete;
+		DisplayDriverSharedMemory &operator = ( const DisplayDriverSharedMemory &other ) = delete;
+
+		const std::string &name() const;
+		size_t capacity() const;
+
+		/// Removes the name of the segment. The memory itself remains
+		/// valid until both the client and server have unmapped it, so this
+		/// may be called as soon as the server has opened the segment,
+		/// ensuring that nothing is leaked if either process crashes.
+		void removeName();
+
+		/// Client side. Copies `size` bytes into the buffer, waiting for
+		/// the server to release space if necessary, and returns the
+		/// position they were written at. Returns false without writing
+		/// anything if `size` exceeds the capacity or the server has
+		/// closed the buffer. If the server releases no space for several
+		/// seconds, it is assumed to have died, and the buffer is closed.
+		bool write( const void *data, size_t size, uint64_t &position );
+
+		/// Server side. Returns a pointer to the data written at `position`,
+		/// or nullptr if the range is invalid.
+		const void *read( uint64_t position, size_t size ) const;
+		/// Server side. Releases all data up to and including the data
+		/// read from `position`.
+		void release( uint64_t position, size_t size );
+		/// Server side. Informs the client that no more data will be
+		/// released, so that it doesn't wait forever.
+		void close();
+
+	private :
+
+		struct Header;
+
+		Header *header() const;
+		char *buffer() const;
+
+		std::string m_name;
+		bool m_owner;
+		// Copied from the header on opening, so the server isn't
+		// affected by the client modifying the header later.
+		uint64_t m_capacity;
+		boost::interprocess::shared_memory_object m_memory;
+		boost::interprocess::mapped_region m_region;
+		uint64_t m_writePosition;
+
+};
+
+} // namespace IECoreImage
+
+#endif // IECOREIMAGE_DISPLAYDRIVERSHAREDMEMORY
@@ -263,6 +263,7 @@ class GeometricVectorTypedDataFunctions : ThisBinder
 				.def("getInterpretation", &ThisClass::getInterpretation, "Returns the geometric interpretation of this data.") \
 				.def("setInterpretation", &ThisClass::setInterpretation, "Sets the geometric interpretation of this data.") \
 			; \
+			ThisBinder::bindBuffer(); \
 		} \
 
 } // namespace IECorePython;
@@ -40,13 +40,104 @@
 #include "IECorePython/IECoreBinding.h"
 #include "IECorePython/RunTimeTypedBinding.h"
 
+#include "IECore/ByteOrder.h"
+
 #include "boost/python/suite/indexing/container_utils.hpp"
 
+#include "Imath/half.h"
+
+#include <cstring>
 #include <sstream>
+#include <type_traits>
 
 namespace IECorePython
 {
 
+namespace Detail
+{
+
+/// Provides the Python buffer protocol format string for
+/// a base type. Types without a specialisation can not be
+/// exposed as buffers.
+template<typename T>
+struct BufferFormat : public std::false_type
+{
+};
+
+#define IECOREPYTHON_DEFINEBUFFERFORMAT( TYPE, FORMAT ) \
+	template<> \
+	struct BufferFormat<TYPE> : public std::true_type \
+	{ \
+		static const char *value() { return FORMAT; } \
+	}; \
+
+IECOREPYTHON_DEFINEBUFFERFORMAT( half, "e" )
+IECOREPYTHON_DEFINEBUFFERFORMAT( float, "f" )
+IECOREPYTHON_DEFINEBUFFERFORMAT( double, "d" )
+IECOREPYTHON_DEFINEBUFFERFORMAT( char, "b" )
+IECOREPYTHON_DEFINEBUFFERFORMAT( unsigned char, "B" )
+IECOREPYTHON_DEFINEBUFFERFORMAT( short, "h" )
+IECOREPYTHON_DEFINEBUFFERFORMAT( unsigned short, "H" )
+IECOREPYTHON_DEFINEBUFFERFORMAT( int, "i" )
+IECOREPYTHON_DEFINEBUFFERFORMAT( unsigned int, "I" )
+IECOREPYTHON_DEFINEBUFFERFORMAT( int64_t, "q" )
+IECOREPYTHON_DEFINEBUFFERFORMAT( uint64_t, "Q" )
+
+#undef IECOREPYTHON_DEFINEBUFFERFORMAT
+
+/// Returns 'i' for signed integers, 'u' for unsigned integers, 'f'
+/// for floating point and 0 for anything else, ignoring any byte order
+/// prefix. This allows us to accept formats such as "l" for int64_t,
+/// which NumPy uses on platforms where long is 64 bits.
+inline char bufferFormatKind( const char *format )
+{
+	if( !format )
+	{
+		// Unspecified formats mean unsigned bytes
+		return 'u';
+	}
+
+	if( *format == '@' || *format == '=' || *format == '<' || *format == '>' || *format == '!' )
+	{
+		if( *format == ( IECore::bigEndian() ? '<' : '>' ) )
+		{
+			return 0;
+		}
+		format++;
+	}
+
+	if( !*format || format[1] )
+	{
+		return 0;
+	}
+
+	switch( *format )
+	{
+		case 'b' :
+		case 'h' :
+		case 'i' :
+		case 'l' :
+		case 'q' :
+		case 'n' :
+			return 'i';
+		case 'B' :
+		case 'H' :
+		case 'I' :
+		case 'L' :
+		case 'Q' :
+		case 'N' :
+			return 'u';
+		case 'e' :
+		case 'f' :
+		case 'd' :
+			return 'f';
+		default :
+			return 0;
+	}
+}
+
+} // namespace Detail
+
 template<typename ThisClass>
 class VectorTypedDataFunctions
 {
@@ -58,6 +149,7 @@ class VectorTypedDataFunctions
 		typedef typename Container::size_type size_type;
 		typedef typename Container::iterator iterator;
 		typedef typename Container::const_iterator const_iterator;
+		typedef typename ThisClass::BaseType BaseType;
 
 		/// default constructor
 		static ThisClassPtr
@@ -81,7 +173,10 @@ class VectorTypedDataFunctions
 			else
 			{
 				ThisClassPtr r = new ThisClass();
-				boost::python::container_utils::extend_container( r->writable(), v );
+				if( !fromBuffer( r->writable(), v.ptr() ) )
+				{
+					boost::python::container_utils::extend_container( r->writable(), v );
+				}
 				return r;
 			}
 		}
@@ -155,6 +250,10 @@ class VectorTypedDataFunctions
 				// we are dealing with a python list object
 				boost::python::container_utils::extend_container( temp, v );
 			}
+			else if( fromBuffer( temp, v.ptr() ) )
+			{
+				// we are dealing with a compatible buffer, such as a numpy array
+			}
 			else
 			{
 				// try to extract the same object
@@ -269,6 +368,10 @@ class VectorTypedDataFunctions
 				// we are dealing with a python list object
 				boost::python::container_utils::extend_container( temp, v );
 			}
+			else if( fromBuffer( temp, v.ptr() ) )
+			{
+				// we are dealing with a compatible buffer, such as a numpy array
+			}
 			else
 			{
 				// try to extract the same object
@@ -540,12 +643,147 @@ class VectorTypedDataFunctions
 			);
 		}
 
+		/// Implements the Python buffer protocol for the bound class, if
+		/// the base type is suitable. This allows zero-copy access from
+		/// `memoryview` and `numpy.asarray()`, with an array shape of
+		/// `( len( x ), numComponents )` for compound types such as V3f.
+		///
+		/// Buffers are read-only, and provide a view of the data as it was
+		/// when the buffer was requested. Because data is shared between copies
+		/// until it is modified, a writable view could not be provided without
+		/// also modifying copies. Bulk modification is instead supported by
+		/// passing buffers to the constructor, `extend()` and slice assignment.
+		static void bindBuffer()
+		{
+			bindBuffer( Detail::BufferFormat<BaseType>() );
+		}
 
 	protected:
 		/*
 		 * Utility functions
 		 */
 
+		static void bindBuffer( std::false_type )
+		{
+		}
+
+		static void bindBuffer( std::true_type )
+		{
+			PyTypeObject *type = boost::python::converter::registered<ThisClass>::converters.get_class_object();
+			PyHeapTypeObject *heapType = reinterpret_cast<PyHeapTypeObject *>( type );
+			heapType->as_buffer.bf_getbuffer = &getBuffer;
+			heapType->as_buffer.bf_releasebuffer = &releaseBuffer;
+			type->tp_as_buffer = &heapType->as_buffer;
+		}
+
+		/// Data owned by each Py_buffer we export.
+		struct BufferInternal
+		{
+			// A copy of the exporting object, sharing its data. This
+			// keeps the data alive and unchanged for the lifetime of
+			// the buffer, because any subsequent modification of the
+			// exporter will trigger copy-on-write.
+			typename ThisClass::ConstPtr snapshot;
+			Py_ssize_t shape[2];
+			Py_ssize_t strides[2];
+		};
+
+		static int getBuffer( PyObject *object, Py_buffer *view, int flags )
+		{
+			view->obj = nullptr;
+			boost::python::extract<ThisClass &> e( object );
+			if( !e.check() )
+			{
+				PyErr_SetString( PyExc_BufferError, "Unable to retrieve data" );
+				return -1;
+			}
+
+			if( flags & PyBUF_WRITABLE )
+			{
+				PyErr_SetString( PyExc_BufferError, "Buffer is read-only" );
+				return -1;
+			}
+
+			BufferInternal *internal = new BufferInternal;
+			internal->snapshot = boost::static_pointer_cast<const ThisClass>( e().Object::copy() );
+			const Container *container = &internal->snapshot->readable();
+
+			const size_t numComponents = sizeof( data_type ) / sizeof( BaseType );
+			internal->shape[0] = container->size();
+			internal->shape[1] = numComponents;
+			internal->strides[0] = sizeof( data_type );
+			internal->strides[1] = sizeof( BaseType );
+
+			// Avoid null pointers for empty vectors, since they
+			// are not accepted by all consumers.
+			static BaseType g_empty;
+			view->buf = container->size() ? const_cast<data_type *>( container->data() ) : &g_empty;
+			view->obj = object;
+			Py_INCREF( object );
+			view->len = container->size() * sizeof( data_type );
+			view->readonly = 1;
+			view->itemsize = sizeof( BaseType );
+			view->format = ( flags & PyBUF_FORMAT ) ? const_cast<char *>( Detail::BufferFormat<BaseType>::value() ) : nullptr;
+			view->ndim = numComponents > 1 ? 2 : 1;
+			view->shape = ( flags & PyBUF_ND ) ? internal->shape : nullptr;
+			view->strides = ( ( flags & PyBUF_STRIDES ) == PyBUF_STRIDES ) ? internal->strides : nullptr;
+			view->suboffsets = nullptr;
+			view->internal = internal;
+
+			return 0;
+		}
+
+		static void releaseBuffer( PyObject *object, Py_buffer *view )
+		{
+			delete static_cast<BufferInternal *>( view->internal );
+		}
+
+		/// Fills the container from a Python object supporting the buffer
+		/// protocol, provided that its items are compatible with our base type.
+		/// Returns false if the object is not a compatible buffer.
+		static bool fromBuffer( Container &container, PyObject *object )
+		{
+			return fromBuffer( container, object, Detail::BufferFormat<BaseType>() );
+		}
+
+		static bool fromBuffer( Container &container, PyObject *object, std::false_type )
+		{
+			return false;
+		}
+
+		static bool fromBuffer( Container &container, PyObject *object, std::true_type )
+		{
+			if( !PyObject_CheckBuffer( object ) || PyBytes_Check( object ) )
+			{
+				return false;
+			}
+
+			Py_buffer view;
+			if( PyObject_GetBuffer( object, &view, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT ) != 0 )
+			{
+				PyErr_Clear();
+				return false;
+			}
+
+			const bool compatible =
+				view.itemsize == sizeof( BaseType ) &&
+				Detail::bufferFormatKind( view.format ) == Detail::bufferFormatKind( Detail::BufferFormat<BaseType>::value() ) &&
+				view.len % sizeof( data_type ) == 0
+			;
+
+			if( compatible )
+			{
+				container.resize( view.len / sizeof( data_type ) );
+				if( view.len )
+				{
+					std::memcpy( static_cast<void *>( container.data() ), view.buf, view.len );
+				}
+			}
+
+			PyBuffer_Release( &view );
+			return compatible;
+		}
+
 		/// converts from python indexes to non-negative C++ indexes.
 		static index_type convertIndex( ThisClass & container, PyObject *i_, bool acceptExpand = false )
 		{
@@ -733,6 +971,7 @@ std::string str<IECore::TypedData<std::vector<TYPE> > >( IECore::TypedData<std::
 			BASIC_VECTOR_BINDING(IECore::TypedData< std::vector< T > >, Tname)																	\
 				.def("__cmp__", &ThisBinder::invalidOperator, "Raises an exception. This vector type does not support comparison operators.")		\
 			;																						\
+			ThisBinder::bindBuffer();																\
 		}
 
 // bind a VectorTypedData class that supports simple Math operators (+=, -= and *=)
@@ -749,6 +988,7 @@ std::string str<IECore::TypedData<std::vector<TYPE> > >( IECore::TypedData<std::
 				.def("__cmp__", &ThisBinder::invalidOperator, "Raises an exception. This vector type does not support comparison operators.")		\
 				.def("toString", &ThisBinder::toString, "Returns a string with a copy of the bytes in the vector.")\
 			;																						\
+			ThisBinder::bindBuffer();																\
 		}
 
 // bind a VectorTypedData class that supports all Math operators (+=, -=, *=, /=)
@@ -769,6 +1009,7 @@ std::string str<IECore::TypedData<std::vector<TYPE> > >( IECore::TypedData<std::
 				.def("__cmp__", &ThisBinder::invalidOperator, "Raises an exception. This vector type does not support comparison operators.")		\
 				.def("toString", &ThisBinder::toString, "Returns a string with a copy of the bytes in the vector.")\
 			;																						\
+			ThisBinder::bindBuffer();																\
 		}
 
 // bind a VectorTypedData class that supports all Math operators (+=, -=, *=, /=, <, >)
@@ -793,6 +1034,7 @@ std::string str<IECore::TypedData<std::vector<TYPE> > >( IECore::TypedData<std::
 				.def("__ge__", &ThisBinder::ge, "The comparison is element-wise, like a string comparison. \n")	\
 				.def("toString", &ThisBinder::toString, "Returns a string with a copy of the bytes in the vector.")\
 			; \
+			ThisBinder::bindBuffer(); \
 		}
 
 } // namespace IECorePython
@@ -84,6 +84,9 @@ IECORESCENE_API PrimitiveVariable calculateFaceVaryingNormals( const MeshPrimiti
 /// Deprecated.
 IECORESCENE_API PrimitiveVariable calculateNormals( const MeshPrimitive *mesh, PrimitiveVariable::Interpolation interpolation = PrimitiveVariable::Vertex, const std::string &position = "P", const IECore::Canceller *canceller = nullptr );
 
+/// NOTE : The calculateTangents functions use tbb internally - in order to integrate with a program using tbb,
+/// they should be placed inside a this_task_arena::isolate or other mechanism to protect from stealing outer tasks.
+
 /// TODO: remove this compatibility function:
 IECORESCENE_API std::pair<PrimitiveVariable, PrimitiveVariable> calculateTangents( const MeshPrimitive *mesh, const std::string &uvSet = "uv", bool orthoTangents = true, const std::string &position = "P" );
 /// Calculate the surface tangent vectors of a mesh primitive based on UV information
@@ -98,20 +101,38 @@ IECORESCENE_API std::pair<PrimitiveVariable, PrimitiveVariable> calculateTangent
 IECORESCENE_API std::pair<PrimitiveVariable, PrimitiveVariable> calculateTangentsFromTwoEdges( const MeshPrimitive *mesh, const std::string &position = "P", const std::string &normal = "N", bool orthoTangents = true, bool leftHanded = false, const IECore::Canceller *canceller = nullptr );
 
 /// Calculate the face area of a mesh primitive.
+///
+/// NOTE : Uses tbb internally - in order to integrate with a program using tbb, should be placed inside a
+/// this_task_arena::isolate or other mechanism to protect from stealing outer tasks.
 IECORESCENE_API PrimitiveVariable calculateFaceArea( const MeshPrimitive *mesh, const std::string &position = "P", const IECore::Canceller *canceller = nullptr );
 
 /// Calculate the face texture area of a mesh primitive based on the specified UV set.
+///
+/// NOTE : Uses tbb internally - in order to integrate with a program using tbb, should be placed inside a
+/// this_task_arena::isolate or other mechanism to protect from stealing outer tasks.
 IECORESCENE_API PrimitiveVariable calculateFaceTextureArea( const MeshPrimitive *mesh, const std::string &uvSet = "uv", const std::string &position = "P", const IECore::Canceller *canceller = nullptr );
 
 /// Calculate the distortions (expansion and contraction) on the mesh edges
 /// The first return value is the float distortion between the two position variables.
 /// The second return value is the V2f distortion of the UV set.
+///
+/// NOTE : Uses tbb internally - in order to integrate with a program using tbb, should be placed inside a
+/// this_task_arena::isolate or other mechanism to protect from stealing outer tasks.
 IECORESCENE_API std::pair<PrimitiveVariable, PrimitiveVariable> calculateDistortion( const MeshPrimitive *mesh, const std::string &uvSet = "uv", const std::string &referencePosition = "Pref", const std::string &position = "P", const IECore::Canceller *canceller = nullptr );
 
+/// Resample a primitive variable to the specified interpolation. Averaging onto
+/// vertices and faces is performed in a fixed order, so results are independent
+/// of the number of threads used.
+///
+/// NOTE : Uses tbb internally - in order to integrate with a program using tbb, should be placed inside a
+/// this_task_arena::isolate or other mechanism to protect from stealing outer tasks.
 IECORESCENE_API void resamplePrimitiveVariable( const MeshPrimitive *mesh, PrimitiveVariable& primitiveVariable, PrimitiveVariable::Interpolation interpolation, const IECore::Canceller *canceller = nullptr );
 
 /// create a new MeshPrimitive deleting faces from the input MeshPrimitive based on the facesToDelete uniform (int|float|bool) PrimitiveVariable
 /// When invert is set then zeros in facesToDelete indicate which faces should be deleted
+///
+/// NOTE : Uses tbb internally - in order to integrate with a program using tbb, should be placed inside a
+/// this_task_arena::isolate or other mechanism to protect from stealing outer tasks.
 IECORESCENE_API MeshPrimitivePtr deleteFaces( const MeshPrimitive *meshPrimitive, const PrimitiveVariable &facesToDelete, bool invert = false, const IECore::Canceller *canceller = nullptr );
 
 /// Reverses the winding order of each face by adjusting the vertex ids and updating all FaceVarying
@@ -191,6 +212,9 @@ private:
 /// Specifying the two parameters segmentValues & primitiveVariable allows for a subset of meshes to be created, rather than
 /// completely segmenting the mesh based on the unique values in a primitive variable. If one of the values specified by
 /// segmentValues does not occur in the primitiveVariable, the corresponding mesh will be a nullptr.
+///
+/// NOTE : Uses tbb internally - in order to integrate with a program using tbb, should be placed inside a
+/// this_task_arena::isolate or other mechanism to protect from stealing outer tasks.
 IECORESCENE_API std::vector<MeshPrimitivePtr> segment( const MeshPrimitive *mesh, const PrimitiveVariable &primitiveVariable, const IECore::Data *segmentValues = nullptr, const IECore::Canceller *canceller = nullptr );
 
 /// Merge the input meshes into a single mesh.
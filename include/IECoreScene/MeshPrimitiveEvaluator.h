@@ -40,6 +40,7 @@
 #include "IECoreScene/PrimitiveEvaluator.h"
 
 #include "IECore/BoundedKDTree.h"
+#include "IECore/BoundingVolumeHierarchy.h"
 
 #include <mutex>
 #include <vector>
@@ -105,7 +106,21 @@ class IECORESCENE_API MeshPrimitiveEvaluator : public PrimitiveEvaluator
 
 		static PrimitiveEvaluatorPtr create( ConstPrimitivePtr primitive );
 
+		/// The acceleration structure used by `intersectionPoint()`,
+		/// `intersectionPoints()` and `batchIntersectionPoint()`.
+		enum class RayAcceleration
+		{
+			/// The BoundedKDTree returned by `triangleBoundTree()`, which
+			/// is also used for `closestPoint()` queries.
+			KDTree,
+			/// The BoundingVolumeHierarchy returned by `triangleBVH()`,
+			/// which is typically much faster for ray queries, and allows
+			/// coherent rays to be traced together in packets.
+			BVH
+		};
+
 		MeshPrimitiveEvaluator( ConstMeshPrimitivePtr mesh );
+		MeshPrimitiveEvaluator( ConstMeshPrimitivePtr mesh, RayAcceleration rayAcceleration );
 
 		~MeshPrimitiveEvaluator() override;
 
@@ -126,6 +141,17 @@ class IECORESCENE_API MeshPrimitiveEvaluator : public PrimitiveEvaluator
 		int intersectionPoints( const Imath::V3f &origin, const Imath::V3f &direction,
 			std::vector<PrimitiveEvaluator::ResultPtr> &results, float maxDistance = std::numeric_limits<float>::max() ) const override;
 
+		/// Equivalent to calling `intersectionPoint( origins[i], directions[i], results[i], maxDistance )`
+		/// for each ray in turn, storing the return values in `hits`. With `RayAcceleration::BVH`,
+		/// rays are traced together in small packets, so that coherent rays share the cost of
+		/// traversing the hierarchy. Returns the number of hits.
+		/// \threading As with the other queries, this may be called concurrently provided
+		/// that each thread uses different results.
+		size_t batchIntersectionPoint( size_t numRays, const Imath::V3f *origins, const Imath::V3f *directions,
+			PrimitiveEvaluator::Result *const *results, bool *hits, float maxDistance = std::numeric_limits<float>::max() ) const;
+
+		RayAcceleration rayAcceleration() const;
+
 		/// A query specific to the MeshPrimitiveEvaluator, this just chooses a barycentric position on a specific triangle.
 		bool barycentricPosition( unsigned int triangleIndex, const Imath::V3f &barycentricCoordinates, PrimitiveEvaluator::Result *result ) const;
 
@@ -144,7 +170,10 @@ class IECORESCENE_API MeshPrimitiveEvaluator : public PrimitiveEvaluator
 		//! @name Internal KDTrees.
 		/// The MeshPrimitiveEvaluator uses internal KDTrees to perform many of
 		/// its queries. Const access is provided to these so that clients can use them
-		/// in implementing their own algorithms.
+		/// in implementing their own algorithms. The trees are built on demand, the
+		/// first time they are needed by a query or accessor, so that evaluators
+		/// which are only used for a subset of queries don't pay for both. It is
+		/// safe to call any of these accessors concurrently.
 		//////////////////////////////////////////////////////////////////////////
 		//@{
 		/// A type for storing the bounding box for a triangle.
@@ -158,6 +187,11 @@ class IECORESCENE_API MeshPrimitiveEvaluator : public PrimitiveEvaluator
 		/// Returns a pointer to a tree that can be used for performing fast spacial queries.
 		///  The iterators in this tree point to elements in the vector returned by triangleBounds().
 		const TriangleBoundTree *triangleBoundTree() const;
+		/// A BoundingVolumeHierarchy providing accelerated ray queries against the triangles.
+		typedef IECore::BoundingVolumeHierarchy<TriangleBoundVector::iterator> TriangleBVH;
+		/// Returns a pointer to a hierarchy that can be used for performing fast ray queries.
+		/// The iterators in this hierarchy point to elements in the vector returned by triangleBounds().
+		const TriangleBVH *triangleBVH() const;
 
 		/// A type for storing the uv bounding box for a triangle.
 		typedef Imath::Box2f UVBound;
@@ -180,17 +214,24 @@ class IECORESCENE_API MeshPrimitiveEvaluator : public PrimitiveEvaluator
 		IECore::ConstV3fVectorDataPtr m_verts;
 		const std::vector<int> *m_meshVertexIds;
 
-		TriangleBoundVector m_triangles;
-		TriangleBoundTree *m_tree;
+		mutable TriangleBoundVector m_triangles;
+		/// Built on demand by `triangleBoundTree()`. This is allocated
+		/// in the constructor as a `LazyData` (see below), so it must
+		/// not be replaced.
+		mutable TriangleBoundTree *m_tree;
 
-		UVBoundVector m_uvTriangles;
-		UVBoundTree *m_uvTree;
+		mutable UVBoundVector m_uvTriangles;
+		mutable UVBoundTree *m_uvTree;
 
 		bool pointAtUVWalk( UVBoundTree::NodeIndex nodeIndex, const Imath::V2f &targetUV, Result *result ) const;
 		void closestPointWalk( TriangleBoundTree::NodeIndex nodeIndex, const Imath::V3f &p, float &closestDistanceSqrd, Result *result ) const;
 		bool intersectionPointWalk( TriangleBoundTree::NodeIndex nodeIndex, const Imath::Line3f &ray, float &maxDistSqrd, Result *result, bool &hit ) const;
 		void intersectionPointsWalk( TriangleBoundTree::NodeIndex nodeIndex, const Imath::Line3f &ray, float maxDistSqrd, std::vector<PrimitiveEvaluator::ResultPtr> &results ) const;
 
+		size_t intersectionPointPacket( size_t numRays, const Imath::V3f *origins, const Imath::V3f *directions, PrimitiveEvaluator::Result *const *results, bool *hits, float maxDistance ) const;
+		void intersectionPointsBVH( const Imath::Line3f &ray, float maxDistSqrd, std::vector<PrimitiveEvaluator::ResultPtr> &results ) const;
+		void setIntersectionResult( Result *result, size_t triangleIndex, const Imath::V3f &point, const Imath::V3f &barycentric ) const;
+
 		void calculateMassProperties() const;
 		void calculateAverageNormals() const;
 
@@ -217,6 +258,15 @@ class IECORESCENE_API MeshPrimitiveEvaluator : public PrimitiveEvaluator
 
 		mutable IECore::V3fVectorDataPtr m_vertexAngleWeightedNormals;
 
+	private :
+
+		// State used to build the trees on demand, along with the
+		// ray acceleration settings. This derives from TriangleBoundTree
+		// and is owned via `m_tree`, so that it can be extended without
+		// changing the layout of this class.
+		struct LazyData;
+		LazyData *lazyData() const;
+
 };
 
 IE_CORE_DECLAREPTR( MeshPrimitiveEvaluator );
@@ -54,6 +54,7 @@ IE_CORE_FORWARDDECLARE(MeshPrimitive);
 
 /// The OBJReader class defines a class for reading OBJ mesh data.
 /// This is a subset of the full setup of objects encodable in OBJ.
+/// Files are memory mapped and parsed in parallel.
 /// \ingroup ioGroup
 class IECORESCENE_API OBJReader : public IECore::Reader
 {
@@ -73,26 +74,12 @@ class IECORESCENE_API OBJReader : public IECore::Reader
 
 		static const ReaderDescription<OBJReader> m_readerDescription;
 
-		// top-level parse method
-		void parseOBJ();
-
-		// statement-level parse methods
-		void parseVertex(const char *, const char *);
-		void parseTextureCoordinate(const char *, const char *);
-		void parseNormal(const char *, const char *);
-
-		// elements
-		void parseFace(const char *, const char *);
-
-		// grouping
-		void parseGroup(const char *, const char *);
-
-		// pointers to mesh data
+		// Unused since the parser was rewritten, but retained
+		// to preserve binary compatibility.
+		/// \todo Remove in the next major version.
 		std::vector<int> *m_vpf, *m_vids;
 		std::vector<Imath::V3f> *m_vertices, *m_normals;
 		std::vector<float> *m_sTextureCoordinates, *m_tTextureCoordinates;
-
-		// local data for assembling mesh
 		std::vector<Imath::V3f> m_introducedNormals, m_introducedTextureCoordinates;
 };
 
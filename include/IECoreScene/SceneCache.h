@@ -35,6 +35,7 @@
 #ifndef IECORESCENE_SCENECACHE_H
 #define IECORESCENE_SCENECACHE_H
 
+#include "IECore/CompoundData.h"
 #include "IECore/PathMatcherData.h"
 
 #include "IECoreScene/Export.h"
@@ -74,7 +75,9 @@ class IECORESCENE_API SceneCache : public SampledSceneInterface
 		/// implementation for the backend. The given IndexedIO should be
 		/// pointing to the root location on the file. The open mode will
 		/// be the same from the given IndexedIO object. Append mode is not
-		/// supported.
+		/// supported. This may also be used to pass options to FileIndexedIO,
+		/// for instance "pipelinedWrites" to compress objects and attributes
+		/// in the background while the next ones are being written.
 		SceneCache( IECore::IndexedIOPtr indexedIO );
 
 		~SceneCache() override;
@@ -139,6 +142,45 @@ class IECORESCENE_API SceneCache : public SampledSceneInterface
 		/// tells you if this scene cache is read only or writable:
 		bool readOnly() const;
 
+		enum PrefetchFlags
+		{
+			PrefetchTransform = 1,
+			PrefetchAttributes = 2,
+			PrefetchObject = 4,
+			PrefetchAll = PrefetchTransform | PrefetchAttributes | PrefetchObject
+		};
+
+		/// Reads the transforms, attributes and/or objects (as specified by flags)
+		/// for all the given locations, at the samples needed to evaluate them at
+		/// the given times. The reads are performed in parallel, and the results
+		/// are stored in the internal caches, so that subsequent reads for these
+		/// locations are satisfied without waiting on the file. Paths are absolute,
+		/// and paths which do not exist are ignored. Only available in Read mode.
+		void prefetch( const std::vector<Path> &paths, const std::vector<double> &times, int flags = PrefetchAll, const IECore::Canceller *canceller = nullptr ) const;
+
+		/// Objects, attributes and transforms read from SceneCaches are held in a
+		/// single cache shared by all files, which is limited by the memory used
+		/// by the results it holds. The default limit is 500 megabytes, and may be
+		/// overridden by setting the IECORE_SCENECACHE_MEMORY environment variable
+		/// to a value in megabytes. The results are stored in an ObjectPool
+		/// dedicated to SceneCache, which is subject to the same limit and is
+		/// registered with the MemoryGovernor as "SceneCache".
+		static size_t getMaxCacheMemoryUsage();
+		static void setMaxCacheMemoryUsage( size_t maxMemoryUsage );
+		/// Returns the memory used by the results currently held in the cache.
+		static size_t cacheMemoryUsage();
+		/// Returns a CompoundData containing the "hits", "misses" and "evictions"
+		/// recorded by the cache since startup or the last call to resetCacheStatistics().
+		/// The same statistics are also provided separately for each type of entry,
+		/// in CompoundData members named "transforms", "attributes" and "objects".
+		static IECore::CompoundDataPtr cacheStatistics();
+		static void resetCacheStatistics();
+		/// Removes all results from the cache.
+		static void clearCache();
+		/// The priority of the cache when the MemoryGovernor reclaims memory.
+		static float getCacheMemoryGovernorPriority();
+		static void setCacheMemoryGovernorPriority( float priority );
+
 		// The attribute names used to mark animated topology and primitive variables
 		// when SceneCache objects are Primitives.
 		static const Name &animatedObjectTopologyAttribute;
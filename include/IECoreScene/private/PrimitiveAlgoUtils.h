@@ -219,33 +219,35 @@ class SplitTask : public tbb::task
 			IECore::BoolVectorDataPtr deletionArrayUpper = new IECore::BoolVectorData();
 			auto &writableUpper = deletionArrayUpper->writable();
 
-			size_t deleteCount = 0;
-			if( segmentPrimVar.indices )
-			{
-				auto &readableIndices = segmentPrimVar.indices->readable();
-				writableLower.resize( readableIndices.size() );
-				writableUpper.resize( readableIndices.size() );
-
-				for( size_t i = 0; i < readableIndices.size(); ++i )
+			// Look up the segment for each element in parallel. The flags can't be
+			// written to the `std::vector<bool>` concurrently, so are gathered first.
+			const std::vector<int> *indices = segmentPrimVar.indices ? &segmentPrimVar.indices->readable() : nullptr;
+			const size_t size = indices ? indices->size() : readable.size();
+			std::vector<char> lowerFlags( size );
+			std::vector<char> upperFlags( size );
+
+			tbb::parallel_for(
+				tbb::blocked_range<size_t>( 0, size ),
+				[&] ( const tbb::blocked_range<size_t> &range )
 				{
-					size_t index = readableIndices[i];
-					writableLower[i] = lowerSegmentsSet.find( readable[index] ) == lowerSegmentsSet.end();
-					writableUpper[i] = upperSegmentsSet.find( readable[index] ) == upperSegmentsSet.end();
-
-					deleteCount += ( writableLower[i] && !lowerSegments.empty() ) || ( writableUpper[i] && !upperSegments.empty() ) ? 1 : 0;
+					for( size_t i = range.begin(); i != range.end(); ++i )
+					{
+						const T &value = readable[indices ? (*indices)[i] : i];
+						lowerFlags[i] = lowerSegmentsSet.find( value ) == lowerSegmentsSet.end();
+						upperFlags[i] = upperSegmentsSet.find( value ) == upperSegmentsSet.end();
+					}
 				}
-			}
-			else
-			{
-				writableLower.resize( readable.size() );
-				writableUpper.resize( readable.size() );
+			);
 
-				for( size_t i = 0; i < readable.size(); ++i )
-				{
-					writableLower[i] = lowerSegmentsSet.find( readable[i] ) == lowerSegmentsSet.end();
-					writableUpper[i] = upperSegmentsSet.find( readable[i] ) == upperSegmentsSet.end();
-					deleteCount += ( writableLower[i] && !lowerSegments.empty() ) || ( writableUpper[i] && !upperSegments.empty() ) ? 1 : 0;
-				}
+			writableLower.resize( size );
+			writableUpper.resize( size );
+
+			size_t deleteCount = 0;
+			for( size_t i = 0; i < size; ++i )
+			{
+				writableLower[i] = lowerFlags[i];
+				writableUpper[i] = upperFlags[i];
+				deleteCount += ( writableLower[i] && !lowerSegments.empty() ) || ( writableUpper[i] && !upperSegments.empty() ) ? 1 : 0;
 			}
 
 			if ( m_segments.size() == 1 && deleteCount == 0)
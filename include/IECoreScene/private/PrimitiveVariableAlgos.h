@@ -38,8 +38,16 @@
 #include "IECoreScene/PrimitiveVariable.h"
 #include "IECoreScene/CurvesPrimitive.h"
 
+#include "IECore/Canceller.h"
 #include "IECore/VectorTypedData.h"
 
+#include "tbb/blocked_range.h"
+#include "tbb/parallel_for.h"
+#include "tbb/parallel_scan.h"
+
+#include <atomic>
+#include <functional>
+#include <type_traits>
 #include <unordered_map>
 
 namespace IECoreScene
@@ -152,248 +160,256 @@ class IndexedPrimitiveVariableBuilder
 		std::unordered_map<int, int> m_indexMapping;
 };
 
-// Base type for all Functors which delete primivars
-template<typename U>
-class DeleteFlagged
-{
-	public:
-		DeleteFlagged( const PrimitiveVariable::IndexedView<U> &deleteFlagView, bool invert )
-			: m_deleteFlagView ( deleteFlagView ), m_dataIndices( nullptr ), m_invert( invert )
-		{
-		}
-
-		bool shouldKeepPrimitive( size_t i ) const
-		{
-			return ( m_invert && m_deleteFlagView[i] ) || ( !m_invert && !m_deleteFlagView[i] );
-		}
-
-		void setIndices( const IECore::TypedData<std::vector<int> > *dataIndices )
-		{
-			m_dataIndices = dataIndices ? &dataIndices->readable() : nullptr;
-		}
-
-	private:
-		const PrimitiveVariable::IndexedView<U> &m_deleteFlagView;
-
-	protected:
-		const std::vector<int> *m_dataIndices;
-		bool m_invert;
-};
-
-/// Filter a primitive variable based on optionally indexed flag array
-/// Lifetime of flags, flagIndices & dataIndices should be longer than this functor.
-template<typename U>
-class DeleteFlaggedUniformFunctor : public DeleteFlagged<U>
+/// Fills `offsets` with the running total of `counts`, such that `offsets[i]`
+/// holds the sum of all counts before `i`, and returns the sum of all counts.
+/// Runs in parallel, giving the same results as a serial loop. `offsets` must
+/// not be the same vector as `counts`.
+inline int exclusiveScan( const std::vector<int> &counts, std::vector<int> &offsets )
 {
-	public:
-
-		DeleteFlaggedUniformFunctor( const PrimitiveVariable::IndexedView<U> &deleteFlagView, bool invert ) : DeleteFlagged<U>( deleteFlagView, invert )
-		{
-		}
-
-		template<typename T, template<typename> class V>
-		IndexedData operator()( const V<std::vector<T> > *data )
+	offsets.resize( counts.size() );
+	return tbb::parallel_scan(
+		tbb::blocked_range<size_t>( 0, counts.size() ), 0,
+		[&counts, &offsets] ( const tbb::blocked_range<size_t> &range, int sum, bool isFinalScan )
 		{
-
-			const std::vector<T> &inputs = data->readable();
-			IECoreScene::PrimitiveVariable::IndexedView<T> dataView( inputs, this->m_dataIndices );
-
-			IndexedPrimitiveVariableBuilder<T, V> builder( inputs.size(), this->m_dataIndices ? this->m_dataIndices->size() : 0, data );
-
-			for( size_t i = 0; i < dataView.size(); ++i )
+			for( size_t i = range.begin(); i != range.end(); ++i )
 			{
-				if( this->shouldKeepPrimitive( i ) )
+				if( isFinalScan )
 				{
-					builder.addIndexedValue( dataView, i );
+					offsets[i] = sum;
 				}
+				sum += counts[i];
 			}
-
-			return builder.indexedData();
-		}
-
-		IndexedData operator()( const IECore::Data *data )
-		{
-			throw IECore::Exception(
-				boost::str( boost::format( "Unexpected Data: %1%" ) % ( data ? data->typeName() : std::string( "nullptr" ) ) )
-			);
-		}
-
-};
-
-template<typename U>
-class DeleteFlaggedFaceVaryingFunctor : public DeleteFlagged<U>
+			return sum;
+		},
+		std::plus<int>()
+	);
+}
+
+/// Returns the offset of the first element of each curve for a primitive variable
+/// with the specified interpolation, followed by the total number of elements.
+inline std::vector<int> curveOffsets( const CurvesPrimitive *curves, PrimitiveVariable::Interpolation interpolation )
 {
-	public:
-
-		DeleteFlaggedFaceVaryingFunctor( const PrimitiveVariable::IndexedView<U> &deleteFlagView, IECore::ConstIntVectorDataPtr verticesPerPrimitive, bool invert )
-			: DeleteFlagged<U>( deleteFlagView, invert ), m_verticesPerPrimitive( verticesPerPrimitive )
+	std::vector<int> sizes( curves->numCurves() );
+	tbb::parallel_for(
+		tbb::blocked_range<size_t>( 0, sizes.size() ),
+		[&sizes, curves, interpolation] ( const tbb::blocked_range<size_t> &range )
 		{
-		}
-
-		template<typename T, template<typename> class V>
-		IndexedData operator()( const V<std::vector<T> > *data )
-		{
-			const std::vector<T> &inputs = data->readable();
-			const std::vector<int> &verticesPerPrimitive = m_verticesPerPrimitive->readable();
-
-			IECoreScene::PrimitiveVariable::IndexedView<T> dataView( inputs, this->m_dataIndices );
-			IndexedPrimitiveVariableBuilder<T, V> builder( inputs.size(), this->m_dataIndices ? this->m_dataIndices->size() : 0, data );
-
-			size_t offset = 0;
-			for( size_t c = 0; c < verticesPerPrimitive.size(); ++c )
+			for( size_t i = range.begin(); i != range.end(); ++i )
 			{
-				int numVerts = verticesPerPrimitive[c];
-				if( this->shouldKeepPrimitive( c ) )
-				{
-					for( int v = 0; v < numVerts; ++v )
-					{
-						builder.addIndexedValue( dataView, offset + v );
-					}
-				}
-				offset += numVerts;
+				sizes[i] = curves->variableSize( interpolation, i );
 			}
-
-			return builder.indexedData();
 		}
+	);
+
+	std::vector<int> offsets;
+	const int size = exclusiveScan( sizes, offsets );
+	offsets.push_back( size );
+	return offsets;
+}
+
+/// Lists the positions at which each of `numValues` values appears in `indices`,
+/// returning offsets to the end of the list for each value, in the same form as
+/// `MeshAlgo::correspondingFaceVertices()`. Positions are listed in increasing
+/// order, so values gathered using them are accumulated in the same order as a
+/// serial loop scattering over `indices`, giving identical results. Building
+/// the lists is serial, but the gathering they enable can be done in parallel.
+inline std::vector<int> invertIndices( const std::vector<int> &indices, size_t numValues, std::vector<int> &positions, const IECore::Canceller *canceller )
+{
+	IECore::Canceller::check( canceller );
+	std::vector<int> offsets( numValues, 0 );
+	for( int i : indices )
+	{
+		offsets[i]++;
+	}
 
-		IndexedData operator()( const IECore::Data *data )
+	IECore::Canceller::check( canceller );
+	int numPositions = 0;
+	for( int &o : offsets )
+	{
+		int count = o;
+		o = numPositions;
+		numPositions += count;
+	}
+
+	IECore::Canceller::check( canceller );
+	positions.resize( numPositions );
+	for( size_t i = 0; i < indices.size(); ++i )
+	{
+		if( i % 1000 == 0 )
 		{
-			throw IECore::Exception(
-				boost::str( boost::format( "Unexpected Data: %1%" ) % ( data ? data->typeName() : std::string( "nullptr" ) ) )
-			);
+			IECore::Canceller::check( canceller );
 		}
+		positions[offsets[indices[i]]++] = i;
+	}
 
-	private:
-
-		IECore::ConstIntVectorDataPtr m_verticesPerPrimitive;
-
-};
+	return offsets;
+}
 
-template<typename U>
-class DeleteFlaggedVaryingFunctor : public DeleteFlagged<U>
+/// Builds a primitive variable from a subset of the elements of another, given
+/// the indices of the source elements in the order they should be output. Indexed
+/// primitive variables are compacted so that the output data holds only the values
+/// referenced, in order of first use. Results are identical to adding each element
+/// in turn to an IndexedPrimitiveVariableBuilder, but the work is done in parallel.
+/// Lifetime of sourceIndices & dataIndices should be longer than this functor.
+class GatherFunctor
 {
 	public:
 
-		DeleteFlaggedVaryingFunctor( const PrimitiveVariable::IndexedView<U> &deleteFlagView, const CurvesPrimitive *curvesPrimitive, bool invert )
-			: DeleteFlagged<U>( deleteFlagView, invert ), m_curvesPrimitive( curvesPrimitive )
+		GatherFunctor( const std::vector<int> &sourceIndices, const IECore::Canceller *canceller )
+			: m_sourceIndices( sourceIndices ), m_dataIndices( nullptr ), m_canceller( canceller )
+		{
+		}
+
+		void setIndices( const IECore::TypedData<std::vector<int> > *dataIndices )
 		{
+			m_dataIndices = dataIndices ? &dataIndices->readable() : nullptr;
 		}
 
 		template<typename T, template<typename> class V>
 		IndexedData operator()( const V<std::vector<T> > *data )
 		{
 			const std::vector<T> &inputs = data->readable();
-			IECoreScene::PrimitiveVariable::IndexedView<T> dataView( inputs, this->m_dataIndices );
-			IndexedPrimitiveVariableBuilder<T, V> builder( inputs.size(), this->m_dataIndices ? this->m_dataIndices->size() : 0, data );
 
-			size_t offset = 0;
-			for( size_t c = 0; c < m_curvesPrimitive->numCurves(); ++c )
+			if constexpr( std::is_same_v<T, bool> )
 			{
-				int numVarying = m_curvesPrimitive->numSegments( c ) + 1;
-
-				if( this->shouldKeepPrimitive( c ) )
+				// Elements of `std::vector<bool>` can't be written
+				// concurrently, so we must build the result serially.
+				PrimitiveVariable::IndexedView<T> dataView( inputs, m_dataIndices );
+				IndexedPrimitiveVariableBuilder<T, V> builder( m_sourceIndices.size(), m_dataIndices ? m_sourceIndices.size() : 0, data );
+				for( size_t i = 0; i < m_sourceIndices.size(); ++i )
 				{
-					for( int v = 0; v < numVarying; ++v )
+					if( i % 1000 == 0 )
 					{
-						builder.addIndexedValue( dataView, offset + v );
+						IECore::Canceller::check( m_canceller );
 					}
+					builder.addIndexedValue( dataView, m_sourceIndices[i] );
 				}
-				offset += numVarying;
+				return builder.indexedData();
 			}
-
-			return builder.indexedData();
-		}
-
-		IndexedData operator()( const IECore::Data *data )
-		{
-			throw IECore::Exception(
-				boost::str( boost::format( "Unexpected Data: %1%" ) % ( data ? data->typeName() : std::string( "nullptr" ) ) )
-			);
-		}
-
-	private:
-
-		const CurvesPrimitive *m_curvesPrimitive;
-};
-
-
-template<typename U>
-class DeleteFlaggedVertexFunctor : public DeleteFlagged<U>
-{
-	public:
-
-		DeleteFlaggedVertexFunctor(
-			size_t maxVertexId,
-			IECore::ConstIntVectorDataPtr vertexIdsData,
-			IECore::ConstIntVectorDataPtr verticesPerFaceData,
-			const PrimitiveVariable::IndexedView<U> &deleteFlagView,
-			bool invert
-		) :  DeleteFlagged<U>( deleteFlagView, invert), m_verticesPerFaceData( verticesPerFaceData ), m_vertexIdsData( vertexIdsData )
-		{
-			const std::vector<int> *vertexIds = nullptr;
-			if( m_vertexIdsData )
+			else
 			{
-				vertexIds = &m_vertexIdsData->readable();
-			}
-			const std::vector<int> &verticesPerFace = m_verticesPerFaceData->readable();
-
-			m_usedVerticesData = new IECore::BoolVectorData();
-			std::vector<bool> &usedVertices = m_usedVerticesData->writable();
+				typename V<std::vector<T> >::Ptr resultData = new V<std::vector<T> >();
+				GeometricInterpretationCopier<V<std::vector<T> > > copier;
+				copier( data, resultData.get() );
+				std::vector<T> &result = resultData->writable();
 
-			usedVertices.resize( maxVertexId, false );
-
-			size_t index = 0;
-			size_t offset = 0;
-			for( size_t f = 0; f < verticesPerFace.size(); ++f )
-			{
-				int numVerts = verticesPerFace[f];
+				const IECore::Canceller *canceller = m_canceller;
+				const std::vector<int> &sourceIndices = m_sourceIndices;
+				tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
 
-				if( this->shouldKeepPrimitive( f ) )
+				if( !m_dataIndices )
 				{
-					for( int v = 0; v < numVerts; ++v )
-					{
-						index = vertexIds ? (*vertexIds)[offset + v] : offset + v;
-						usedVertices[index] = true;
-					}
+					result.resize( sourceIndices.size() );
+					tbb::parallel_for(
+						tbb::blocked_range<size_t>( 0, sourceIndices.size() ),
+						[&inputs, &sourceIndices, &result, canceller] ( const tbb::blocked_range<size_t> &range )
+						{
+							IECore::Canceller::check( canceller );
+							for( size_t i = range.begin(); i != range.end(); ++i )
+							{
+								result[i] = inputs[sourceIndices[i]];
+							}
+						},
+						taskGroupContext
+					);
+					return IndexedData( resultData, nullptr );
 				}
-				offset += numVerts;
-			}
-
-			m_remappingData = new IECore::IntVectorData();
-			std::vector<int> &remapping = m_remappingData->writable();
 
-			// again this array is too large but large enough
-			remapping.resize( maxVertexId, -1 );
-
-			size_t newIndex = 0;
-			for( size_t i = 0; i < usedVertices.size(); ++i )
-			{
-				if( usedVertices[i] )
+				if( sourceIndices.empty() )
 				{
-					remapping[i] = newIndex;
-					newIndex++;
+					return IndexedData( resultData, nullptr );
 				}
-			}
-		}
 
-		template<typename T, template<typename> class V>
-		IndexedData operator()(const V<std::vector<T> > *data )
-		{
-			const std::vector<bool> &usedVertices = m_usedVerticesData->readable();
-			const std::vector<T> &vertices = data->readable();
+				const std::vector<int> &dataIndices = *m_dataIndices;
+				const int numOutputs = sourceIndices.size();
 
-			IndexedPrimitiveVariableBuilder<T, V> builder( vertices.size(), this->m_dataIndices ? this->m_dataIndices->size() : 0, data );
-			IECoreScene::PrimitiveVariable::IndexedView<T> dataView( vertices, this->m_dataIndices );
+				// Find the first output to reference each value.
 
-			for( size_t v = 0; v < dataView.size(); ++v )
-			{
-				if( usedVertices[v] )
-				{
-					builder.addIndexedValue(dataView, v);
-				}
+				std::vector<std::atomic<int>> firstUses( inputs.size() );
+				tbb::parallel_for(
+					tbb::blocked_range<size_t>( 0, firstUses.size() ),
+					[&firstUses, numOutputs] ( const tbb::blocked_range<size_t> &range )
+					{
+						for( size_t i = range.begin(); i != range.end(); ++i )
+						{
+							firstUses[i].store( numOutputs, std::memory_order_relaxed );
+						}
+					},
+					taskGroupContext
+				);
+
+				tbb::parallel_for(
+					tbb::blocked_range<int>( 0, numOutputs ),
+					[&firstUses, &dataIndices, &sourceIndices, canceller] ( const tbb::blocked_range<int> &range )
+					{
+						IECore::Canceller::check( canceller );
+						for( int i = range.begin(); i != range.end(); ++i )
+						{
+							std::atomic<int> &firstUse = firstUses[dataIndices[sourceIndices[i]]];
+							int current = firstUse.load( std::memory_order_relaxed );
+							while( i < current && !firstUse.compare_exchange_weak( current, i, std::memory_order_relaxed ) )
+							{
+							}
+						}
+					},
+					taskGroupContext
+				);
+
+				// Number the values in order of first use.
+
+				std::vector<int> isFirstUse( numOutputs );
+				tbb::parallel_for(
+					tbb::blocked_range<int>( 0, numOutputs ),
+					[&isFirstUse, &firstUses, &dataIndices, &sourceIndices] ( const tbb::blocked_range<int> &range )
+					{
+						for( int i = range.begin(); i != range.end(); ++i )
+						{
+							isFirstUse[i] = firstUses[dataIndices[sourceIndices[i]]].load( std::memory_order_relaxed ) == i;
+						}
+					},
+					taskGroupContext
+				);
+
+				IECore::Canceller::check( canceller );
+				IECore::IntVectorDataPtr resultIndicesData = new IECore::IntVectorData();
+				std::vector<int> &resultIndices = resultIndicesData->writable();
+				result.resize( exclusiveScan( isFirstUse, resultIndices ) );
+
+				// Copy the values and remap the indices.
+
+				std::vector<int> remapping( inputs.size() );
+				tbb::parallel_for(
+					tbb::blocked_range<int>( 0, numOutputs ),
+					[&isFirstUse, &inputs, &result, &resultIndices, &remapping, &dataIndices, &sourceIndices, canceller] ( const tbb::blocked_range<int> &range )
+					{
+						IECore::Canceller::check( canceller );
+						for( int i = range.begin(); i != range.end(); ++i )
+						{
+							if( isFirstUse[i] )
+							{
+								const int index = dataIndices[sourceIndices[i]];
+								result[resultIndices[i]] = inputs[index];
+								remapping[index] = resultIndices[i];
+							}
+						}
+					},
+					taskGroupContext
+				);
+
+				tbb::parallel_for(
+					tbb::blocked_range<int>( 0, numOutputs ),
+					[&resultIndices, &remapping, &dataIndices, &sourceIndices] ( const tbb::blocked_range<int> &range )
+					{
+						for( int i = range.begin(); i != range.end(); ++i )
+						{
+							resultIndices[i] = remapping[dataIndices[sourceIndices[i]]];
+						}
+					},
+					taskGroupContext
+				);
+
+				return IndexedData( resultData, resultIndicesData );
 			}
-
-			return builder.indexedData();
 		}
 
 		IndexedData operator()( const IECore::Data *data )
@@ -403,19 +419,12 @@ class DeleteFlaggedVertexFunctor : public DeleteFlagged<U>
 			);
 		}
 
-		IECore::ConstIntVectorDataPtr getRemapping() const
-		{
-			return m_remappingData;
-		}
-
 	private:
-		IECore::ConstIntVectorDataPtr m_verticesPerFaceData;
-		IECore::ConstIntVectorDataPtr m_vertexIdsData;
 
-		IECore::BoolVectorDataPtr m_usedVerticesData;
+		const std::vector<int> &m_sourceIndices;
+		const std::vector<int> *m_dataIndices;
+		const IECore::Canceller *m_canceller;
 
-		// map from old vertex index to new
-		IECore::IntVectorDataPtr m_remappingData;
 };
 
 } // PrimitiveVariableAlgos
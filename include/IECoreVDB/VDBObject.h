@@ -44,6 +44,7 @@
 
 #include "IECore/CompoundObject.h"
 #include "IECore/Export.h"
+#include "IECore/IndexedIO.h"
 #include "IECore/Object.h"
 #include "IECore/VectorTypedData.h"
 
@@ -55,6 +56,7 @@ IECORE_POP_DEFAULT_VISIBILITY
 
 #include "tbb/recursive_mutex.h"
 
+#include <ctime>
 #include <unordered_map>
 
 namespace IECoreVDB
@@ -75,6 +77,13 @@ class IECOREVDB_API VDBObject : public IECoreScene::VisibleRenderable
 		void insertGrid( openvdb::GridBase::Ptr grid );
 		void removeGrid( const std::string &name );
 
+		//! grids read from a vdb file or loaded from an IndexedIO file contain
+		//! only metadata until they are first accessed with findGrid(), at which
+		//! point the topology and data are loaded. The source file must therefore
+		//! not be overwritten while such grids remain unloaded. For IndexedIO files
+		//! this is detected, and findGrid() throws rather than reading invalid data.
+		//! This includes saving an object back to the file it was loaded from, so
+		//! findGrid() must be called for every grid before doing that.
 		openvdb::GridBase::ConstPtr findGrid( const std::string &name ) const;
 		openvdb::GridBase::Ptr findGrid( const std::string &name );
 
@@ -111,16 +120,43 @@ class IECOREVDB_API VDBObject : public IECoreScene::VisibleRenderable
 			std::recursive_mutex mutex;
 		};
 
+		// guard multithreaded access to the IndexedIO container a grid
+		// was loaded from via load(), and detect the file backing it
+		// being overwritten before the grid is loaded
+		struct LockedContainer
+		{
+			LockedContainer( IECore::ConstIndexedIOPtr container );
+
+			// throws if the file has been modified since the container was read
+			void checkUnmodified( const std::string &gridName ) const;
+
+			IECore::ConstIndexedIOPtr container;
+			std::recursive_mutex mutex;
+
+			std::string fileName;
+			uintmax_t fileSize;
+			std::time_t fileTime;
+		};
+
 		class HashedGrid
 		{
 			public:
-				HashedGrid() : m_hashValid( false )
+				HashedGrid() : m_hashValid( false ), m_unmodifiedFromFile( false )
 				{
 				}
 
 				HashedGrid( openvdb::GridBase::Ptr grid, std::shared_ptr<LockedFile> file )
 					: m_grid( grid ),
-					m_hashValid( false ), m_lockedFile( file )
+					m_hashValid( false ), m_unmodifiedFromFile( file != nullptr ), m_lockedFile( file )
+				{
+				}
+
+				//! grid contains only the metadata, with the topology & data
+				//! being loaded from container on demand. The hash is the one
+				//! computed when the grid was saved.
+				HashedGrid( openvdb::GridBase::Ptr grid, std::shared_ptr<LockedContainer> container, const IECore::MurmurHash &hash )
+					: m_grid( grid ),
+					m_hashValid( true ), m_hash( hash ), m_unmodifiedFromFile( true ), m_metadataGrid( grid ), m_lockedContainer( container )
 				{
 				}
 
@@ -128,14 +164,22 @@ class IECOREVDB_API VDBObject : public IECoreScene::VisibleRenderable
 				openvdb::GridBase::Ptr metadata() const;
 				openvdb::GridBase::Ptr grid() const;
 				bool unmodifiedFromFile() const;
+				//! returns a grid whose stats metadata is known to be up to date,
+				//! or null if the stats must be recomputed.
+				openvdb::GridBase::ConstPtr statsMetadata() const;
 				void markedAsEdited();
 
 			private:
 				mutable openvdb::GridBase::Ptr m_grid;
 				mutable bool m_hashValid;
 				mutable IECore::MurmurHash m_hash;
+				bool m_unmodifiedFromFile;
+				// the metadata grid read by load(), which keeps the
+				// stats computed by save() after the full grid is loaded
+				openvdb::GridBase::ConstPtr m_metadataGrid;
 
 				mutable std::shared_ptr<LockedFile> m_lockedFile;
+				mutable std::shared_ptr<LockedContainer> m_lockedContainer;
 		};
 
 		std::unordered_map<std::string, HashedGrid> m_grids;
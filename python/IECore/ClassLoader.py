@@ -37,6 +37,10 @@ import glob
 import re
 import os.path
 import threading
+import time
+import json
+import hashlib
+import concurrent.futures
 from fnmatch import fnmatch
 import importlib.util
 
@@ -57,6 +61,15 @@ from IECore import Msg, msg, SearchPath, warning
 # And for performance sake, it will not explore directories which
 # contain files that match this:
 # <any path>/<className>/<className>*.*
+#
+# Finding all classes requires a scan of every directory on the
+# searchpaths, which can be slow on network filesystems. The results
+# are therefore stored in an index on disk, which is reused until the
+# modification time of one of the scanned directories changes. The
+# index is stored in the directory specified by the
+# IECORE_CLASSLOADER_INDEX_PATH environment variable, defaulting to
+# a "cortex/classLoaderIndex" directory in the user's cache directory.
+# Setting the variable to an empty string disables the index.
 class ClassLoader :
 
 	## Creates a ClassLoader which will load
@@ -273,25 +286,163 @@ class ClassLoader :
 			return
 
 		self.__classes = {}
-		for path in self.__searchPaths.paths :
+		with concurrent.futures.ThreadPoolExecutor() as executor :
 
-			for root, dirs, files in os.walk( path ) :
+			for path in self.__searchPaths.paths :
 
-				if path.endswith( os.path.sep ) :
-					nameBase = root[len(path):]
-				else :
-					nameBase = root[len(path)+1:]
+				classes = self.__loadIndex( path, executor )
+				if classes is None :
+					classes, directories = self.__scanSearchPath( path, executor )
+					self.__saveIndex( path, classes, directories )
 
-				dirsToPrune = set()
-				for d in dirs :
+				for name, versions in classes.items() :
+					c = self.__classes.setdefault( name, { "versions" : [], "imports" : {} } )
+					c["versions"] = sorted( set( c["versions"] ) | set( versions ) )
 
-					if self.__updateClassFromSearchPath( path, os.path.join( nameBase, d ) ) :
-						dirsToPrune.add( d )
+		self.__foundAllClasses = True
 
-				for d in dirsToPrune :
-					dirs.remove( d )
+	# Scans a searchpath using the same rules as `__updateClassFromSearchPath()`,
+	# but listing each directory only once and listing directories in parallel.
+	# Returns a dictionary mapping from class names to versions, and a dictionary
+	# mapping from each directory visited to its modification time.
+	@staticmethod
+	def __scanSearchPath( path, executor ) :
 
-		self.__foundAllClasses = True
+		classes = {}
+		directories = {}
+		versionPattern = re.compile( r".*-(\d+).py$" )
+
+		def scanDirectory( name, isSymlink ) :
+
+			fullPath = os.path.join( path, name )
+			# Get the modification time before listing, so that any
+			# changes made during the scan invalidate the index.
+			mTime = ClassLoader.__modificationTime( fullPath )
+			try :
+				with os.scandir( fullPath ) as it :
+					entries = [ ( e.name, e.is_dir(), e.is_symlink() ) for e in it ]
+			except OSError :
+				entries = []
+
+			nameTail = os.path.basename( name )
+			if name and any( fnmatch( e[0], nameTail + "*.*" ) for e in entries ) :
+				# A class directory. We don't explore any further.
+				versions = []
+				for entryName, isDir, entryIsSymlink in entries :
+					m = versionPattern.match( entryName ) if fnmatch( entryName, nameTail + "*.*" ) else None
+					if m is not None :
+						versions.append( int( m.group( 1 ) ) )
+				return mTime, versions, []
+
+			# Like `os.walk()`, we don't follow symlinks other
+			# than to check if they are class directories.
+			children = []
+			if not isSymlink :
+				children = [ ( os.path.join( name, e[0] ), e[2] ) for e in entries if e[1] ]
+
+			return mTime, None, children
+
+		pending = { executor.submit( scanDirectory, "", False ) : "" }
+		while pending :
+			done, notDone = concurrent.futures.wait( pending, return_when = concurrent.futures.FIRST_COMPLETED )
+			for future in done :
+				name = pending.pop( future )
+				mTime, versions, children = future.result()
+				directories[name] = mTime
+				if versions :
+					classes[name] = sorted( set( versions ) )
+				for childName, childIsSymlink in children :
+					pending[executor.submit( scanDirectory, childName, childIsSymlink )] = childName
+
+		return classes, directories
+
+	@staticmethod
+	def __modificationTime( path ) :
+
+		try :
+			return os.stat( path ).st_mtime_ns
+		except OSError :
+			return None
+
+	@staticmethod
+	def __indexFileName( path ) :
+
+		indexPath = os.environ.get( "IECORE_CLASSLOADER_INDEX_PATH" )
+		if indexPath is None :
+			cachePath = os.environ.get( "XDG_CACHE_HOME" ) or os.path.join( os.path.expanduser( "~" ), ".cache" )
+			indexPath = os.path.join( cachePath, "cortex", "classLoaderIndex" )
+
+		if not indexPath :
+			return None
+
+		return os.path.join( indexPath, hashlib.sha1( os.path.abspath( path ).encode( "utf-8" ) ).hexdigest() + ".json" )
+
+	# Returns the classes from the index for the searchpath, or None if
+	# there is no index or any of the directories have changed since it
+	# was made.
+	@staticmethod
+	def __loadIndex( path, executor ) :
+
+		indexFileName = ClassLoader.__indexFileName( path )
+		if indexFileName is None :
+			return None
+
+		try :
+			with open( indexFileName ) as f :
+				index = json.load( f )
+			if index["version"] != ClassLoader.__indexVersion or index["searchPath"] != os.path.abspath( path ) :
+				return None
+			directories = index["directories"]
+			classes = index["classes"]
+		except ( OSError, ValueError, KeyError, TypeError ) :
+			return None
+
+		def unchanged( item ) :
+			name, mTime = item
+			return ClassLoader.__modificationTime( os.path.join( path, name ) ) == mTime
+
+		if not all( executor.map( unchanged, directories.items() ) ) :
+			return None
+
+		return classes
+
+	@staticmethod
+	def __saveIndex( path, classes, directories ) :
+
+		indexFileName = ClassLoader.__indexFileName( path )
+		if indexFileName is None :
+			return
+
+		# Modification times may have a coarse resolution, so a
+		# directory which is modified just after it was scanned could
+		# appear unchanged. We don't write an index until things have
+		# settled down.
+		recent = time.time_ns() - 2 * 10**9
+		if any( t is not None and t > recent for t in directories.values() ) :
+			return
+
+		index = {
+			"version" : ClassLoader.__indexVersion,
+			"searchPath" : os.path.abspath( path ),
+			"directories" : directories,
+			"classes" : classes,
+		}
+
+		# Write to a temporary file and rename, so that concurrent
+		# processes never see a partially written index.
+		tempFileName = "{}.{}.tmp".format( indexFileName, os.getpid() )
+		try :
+			os.makedirs( os.path.dirname( indexFileName ), exist_ok = True )
+			with open( tempFileName, "w" ) as f :
+				json.dump( index, f )
+			os.replace( tempFileName, indexFileName )
+		except OSError :
+			try :
+				os.remove( tempFileName )
+			except OSError :
+				pass
+
+	__indexVersion = 1
 
 	# throws an exception if the version is no good
 	@staticmethod
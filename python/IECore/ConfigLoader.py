@@ -37,8 +37,59 @@ import os
 import os.path
 import sys
 import traceback
+import marshal
+import struct
+import importlib.util
 import IECore
 
+__pyExtTest = re.compile( r"^[^~].*\.py$" )
+
+## Returns the compiled code for a config file. This is cached in the
+# standard `__pycache__` location using the same format as Python's
+# own bytecode cache, so that config files needn't be recompiled by
+# every process. Caching is skipped silently where the cache isn't
+# writable.
+def __compileConfigFile( fileName ) :
+
+	stat = os.stat( fileName )
+	header = importlib.util.MAGIC_NUMBER + struct.pack(
+		"<III", 0, int( stat.st_mtime ) & 0xFFFFFFFF, stat.st_size & 0xFFFFFFFF
+	)
+
+	try :
+		cacheFileName = importlib.util.cache_from_source( fileName )
+	except NotImplementedError :
+		cacheFileName = None
+
+	if cacheFileName is not None :
+		try :
+			with open( cacheFileName, "rb" ) as f :
+				data = f.read()
+			if data[:len( header )] == header :
+				return marshal.loads( data[len( header ):] )
+		except ( OSError, EOFError, ValueError, TypeError ) :
+			pass
+
+	with open( fileName ) as f :
+		code = compile( f.read(), fileName, "exec" )
+
+	if cacheFileName is not None and not sys.dont_write_bytecode :
+		# Write to a temporary file and rename, so that concurrent
+		# processes never see a partially written cache.
+		tempFileName = "{}.{}.tmp".format( cacheFileName, os.getpid() )
+		try :
+			os.makedirs( os.path.dirname( cacheFileName ), exist_ok = True )
+			with open( tempFileName, "wb" ) as f :
+				f.write( header + marshal.dumps( code ) )
+			os.replace( tempFileName, cacheFileName )
+		except OSError :
+			try :
+				os.remove( tempFileName )
+			except OSError :
+				pass
+
+	return code
+
 ## This function provides an easy means of providing a flexible configuration
 # mechanism for any software. It works by executing all .py files found on
 # a series of searchpaths. A copy of the `contextDict` is used as the locals
@@ -61,9 +112,10 @@ def loadConfig( searchPaths, contextDict = {}, raiseExceptions = False, subdirec
 		else :
 			visitedPaths.add( path )
 
-		pyExtTest = re.compile( r"^[^~].*\.py$" )
 		for dirPath, dirNames, fileNames in os.walk( os.path.join( path, subdirectory ) ) :
-			for fileName in filter( pyExtTest.search, sorted( fileNames ) ) :
+			if "__pycache__" in dirNames :
+				dirNames.remove( "__pycache__" )
+			for fileName in filter( __pyExtTest.search, sorted( fileNames ) ) :
 				fullFileName = os.path.abspath( os.path.join( dirPath, fileName ) )
 
 				IECore.msg( IECore.Msg.Level.Debug, "IECore.loadConfig", "Loading file \"%s\"" % fullFileName )
@@ -72,11 +124,7 @@ def loadConfig( searchPaths, contextDict = {}, raiseExceptions = False, subdirec
 				fileContextDict["__file__"] = fullFileName
 
 				try :
-					with open( fullFileName ) as f :
-						exec(
-							compile( f.read(), fullFileName, "exec" ),
-							fileContextDict, fileContextDict
-						)
+					exec( __compileConfigFile( fullFileName ), fileContextDict, fileContextDict )
 				except Exception as m :
 					if raiseExceptions :
 						raise
@@ -38,6 +38,9 @@ import re
 import glob
 import shutil
 import os.path
+import sys
+import queue
+import threading
 from . import _IECore as IECore
 
 # This is here because we can't yet create a to_python converter for boost::regex
@@ -91,6 +94,50 @@ def cat( sequence ) :
 
 		ret = os.system( 'cat "%s"' % ( f ) )
 
+## Walks the directory tree rooted at `path`, yielding a `( directory, sequences )`
+# tuple for each directory containing sequences, in the manner of `os.walk()`.
+# The sequences have file names relative to the directory. Directories are scanned
+# in parallel on background threads by `lsRecursive()`, and results are yielded
+# as soon as they are available, so the order in which directories are visited is
+# not deterministic. Closing the generator early cancels the scan.
+## \ingroup python
+def walkSequences( path, minSequenceSize = 2, followLinks = False, maxDepth = None ) :
+
+	results = queue.Queue()
+	canceller = IECore.Canceller()
+	finished = object()
+	exceptions = []
+
+	def scan() :
+
+		try :
+			IECore.lsRecursive(
+				path, lambda directory, sequences : results.put( ( directory, sequences ) ),
+				minSequenceSize, followLinks, sys.maxsize if maxDepth is None else maxDepth, canceller
+			)
+		except IECore.Cancelled :
+			pass
+		except Exception as e :
+			exceptions.append( e )
+		finally :
+			results.put( finished )
+
+	thread = threading.Thread( target = scan )
+	thread.start()
+
+	try :
+		while True :
+			result = results.get()
+			if result is finished :
+				break
+			yield result
+	finally :
+		canceller.cancel()
+		thread.join()
+
+	if exceptions :
+		raise exceptions[0]
+
 # private utility functions
 
 def __sequencesClash( sequence1, sequence2 ) :
@@ -120,4 +167,4 @@ def __tmpPrefix() :
 	h.update( str( time.time() ).encode() )
 	return "ieSequenceTmp" + h.hexdigest() + "."
 
-__all__ = [ "mv", "cp", "rm", "cat" ]
+__all__ = [ "mv", "cp", "rm", "cat", "walkSequences" ]
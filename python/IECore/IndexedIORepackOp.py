@@ -0,0 +1,130 @@
+##########################################################################
+#
+#  Copyright (c) 2026, Image Engine Design Inc. All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are
+#  met:
+#
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#
+#     * Neither the name of Image Engine Design nor the names of any
+#       other contributors to this software may be used to endorse or
+#       promote products derived from this software without specific prior
+#       written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+#  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+#  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+#  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+#  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+#  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+#  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+#  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+#  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+#  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+#  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+##########################################################################
+
+import IECore
+
+class IndexedIORepackOp( IECore.Op ) :
+
+	def __init__( self ) :
+
+		IECore.Op.__init__( self, "Rewrites an IndexedIO file (such as a SceneCache) without any free space, optionally recompressing it, and laid out in read order.",
+			IECore.FileNameParameter(
+				name = "result",
+				description = "The repacked file.",
+				defaultValue = "",
+				allowEmptyString = True,
+			)
+		)
+
+		self.parameters().addParameters(
+
+			[
+				IECore.FileNameParameter(
+					name = "src",
+					description = "The file to repack.",
+					defaultValue = "",
+					check = IECore.FileNameParameter.CheckType.MustExist,
+					extensions = "fio scc",
+					allowEmptyString = False,
+				),
+
+				IECore.FileNameParameter(
+					name = "dst",
+					description = "The file to write the result to. When empty, the source file is repacked in place.",
+					defaultValue = "",
+					extensions = "fio scc",
+					allowEmptyString = True,
+				),
+
+				IECore.StringParameter(
+					name = "order",
+					description = "The order in which data is laid out in the file. \"depthFirst\" keeps all the samples "
+						"of each location together, and suits reading whole locations at a time. \"timeMajor\" groups "
+						"the data for each sample together, and suits reading a whole scene one frame at a time.",
+					defaultValue = "depthFirst",
+					presets = (
+						( "depthFirst", "depthFirst" ),
+						( "timeMajor", "timeMajor" ),
+					),
+					presetsOnly = True,
+				),
+
+				IECore.StringParameter(
+					name = "compressor",
+					description = "The compressor to use for the repacked data. When empty, the compressor used by the source file is kept.",
+					defaultValue = "",
+					presets = (
+						( "Same As Source", "" ),
+						( "blosclz", "blosclz" ),
+						( "lz4", "lz4" ),
+						( "lz4hc", "lz4hc" ),
+						( "snappy", "snappy" ),
+						( "zlib", "zlib" ),
+					),
+					presetsOnly = True,
+				),
+
+				IECore.IntParameter(
+					name = "compressionLevel",
+					description = "The compression level to use for the repacked data, from 0 (no compression) to 9 (maximum compression). "
+						"When -1, the compression level used by the source file is kept.",
+					defaultValue = -1,
+					minValue = -1,
+					maxValue = 9,
+				),
+
+			]
+		)
+
+	def doOperation( self, operands ) :
+
+		src = operands["src"].value
+		dst = operands["dst"].value or src
+
+		options = IECore.CompoundData()
+		if operands["compressor"].value :
+			options["compressor"] = IECore.StringData( operands["compressor"].value )
+		if operands["compressionLevel"].value >= 0 :
+			options["compressionLevel"] = IECore.IntData( operands["compressionLevel"].value )
+
+		order = {
+			"depthFirst" : IECore.IndexedIOAlgo.RepackOrder.DepthFirst,
+			"timeMajor" : IECore.IndexedIOAlgo.RepackOrder.TimeMajor,
+		}[operands["order"].value]
+
+		IECore.IndexedIOAlgo.repack( src, dst, order, options )
+
+		return IECore.StringData( dst )
+
+IECore.registerRunTimeTyped( IndexedIORepackOp )
@@ -36,6 +36,7 @@ import IECore
 import os
 import os.path
 import datetime
+import concurrent.futures
 
 class SequenceLsOp( IECore.Op ) :
 
@@ -179,37 +180,6 @@ class SequenceLsOp( IECore.Op ) :
 			]
 		)
 
-	@staticmethod
-	def __walk(top, topdown=True, followlinks=False):
-
-		from os.path import join, isdir, islink
-		from os import listdir, error
-
-		try:
-			names = listdir(top)
-		except error :
-		        return
-
-		dirs, nondirs = [], []
-		for name in names:
-			if isdir(join(top, name)):
-				dirs.append(name)
-			else:
-				nondirs.append(name)
-
-		if topdown:
-			yield top, dirs, nondirs
-
-		for name in dirs:
-			path = join(top, name)
-			if followlinks or not islink(path):
-				for x in IECore.SequenceLsOp.__walk(path, topdown, followlinks):
-					yield x
-
-		if not topdown:
-			yield top, dirs, nondirs
-
-
 	def doOperation( self, operands ) :
 
 		# recursively find sequences
@@ -217,43 +187,38 @@ class SequenceLsOp( IECore.Op ) :
 		if baseDirectory != "/" and baseDirectory[-1] == '/' :
 			baseDirectory = baseDirectory[:-1]
 
-		sequences = IECore.ls( baseDirectory, operands["minSequenceSize"].value )
-
 		# If we've passed in a directory which isn't the current one it is convenient to get that included in the returned sequence names
 		relDir = os.path.normpath( baseDirectory ) != "."
 
-		if relDir :
-			for s in sequences :
-				s.fileName = os.path.join( baseDirectory, s.fileName )
-
-		if operands["recurse"].value :
-			# \todo Can safely use os.walk here after Python 2.6, which introduced the followlinks parameter
-			for root, dirs, files in IECore.SequenceLsOp.__walk( baseDirectory, topdown = True, followlinks = operands["followLinks"].value ) :
-				relRoot = root[len(baseDirectory)+1:]
-				if relRoot!="" :
-					depth = len( relRoot.split( "/" ) )
-				else :
-					depth = 0
-
-				if depth>=operands["maxDepth"].value :
-					dirs[:] = []
-
-				for d in dirs :
-					ss = IECore.ls( os.path.join( root, d ), operands["minSequenceSize"].value )
-					if ss :
-						for s in ss :
-
-							if relDir :
-								s.fileName = os.path.join( baseDirectory, relRoot, d, s.fileName )
-							else :
-								s.fileName = os.path.join( relRoot, d, s.fileName )
-							sequences.append( s )
-
+		sequences = []
+		for directory, directorySequences in IECore.walkSequences(
+			baseDirectory,
+			minSequenceSize = operands["minSequenceSize"].value,
+			followLinks = operands["followLinks"].value,
+			maxDepth = operands["maxDepth"].value if operands["recurse"].value else 0,
+		) :
+			if not relDir :
+				directory = os.path.relpath( directory, baseDirectory )
+			for s in directorySequences :
+				if directory != "." :
+					s.fileName = os.path.join( directory, s.fileName )
+				sequences.append( s )
+
+		# Directories are scanned in parallel, so we sort to give a consistent order.
+		sequences.sort( key = lambda s : s.fileName )
 
 		# \todo This Op would benefit considerably from dynamic parameters
 		# NB. Ordering of filters could have considerable impact on execution time. The most expensive filters should be specified last.
 		filters = []
 
+		# Filters which need to stat every file in a sequence do so in parallel,
+		# which hides much of the latency on network filesystems.
+		executor = []
+		def statExecutor() :
+			if not executor :
+				executor.append( concurrent.futures.ThreadPoolExecutor() )
+			return executor[0]
+
 		# filter sequences based on type
 		if operands["type"].value != "any" :
 
@@ -264,11 +229,7 @@ class SequenceLsOp( IECore.Op ) :
 				fileTypeTest = os.path.isdir
 
 			def matchType( sequence ) :
-				for sequenceFile in sequence.fileNames() :
-					if not fileTypeTest( sequenceFile ) :
-						return False
-
-				return True
+				return all( statExecutor().map( fileTypeTest, sequence.fileNames() ) )
 
 			filters.append( matchType )
 
@@ -316,17 +277,15 @@ class SequenceLsOp( IECore.Op ) :
 
 			assert( matchFn )
 
-			def matchModificationTime( sequence ) :
+			def modificationTimeMatches( sequenceFile ) :
 
-				# If any file in the sequence matches, we have a match.
-				for sequenceFile in sequence.fileNames() :
+				st = os.stat( sequenceFile )
+				return matchFn( datetime.datetime.fromtimestamp( st.st_mtime ) )
 
-					st = os.stat( sequenceFile )
-					modifiedTime = datetime.datetime.fromtimestamp( st.st_mtime )
-					if matchFn( modifiedTime ) :
-						return True
+			def matchModificationTime( sequence ) :
 
-				return False
+				# If any file in the sequence matches, we have a match.
+				return any( statExecutor().map( modificationTimeMatches, sequence.fileNames() ) )
 
 			filters.append( matchModificationTime )
 
@@ -345,7 +304,11 @@ class SequenceLsOp( IECore.Op ) :
 			return False
 
 		# \todo Allow matching of any filter, optionally
-		sequences = [ s for s in sequences if matchAllFilters( s ) ]
+		try :
+			sequences = [ s for s in sequences if matchAllFilters( s ) ]
+		finally :
+			if executor :
+				executor[0].shutdown()
 
 		# reformat the sequences into strings as requested
 
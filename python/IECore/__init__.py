@@ -70,6 +70,39 @@ __import__( "imath" )
 
 from ._IECore import *
 
+## A few pure Python utilities are imported lazily on first access, to
+# keep `import IECore` fast. This maps from the name of each attribute to
+# the submodule providing it, and the name within that submodule (or None
+# where the attribute is the submodule itself). Modules which call
+# `registerRunTimeTyped()` must not be listed here, because their types
+# must be registered as soon as IECore is imported. Neither may attributes
+# which share the name of their submodule, such as `Struct`, because
+# importing the submodule directly would bind the module in their place.
+__lazyAttributes = {
+	"StringUtil" : ( "StringUtil", None ),
+	"formatParameterHelp" : ( "FormattedParameterHelp", "formatParameterHelp" ),
+	"Enum" : ( "Enum", None ),
+	"ParameterAlgo" : ( "ParameterAlgo", None ),
+}
+
+def __getattr__( name ) :
+
+	try :
+		moduleName, attributeName = __lazyAttributes[name]
+	except KeyError :
+		raise AttributeError( "module {!r} has no attribute {!r}".format( __name__, name ) ) from None
+
+	import importlib
+	module = importlib.import_module( "." + moduleName, __name__ )
+	value = module if attributeName is None else getattr( module, attributeName )
+	globals()[name] = value
+
+	return value
+
+def __dir__() :
+
+	return sorted( set( globals().keys() ) | set( __lazyAttributes.keys() ) )
+
 # access by a shorter name for convenience
 Msg = MessageHandler
 from .registerRunTimeTyped import registerRunTimeTyped
@@ -77,7 +110,6 @@ from .registerObject import registerObject
 from .Log import *
 from .Formatter import Formatter
 from .WrappedTextFormatter import WrappedTextFormatter
-from . import StringUtil
 from .DataTraits import *
 from .FileSequenceFunctions import *
 from .ClassLoader import ClassLoader
@@ -88,11 +120,9 @@ from .SequenceRmOp import SequenceRmOp
 from .SequenceCatOp import SequenceCatOp
 from .SequenceRenumberOp import SequenceRenumberOp
 from .SequenceConvertOp import SequenceConvertOp
-from .FormattedParameterHelp import formatParameterHelp
 from .ClassLsOp import ClassLsOp
 from .OptionalCompoundParameter import OptionalCompoundParameter
 from .Struct import Struct
-from . import Enum
 from .LsHeaderOp import LsHeaderOp
 from .curry import curry
 from .MenuItemDefinition import MenuItemDefinition
@@ -103,6 +133,7 @@ from .CapturingMessageHandler import CapturingMessageHandler
 from .LayeredDict import LayeredDict
 from .CompoundVectorParameter import CompoundVectorParameter
 from .SequenceMergeOp import SequenceMergeOp
+from .IndexedIORepackOp import IndexedIORepackOp
 from .DateTimeParameterParser import *
 from .SubstitutedDict import SubstitutedDict
 from .ClassParameter import ClassParameter
@@ -110,7 +141,6 @@ from .ClassVectorParameter import ClassVectorParameter
 from .CompoundStream import CompoundStream
 from .IgnoredExceptions import IgnoredExceptions
 from .TestUtil import TestUtil
-from . import ParameterAlgo
 
 # importing internal utility modules and class overwrites
 from .ObjectOverwriting import *
@@ -123,4 +153,7 @@ from .ConfigLoader import loadConfig
 from .Preset import Preset
 from .BasicPreset import BasicPreset
 
+# Ensure `from IECore import *` provides the lazy attributes too.
+__all__ = sorted( { n for n in globals() if not n.startswith( "_" ) } | set( __lazyAttributes.keys() ) )
+
 loadConfig( "CORTEX_STARTUP_PATHS", subdirectory = "IECore" )
@@ -34,10 +34,14 @@
 
 #include "IECore/FileIndexedIO.h"
 
+#include "IECore/CompoundData.h"
 #include "IECore/MessageHandler.h"
+#include "IECore/SimpleTypedData.h"
 
 #include "boost/filesystem/operations.hpp"
 
+#include <cstring>
+
 using namespace IECore;
 
 namespace fs = boost::filesystem;
@@ -59,7 +63,7 @@ class FileIndexedIO::StreamFile : public StreamIndexedIO::StreamFile
 
 		size_t m_endPosition;
 
-		StreamFile( const std::string &filename, IndexedIO::OpenMode mode );
+		StreamFile( const std::string &filename, IndexedIO::OpenMode mode, bool memoryMapped = false );
 
 		~StreamFile() override;
 
@@ -69,7 +73,7 @@ class FileIndexedIO::StreamFile : public StreamIndexedIO::StreamFile
 
 };
 
-FileIndexedIO::StreamFile::StreamFile( const std::string &filename, IndexedIO::OpenMode mode ) : StreamIndexedIO::StreamFile(mode), m_filename( filename ), m_endPosition(0)
+FileIndexedIO::StreamFile::StreamFile( const std::string &filename, IndexedIO::OpenMode mode, bool memoryMapped ) : StreamIndexedIO::StreamFile(mode), m_filename( filename ), m_endPosition(0)
 {
 	if (mode & IndexedIO::Write)
 	{
@@ -132,7 +136,7 @@ FileIndexedIO::StreamFile::StreamFile( const std::string &filename, IndexedIO::O
 
 		try
 		{
-			setInput( f, false, filename );
+			setInput( f, false, filename, memoryMapped );
 		}
 		catch ( Exception &e )
 		{
@@ -200,6 +204,30 @@ bool FileIndexedIO::StreamFile::canRead( const std::string &path )
 
 static IndexedIO::Description<FileIndexedIO> registrar(".fio");
 
+namespace
+{
+
+bool memoryMappedDefault()
+{
+	const char *m = getenv( "IECORE_FILEINDEXEDIO_MEMORYMAPPED" );
+	return m && !strcmp( m, "1" );
+}
+
+bool memoryMapped( const CompoundData *options )
+{
+	static const bool g_default = memoryMappedDefault();
+	if( options )
+	{
+		if( const BoolData *m = options->member<BoolData>( "memoryMapped", false ) )
+		{
+			return m->readable();
+		}
+	}
+	return g_default;
+}
+
+} // namespace
+
 IndexedIOPtr FileIndexedIO::create(const std::string &path, const IndexedIO::EntryIDList &root, IndexedIO::OpenMode mode, const CompoundData* options)
 {
 	return new FileIndexedIO(path, root, mode, options);
@@ -223,7 +251,7 @@ FileIndexedIO::FileIndexedIO(const std::string &path, const IndexedIO::EntryIDLi
 	{
 		throw FileNotFoundIOException(filename);
 	}
-	open( new StreamFile( filename, mode ), root, options );
+	open( new StreamFile( filename, mode, memoryMapped( options ) ), root, options );
 }
 
 FileIndexedIO::FileIndexedIO( StreamIndexedIO::Node &rootNode ) : StreamIndexedIO( rootNode )
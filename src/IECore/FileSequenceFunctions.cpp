@@ -50,8 +50,13 @@
 #include "boost/regex.hpp"
 #include "boost/version.hpp"
 
+#include "tbb/blocked_range.h"
+#include "tbb/parallel_for.h"
+#include "tbb/task_arena.h"
+
 #include <algorithm>
 #include <cassert>
+#include <mutex>
 
 #include <math.h>
 
@@ -83,6 +88,86 @@
 
 using namespace IECore;
 
+namespace
+{
+
+struct LsRecursiveContext
+{
+	const LsRecursiveFunction &function;
+	std::mutex functionMutex;
+	const size_t minSequenceSize;
+	const bool followLinks;
+	const size_t maxDepth;
+	const Canceller *canceller;
+};
+
+// The root directory is scanned with an isolated `taskGroupContext`, and
+// subdirectories inherit it from their parent task.
+void lsRecursiveWalk( const boost::filesystem::path &directory, size_t depth, bool scanSubdirectories, LsRecursiveContext &context, tbb::task_group_context *taskGroupContext = nullptr )
+{
+	Canceller::check( context.canceller );
+
+	scanSubdirectories = scanSubdirectories && depth < context.maxDepth;
+
+	std::vector<std::string> names;
+	std::vector<std::pair<std::string, bool>> subdirectories; // Name and whether or not it is a symlink
+
+	boost::system::error_code error;
+	for( boost::filesystem::directory_iterator it( directory, error ), end; !error && it != end; it.increment( error ) )
+	{
+		names.push_back( it->path().PATH_TO_STRING );
+		if( !scanSubdirectories )
+		{
+			continue;
+		}
+
+		// The entry type is normally provided by the directory listing
+		// itself, so `symlink_status()` doesn't need to call `stat()`.
+		// We only pay for that when following symlinks.
+		boost::system::error_code statusError;
+		const boost::filesystem::file_status status = it->symlink_status( statusError );
+		if( boost::filesystem::is_directory( status ) )
+		{
+			subdirectories.push_back( { names.back(), false } );
+		}
+		else if( boost::filesystem::is_symlink( status ) && boost::filesystem::is_directory( it->status( statusError ) ) )
+		{
+			subdirectories.push_back( { names.back(), true } );
+		}
+	}
+
+	std::vector<FileSequencePtr> sequences;
+	findSequences( names, sequences, context.minSequenceSize );
+	if( sequences.size() )
+	{
+		std::lock_guard<std::mutex> lock( context.functionMutex );
+		context.function( directory.string(), sequences );
+	}
+
+	const tbb::blocked_range<size_t> subdirectoryRange( 0, subdirectories.size(), 1 );
+	const auto walkSubdirectories = [&]( const tbb::blocked_range<size_t> &range ) {
+		for( size_t i = range.begin(); i != range.end(); ++i )
+		{
+			lsRecursiveWalk(
+				directory / subdirectories[i].first, depth + 1,
+				context.followLinks || !subdirectories[i].second,
+				context
+			);
+		}
+	};
+
+	if( taskGroupContext )
+	{
+		tbb::parallel_for( subdirectoryRange, walkSubdirectories, *taskGroupContext );
+	}
+	else
+	{
+		tbb::parallel_for( subdirectoryRange, walkSubdirectories );
+	}
+}
+
+} // namespace
+
 void IECore::findSequences( const std::vector< std::string > &names, std::vector< FileSequencePtr > &sequences, size_t minSequenceSize )
 {
 	sequences.clear();
@@ -310,6 +395,22 @@ void IECore::ls( const std::string &sequencePath, FileSequencePtr &sequence, siz
 	}
 }
 
+void IECore::lsRecursive( const std::string &path, const LsRecursiveFunction &function, size_t minSequenceSize, bool followLinks, size_t maxDepth, const Canceller *canceller )
+{
+	if( !boost::filesystem::is_directory( path ) )
+	{
+		return;
+	}
+
+	LsRecursiveContext context = { function, {}, minSequenceSize, followLinks, maxDepth, canceller };
+	tbb::this_task_arena::isolate(
+		[&] {
+			tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+			lsRecursiveWalk( path, 0, true, context, &taskGroupContext );
+		}
+	);
+}
+
 FrameListPtr IECore::frameListFromList( const std::vector< FrameList::Frame > &frames )
 {
 	if ( frames.size() == 0 )
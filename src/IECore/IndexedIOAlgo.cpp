@@ -34,9 +34,14 @@
 
 #include "IECore/IndexedIOAlgo.h"
 
+#include "IECore/CompoundData.h"
+
+#include "boost/filesystem/operations.hpp"
+
 #include "tbb/task.h"
 
 #include <atomic>
+#include <map>
 
 using namespace IECore;
 using namespace IECore::IndexedIOAlgo;
@@ -227,6 +232,105 @@ void recursiveCopy( const IndexedIO *src, IndexedIO *dst )
 	}
 }
 
+// Returns true if `name` is an integer sample index of the form
+// written by SceneCache, storing the index in `sample`.
+bool sampleIndex( const IndexedIO::EntryID &name, size_t &sample )
+{
+	const std::string &s = name.value();
+	if( s.empty() || s.size() > 18 || ( s.size() > 1 && s[0] == '0' ) )
+	{
+		return false;
+	}
+
+	sample = 0;
+	for( char c : s )
+	{
+		if( c < '0' || c > '9' )
+		{
+			return false;
+		}
+		sample = sample * 10 + ( c - '0' );
+	}
+	return true;
+}
+
+// An entry whose copy is deferred until all samples
+// with a lower index have been written.
+struct DeferredSample
+{
+	ConstIndexedIOPtr src;
+	IndexedIOPtr dst;
+	IndexedIO::EntryID name;
+	IndexedIO::EntryType type;
+};
+
+using DeferredSamples = std::map<size_t, std::vector<DeferredSample>>;
+
+// Copies everything except sample entries depth first, collecting
+// the sample entries into `samples` in the order they are visited.
+void timeMajorWalk( const ConstIndexedIOPtr &src, const IndexedIOPtr &dst, DeferredSamples &samples )
+{
+	size_t sample;
+
+	IndexedIO::EntryIDList fileNames;
+	src->entryIds( fileNames, IndexedIO::EntryType::File );
+
+	for( const auto &fileName : fileNames )
+	{
+		if( sampleIndex( fileName, sample ) )
+		{
+			samples[sample].push_back( { src, dst, fileName, IndexedIO::EntryType::File } );
+		}
+		else
+		{
+			int dummy = 0;
+			handleFile<Copier, int>( src.get(), dst.get(), fileName, dummy );
+		}
+	}
+
+	IndexedIO::EntryIDList directoryNames;
+	src->entryIds( directoryNames, IndexedIO::EntryType::Directory );
+
+	for( const auto &directoryName : directoryNames )
+	{
+		if( sampleIndex( directoryName, sample ) )
+		{
+			samples[sample].push_back( { src, dst, directoryName, IndexedIO::EntryType::Directory } );
+		}
+		else
+		{
+			timeMajorWalk(
+				src->subdirectory( directoryName, IndexedIO::ThrowIfMissing ),
+				dst->subdirectory( directoryName, IndexedIO::CreateIfMissing ),
+				samples
+			);
+		}
+	}
+}
+
+void timeMajorCopy( const IndexedIO *src, IndexedIO *dst )
+{
+	DeferredSamples samples;
+	timeMajorWalk( ConstIndexedIOPtr( src ), IndexedIOPtr( dst ), samples );
+
+	for( const auto &entries : samples )
+	{
+		for( const auto &entry : entries.second )
+		{
+			if( entry.type == IndexedIO::EntryType::File )
+			{
+				int dummy = 0;
+				handleFile<Copier, int>( entry.src.get(), entry.dst.get(), entry.name, dummy );
+			}
+			else
+			{
+				IndexedIOPtr childDst = entry.dst->subdirectory( entry.name, IndexedIO::CreateIfMissing );
+				recursiveCopy( entry.src->subdirectory( entry.name, IndexedIO::ThrowIfMissing ).get(), childDst.get() );
+			}
+		}
+	}
+}
+
 //! Task for traversing all files in parallel. New tasks are spawned for each directory
 template<template<typename, typename> class FileHandler, typename FileCallback>
 class FileTask : public tbb::task
@@ -293,6 +397,72 @@ void copy( const IndexedIO *src, IndexedIO *dst )
 	::recursiveCopy( src, dst );
 }
 
+void repack( const IndexedIO *src, IndexedIO *dst, RepackOrder order )
+{
+	switch( order )
+	{
+		case RepackOrder::DepthFirst :
+			::recursiveCopy( src, dst );
+			break;
+		case RepackOrder::TimeMajor :
+			::timeMajorCopy( src, dst );
+			break;
+	}
+}
+
+void repack( const std::string &srcFileName, const std::string &dstFileName, RepackOrder order, const CompoundData *options )
+{
+	ConstIndexedIOPtr src = IndexedIO::create( srcFileName, IndexedIO::rootPath, IndexedIO::Read );
+
+	// Default to the compression settings of the source, so that
+	// repacking only changes the codec when asked to.
+	CompoundDataPtr dstOptions = options ? options->copy() : CompoundDataPtr( new CompoundData );
+	if( ConstCompoundDataPtr metadata = src->metadata() )
+	{
+		for( const char *name : { "compressor", "compressionLevel" } )
+		{
+			const Data *value = metadata->member<Data>( name );
+			if( value && !dstOptions->member<Data>( name ) )
+			{
+				dstOptions->writable()[name] = value->copy();
+			}
+		}
+	}
+
+	// Write to a uniquely named temporary file alongside the destination,
+	// keeping the extension so that IndexedIO::create() picks the same
+	// implementation. This lets the source and destination be the same
+	// file, and avoids leaving a partial file at the destination if we fail.
+	const boost::filesystem::path dstPath( dstFileName );
+	const boost::filesystem::path tmpPath = dstPath.parent_path() / (
+		dstPath.stem().string() + boost::filesystem::unique_path( ".repack-%%%%-%%%%-%%%%" ).string() + dstPath.extension().string()
+	);
+
+	try
+	{
+		IndexedIOPtr dst = IndexedIO::create( tmpPath.string(), IndexedIO::rootPath, IndexedIO::Write, dstOptions.get() );
+		repack( src.get(), dst.get(), order );
+		// Release both files so that the index is written
+		// and the source is closed before we replace it.
+		dst.reset();
+		src.reset();
+		// Preserve the permissions of any file we're replacing.
+		boost::system::error_code ec;
+		const boost::filesystem::file_status dstStatus = boost::filesystem::status( dstPath, ec );
+		if( boost::filesystem::exists( dstStatus ) )
+		{
+			boost::filesystem::permissions( tmpPath, dstStatus.permissions() );
+		}
+		boost::filesystem::rename( tmpPath, dstPath );
+	}
+	catch( ... )
+	{
+		boost::system::error_code ec;
+		boost::filesystem::remove( tmpPath, ec );
+		throw;
+	}
+}
+
 FileStats<size_t> parallelReadAll( const IndexedIO *src )
 {
 	FileStats<std::atomic<size_t> > fileStats;
@@ -42,6 +42,8 @@
 #include "tbb/spin_rw_mutex.h"
 
 #include <string.h>
+#include <string_view>
+#include <vector>
 
 namespace IECore
 {
@@ -49,52 +51,48 @@ namespace IECore
 namespace Detail
 {
 
-// Simple type for specifying a range of characters, to
-// represent non-null-terminated strings.
-typedef std::pair<const char *, const char *> CharRange;
-
-// Hash for strings of various types.
-// By overloading it for multiple types, we are able to do
-// lookups into HashSet using any type as a key, and without
-// needing to construct a temporary std::string when the type
-// is a raw c string.
-struct Hash
+inline size_t hash( const char *value, size_t length )
 {
+	return std::hash<std::string_view>()( std::string_view( value, length ) );
+}
 
-	// Dan Bernstein's original string hash
-	size_t operator()( const char *s ) const
+// A string which isn't necessarily null-terminated, along with its
+// precomputed hash. We use this as the key for lookups into the HashSet,
+// so that we don't need to construct a temporary std::string, and so that
+// the hash is computed only once for both shard selection and lookup.
+struct HashedString
+{
+	HashedString( const char *value, size_t length )
+		:	value( value ), length( length ), hash( Detail::hash( value, length ) )
 	{
-		size_t hash = 5381;
-		while( *s )
-		{
-			hash = ( ( hash << 5 ) + hash ) + *s++;
-		}
-
-		return hash;
 	}
 
+	const char *value;
+	size_t length;
+	size_t hash;
+};
+
+// Hash for strings of various types. By overloading it for multiple
+// types, we are able to do lookups into HashSet using HashedString
+// as a key.
+struct Hash
+{
+
 	size_t operator()( const std::string &s ) const
 	{
-		return (*this)( s.c_str() );
+		return hash( s.c_str(), s.size() );
 	}
 
-	size_t operator()( const CharRange &range ) const
+	size_t operator()( const HashedString &s ) const
 	{
-		size_t hash = 5381;
-		for( const char *s = range.first; s != range.second; ++s )
-		{
-			hash = ( ( hash << 5 ) + hash ) + *s;
-		}
-
-		return hash;
+		return s.hash;
 	}
 
 };
 
 // Equality operator between strings of various types.
 // As above, this allows HashSet lookups to be performed
-// using any type, without the overhead of constructing
-// temporary std::strings.
+// using HashedString.
 struct Equal
 {
 
@@ -103,24 +101,14 @@ struct Equal
 		return s1 == s2;
 	}
 
-	bool operator()( const char *c, const std::string &s ) const
+	bool operator()( const HashedString &h, const std::string &s ) const
 	{
-		return strcmp( c, s.c_str() )==0;
+		return h.length == s.size() && memcmp( h.value, s.c_str(), h.length ) == 0;
 	}
 
-	bool operator()( const std::string &s, const char *c ) const
+	bool operator()( const std::string &s, const HashedString &h ) const
 	{
-		return strcmp( c, s.c_str() )==0;
-	}
-
-	bool operator()( const CharRange &c, const std::string &s ) const
-	{
-		return s.compare( 0, std::string::npos, c.first, c.second - c.first )==0;
-	}
-
-	bool operator()( const std::string &s, const CharRange &c ) const
-	{
-		return s.compare( 0, std::string::npos, c.first, c.second - c.first )==0;
+		return (*this)( h, s );
 	}
 
 };
@@ -136,63 +124,161 @@ typedef boost::multi_index::multi_index_container<
 	>
 > HashSet;
 
-typedef HashSet::nth_index<0>::type Index;
-typedef HashSet::nth_index_const_iterator<0>::type ConstIterator;
 typedef tbb::spin_rw_mutex Mutex;
 
-static HashSet *hashSet()
+// The table is split into shards, each with its own mutex, so that
+// threads interning different strings rarely contend for the same lock.
+// Shards are aligned to avoid false sharing between their mutexes.
+struct alignas( 64 ) Shard
 {
-	static HashSet g_hashSet;
-	return &g_hashSet;
-}
+	Mutex mutex;
+	HashSet hashSet;
+};
 
-static Mutex *mutex()
+const size_t g_numShardsLog2 = 6;
+const size_t g_numShards = 1 << g_numShardsLog2;
+
+static Shard *shards()
 {
-	static Detail::Mutex g_mutex;
-	return &g_mutex;
+	static Shard g_shards[g_numShards];
+	return g_shards;
 }
 
-} // namespace Detail
+// We use the high bits of the hash to choose the shard, because the
+// low bits are used to choose the bucket within the shard's HashSet.
+inline size_t shardIndex( size_t hash )
+{
+	return hash >> ( sizeof( size_t ) * 8 - g_numShardsLog2 );
+}
 
-const std::string *InternedString::internedString( const char *value )
+// Returns the interned string for `key`, which must belong to `shard`,
+// and for which `lock` must hold at least a read lock on the shard.
+// Upgrades the lock to a write lock if insertion is necessary.
+inline const std::string *internedString( Shard &shard, const HashedString &key, Mutex::scoped_lock &lock, bool &isWriter )
 {
-	Detail::HashSet *hashSet = Detail::hashSet();
-	Detail::Index &hashIndex = hashSet->get<0>();
-	Detail::Mutex::scoped_lock lock( *Detail::mutex(), false ); // read-only lock
-	Detail::HashSet::const_iterator it = hashIndex.find( value );
-	if( it!=hashIndex.end() )
+	HashSet::const_iterator it = shard.hashSet.find( key );
+	if( it != shard.hashSet.end() )
 	{
 		return &(*it);
 	}
-	else
+
+	if( !isWriter )
 	{
+		// Note that `upgrade_to_writer()` may temporarily release the
+		// lock, but that's OK because `insert()` will just return the
+		// existing string if another thread inserted it in the meantime.
 		lock.upgrade_to_writer();
-		return &(*(hashSet->insert( std::string( value ) ).first ) );
+		isWriter = true;
 	}
+	return &(*( shard.hashSet.insert( std::string( key.value, key.length ) ).first ) );
+}
+
+} // namespace Detail
+
+const std::string *InternedString::internedString( const char *value )
+{
+	return internedString( value, strlen( value ) );
 }
 
 const std::string *InternedString::internedString( const char *value, size_t length )
 {
-	Detail::HashSet *hashSet = Detail::hashSet();
-	Detail::Index &hashIndex = hashSet->get<0>();
-	Detail::Mutex::scoped_lock lock( *Detail::mutex(), false ); // read-only lock
-	Detail::HashSet::const_iterator it = hashIndex.find( Detail::CharRange( value, value + length ) );
-	if( it!=hashIndex.end() )
+	const Detail::HashedString key( value, length );
+	Detail::Shard &shard = Detail::shards()[Detail::shardIndex( key.hash )];
+	Detail::Mutex::scoped_lock lock( shard.mutex, false ); // read-only lock
+	bool isWriter = false;
+	return Detail::internedString( shard, key, lock, isWriter );
+}
+
+void InternedString::intern( const std::string_view *values, size_t count, InternedString *result )
+{
+	// Hash everything up front, and sort the indices by shard, so
+	// that we only need to lock each shard once.
+
+	std::vector<Detail::HashedString> keys;
+	keys.reserve( count );
+	std::vector<size_t> shardOffsets( Detail::g_numShards + 1, 0 );
+	for( size_t i = 0; i < count; ++i )
 	{
-		return &(*it);
+		keys.emplace_back( values[i].data(), values[i].size() );
+		shardOffsets[Detail::shardIndex( keys.back().hash ) + 1]++;
+	}
+
+	for( size_t s = 0; s < Detail::g_numShards; ++s )
+	{
+		shardOffsets[s+1] += shardOffsets[s];
 	}
-	else
+
+	std::vector<size_t> order( count );
+	std::vector<size_t> insertionOffsets( shardOffsets.begin(), shardOffsets.end() - 1 );
+	for( size_t i = 0; i < count; ++i )
 	{
-		lock.upgrade_to_writer();
-		return &(*(hashSet->insert( std::string( value, length ) ).first ) );
+		order[insertionOffsets[Detail::shardIndex( keys[i].hash )]++] = i;
+	}
+
+	for( size_t s = 0; s < Detail::g_numShards; ++s )
+	{
+		if( shardOffsets[s] == shardOffsets[s+1] )
+		{
+			continue;
+		}
+
+		Detail::Shard &shard = Detail::shards()[s];
+		Detail::Mutex::scoped_lock lock( shard.mutex, false ); // read-only lock
+		bool isWriter = false;
+		for( size_t o = shardOffsets[s]; o < shardOffsets[s+1]; ++o )
+		{
+			const size_t i = order[o];
+			result[i].m_value = Detail::internedString( shard, keys[i], lock, isWriter );
+		}
 	}
 }
 
+std::vector<InternedString> InternedString::intern( const std::vector<std::string> &values )
+{
+	std::vector<std::string_view> views( values.begin(), values.end() );
+	std::vector<InternedString> result( values.size() );
+	intern( views.data(), views.size(), result.data() );
+	return result;
+}
+
 size_t InternedString::numUniqueStrings()
 {
-	Detail::Mutex::scoped_lock lock( *Detail::mutex(), false ); // read-only lock
-	Detail::HashSet *hashSet = Detail::hashSet();
-	return hashSet->size();
+	size_t result = 0;
+	Detail::Shard *shards = Detail::shards();
+	for( size_t s = 0; s < Detail::g_numShards; ++s )
+	{
+		Detail::Mutex::scoped_lock lock( shards[s].mutex, false ); // read-only lock
+		result += shards[s].hashSet.size();
+	}
+	return result;
+}
+
+size_t InternedString::memoryUsage()
+{
+	// An approximation, accounting for the strings themselves,
+	// the nodes which hold them and the bucket arrays.
+	const std::string emptyString;
+	const size_t nodeSize = sizeof( std::string ) + 2 * sizeof( void * );
+
+	size_t result = sizeof( Detail::Shard ) * Detail::g_numShards;
+	Detail::Shard *shards = Detail::shards();
+	for( size_t s = 0; s < Detail::g_numShards; ++s )
+	{
+		Detail::Mutex::scoped_lock lock( shards[s].mutex, false ); // read-only lock
+		const Detail::HashSet &hashSet = shards[s].hashSet;
+		result += hashSet.bucket_count() * sizeof( void * );
+		for( const auto &str : hashSet )
+		{
+			result += nodeSize;
+			if( str.capacity() > emptyString.capacity() )
+			{
+				// Not using the small string optimisation,
+				// so has a separate allocation.
+				result += str.capacity() + 1;
+			}
+		}
+	}
+	return result;
 }
 
 static InternedString g_emptyString("");
@@ -0,0 +1,373 @@
+//////////////////////////////////////////////////////////////////////////
+//
+//  Copyright (c) 2026, Image Engine Design Inc. All rights reserved.
+//
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//
+//     * Redistributions of source code must retain the above copyright
+//       notice, this list of conditions and the following disclaimer.
+//
+//     * Redistributions in binary form must reproduce the above copyright
+//       notice, this list of conditions and the following disclaimer in the
+//       documentation and/or other materials provided with the distribution.
+//
+//     * Neither the name of Image Engine Design nor the names of any
+//       other contributors to this software may be used to endorse or
+//       promote products derived from this software without specific prior
+//       written permission.
+//
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//////////////////////////////////////////////////////////////////////////
+
+#include "IECore/MemoryGovernor.h"
+
+#include "IECore/Exception.h"
+#include "IECore/MessageHandler.h"
+#include "IECore/SimpleTypedData.h"
+
+#include "boost/format.hpp"
+
+#include <algorithm>
+#include <atomic>
+#include <cmath>
+#include <cstdlib>
+#include <map>
+#include <mutex>
+#include <vector>
+
+using namespace IECore;
+
+//////////////////////////////////////////////////////////////////////////
+// Internal implementation
+//////////////////////////////////////////////////////////////////////////
+
+namespace
+{
+
+struct Registration
+{
+	MemoryGovernor::Client *client;
+	std::string name;
+	float priority;
+};
+
+size_t defaultMaxMemoryUsage()
+{
+	size_t mi = 0;
+	if( const char *m = getenv( "IECORE_MEMORYGOVERNOR_MEMORY" ) )
+	{
+		char *end = nullptr;
+		const unsigned long long v = strtoull( m, &end, 10 );
+		if( end != m && *end == '\0' )
+		{
+			mi = v;
+		}
+		else
+		{
+			msg( Msg::Warning, "MemoryGovernor", boost::format( "Ignoring invalid IECORE_MEMORYGOVERNOR_MEMORY value \"%1%\"" ) % m );
+		}
+	}
+	return 1024 * 1024 * mi;
+}
+
+void checkPriority( float priority, const char *context )
+{
+	if( priority <= 0.0f )
+	{
+		throw InvalidArgumentException( boost::str( boost::format( "%1% : Priority must be greater than 0" ) % context ) );
+	}
+}
+
+struct Registry
+{
+	Registry() : maxMemoryUsage( defaultMaxMemoryUsage() ), estimatedMemoryUsage( 0 )
+	{
+	}
+
+	std::mutex mutex;
+	std::vector<Registration> registrations;
+	std::atomic<size_t> maxMemoryUsage;
+	// Upper bound on the combined usage of all clients. This is
+	// incremented by `memoryAdded()` and corrected by `enforce()`,
+	// which measures the true usage.
+	std::atomic<size_t> estimatedMemoryUsage;
+};
+
+Registry &registry()
+{
+	// Deliberately leaked, so that clients may still
+	// deregister themselves during static destruction.
+	static Registry *r = new Registry;
+	return *r;
+}
+
+struct Candidate
+{
+	MemoryGovernor::Client *client;
+	size_t memoryUsage;
+	size_t reduction;
+	double weight;
+};
+
+} // namespace
+
+//////////////////////////////////////////////////////////////////////////
+// MemoryGovernor
+//////////////////////////////////////////////////////////////////////////
+
+MemoryGovernor::Client::~Client()
+{
+}
+
+void MemoryGovernor::registerClient( Client *client, const std::string &name, float priority )
+{
+	checkPriority( priority, "MemoryGovernor::registerClient" );
+
+	Registry &r = registry();
+	std::lock_guard<std::mutex> lock( r.mutex );
+	r.registrations.push_back( { client, name, priority } );
+}
+
+void MemoryGovernor::deregisterClient( Client *client )
+{
+	Registry &r = registry();
+	std::lock_guard<std::mutex> lock( r.mutex );
+	r.registrations.erase(
+		std::remove_if(
+			r.registrations.begin(), r.registrations.end(),
+			[client]( const Registration &registration ) { return registration.client == client; }
+		),
+		r.registrations.end()
+	);
+}
+
+void MemoryGovernor::setPriority( Client *client, float priority )
+{
+	checkPriority( priority, "MemoryGovernor::setPriority" );
+
+	Registry &r = registry();
+	std::lock_guard<std::mutex> lock( r.mutex );
+	for( auto &registration : r.registrations )
+	{
+		if( registration.client == client )
+		{
+			registration.priority = priority;
+			return;
+		}
+	}
+
+	throw InvalidArgumentException( "MemoryGovernor::setPriority : Client is not registered" );
+}
+
+float MemoryGovernor::getPriority( const Client *client )
+{
+	Registry &r = registry();
+	std::lock_guard<std::mutex> lock( r.mutex );
+	for( const auto &registration : r.registrations )
+	{
+		if( registration.client == client )
+		{
+			return registration.priority;
+		}
+	}
+
+	throw InvalidArgumentException( "MemoryGovernor::getPriority : Client is not registered" );
+}
+
+void MemoryGovernor::setPriority( const std::string &name, float priority )
+{
+	checkPriority( priority, "MemoryGovernor::setPriority" );
+
+	Registry &r = registry();
+	std::lock_guard<std::mutex> lock( r.mutex );
+	bool found = false;
+	for( auto &registration : r.registrations )
+	{
+		if( registration.name == name )
+		{
+			registration.priority = priority;
+			found = true;
+		}
+	}
+
+	if( !found )
+	{
+		throw InvalidArgumentException( boost::str( boost::format( "MemoryGovernor::setPriority : No client named \"%1%\"" ) % name ) );
+	}
+}
+
+float MemoryGovernor::getPriority( const std::string &name )
+{
+	Registry &r = registry();
+	std::lock_guard<std::mutex> lock( r.mutex );
+	float result = 0.0f;
+	for( const auto &registration : r.registrations )
+	{
+		if( registration.name == name )
+		{
+			result = std::max( result, registration.priority );
+		}
+	}
+
+	if( result == 0.0f )
+	{
+		throw InvalidArgumentException( boost::str( boost::format( "MemoryGovernor::getPriority : No client named \"%1%\"" ) % name ) );
+	}
+	return result;
+}
+
+size_t MemoryGovernor::getMaxMemoryUsage()
+{
+	return registry().maxMemoryUsage;
+}
+
+void MemoryGovernor::setMaxMemoryUsage( size_t maxMemoryUsage )
+{
+	registry().maxMemoryUsage = maxMemoryUsage;
+	enforce();
+}
+
+size_t MemoryGovernor::memoryUsage()
+{
+	Registry &r = registry();
+	std::lock_guard<std::mutex> lock( r.mutex );
+	size_t result = 0;
+	for( const auto &registration : r.registrations )
+	{
+		result += registration.client->memoryUsage();
+	}
+	return result;
+}
+
+CompoundDataPtr MemoryGovernor::clientMemoryUsage()
+{
+	std::map<std::string, uint64_t> usage;
+	{
+		Registry &r = registry();
+		std::lock_guard<std::mutex> lock( r.mutex );
+		for( const auto &registration : r.registrations )
+		{
+			usage[registration.name] += registration.client->memoryUsage();
+		}
+	}
+
+	CompoundDataPtr result = new CompoundData;
+	for( const auto &u : usage )
+	{
+		result->writable()[u.first] = new UInt64Data( u.second );
+	}
+	return result;
+}
+
+void MemoryGovernor::enforce()
+{
+	Registry &r = registry();
+	const size_t maxMemoryUsage = r.maxMemoryUsage;
+	if( !maxMemoryUsage )
+	{
+		return;
+	}
+
+	// If another thread is already enforcing the limit then there
+	// is no need for us to wait for it.
+	std::unique_lock<std::mutex> lock( r.mutex, std::try_to_lock );
+	if( !lock.owns_lock() )
+	{
+		return;
+	}
+
+	// Growth reported while we are measuring will be counted both in
+	// our measurement and in the difference from `initialEstimate`,
+	// so the corrected estimate remains an upper bound.
+	const size_t initialEstimate = r.estimatedMemoryUsage;
+
+	std::vector<Candidate> candidates;
+	candidates.reserve( r.registrations.size() );
+	size_t totalMemoryUsage = 0;
+	for( const auto &registration : r.registrations )
+	{
+		const size_t memoryUsage = registration.client->memoryUsage();
+		if( memoryUsage )
+		{
+			candidates.push_back( { registration.client, memoryUsage, 0, (double)memoryUsage / registration.priority } );
+			totalMemoryUsage += memoryUsage;
+		}
+	}
+
+	if( totalMemoryUsage <= maxMemoryUsage )
+	{
+		r.estimatedMemoryUsage += totalMemoryUsage - initialEstimate;
+		return;
+	}
+
+	// Share the excess between the candidates according to their weight. A
+	// candidate may not give up more than it holds, so we redistribute any
+	// shortfall among the remaining candidates until the excess is covered.
+
+	size_t excess = totalMemoryUsage - maxMemoryUsage;
+	std::vector<Candidate *> active;
+	for( auto &c : candidates )
+	{
+		active.push_back( &c );
+	}
+
+	while( excess && !active.empty() )
+	{
+		double totalWeight = 0;
+		for( const auto *c : active )
+		{
+			totalWeight += c->weight;
+		}
+
+		size_t reclaimed = 0;
+		for( auto *c : active )
+		{
+			size_t share = (size_t)std::ceil( (double)excess * c->weight / totalWeight );
+			share = std::min( { share, c->memoryUsage - c->reduction, excess - reclaimed } );
+			c->reduction += share;
+			reclaimed += share;
+		}
+		excess -= reclaimed;
+
+		active.erase(
+			std::remove_if( active.begin(), active.end(), []( const Candidate *c ) { return c->reduction == c->memoryUsage; } ),
+			active.end()
+		);
+	}
+
+	size_t reducedMemoryUsage = totalMemoryUsage;
+	for( const auto &c : candidates )
+	{
+		if( c.reduction )
+		{
+			c.client->reduceMemoryUsage( c.memoryUsage - c.reduction );
+			reducedMemoryUsage = reducedMemoryUsage - c.memoryUsage + c.client->memoryUsage();
+		}
+	}
+
+	r.estimatedMemoryUsage += reducedMemoryUsage - initialEstimate;
+}
+
+void MemoryGovernor::memoryAdded( size_t memoryUsage )
+{
+	Registry &r = registry();
+	const size_t estimate = r.estimatedMemoryUsage += memoryUsage;
+	const size_t maxMemoryUsage = r.maxMemoryUsage;
+	if( maxMemoryUsage && estimate > maxMemoryUsage )
+	{
+		enforce();
+	}
+}
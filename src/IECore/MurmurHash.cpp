@@ -37,8 +37,16 @@
 
 #include <boost/format.hpp>
 
+#include "tbb/blocked_range.h"
+#include "tbb/parallel_for.h"
+#include "tbb/task_arena.h"
+
+#include <algorithm>
+#include <atomic>
+#include <cstdlib>
 #include <iomanip>
 #include <sstream>
+#include <vector>
 
 using namespace IECore;
 
@@ -72,6 +80,18 @@ void internalFromString( const std::string &repr, uint64_t &h1, uint64_t &h2 )
 	s >> std::hex >> h2;
 }
 
+// The size of the chunks hashed in parallel by `appendTree()`. Changing
+// this changes the results, so requires `treeHashVersion` to be incremented.
+const size_t g_treeHashChunkSize = 1024 * 1024;
+
+size_t treeHashThresholdDefault()
+{
+	const char *t = getenv( "IECORE_MURMURHASH_TREE_THRESHOLD" );
+	return t ? strtoull( t, nullptr, 10 ) : 0;
+}
+
+std::atomic<size_t> g_treeHashThreshold( treeHashThresholdDefault() );
+
 } // namespace
 
 MurmurHash::MurmurHash( const std::string &repr )
@@ -95,3 +115,50 @@ std::ostream &IECore::operator << ( std::ostream &o, const MurmurHash &hash )
 	o << hash.toString();
 	return o;
 }
+
+void MurmurHash::setTreeHashThreshold( size_t bytes )
+{
+	g_treeHashThreshold = bytes;
+}
+
+size_t MurmurHash::treeHashThreshold()
+{
+	return g_treeHashThreshold.load( std::memory_order_relaxed );
+}
+
+void MurmurHash::appendTreeInternal( const void *data, size_t numElements, size_t elementSize, ChunkHasher chunkHasher )
+{
+	const size_t chunkElements = std::max<size_t>( 1, g_treeHashChunkSize / elementSize );
+	const size_t numChunks = ( numElements + chunkElements - 1 ) / chunkElements;
+
+	// Each chunk hash contributes its two 64 bit values, so that
+	// they can be appended in a single call at the end.
+	std::vector<uint64_t> chunkHashes( numChunks * 2 );
+
+	// Isolate so that this thread doesn't steal unrelated outer tasks
+	// while waiting, which could deadlock callers holding locks.
+	tbb::this_task_arena::isolate(
+		[&]
+		{
+			tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+			tbb::parallel_for(
+				tbb::blocked_range<size_t>( 0, numChunks ),
+				[&]( const tbb::blocked_range<size_t> &range )
+				{
+					for( size_t i = range.begin(); i != range.end(); ++i )
+					{
+						const size_t begin = i * chunkElements;
+						const MurmurHash h = chunkHasher( data, begin, std::min( begin + chunkElements, numElements ) );
+						chunkHashes[i*2] = h.m_h1;
+						chunkHashes[i*2+1] = h.m_h2;
+					}
+				},
+				taskGroupContext
+			);
+		}
+	);
+
+	append( treeHashVersion );
+	append( (uint64_t)numElements );
+	append( chunkHashes.data(), chunkHashes.size() );
+}
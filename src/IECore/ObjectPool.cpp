@@ -35,6 +35,7 @@
 #include "IECore/ObjectPool.h"
 
 #include "IECore/LRUCache.h"
+#include "IECore/MemoryGovernor.h"
 
 #include "boost/lexical_cast.hpp"
 
@@ -44,11 +45,27 @@ using namespace IECore;
 // MemberData
 ////////////////////////////////////////////////////////////////////////
 
-struct ObjectPool::MemberData
+struct ObjectPool::MemberData : public MemoryGovernor::Client
 {
 
-	MemberData( size_t maxMemory ) : cache( getter, maxMemory )
+	MemberData( size_t maxMemory, const std::string &memoryGovernorName ) : cache( getter, maxMemory )
 	{
+		MemoryGovernor::registerClient( this, memoryGovernorName );
+	}
+
+	~MemberData() override
+	{
+		MemoryGovernor::deregisterClient( this );
+	}
+
+	size_t memoryUsage() const override
+	{
+		return cache.currentCost();
+	}
+
+	void reduceMemoryUsage( size_t memoryUsage ) override
+	{
+		cache.limitCost( memoryUsage );
 	}
 
 	LRUCache< MurmurHash, ConstObjectPtr > cache;
@@ -66,7 +83,12 @@ struct ObjectPool::MemberData
 //////////////////////////////////////////////////////////////////////////
 
 ObjectPool::ObjectPool( size_t maxMemory )
-	:	m_data( new MemberData(maxMemory) )
+	:	m_data( new MemberData( maxMemory, "ObjectPool" ) )
+{
+}
+
+ObjectPool::ObjectPool( size_t maxMemory, const std::string &memoryGovernorName )
+	:	m_data( new MemberData( maxMemory, memoryGovernorName ) )
 {
 }
 
@@ -93,12 +115,16 @@ ConstObjectPtr ObjectPool::store( const Object *obj, StoreMode mode )
 	if ( mode == StoreCopy )
 	{
 		cachedObj = obj->copy();
-		m_data->cache.set( h, cachedObj, obj->memoryUsage() );
+		const size_t cost = obj->memoryUsage();
+		m_data->cache.set( h, cachedObj, cost );
+		MemoryGovernor::memoryAdded( cost );
 		return cachedObj;
 	}
 	else if ( mode == StoreReference )
 	{
-		m_data->cache.set( h, obj, obj->memoryUsage() );
+		const size_t cost = obj->memoryUsage();
+		m_data->cache.set( h, obj, cost );
+		MemoryGovernor::memoryAdded( cost );
 		return obj;
 	}
 	else
@@ -137,6 +163,16 @@ size_t ObjectPool::memoryUsage() const
 	return m_data->cache.currentCost();
 }
 
+void ObjectPool::setMemoryGovernorPriority( float priority )
+{
+	MemoryGovernor::setPriority( m_data.get(), priority );
+}
+
+float ObjectPool::getMemoryGovernorPriority() const
+{
+	return MemoryGovernor::getPriority( m_data.get() );
+}
+
 ObjectPool *ObjectPool::defaultObjectPool()
 {
 	static ObjectPoolPtr c = nullptr;
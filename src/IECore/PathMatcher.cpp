@@ -39,6 +39,12 @@
 
 #include "IECore/StringAlgo.h"
 
+#include "tbb/blocked_range.h"
+#include "tbb/parallel_for.h"
+#include "tbb/task_arena.h"
+
+#include <atomic>
+#include <functional>
 #include <stack>
 
 using namespace std;
@@ -46,6 +52,43 @@ using namespace IECore;
 
 static IECore::InternedString g_ellipsis( "..." );
 
+namespace
+{
+
+// Nodes with at least this many children have them processed
+// in parallel by the set operations.
+const size_t g_minParallelChildren = 128;
+
+// Calls `f( i, it )` for every child in `children`, in parallel.
+template<typename ChildMap, typename F>
+void parallelForEachChild( const ChildMap &children, F &&f )
+{
+	std::vector<typename ChildMap::const_iterator> iterators;
+	iterators.reserve( children.size() );
+	for( auto it = children.begin(), eIt = children.end(); it != eIt; ++it )
+	{
+		iterators.push_back( it );
+	}
+
+	tbb::this_task_arena::isolate(
+		[&iterators, &f] {
+			tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+			tbb::parallel_for(
+				tbb::blocked_range<size_t>( 0, iterators.size() ),
+				[&iterators, &f]( const tbb::blocked_range<size_t> &range ) {
+					for( size_t i = range.begin(); i != range.end(); ++i )
+					{
+						f( i, iterators[i] );
+					}
+				},
+				taskGroupContext
+			);
+		}
+	);
+}
+
+} // namespace
+
 //////////////////////////////////////////////////////////////////////////
 // Name implementation
 //////////////////////////////////////////////////////////////////////////
@@ -129,7 +172,7 @@ bool PathMatcher::Node::operator == ( const Node &other ) const
 		{
 			return false;
 		}
-		if( !(*(it->second) == *(oIt->second) ) )
+		if( it->second != oIt->second && !(*(it->second) == *(oIt->second) ) )
 		{
 			return false;
 		}
@@ -424,6 +467,15 @@ bool PathMatcher::addPaths( const PathMatcher &paths, const std::vector<IECore::
 
 bool PathMatcher::removePaths( const PathMatcher &paths )
 {
+	if( paths.m_root == m_root )
+	{
+		// Removing from ourselves. Avoid `removePathsWalk()`, since
+		// it doesn't support editing the node it is iterating.
+		const bool result = !isEmpty();
+		clear();
+		return result;
+	}
+
 	bool result = false;
 	NodePtr newRoot = removePathsWalk( m_root.get(), paths.m_root.get(), /* shared = */ false, result );
 	if( newRoot )
@@ -435,20 +487,73 @@ bool PathMatcher::removePaths( const PathMatcher &paths )
 
 PathMatcher PathMatcher::intersection( const PathMatcher &paths ) const
 {
-	PathMatcher result = PathMatcher();
-	for( Iterator it = (*this).begin(); it != (*this).end(); ++it )
-	{
-		RawIterator rit = paths.find( *it );
-		if( rit == paths.end() )
+	// Walks both trees together, returning the intersection of
+	// `node` and `srcNode`, or null if it is empty.
+	std::function<NodePtr ( Node *, Node * )> walk = [&walk] ( Node *node, Node *srcNode ) -> NodePtr {
+		if( node == srcNode )
 		{
-			it.prune();
+			// The intersection of a subtree with itself is just
+			// the subtree, which we can share.
+			return node;
 		}
-		else if( rit.exactMatch() )
+
+		// Iterate over the smaller set of children, looking
+		// up matches in the larger.
+		Node *smaller = node->children.size() <= srcNode->children.size() ? node : srcNode;
+		Node *larger = smaller == node ? srcNode : node;
+		const Node::ChildMap &children = smaller->children;
+
+		auto childIntersection = [&walk, larger] ( const Node::ConstChildMapIterator &it ) -> NodePtr {
+			if( Node *otherChild = larger->child( it->first ) )
+			{
+				return walk( it->second.get(), otherChild );
+			}
+			return nullptr;
+		};
+
+		NodePtr result = new Node( node->terminator && srcNode->terminator );
+		if( children.size() < g_minParallelChildren )
 		{
-			result.addPath( *it );
+			for( Node::ConstChildMapIterator it = children.begin(), eIt = children.end(); it != eIt; ++it )
+			{
+				if( NodePtr c = childIntersection( it ) )
+				{
+					result->children[it->first] = c;
+				}
+			}
 		}
-	}
-	return result;
+		else
+		{
+			std::vector<NodePtr> newChildren( children.size() );
+			parallelForEachChild(
+				children,
+				[&newChildren, &childIntersection] ( size_t i, const Node::ConstChildMapIterator &it ) {
+					newChildren[i] = childIntersection( it );
+				}
+			);
+
+			size_t i = 0;
+			for( Node::ConstChildMapIterator it = children.begin(), eIt = children.end(); it != eIt; ++it, ++i )
+			{
+				if( newChildren[i] )
+				{
+					result->children[it->first] = newChildren[i];
+				}
+			}
+		}
+
+		if( result->children.empty() )
+		{
+			// Return null to signify an empty intersection, and
+			// use the shared leaf node where possible.
+			return result->terminator ? Node::leaf() : nullptr;
+		}
+
+		return result;
+	};
+
+	NodePtr root = walk( m_root.get(), paths.m_root.get() );
+	return root ? PathMatcher( root ) : PathMatcher();
 }
 
 bool PathMatcher::prune( const std::string &path )
@@ -550,8 +655,9 @@ PathMatcher::NodePtr PathMatcher::addWalk( Node *node, const NameIterator &start
 
 	NodePtr newChild;
 	NameIterator childStart = start; childStart++;
+	const Name name( *start );
 
-	if( Node *child = node->child( *start ) )
+	if( Node *child = node->child( name ) )
 	{
 		// Recurse using the child we've found. We may still need to replace this
 		// child with a new one in the event that it is duplicated in order to be
@@ -561,7 +667,6 @@ PathMatcher::NodePtr PathMatcher::addWalk( Node *node, const NameIterator &start
 	else
 	{
 		// No matching child, so make a new one.
-		newChild = new Node();
 		if( childStart == end )
 		{
 			// We're adding a leaf node. Rather than allocate a brand
@@ -586,7 +691,7 @@ PathMatcher::NodePtr PathMatcher::addWalk( Node *node, const NameIterator &start
 	// return that to our caller to be replaced in its node and so on.
 	if( newChild )
 	{
-		writable( node, result, shared )->children[*start] = newChild;
+		writable( node, result, shared )->children[name] = newChild;
 	}
 
 	return result;
@@ -614,24 +719,23 @@ PathMatcher::NodePtr PathMatcher::removeWalk( Node *node, const NameIterator &st
 		return result;
 	}
 
-	Node::ChildMapIterator childIt = node->children.find( *start );
-	if( childIt == node->children.end() )
+	const Name name( *start );
+	Node *childNode = node->child( name );
+	if( !childNode )
 	{
 		return result;
 	}
 
-	Node *childNode = childIt->second.get();
-
 	NameIterator childStart = start; childStart++;
-	NodePtr newChild = removeWalk( childIt->second.get(), childStart, end, shared, prune, removed );
+	NodePtr newChild = removeWalk( childNode, childStart, end, shared, prune, removed );
 
 	if( newChild && !newChild->isEmpty() )
 	{
-		writable( node, result, shared )->children[childIt->first] = newChild;
+		writable( node, result, shared )->children[name] = newChild;
 	}
 	else if( childNode->isEmpty() || ( newChild && newChild->isEmpty() ) )
 	{
-		writable( node, result, shared )->children.erase( childIt->first );
+		writable( node, result, shared )->children.erase( name );
 	}
 
 	return result;
@@ -648,25 +752,57 @@ PathMatcher::NodePtr PathMatcher::addPathsWalk( Node *node, const Node *srcNode,
 		writable( node, result, shared )->terminator = true;
 	}
 
-	for( Node::ChildMap::const_iterator it = srcNode->children.begin(), eIt = srcNode->children.end(); it != eIt; ++it )
-	{
+	const Node::ChildMap &srcChildren = srcNode->children;
+	auto mergedChild = [&] ( const Node::ConstChildMapIterator &it, bool &childAdded ) -> NodePtr {
 		Node *srcChild = it->second.get();
-		NodePtr newChild;
 		if( Node *child = node->child( it->first ) )
 		{
 			if( child != srcChild )
 			{
-				newChild = addPathsWalk( child, srcChild, shared, added );
+				return addPathsWalk( child, srcChild, shared, childAdded );
 			}
+			return nullptr;
 		}
-		else
+		childAdded = true; // source node can only exist if it or a descendant is a terminator
+		return srcChild;
+	};
+
+	if( srcChildren.size() < g_minParallelChildren )
+	{
+		for( Node::ConstChildMapIterator it = srcChildren.begin(), eIt = srcChildren.end(); it != eIt; ++it )
 		{
-			newChild = srcChild;
-			added = true; // source node can only exist if it or a descendant is a terminator
+			if( NodePtr c = mergedChild( it, added ) )
+			{
+				writable( node, result, shared )->children[it->first] = c;
+			}
 		}
-		if( newChild )
+		return result;
+	}
+
+	// Each child is the root of an independent subtree, so we can
+	// process them in parallel, deferring the edits to `node` itself
+	// until afterwards.
+	std::vector<NodePtr> newChildren( srcChildren.size() );
+	std::atomic<bool> childAdded( false );
+	parallelForEachChild(
+		srcChildren,
+		[&newChildren, &childAdded, &mergedChild] ( size_t i, const Node::ConstChildMapIterator &it ) {
+			bool a = false;
+			newChildren[i] = mergedChild( it, a );
+			if( a )
+			{
+				childAdded = true;
+			}
+		}
+	);
+
+	added = added || childAdded;
+	size_t i = 0;
+	for( Node::ConstChildMapIterator it = srcChildren.begin(), eIt = srcChildren.end(); it != eIt; ++it, ++i )
+	{
+		if( newChildren[i] )
 		{
-			writable( node, result, shared )->children[it->first] = newChild;
+			writable( node, result, shared )->children[it->first] = newChildren[i];
 		}
 	}
 
@@ -689,8 +825,9 @@ PathMatcher::NodePtr PathMatcher::addPrefixedPathsWalk( Node *node, const Node *
 
 	NodePtr newChild;
 	NameIterator childStart = start; childStart++;
+	const Name name( *start );
 
-	if( Node *child = node->child( *start ) )
+	if( Node *child = node->child( name ) )
 	{
 		// Recurse using the child we've found. We may still need to replace this
 		// child with a new one in the event that it is duplicated in order to be
@@ -710,7 +847,7 @@ PathMatcher::NodePtr PathMatcher::addPrefixedPathsWalk( Node *node, const Node *
 	NodePtr result;
 	if( newChild )
 	{
-		writable( node, result, shared )->children[*start] = newChild;
+		writable( node, result, shared )->children[name] = newChild;
 	}
 
 	return result;
@@ -727,23 +864,60 @@ PathMatcher::NodePtr PathMatcher::removePathsWalk( Node *node, const Node *srcNo
 		removed = true;
 	}
 
-	for( Node::ChildMap::const_iterator it = srcNode->children.begin(), eIt = srcNode->children.end(); it != eIt; ++it )
-	{
-		const Node::ChildMapIterator childIt = node->children.find( it->first );
-		if( childIt != node->children.end() )
+	const Node::ChildMap &srcChildren = srcNode->children;
+	auto updateChild = [&] ( const Name &name, Node *child, const NodePtr &newChild ) {
+		if( newChild && !newChild->isEmpty() )
 		{
-			Node *child = childIt->second.get();
-			NodePtr newChild = removePathsWalk( child, it->second.get(), shared, removed );
+			writable( node, result, shared )->children[name] = newChild;
+		}
+		else if( child->isEmpty() || ( newChild && newChild->isEmpty() ) )
+		{
+			writable( node, result, shared )->children.erase( name );
+		}
+	};
 
-			if( newChild && !newChild->isEmpty() )
+	if( srcChildren.size() < g_minParallelChildren )
+	{
+		for( Node::ConstChildMapIterator it = srcChildren.begin(), eIt = srcChildren.end(); it != eIt; ++it )
+		{
+			const Name name = it->first;
+			if( Node *child = node->child( name ) )
 			{
-				writable( node, result, shared )->children[childIt->first] = newChild;
+				updateChild( name, child, removePathsWalk( child, it->second.get(), shared, removed ) );
 			}
-			else if( child->isEmpty() || ( newChild && newChild->isEmpty() ) )
+		}
+		return result;
+	}
+
+	// As for `addPathsWalk()`, process the independent subtrees
+	// in parallel, and then edit `node` serially.
+	std::vector<Node *> children( srcChildren.size(), nullptr );
+	std::vector<NodePtr> newChildren( srcChildren.size() );
+	std::atomic<bool> childRemoved( false );
+	parallelForEachChild(
+		srcChildren,
+		[&] ( size_t i, const Node::ConstChildMapIterator &it ) {
+			children[i] = node->child( it->first );
+			if( children[i] )
 			{
-				writable( node, result, shared )->children.erase( childIt->first );
+				bool r = false;
+				newChildren[i] = removePathsWalk( children[i], it->second.get(), shared, r );
+				if( r )
+				{
+					childRemoved = true;
+				}
 			}
 		}
+	);
+
+	removed = removed || childRemoved;
+	size_t i = 0;
+	for( Node::ConstChildMapIterator it = srcChildren.begin(), eIt = srcChildren.end(); it != eIt; ++it, ++i )
+	{
+		if( children[i] )
+		{
+			updateChild( it->first, children[i], newChildren[i] );
+		}
 	}
 
 	return result;
@@ -45,7 +45,11 @@
 
 #include "blosc.h"
 
+#include "tbb/blocked_range.h"
+#include "tbb/parallel_for.h"
 #include "tbb/spin_rw_mutex.h"
+#include "tbb/task_arena.h"
+#include "tbb/task_group.h"
 
 #include "boost/format.hpp"
 #include "boost/iostreams/device/file.hpp"
@@ -56,15 +60,26 @@
 #include "boost/tokenizer.hpp"
 
 #include <algorithm>
+#include <atomic>
 #include <cassert>
+#include <condition_variable>
+#include <deque>
+#include <exception>
 #include <iostream>
+#include <limits>
 #include <list>
 #include <map>
+#include <memory>
+#include <mutex>
 #include <optional>
 #include <set>
 
+#include <cstring>
+
 #include <fcntl.h>
 #ifndef _MSC_VER
+	#include <sys/mman.h>
+	#include <sys/stat.h>
 	#include <unistd.h>
 #endif
 #include <stdint.h>
@@ -162,7 +177,10 @@ class StreamIndexedIO::PlatformReader
 	public:
 		virtual ~PlatformReader();
 		virtual bool read( char *buffer, size_t size, size_t pos ) = 0;
-		static std::unique_ptr<PlatformReader> create( const std::string &fileName );
+		/// Returns a pointer directly to the file contents if they are
+		/// available in memory, or nullptr otherwise.
+		virtual const char *data( size_t size, size_t pos ) const;
+		static std::unique_ptr<PlatformReader> create( const std::string &fileName, bool memoryMapped = false );
 };
 
 #ifndef _MSC_VER
@@ -200,15 +218,103 @@ bool PosixPlatformReader::read( char *buffer, size_t size, size_t pos )
 	return (size_t) result == size;
 }
 
+/// Posix Reader which maps the whole file into memory, so that reads
+/// are satisfied from the mapped pages without any system calls, and
+/// the pages are shared with all other processes reading the same file.
+class MemoryMappedPlatformReader : public StreamIndexedIO::PlatformReader
+{
+	public:
+		~MemoryMappedPlatformReader();
+		MemoryMappedPlatformReader( const std::string &fileName );
+		bool read( char *buffer, size_t size, size_t pos ) override;
+		const char *data( size_t size, size_t pos ) const override;
+		bool isMapped() const;
+	private:
+		const char *m_data;
+		size_t m_size;
+};
+
+MemoryMappedPlatformReader::MemoryMappedPlatformReader( const std::string &fileName ) : m_data( nullptr ), m_size( 0 )
+{
+	int fileHandle = ::open( fileName.c_str(), O_RDONLY );
+	if( fileHandle < 0 )
+	{
+		return;
+	}
+
+	struct stat s;
+	if( fstat( fileHandle, &s ) == 0 && s.st_size > 0 )
+	{
+		void *mapped = mmap( nullptr, s.st_size, PROT_READ, MAP_SHARED, fileHandle, 0 );
+		if( mapped != MAP_FAILED )
+		{
+			m_data = static_cast<const char *>( mapped );
+			m_size = s.st_size;
+		}
+	}
+
+	// the mapping keeps its own reference to the file
+	::close( fileHandle );
+}
+
+MemoryMappedPlatformReader::~MemoryMappedPlatformReader()
+{
+	if( m_data )
+	{
+		munmap( const_cast<char *>( m_data ), m_size );
+	}
+}
+
+bool MemoryMappedPlatformReader::read( char *buffer, size_t size, size_t pos )
+{
+	const char *d = data( size, pos );
+	if( !d )
+	{
+		return false;
+	}
+
+	memcpy( buffer, d, size );
+	return true;
+}
+
+const char *MemoryMappedPlatformReader::data( size_t size, size_t pos ) const
+{
+	if( !m_data || pos > m_size || size > m_size - pos )
+	{
+		return nullptr;
+	}
+
+	return m_data + pos;
+}
+
+bool MemoryMappedPlatformReader::isMapped() const
+{
+	return m_data != nullptr;
+}
+
 #endif
 
 StreamIndexedIO::PlatformReader::~PlatformReader()
 {
 }
 
-std::unique_ptr<StreamIndexedIO::PlatformReader> StreamIndexedIO::PlatformReader::create(const std::string& fileName)
+const char *StreamIndexedIO::PlatformReader::data( size_t size, size_t pos ) const
+{
+	return nullptr;
+}
+
+std::unique_ptr<StreamIndexedIO::PlatformReader> StreamIndexedIO::PlatformReader::create( const std::string& fileName, bool memoryMapped )
 {
 #ifndef _MSC_VER
+	if( memoryMapped )
+	{
+		std::unique_ptr<MemoryMappedPlatformReader> m( new MemoryMappedPlatformReader( fileName ) );
+		if( m->isMapped() )
+		{
+			return m;
+		}
+		// fall back to offset reads if the mapping failed
+	}
 	PlatformReader* p = new PosixPlatformReader(fileName);
 	return std::unique_ptr<StreamIndexedIO::PlatformReader>(p);
 #else
@@ -235,12 +341,27 @@ class StreamIndexedIO::StringCache
 
 			m_idToStringMap.reserve(sz + 100);
 
+			std::vector<std::string> strings;
+			std::vector<uint64_t> ids;
+			strings.reserve( sz );
+			ids.reserve( sz );
 			for (uint64_t i = 0; i < sz; ++i)
 			{
-				const char *s = read(f);
+				strings.push_back( read(f) );
 
 				uint64_t id;
 				readLittleEndian( f,id );
+				ids.push_back( id );
+			}
+
+			// Interning in bulk is significantly cheaper than
+			// interning each string individually.
+			const std::vector<InternedString> internedStrings = InternedString::intern( strings );
+
+			for (uint64_t i = 0; i < sz; ++i)
+			{
+				const uint64_t id = ids[i];
+				const IndexedIO::EntryID &s = internedStrings[i];
 
 				m_prevId = std::max( id, m_prevId );
 
@@ -375,6 +496,9 @@ namespace
 const char* indexCompressor = "lz4";
 const int indexCompressionLevel = 9;
 
+//! data smaller than this is never compressed
+const size_t minCompressedDataSize = 1024U;
+
 const static std::map<std::string, int> nameCodeMapping = {{"blosclz", 0}, {"lz4", 1}, {"lz4hc", 2}, {"snappy", 3}, {"zlib", 4}};
 
 //! map blosc compressor name to a int which we can serialise into
@@ -416,7 +540,7 @@ size_t compress(
 	const std::string &compressor,
 	int threadCount,
 	std::optional<size_t> maxBlockSize = std::optional<size_t>(),
-	size_t minCompressedBlockSize = 1024U
+	size_t minCompressedBlockSize = minCompressedDataSize
 )
 {
 	const size_t maxCompressedBlockSize = maxBlockSize.value_or( BLOSC_MAX_BUFFERSIZE );
@@ -485,47 +609,104 @@ size_t compress(
 	return numBlocks;
 }
 
-/// decompress a memory buffer which is formed by a number of blosc compressed blocks
-/// returns the number of compression blocks
-/// 'outputBuffer' contains the decompressed data and is resized in this function if not large enough.
-size_t decompress( const char *data, size_t size, std::vector<char> &outputBuffer, int threadCount )
+/// A single blosc compressed block within a buffer.
+struct CompressedBlock
+{
+	const char *data;
+	size_t compressedSize;
+	size_t decompressedSize;
+	size_t decompressedOffset;
+};
+
+/// Fills 'blocks' with the location of each blosc compressed block in the 'size'
+/// bytes at 'data', reading no more than 'maxBlocks' blocks. Returns the total
+/// decompressed size.
+size_t compressedBlocks( const char *data, size_t size, std::vector<CompressedBlock> &blocks, size_t maxBlocks = std::numeric_limits<size_t>::max() )
 {
-	std::vector<std::pair<size_t, size_t>> blockSizes;
 	size_t totalDecompressedSize = 0;
 	size_t compressedBytesRead = 0;
 
-	while( compressedBytesRead < size )
+	while( compressedBytesRead < size && blocks.size() < maxBlocks )
 	{
+		if( size - compressedBytesRead < BLOSC_MIN_HEADER_LENGTH )
+		{
+			throw IECore::IOException( "StreamIndexedIO (decompress) - Corrupted compressed archive" );
+		}
+
 		size_t compressedNumBytes = 0, decompressedNumBytes = 0, blockSize = 0;
 		blosc_cbuffer_sizes( &data[compressedBytesRead], &decompressedNumBytes, &compressedNumBytes, &blockSize );
 
-		blockSizes.push_back( std::make_pair( compressedNumBytes, decompressedNumBytes ) );
+		if( compressedNumBytes == 0 || compressedNumBytes > size - compressedBytesRead )
+		{
+			throw IECore::IOException( "StreamIndexedIO (decompress) - Corrupted compressed archive" );
+		}
+
+		blocks.push_back( { &data[compressedBytesRead], compressedNumBytes, decompressedNumBytes, totalDecompressedSize } );
 		totalDecompressedSize += decompressedNumBytes;
 		compressedBytesRead += compressedNumBytes;
 	}
 
+	return totalDecompressedSize;
+}
+
+/// Decompresses each of the blocks into 'outputBuffer', which must be large enough to hold
+/// all the decompressed data. Blocks are independent of each other, so when there is more
+/// than one they are decompressed in parallel on the TBB thread pool. Returns false if any
+/// block failed to decompress.
+bool decompressBlocks( const std::vector<CompressedBlock> &blocks, char *outputBuffer, int threadCount )
+{
+	auto decompressBlock = [outputBuffer, threadCount]( const CompressedBlock &block ) {
+		return blosc_decompress_ctx( block.data, outputBuffer + block.decompressedOffset, block.decompressedSize, threadCount ) > 0;
+	};
+
+	if( blocks.size() == 1 )
+	{
+		return decompressBlock( blocks[0] );
+	}
+
+	std::atomic<bool> succeeded( true );
+	tbb::this_task_arena::isolate(
+		[&blocks, &succeeded, &decompressBlock] {
+			tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+			tbb::parallel_for(
+				tbb::blocked_range<size_t>( 0, blocks.size(), 1 ),
+				[&blocks, &succeeded, &decompressBlock]( const tbb::blocked_range<size_t> &range ) {
+					for( size_t i = range.begin(); i != range.end(); ++i )
+					{
+						if( !decompressBlock( blocks[i] ) )
+						{
+							succeeded = false;
+						}
+					}
+				},
+				taskGroupContext
+			);
+		}
+	);
+
+	return succeeded;
+}
+
+/// decompress a memory buffer which is formed by a number of blosc compressed blocks
+/// returns the number of compression blocks
+/// 'outputBuffer' contains the decompressed data and is resized in this function if not large enough.
+size_t decompress( const char *data, size_t size, std::vector<char> &outputBuffer, int threadCount )
+{
+	std::vector<CompressedBlock> blocks;
+	const size_t totalDecompressedSize = compressedBlocks( data, size, blocks );
+
 	if( outputBuffer.size() < totalDecompressedSize )
 	{
 		std::vector<char> b ( totalDecompressedSize );
 		outputBuffer.swap( b );
 	}
 
-	compressedBytesRead = 0;
-	size_t decompressedBytesWritten = 0;
-	for( const auto &blockSize : blockSizes )
+	if( !decompressBlocks( blocks, outputBuffer.data(), threadCount ) )
 	{
-		int bloscResult = blosc_decompress_ctx( &data[compressedBytesRead], &outputBuffer[decompressedBytesWritten], blockSize.second, threadCount );
-
-		if( bloscResult <= 0 )
-		{
-			throw IECore::IOException( "StreamIndexedIO (decompress) - Corrupted compressed archive" );
-		}
-
-		compressedBytesRead += blockSize.first;
-		decompressedBytesWritten += blockSize.second;
+		throw IECore::IOException( "StreamIndexedIO (decompress) - Corrupted compressed archive" );
 	}
 
-	return blockSizes.size();
+	return blocks.size();
 }
 
 } // namespace
@@ -700,6 +881,14 @@ class DataNode : public NodeBase
 			return m_numCompressedBlocks;
 		}
 
+		/// Used to fill in the location of data written by the WritePipeline.
+		void setStorage( uint64_t offset, uint64_t size, unsigned short numCompressedBlocks )
+		{
+			m_offset = offset;
+			m_size = size;
+			m_numCompressedBlocks = numCompressedBlocks;
+		}
+
 		void copyFrom( DataNode *other )
 		{
 			m_dataType = other->m_dataType;
@@ -900,7 +1089,7 @@ class StreamIndexedIO::Node
 		bool dataChildInfo( const IndexedIO::EntryID &name, Info &info ) const;
 
 		DirectoryNode* addChild( const IndexedIO::EntryID & childName );
-		void addDataChild(
+		NodeBase *addDataChild(
 			const IndexedIO::EntryID &childName,
 			IndexedIO::DataType dataType,
 			size_t arrayLen,
@@ -910,6 +1099,17 @@ class StreamIndexedIO::Node
 			size_t numCompressedBlocks
 		);
 
+		/// Writes 'size' bytes of flattened 'data' to the file and adds a data child
+		/// referencing it. When the index has a WritePipeline, compression happens
+		/// in the background and the location of the data is filled in later.
+		void writeDataChild(
+			const IndexedIO::EntryID &childName,
+			IndexedIO::DataType dataType,
+			size_t arrayLen,
+			const char *data,
+			size_t size
+		);
+
 		void removeChild( const IndexedIO::EntryID &childName, bool throwException = true );
 
 		StreamIndexedIO::IndexPtr m_idx;
@@ -917,7 +1117,9 @@ class StreamIndexedIO::Node
 };
 
 //! Small scoped class to read from a given data block in a file,
-//! decompressing if required.
+//! decompressing if required. When the file is memory mapped, compressed
+//! blocks are decompressed directly from the mapping, and uncompressed
+//! blocks are referenced in place unless an outputBuffer is supplied.
 class StreamIndexedIO::Reader
 {
 	public:
@@ -927,42 +1129,46 @@ class StreamIndexedIO::Reader
 		Reader( StreamIndexedIO::StreamFile &f, const Node::Info &info, int threadCount = 1, char *outputBuffer = nullptr )
 			: m_data( nullptr ),
 			m_decompressedData( outputBuffer ),
+			m_mappedData( nullptr ),
 			m_size( info.size ),
 			m_decompressedSize( info.decompressedSize ),
 			m_ownDecompressedData( outputBuffer == nullptr )
 		{
-			if( m_ownDecompressedData )
-			{
-				m_decompressedData = new char[m_decompressedSize];
-			}
-
 			if( info.numCompressedBlocks > 0 )
 			{
-				m_data = new char[info.size];
-				f.read( m_data, info.size, info.offset );
-
-				const char* readPtr = m_data;
-				char* writePtr = m_decompressedData;
-
-				for ( size_t block = 0; block < info.numCompressedBlocks; ++block )
+				if( m_ownDecompressedData )
 				{
-					/// read the blosc header so we can decompress this block
-					size_t compresedNumBytes = 0, decompressedNumBytes = 0, blockSize = 0;
-					blosc_cbuffer_sizes( readPtr, &decompressedNumBytes , &compresedNumBytes, &blockSize );
+					m_decompressedData = new char[m_decompressedSize];
+				}
 
-					int bloscResult = blosc_decompress_ctx( readPtr, writePtr, decompressedNumBytes, threadCount );
+				const char *readPtr = f.mappedData( info.size, info.offset );
+				if( !readPtr )
+				{
+					m_data = new char[info.size];
+					f.read( m_data, info.size, info.offset );
+					readPtr = m_data;
+				}
 
-					if( bloscResult <= 0 )
-					{
-						throw IECore::IOException( "StreamIndexedIO::Reader - Corrupted compressed archive" );
-					}
+				std::vector<CompressedBlock> blocks;
+				blocks.reserve( info.numCompressedBlocks );
+				const size_t decompressedSize = compressedBlocks( readPtr, info.size, blocks, info.numCompressedBlocks );
 
-					readPtr += compresedNumBytes;
-					writePtr += decompressedNumBytes;
+				if( blocks.size() != info.numCompressedBlocks || decompressedSize > m_decompressedSize || !decompressBlocks( blocks, m_decompressedData, threadCount ) )
+				{
+					throw IECore::IOException( "StreamIndexedIO::Reader - Corrupted compressed archive" );
 				}
 			}
+			else if( m_ownDecompressedData && ( m_mappedData = f.mappedData( info.size, info.offset ) ) )
+			{
+				// no copy required - the data is read in place from the mapping
+				m_ownDecompressedData = false;
+			}
 			else
 			{
+				if( m_ownDecompressedData )
+				{
+					m_decompressedData = new char[m_decompressedSize];
+				}
 				f.read( m_decompressedData, info.size, info.offset );
 			}
 		}
@@ -980,9 +1186,13 @@ class StreamIndexedIO::Reader
 			}
 		}
 
-		char *data() const
+		const char *data() const
 		{
-			if( m_decompressedData )
+			if( m_mappedData )
+			{
+				return m_mappedData;
+			}
+			else if( m_decompressedData )
 			{
 				return m_decompressedData;
 			}
@@ -1000,6 +1210,7 @@ class StreamIndexedIO::Reader
 	private:
 		char *m_data;
 		char *m_decompressedData;
+		const char *m_mappedData;
 		uint64_t m_size;
 		uint64_t m_decompressedSize;
 		bool m_ownDecompressedData;
@@ -1039,6 +1250,8 @@ class StreamIndexedIO::Index : public RefCounted
 		/// Returns the offset after saving the data to file or the offset for a previously saved data (with matching hash)
 		/// \param prefixSize If true than it will prepend to the block, the size of it
 		uint64_t writeUniqueData( const char *data, size_t size, bool prefixSize = false );
+		/// As above, but using a previously computed hash of the data.
+		uint64_t writeUniqueData( const char *data, size_t size, const MurmurHash &hash, bool prefixSize = false );
 
 		struct WriteInfo
 		{
@@ -1063,6 +1276,13 @@ class StreamIndexedIO::Index : public RefCounted
 		/// read the subindex that contains the children of the given node
 		void readNodeFromSubIndex( DirectoryNode *n );
 
+		/// Compresses DataNodes in parallel when writing.
+		class WritePipeline;
+
+		/// Blocks until all the data passed to the WritePipeline has been
+		/// written to the file, so that every node has a valid location.
+		void writePendingData();
+
 		typedef tbb::spin_rw_mutex Mutex;
 		typedef Mutex::scoped_lock MutexLock;
 		/// Returns an appropriate mutex scoped lock to access the given Directory node.
@@ -1127,6 +1347,10 @@ class StreamIndexedIO::Index : public RefCounted
 		std::optional<size_t> m_maxCompressedBlockSize;
 		std::string m_compressor;
 
+		/// Only present when the "pipelinedWrites" option is used
+		/// on a file which is open for writing.
+		std::unique_ptr<WritePipeline> m_writePipeline;
+
 		struct FreePage
 		{
 			FreePage( uint64_t offset, uint64_t sz ) : m_offset(offset), m_size(sz) {}
@@ -1180,6 +1404,188 @@ class StreamIndexedIO::Index : public RefCounted
 		NodeBase *readNode( F &f );
 };
 
+///////////////////////////////////////////////
+//
+// StreamIndexedIO::Index::WritePipeline
+//
+///////////////////////////////////////////////
+
+/// Compresses and hashes the data for DataNodes on the TBB thread pool,
+/// while the writing thread stores the results in the file in the order
+/// in which they were submitted. This keeps the file layout and the
+/// deduplication of identical blocks the same as for serial writes. The
+/// amount of data awaiting compression is bounded, with the writing thread
+/// blocking (and compressing blocks itself) when the limit is reached.
+class StreamIndexedIO::Index::WritePipeline
+{
+
+	public :
+
+		WritePipeline( Index *index )
+			:	m_index( index ), m_pendingBytes( 0 )
+		{
+		}
+
+		~WritePipeline()
+		{
+			// Any remaining jobs have been abandoned, most likely
+			// due to an exception. Avoid compressing them needlessly.
+			m_taskGroup.cancel();
+			m_taskGroup.wait();
+		}
+
+		/// Queues the 'size' bytes at 'data' for compression, after which
+		/// they will be written to the file and the location stored in 'node'.
+		void push( DataNode *node, const char *data, size_t size )
+		{
+			JobPtr job = std::make_shared<Job>( node, data, size );
+			m_jobs.push_back( job );
+			m_pendingBytes += size;
+
+			m_taskGroup.run( [this, job] { process( *job ); } );
+
+			writeCompleted();
+			while( m_pendingBytes > maxPendingBytes )
+			{
+				writeFront();
+			}
+		}
+
+		/// Writes all the jobs which have already been compressed,
+		/// without waiting for those which haven't.
+		void writeCompleted()
+		{
+			while( m_jobs.size() && m_jobs.front()->state == Done )
+			{
+				writeFront();
+			}
+		}
+
+		/// Writes all jobs, waiting for them to be compressed.
+		void writeAll()
+		{
+			while( m_jobs.size() )
+			{
+				writeFront();
+			}
+		}
+
+	private :
+
+		static const size_t maxPendingBytes = 256 * 1024 * 1024;
+
+		enum State
+		{
+			Pending,
+			Running,
+			Done
+		};
+
+		struct Job
+		{
+			Job( DataNode *node, const char *data, size_t size )
+				:	node( node ), data( data, data + size ), numBlocks( 0 ), state( Pending )
+			{
+			}
+
+			DataNode *node;
+			std::vector<char> data;
+			std::vector<char> compressedData;
+			size_t numBlocks;
+			MurmurHash hash;
+			std::exception_ptr exception;
+			std::atomic<int> state;
+		};
+
+		// Shared so that a task can't outlive its job, even if
+		// the writing thread processed and wrote the job first.
+		typedef std::shared_ptr<Job> JobPtr;
+
+		// Called by both the TBB tasks and the writing thread. Whichever
+		// gets to the job first compresses it, and the other does nothing.
+		void process( Job &job )
+		{
+			int expected = Pending;
+			if( !job.state.compare_exchange_strong( expected, Running ) )
+			{
+				return;
+			}
+
+			try
+			{
+				job.numBlocks = compress(
+					job.data.data(), job.data.size(), job.compressedData,
+					m_index->m_compressionLevel, m_index->m_compressor,
+					m_index->m_compressionThreadCount, m_index->m_maxCompressedBlockSize
+				);
+
+				//! as in writeUniqueDataCompressed(), fall back to the
+				//! original data if compression didn't reduce the size
+				if( !job.numBlocks || job.compressedData.empty() || job.compressedData.size() >= job.data.size() )
+				{
+					job.numBlocks = 0;
+					job.compressedData.clear();
+				}
+
+				const std::vector<char> &buffer = job.numBlocks ? job.compressedData : job.data;
+				job.hash.append( buffer.data(), buffer.size() );
+			}
+			catch( ... )
+			{
+				job.exception = std::current_exception();
+			}
+
+			{
+				std::lock_guard<std::mutex> lock( m_mutex );
+				job.state = Done;
+			}
+			m_condition.notify_all();
+		}
+
+		void writeFront()
+		{
+			JobPtr job = m_jobs.front();
+			m_jobs.pop_front();
+			m_pendingBytes -= job->data.size();
+
+			// Compress the job ourselves if no task has started it yet,
+			// otherwise wait for the task to finish.
+			process( *job );
+			{
+				std::unique_lock<std::mutex> lock( m_mutex );
+				m_condition.wait( lock, [&job] { return job->state == Done; } );
+			}
+
+			if( job->exception )
+			{
+				std::rethrow_exception( job->exception );
+			}
+
+			if( job->numBlocks > std::numeric_limits<unsigned short>::max() )
+			{
+				throw IECore::Exception(
+					boost::str(
+						boost::format( "StreamIndexedIO::Index::WritePipeline - Unable to store file with more than %1% compressed blocks " ) %
+							std::numeric_limits<unsigned short>::max()
+					)
+				);
+			}
+
+			const std::vector<char> &buffer = job->numBlocks ? job->compressedData : job->data;
+			const uint64_t offset = m_index->writeUniqueData( buffer.data(), buffer.size(), job->hash );
+			job->node->setStorage( offset, buffer.size(), job->numBlocks );
+		}
+
+		Index *m_index;
+		std::deque<JobPtr> m_jobs;
+		size_t m_pendingBytes;
+
+		std::mutex m_mutex;
+		std::condition_variable m_condition;
+		tbb::task_group m_taskGroup;
+
+};
+
 ///////////////////////////////////////////////
 //
 // NodeBase
@@ -1374,6 +1780,10 @@ DirectoryNode* StreamIndexedIO::Node::directoryChild( const IndexedIO::EntryID &
 
 bool StreamIndexedIO::Node::dataChildInfo( const IndexedIO::EntryID &name, Info &info ) const
 {
+	// Reading back data while writing is uncommon, so we simply
+	// wait for all pending data to be written first.
+	m_idx->writePendingData();
+
 	Index::MutexLock lock;
 	m_idx->lockDirectory( lock, m_node );
 
@@ -1430,7 +1840,7 @@ DirectoryNode* StreamIndexedIO::Node::addChild( const IndexedIO::EntryID &childN
 	return child;
 }
 
-void StreamIndexedIO::Node::addDataChild(
+NodeBase *StreamIndexedIO::Node::addDataChild(
 	const IndexedIO::EntryID &childName,
 	IndexedIO::DataType dataType,
 	size_t arrayLen,
@@ -1452,6 +1862,8 @@ void StreamIndexedIO::Node::addDataChild(
 
 	m_idx->m_stringCache.add( childName );
 
+	NodeBase *result;
+
 	// SmallDataNodes should not be compressed.
 	if( arrayLen <= SmallDataNode::maxArrayLength && size <= SmallDataNode::maxSize && ( size == decompressedSize ) && (numCompressedBlocks == 0) )
 	{
@@ -1461,6 +1873,7 @@ void StreamIndexedIO::Node::addDataChild(
 			throw Exception( "Failed to allocate node!" );
 		}
 		m_node->registerChild( child );
+		result = child;
 	}
 	else
 	{
@@ -1480,10 +1893,43 @@ void StreamIndexedIO::Node::addDataChild(
 			throw Exception( "Failed to allocate node!" );
 		}
 		m_node->registerChild( child );
+		result = child;
 	}
 	m_idx->m_hasChanged = true;
+
+	return result;
 }
 
+void StreamIndexedIO::Node::writeDataChild(
+	const IndexedIO::EntryID &childName,
+	IndexedIO::DataType dataType,
+	size_t arrayLen,
+	const char *data,
+	size_t size
+)
+{
+	Index::WritePipeline *pipeline = m_idx->m_writePipeline.get();
+	if( !pipeline || size < minCompressedDataSize )
+	{
+		if( pipeline )
+		{
+			// Keep the file layout close to the order of the writes.
+			pipeline->writeCompleted();
+		}
+		Index::WriteInfo info = m_idx->writeUniqueDataCompressed( data, size );
+		addDataChild( childName, dataType, arrayLen, info.offset, info.size, size, info.numCompressedBlocks );
+		return;
+	}
+
+	// We don't yet know where the data will be stored, or its compressed size, so we
+	// add the node with placeholder values for the pipeline to replace. The non-zero
+	// block count ensures we get a DataNode, since only those can be updated.
+	NodeBase *child = addDataChild( childName, dataType, arrayLen, 0, size, size, 1 );
+	assert( child->nodeType() == NodeBase::Data );
+	pipeline->push( static_cast<DataNode *>( child ), data, size );
+}
+
+
 const IndexedIO::EntryID &StreamIndexedIO::Node::name() const
 {
 	return m_node->name();
@@ -1568,6 +2014,9 @@ StreamIndexedIO::Index::Index( StreamIndexedIO::StreamFilePtr stream, const Comp
 {
 	m_stringCache.add(IndexedIO::rootName);
 
+	const char *pipelinedWritesEnvVar = getenv( "IECORE_STREAMINDEXEDIO_PIPELINEDWRITES" );
+	bool pipelinedWrites = pipelinedWritesEnvVar && !strcmp( pipelinedWritesEnvVar, "1" );
+
 	const char *compressionLevelEnvVar = getenv( "IECORE_STREAMINDEXEDIO_COMPRESSION" );
 	if ( compressionLevelEnvVar )
 	{
@@ -1604,6 +2053,11 @@ StreamIndexedIO::Index::Index( StreamIndexedIO::StreamFilePtr stream, const Comp
 		{
 			m_maxCompressedBlockSize = maxCompressedBlockSize->readable();
 		}
+
+		if ( const BoolData* pipelinedWritesData = options->member<BoolData>("pipelinedWrites", false) )
+		{
+			pipelinedWrites = pipelinedWritesData->readable();
+		}
 	}
 
 	// validate our parameters
@@ -1616,11 +2070,17 @@ StreamIndexedIO::Index::Index( StreamIndexedIO::StreamFilePtr stream, const Comp
 		m_compressor = "lz4";
 	}
 
+	if ( pipelinedWrites && m_compressionLevel && ( m_stream->openMode() & ( IndexedIO::Write | IndexedIO::Append ) ) )
+	{
+		m_writePipeline.reset( new WritePipeline( this ) );
+	}
+
 }
 
 StreamIndexedIO::Index::~Index()
 {
 	flush();
+	m_writePipeline.reset();
 
 	assert( m_freePagesOffset.size() == m_freePagesSize.size() );
 
@@ -2245,6 +2705,8 @@ void StreamIndexedIO::Index::writeNode( DirectoryNode *node, F &f )
 
 uint64_t StreamIndexedIO::Index::write()
 {
+	writePendingData();
+
 	StreamIndexedIO::StreamFile &f = *m_stream;
 
 	/// Write index at end
@@ -2499,16 +2961,21 @@ void StreamIndexedIO::Index::addFreePage(  uint64_t offset, uint64_t sz )
 }
 
 uint64_t StreamIndexedIO::Index::writeUniqueData( const char *data, size_t size, bool prefixSize )
+{
+	// compute hash for the data
+	MurmurHash hash;
+	hash.append( data, size );
+
+	return writeUniqueData( data, size, hash, prefixSize );
+}
+
+uint64_t StreamIndexedIO::Index::writeUniqueData( const char *data, size_t size, const MurmurHash &hash, bool prefixSize )
 {
 	m_hasChanged = true;
 
 	/// Find next writable location
 	uint64_t loc;
 
-	// compute hash for the data
-	MurmurHash hash;
-	hash.append( data, size );
-
 	if ( size >= UINT32_MAX )
 	{
 		throw IOException( "StreamIndexedIO: Data size too long!" );
@@ -2604,6 +3071,14 @@ void StreamIndexedIO::Index::deallocateWalk( NodeBase* n )
 
 }
 
+void StreamIndexedIO::Index::writePendingData()
+{
+	if( m_writePipeline )
+	{
+		m_writePipeline->writeAll();
+	}
+}
+
 void StreamIndexedIO::Index::commitNodeToSubIndex( DirectoryNode *n )
 {
 	if (!n)
@@ -2611,6 +3086,10 @@ void StreamIndexedIO::Index::commitNodeToSubIndex( DirectoryNode *n )
 		return;
 	}
 
+	// The subindex records the location of each DataNode,
+	// so they must all have been written first.
+	writePendingData();
+
 	if ( n->subindex() == DirectoryNode::NoSubIndex )
 	{
 		MemoryStreamSink sink;
@@ -2751,6 +3230,11 @@ IndexedIO::OpenMode StreamIndexedIO::StreamFile::openMode() const
 }
 
 void StreamIndexedIO::StreamFile::setInput( std::iostream *stream, bool emptyFile, const std::string& fileName )
+{
+	setInput( stream, emptyFile, fileName, /* memoryMapped = */ false );
+}
+
+void StreamIndexedIO::StreamFile::setInput( std::iostream *stream, bool emptyFile, const std::string& fileName, bool memoryMapped )
 {
 	m_stream = stream;
 	if ( m_openmode & IndexedIO::Append && emptyFile )
@@ -2760,7 +3244,9 @@ void StreamIndexedIO::StreamFile::setInput( std::iostream *stream, bool emptyFil
 
 	if ( fileName != "" && getenv("IECORE_OFFSETREAD_DISABLED") == nullptr )
 	{
-		m_platformReader = PlatformReader::create( fileName );
+		// we only map files opened for reading, as the mapping
+		// would not reflect data appended to the file.
+		m_platformReader = PlatformReader::create( fileName, memoryMapped && ( m_openmode & IndexedIO::Read ) );
 	}
 }
 
@@ -2821,6 +3307,11 @@ void StreamIndexedIO::StreamFile::read( char *buffer, size_t size, size_t pos )
 	}
 }
 
+const char *StreamIndexedIO::StreamFile::mappedData( size_t size, size_t pos ) const
+{
+	return m_platformReader ? m_platformReader->data( size, pos ) : nullptr;
+}
+
 void StreamIndexedIO::StreamFile::seekg( size_t pos, std::ios_base::seekdir dir )
 {
 	m_stream->seekg( pos, dir );
@@ -3221,8 +3712,7 @@ void StreamIndexedIO::write(const IndexedIO::EntryID &name, const InternedString
 
 	IndexedIO::DataFlattenTraits<uint64_t*>::flatten(constIds, arrayLength, data);
 
-	Index::WriteInfo info = index->writeUniqueDataCompressed( data, size );
-	m_node->addDataChild( name, dataType, arrayLength, info.offset, info.size, size, info.numCompressedBlocks );
+	m_node->writeDataChild( name, dataType, arrayLength, data, size );
 
 	delete [] ids;
 }
@@ -3282,8 +3772,7 @@ void StreamIndexedIO::write(const IndexedIO::EntryID &name, const T *x, size_t a
 	assert(data);
 	IndexedIO::DataFlattenTraits<T*>::flatten(x, arrayLength, data);
 
-	Index::WriteInfo info = m_node->m_idx->writeUniqueDataCompressed( data, size );
-	m_node->addDataChild( name, dataType, arrayLength, info.offset, info.size, size, info.numCompressedBlocks );
+	m_node->writeDataChild( name, dataType, arrayLength, data, size );
 }
 
 template<typename T>
@@ -3295,8 +3784,7 @@ void StreamIndexedIO::rawWrite(const IndexedIO::EntryID &name, const T *x, size_
 	size_t size = IndexedIO::DataSizeTraits<T*>::size(x, arrayLength);
 	IndexedIO::DataType dataType = IndexedIO::DataTypeTraits<T*>::type();
 
-	Index::WriteInfo info = m_node->m_idx->writeUniqueDataCompressed( (char *) x, size );
-	m_node->addDataChild( name, dataType, arrayLength, info.offset, info.size, size, info.numCompressedBlocks );
+	m_node->writeDataChild( name, dataType, arrayLength, (const char *) x, size );
 }
 
 template<typename T>
@@ -3312,8 +3800,7 @@ void StreamIndexedIO::write(const IndexedIO::EntryID &name, const T &x)
 	assert(data);
 	IndexedIO::DataFlattenTraits<T>::flatten(x, data);
 
-	Index::WriteInfo info = m_node->m_idx->writeUniqueDataCompressed( data, size );
-	m_node->addDataChild( name, dataType, 0, info.offset, info.size, size, info.numCompressedBlocks );
+	m_node->writeDataChild( name, dataType, 0, data, size );
 }
 
 template<typename T>
@@ -3325,8 +3812,7 @@ void StreamIndexedIO::rawWrite(const IndexedIO::EntryID &name, const T &x)
 	size_t size = IndexedIO::DataSizeTraits<T>::size(x);
 	IndexedIO::DataType dataType = IndexedIO::DataTypeTraits<T>::type();
 
-	Index::WriteInfo info = m_node->m_idx->writeUniqueDataCompressed( (char *) &x, size );
-	m_node->addDataChild( name, dataType, 0, info.offset, info.size, size, info.numCompressedBlocks );
+	m_node->writeDataChild( name, dataType, 0, (const char *) &x, size );
 }
 
 template<typename T>
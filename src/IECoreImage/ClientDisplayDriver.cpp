@@ -45,6 +45,7 @@
 #include "boost/asio.hpp"
 
 #include "IECoreImage/Private/DisplayDriverServerHeader.h"
+#include "IECoreImage/Private/DisplayDriverSharedMemory.h"
 
 #include "IECore/MemoryIndexedIO.h"
 #include "IECore/SimpleTypedData.h"
@@ -52,6 +53,12 @@
 #include "boost/array.hpp"
 #include "boost/bind/bind.hpp"
 
+#include "blosc.h"
+
+#include <algorithm>
+#include <memory>
+#include <vector>
+
 using namespace std;
 using boost::asio::ip::tcp;
 using namespace boost;
@@ -64,7 +71,8 @@ class ClientDisplayDriver::PrivateData : public RefCounted
 {
 	public :
 		PrivateData() :
-		m_service(), m_host(""), m_port(""), m_scanLineOrderOnly(false), m_acceptsRepeatedData(false), m_socket( m_service )
+		m_service(), m_host(""), m_port(""), m_scanLineOrderOnly(false), m_acceptsRepeatedData(false), m_socket( m_service ),
+		m_compressionLevel( 1 ), m_compressionAccepted( false ), m_bucketsSent{ 0, 0, 0 }
 		{
 		}
 
@@ -79,8 +87,24 @@ class ClientDisplayDriver::PrivateData : public RefCounted
 		bool m_scanLineOrderOnly;
 		bool m_acceptsRepeatedData;
 		boost::asio::ip::tcp::socket m_socket;
+
+		// Optional transports negotiated with the server.
+		std::string m_compressor;
+		int m_compressionLevel;
+		bool m_compressionAccepted;
+		std::vector<char> m_compressedBuffer;
+		std::unique_ptr<DisplayDriverSharedMemory> m_sharedMemory;
+
+		size_t m_bucketsSent[3];
 };
 
+namespace
+{
+
+const int g_defaultSharedMemorySize = 64 * 1024 * 1024;
+
+} // namespace
+
 IE_CORE_DEFINERUNTIMETYPED( ClientDisplayDriver );
 
 const DisplayDriver::DisplayDriverDescription<ClientDisplayDriver> ClientDisplayDriver::g_description;
@@ -128,6 +152,54 @@ ClientDisplayDriver::ClientDisplayDriver( const Imath::Box2i &displayWindow, con
 	tmpParameters->writable()[ "clientPID" ] = new IntData( _getpid() );
 #endif
 
+	// The transport parameters are for us rather than the driver on
+	// the server, so we remove them and instead send our requests in
+	// a single "displayTransports" parameter. See DisplayDriverServerHeader.
+
+	CompoundDataPtr transports = new CompoundData;
+
+	if( const StringData *compressionData = parameters->member<StringData>( "displayCompression" ) )
+	{
+		m_data->m_compressor = compressionData->readable();
+		if( const IntData *compressionLevelData = parameters->member<IntData>( "displayCompressionLevel" ) )
+		{
+			m_data->m_compressionLevel = std::max( 0, std::min( 9, compressionLevelData->readable() ) );
+		}
+		transports->writable()["compression"] = new StringData( m_data->m_compressor );
+	}
+
+	int sharedMemorySize = g_defaultSharedMemorySize;
+	if( const IntData *sharedMemorySizeData = parameters->member<IntData>( "displaySharedMemorySize" ) )
+	{
+		sharedMemorySize = sharedMemorySizeData->readable();
+	}
+
+	// Shared memory is only useful when the server is on the same host,
+	// so we don't allocate it otherwise.
+	boost::system::error_code endpointError;
+	const tcp::endpoint endpoint = m_data->m_socket.remote_endpoint( endpointError );
+	if( sharedMemorySize > 0 && !endpointError && endpoint.address().is_loopback() )
+	{
+		try
+		{
+			m_data->m_sharedMemory.reset( new DisplayDriverSharedMemory( sharedMemorySize ) );
+			transports->writable()["sharedMemoryName"] = new StringData( m_data->m_sharedMemory->name() );
+		}
+		catch( const std::exception & )
+		{
+			// Shared memory is an optimisation, so we don't
+			// fail just because we couldn't allocate it.
+		}
+	}
+
+	tmpParameters->writable().erase( "displayCompression" );
+	tmpParameters->writable().erase( "displayCompressionLevel" );
+	tmpParameters->writable().erase( "displaySharedMemorySize" );
+	if( !transports->readable().empty() )
+	{
+		tmpParameters->writable()["displayTransports"] = transports;
+	}
+
 	// build the data block
 	io = new MemoryIndexedIO( ConstCharVectorDataPtr(), IndexedIO::rootPath, IndexedIO::Exclusive | IndexedIO::Write );
 	displayWindowData->Object::save( io, "displayWindow" );
@@ -148,11 +220,32 @@ ClientDisplayDriver::ClientDisplayDriver( const Imath::Box2i &displayWindow, con
 	}
 	m_data->m_socket.receive( boost::asio::buffer( &m_data->m_scanLineOrderOnly, sizeof(m_data->m_scanLineOrderOnly) ) );
 
-	if ( receiveHeader( DisplayDriverServerHeader::imageOpen ) != sizeof(m_data->m_acceptsRepeatedData) )
+	// Servers which understand the transport negotiation reply with an
+	// additional byte of TransportFlags if we requested any transports.
+	// Older servers just send acceptsRepeatedData.
+	const size_t acceptsRepeatedDataReplySize = receiveHeader( DisplayDriverServerHeader::imageOpen );
+	if ( acceptsRepeatedDataReplySize != 1 && ( acceptsRepeatedDataReplySize != 2 || transports->readable().empty() ) )
 	{
 		throw Exception( "Invalid returned acceptsRepeatedData from display driver server!" );
 	}
-	m_data->m_socket.receive( boost::asio::buffer( &m_data->m_acceptsRepeatedData, sizeof(m_data->m_acceptsRepeatedData) ) );
+	unsigned char acceptsRepeatedDataReply[2] = { 0, 0 };
+	boost::asio::read( m_data->m_socket, boost::asio::buffer( acceptsRepeatedDataReply, acceptsRepeatedDataReplySize ) );
+	m_data->m_acceptsRepeatedData = acceptsRepeatedDataReply[0];
+
+	const unsigned char transportFlags = acceptsRepeatedDataReply[1];
+	m_data->m_compressionAccepted = !m_data->m_compressor.empty() && ( transportFlags & DisplayDriverServerHeader::compressionAccepted );
+	if( m_data->m_sharedMemory )
+	{
+		if( transportFlags & DisplayDriverServerHeader::sharedMemoryAccepted )
+		{
+			// The server has opened the segment, so we no longer need the name.
+			m_data->m_sharedMemory->removeName();
+		}
+		else
+		{
+			m_data->m_sharedMemory.reset();
+		}
+	}
 }
 
 ClientDisplayDriver::~ClientDisplayDriver()
@@ -179,6 +272,11 @@ bool ClientDisplayDriver::acceptsRepeatedData() const
 	return m_data->m_acceptsRepeatedData;
 }
 
+size_t ClientDisplayDriver::bucketsSent( Transport transport ) const
+{
+	return m_data->m_bucketsSent[transport];
+}
+
 void ClientDisplayDriver::sendHeader( int msg, size_t dataSize )
 {
 	DisplayDriverServerHeader header( (DisplayDriverServerHeader::MessageType)msg, dataSize );
@@ -211,13 +309,52 @@ size_t ClientDisplayDriver::receiveHeader( int msg )
 
 void ClientDisplayDriver::imageData( const Box2i &box, const float *data, size_t dataSize )
 {
-	sendHeader( DisplayDriverServerHeader::imageData, sizeof( box ) + dataSize * sizeof( float ) );
+	const size_t numBytes = dataSize * sizeof( float );
+
+	uint64_t location[2] = { 0, numBytes };
+	if( m_data->m_sharedMemory && m_data->m_sharedMemory->write( data, numBytes, location[0] ) )
+	{
+		sendHeader( DisplayDriverServerHeader::imageDataShared, sizeof( box ) + sizeof( location ) );
+		boost::array<boost::asio::const_buffer, 2> buffers = { {
+			boost::asio::buffer( &box, sizeof( box ) ),
+			boost::asio::buffer( location, sizeof( location ) )
+		} };
+		boost::asio::write( m_data->m_socket, buffers );
+		m_data->m_bucketsSent[SharedMemory]++;
+		return;
+	}
+
+	if( m_data->m_compressionAccepted )
+	{
+		m_data->m_compressedBuffer.resize( numBytes + BLOSC_MAX_OVERHEAD );
+		const int compressedSize = blosc_compress_ctx(
+			m_data->m_compressionLevel, BLOSC_SHUFFLE, sizeof( float ),
+			numBytes, data, m_data->m_compressedBuffer.data(), m_data->m_compressedBuffer.size(),
+			m_data->m_compressor.c_str(), /* blocksize = */ 0, /* numinternalthreads = */ 1
+		);
+		// Fall back to sending uncompressed data if compression failed
+		// or didn't save anything.
+		if( compressedSize > 0 && (size_t)compressedSize < numBytes )
+		{
+			sendHeader( DisplayDriverServerHeader::imageDataCompressed, sizeof( box ) + compressedSize );
+			boost::array<boost::asio::const_buffer, 2> buffers = { {
+				boost::asio::buffer( &box, sizeof( box ) ),
+				boost::asio::buffer( m_data->m_compressedBuffer.data(), compressedSize )
+			} };
+			boost::asio::write( m_data->m_socket, buffers );
+			m_data->m_bucketsSent[Compressed]++;
+			return;
+		}
+	}
+
+	sendHeader( DisplayDriverServerHeader::imageData, sizeof( box ) + numBytes );
 
 	boost::array<boost::asio::const_buffer, 2> buffers = { {
 		boost::asio::buffer( &box, sizeof( box ) ),
-		boost::asio::buffer( data, dataSize * sizeof( float ) )
+		boost::asio::buffer( data, numBytes )
 	} };
 	boost::asio::write( m_data->m_socket, buffers );
+	m_data->m_bucketsSent[Socket]++;
 }
 
 void ClientDisplayDriver::imageClose()
@@ -225,5 +362,6 @@ void ClientDisplayDriver::imageClose()
 	sendHeader( DisplayDriverServerHeader::imageClose, 0 );
 	receiveHeader( DisplayDriverServerHeader::imageClose );
 	m_data->m_socket.close();
+	m_data->m_sharedMemory.reset();
 }
 
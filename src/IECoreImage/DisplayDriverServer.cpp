@@ -44,6 +44,7 @@
 #include "boost/asio.hpp"
 
 #include "IECoreImage/Private/DisplayDriverServerHeader.h"
+#include "IECoreImage/Private/DisplayDriverSharedMemory.h"
 
 #include "IECore/Exception.h"
 #include "IECore/MemoryIndexedIO.h"
@@ -52,7 +53,13 @@
 
 #include "boost/bind/bind.hpp"
 
+#include "blosc.h"
+
+#include <algorithm>
+#include <cstring>
+#include <memory>
 #include <thread>
+#include <vector>
 
 #include <fcntl.h>
 #ifndef _MSC_VER
@@ -89,6 +96,24 @@ static DisplayDriverServer::PortRange g_portRange(
 
 static std::map<std::string, const DisplayDriverServer::PortRange> g_portRegistry;
 
+// Returns true if the socket is connected to a peer on this host. Our
+// acceptor is dual stack, so IPv4 peers have IPv4-mapped IPv6 addresses.
+bool isLoopback( const tcp::socket &socket )
+{
+	boost::system::error_code error;
+	const boost::asio::ip::address address = socket.remote_endpoint( error ).address();
+	if( error )
+	{
+		return false;
+	}
+
+	if( address.is_v6() && address.to_v6().is_v4_mapped() )
+	{
+		return boost::asio::ip::make_address_v4( boost::asio::ip::v4_mapped, address.to_v6() ).is_loopback();
+	}
+	return address.is_loopback();
+}
+
 } // namespace
 
 class DisplayDriverServer::Session : public RefCounted
@@ -109,11 +134,20 @@ class DisplayDriverServer::Session : public RefCounted
 		void sendResult( DisplayDriverServerHeader::MessageType msg, size_t dataSize );
 		void sendException( const char *message );
 
+		void asyncReadHeader();
+
 	private:
 		boost::asio::ip::tcp::socket m_socket;
+		// All handlers for the session are run through the strand, so that
+		// they are serialised even when the service is run by multiple threads.
+		boost::asio::io_service::strand m_strand;
 		DisplayDriverPtr m_displayDriver;
 		DisplayDriverServerHeader m_header;
 		CharVectorDataPtr m_buffer;
+		// Used by `imageDataCompressed` messages.
+		std::vector<float> m_decompressedBuffer;
+		// Used by `imageDataShared` messages.
+		std::unique_ptr<DisplayDriverSharedMemory> m_sharedMemory;
 };
 
 class DisplayDriverServer::PrivateData : public RefCounted
@@ -124,12 +158,11 @@ class DisplayDriverServer::PrivateData : public RefCounted
 		boost::asio::ip::tcp::endpoint m_endpoint;
 		boost::asio::io_service m_service;
 		boost::asio::ip::tcp::acceptor m_acceptor;
-		std::thread m_thread;
+		std::vector<std::thread> m_threads;
 
 		PrivateData( DisplayDriverServer::Port portNumber ) :
 			m_service(),
-			m_acceptor( m_service ),
-			m_thread()
+			m_acceptor( m_service )
 		{
 			if( g_portRange.first != std::numeric_limits<DisplayDriverServer::Port>::min() || g_portRange.second != std::numeric_limits<DisplayDriverServer::Port>::max() )
 			{
@@ -170,7 +203,10 @@ class DisplayDriverServer::PrivateData : public RefCounted
 		{
 			m_acceptor.cancel();
 			m_acceptor.close();
-			m_thread.join();
+			for( auto &thread : m_threads )
+			{
+				thread.join();
+			}
 		}
 
 		void openPort( DisplayDriverServer::Port portNumber )
@@ -192,6 +228,11 @@ class DisplayDriverServer::PrivateData : public RefCounted
 };
 
 DisplayDriverServer::DisplayDriverServer( DisplayDriverServer::Port portNumber ) :
+		DisplayDriverServer( portNumber, 1 )
+{
+}
+
+DisplayDriverServer::DisplayDriverServer( DisplayDriverServer::Port portNumber, size_t numThreads ) :
 		m_data( nullptr )
 {
 	m_data = new DisplayDriverServer::PrivateData( portNumber );
@@ -201,8 +242,15 @@ DisplayDriverServer::DisplayDriverServer( DisplayDriverServer::Port portNumber )
 			boost::bind( &DisplayDriverServer::handleAccept, this, newSession,
 			boost::asio::placeholders::error));
 	fixSocketFlags( m_data->m_acceptor.native_handle() );
-	std::thread newThread( boost::bind(&DisplayDriverServer::serverThread, this) );
-	m_data->m_thread.swap( newThread );
+
+	if( !numThreads )
+	{
+		numThreads = std::max( 1u, std::thread::hardware_concurrency() );
+	}
+	for( size_t i = 0; i < numThreads; ++i )
+	{
+		m_data->m_threads.emplace_back( boost::bind( &DisplayDriverServer::serverThread, this ) );
+	}
 }
 
 DisplayDriverServer::~DisplayDriverServer()
@@ -264,6 +312,11 @@ DisplayDriverServer::Port DisplayDriverServer::portNumber()
 	return m_data->m_acceptor.local_endpoint().port();
 }
 
+size_t DisplayDriverServer::numThreads() const
+{
+	return m_data->m_threads.size();
+}
+
 void DisplayDriverServer::serverThread()
 {
 	try
@@ -293,12 +346,18 @@ void DisplayDriverServer::handleAccept( DisplayDriverServer::SessionPtr session,
  */
 
 DisplayDriverServer::Session::Session( boost::asio::io_service& io_service ) :
-	m_socket( io_service ), m_displayDriver(nullptr), m_buffer( new CharVectorData( ) )
+	m_socket( io_service ), m_strand( io_service ), m_displayDriver(nullptr), m_buffer( new CharVectorData( ) )
 {
 }
 
 DisplayDriverServer::Session::~Session()
 {
+	if( m_sharedMemory )
+	{
+		// Make sure the client doesn't wait for space
+		// that will never be released.
+		m_sharedMemory->close();
+	}
 	m_socket.close();
 }
 
@@ -308,15 +367,22 @@ boost::asio::ip::tcp::socket& DisplayDriverServer::Session::socket()
 }
 
 void DisplayDriverServer::Session::start()
+{
+	fixSocketFlags( m_socket.native_handle() );
+	asyncReadHeader();
+}
+
+void DisplayDriverServer::Session::asyncReadHeader()
 {
 	boost::asio::async_read( m_socket,
 			boost::asio::buffer( m_header.buffer(), m_header.headerLength),
-			boost::bind(
-				&DisplayDriverServer::Session::handleReadHeader, SessionPtr(this),
-				boost::asio::placeholders::error
+			m_strand.wrap(
+				boost::bind(
+					&DisplayDriverServer::Session::handleReadHeader, SessionPtr(this),
+					boost::asio::placeholders::error
+				)
 			)
 	);
-	fixSocketFlags( m_socket.native_handle() );
 }
 
 void DisplayDriverServer::Session::handleReadHeader( const boost::system::error_code& error )
@@ -347,15 +413,17 @@ void DisplayDriverServer::Session::handleReadHeader( const boost::system::error_
 	case DisplayDriverServerHeader::imageOpen:
 		boost::asio::async_read( m_socket,
 				boost::asio::buffer( &data[0], bytesAhead ),
-				boost::bind( &DisplayDriverServer::Session::handleReadOpenParameters, SessionPtr(this), boost::asio::placeholders::error)
+				m_strand.wrap( boost::bind( &DisplayDriverServer::Session::handleReadOpenParameters, SessionPtr(this), boost::asio::placeholders::error) )
 		);
 		break;
 
 	case DisplayDriverServerHeader::imageData:
+	case DisplayDriverServerHeader::imageDataCompressed:
+	case DisplayDriverServerHeader::imageDataShared:
 		boost::asio::async_read( m_socket,
 				boost::asio::buffer( &data[0], bytesAhead ),
-				boost::bind(&DisplayDriverServer::Session::handleReadDataParameters, SessionPtr(this),
-				boost::asio::placeholders::error));
+				m_strand.wrap( boost::bind(&DisplayDriverServer::Session::handleReadDataParameters, SessionPtr(this),
+				boost::asio::placeholders::error) ) );
 		break;
 
 	case DisplayDriverServerHeader::imageClose:
@@ -411,6 +479,8 @@ void DisplayDriverServer::Session::handleReadOpenParameters( const boost::system
 	CompoundDataPtr parameters;
 	bool scanLineOrder = false;
 	bool acceptsRepeatedData = false;
+	bool negotiateTransport = false;
+	unsigned char transportFlags = 0;
 
 	// handle imageOpen parameters.
 	try
@@ -423,11 +493,48 @@ void DisplayDriverServer::Session::handleReadOpenParameters( const boost::system
 
 		const StringData *displayType = parameters->member<StringData>( "remoteDisplayType", true /* throw if missing */ );
 
+		// Take any transport requests from the parameters, since
+		// they are not intended for the display driver.
+		ConstCompoundDataPtr transports = parameters->member<CompoundData>( "displayTransports" );
+		parameters->writable().erase( "displayTransports" );
+
 		// create a displayDriver using the factory function.
 		m_displayDriver = DisplayDriver::create( displayType->readable(), displayWindow->readable(), dataWindow->readable(), channelNames->readable(), parameters );
 
 		scanLineOrder = m_displayDriver->scanLineOrderOnly();
 		acceptsRepeatedData = m_displayDriver->acceptsRepeatedData();
+
+		// Negotiate any additional transports requested by the client.
+		// See DisplayDriverServerHeader for details.
+
+		if( transports )
+		{
+			negotiateTransport = true;
+
+			if( const StringData *compression = transports->member<StringData>( "compression" ) )
+			{
+				if( blosc_compname_to_compcode( compression->readable().c_str() ) >= 0 )
+				{
+					transportFlags |= DisplayDriverServerHeader::compressionAccepted;
+				}
+			}
+
+			// Shared memory is only accepted from clients on this host, so
+			// that remote clients can't make us open arbitrary segments.
+			const StringData *sharedMemoryName = transports->member<StringData>( "sharedMemoryName" );
+			if( sharedMemoryName && isLoopback( m_socket ) )
+			{
+				try
+				{
+					m_sharedMemory.reset( new DisplayDriverSharedMemory( sharedMemoryName->readable() ) );
+					transportFlags |= DisplayDriverServerHeader::sharedMemoryAccepted;
+				}
+				catch( const std::exception &e )
+				{
+					msg( Msg::Warning, "DisplayDriverServer::Session::handleReadOpenParameters", e.what() );
+				}
+			}
+		}
 	}
 	catch( std::exception &e )
 	{
@@ -443,17 +550,13 @@ void DisplayDriverServer::Session::handleReadOpenParameters( const boost::system
 		sendResult( DisplayDriverServerHeader::imageOpen, sizeof(scanLineOrder) );
 		m_socket.send( boost::asio::buffer( &scanLineOrder, sizeof(scanLineOrder) ) );
 
-		sendResult( DisplayDriverServerHeader::imageOpen, sizeof(acceptsRepeatedData) );
-		m_socket.send( boost::asio::buffer( &acceptsRepeatedData, sizeof(acceptsRepeatedData) ) );
+		const unsigned char acceptsRepeatedDataReply[2] = { (unsigned char)acceptsRepeatedData, transportFlags };
+		const size_t acceptsRepeatedDataReplySize = negotiateTransport ? 2 : 1;
+		sendResult( DisplayDriverServerHeader::imageOpen, acceptsRepeatedDataReplySize );
+		m_socket.send( boost::asio::buffer( acceptsRepeatedDataReply, acceptsRepeatedDataReplySize ) );
 
 		// prepare for getting imageData packages
-		boost::asio::async_read( m_socket,
-			boost::asio::buffer( m_header.buffer(), m_header.headerLength),
-			boost::bind(
-				&DisplayDriverServer::Session::handleReadHeader, SessionPtr(this),
-				boost::asio::placeholders::error
-			)
-		);
+		asyncReadHeader();
 	}
 	catch( std::exception &e )
 	{
@@ -487,20 +590,63 @@ void DisplayDriverServer::Session::handleReadDataParameters( const boost::system
 		/// for us, but the overhead of this significantly affected interactive render
 		/// speeds.
 		const Imath::Box2i box = *reinterpret_cast<const Imath::Box2i *>( &m_buffer->readable()[0] );
-		const float *data = reinterpret_cast<const float *>( &m_buffer->readable()[0] + sizeof( box ) );
-		const size_t dataSize = ( m_buffer->readable().size() - sizeof( box ) ) / sizeof( float );
+		const char *payload = &m_buffer->readable()[0] + sizeof( box );
+		const size_t payloadSize = m_buffer->readable().size() - sizeof( box );
 
-		// call imageData passing the data
-		m_displayDriver->imageData( box, data, dataSize );
+		switch( m_header.messageType() )
+		{
+			case DisplayDriverServerHeader::imageDataCompressed :
+			{
+				size_t numBytes = 0, compressedNumBytes = 0, blockSize = 0;
+				if( payloadSize >= BLOSC_MIN_HEADER_LENGTH )
+				{
+					blosc_cbuffer_sizes( payload, &numBytes, &compressedNumBytes, &blockSize );
+				}
+				// Check the uncompressed size against the size of the tile
+				// before allocating anything, since it comes from the client.
+				const uint64_t expectedNumBytes = box.isEmpty() ? 0 :
+					uint64_t( int64_t( box.max.x ) - box.min.x + 1 ) * uint64_t( int64_t( box.max.y ) - box.min.y + 1 ) *
+					m_displayDriver->channelNames().size() * sizeof( float )
+				;
+				if( !compressedNumBytes || compressedNumBytes != payloadSize || numBytes != expectedNumBytes )
+				{
+					throw IECore::Exception( "Invalid compressed data" );
+				}
+
+				m_decompressedBuffer.resize( numBytes / sizeof( float ) );
+				if( blosc_decompress_ctx( payload, m_decompressedBuffer.data(), numBytes, 1 ) < 0 )
+				{
+					throw IECore::Exception( "Failed to decompress data" );
+				}
+
+				m_displayDriver->imageData( box, m_decompressedBuffer.data(), m_decompressedBuffer.size() );
+				break;
+			}
+			case DisplayDriverServerHeader::imageDataShared :
+			{
+				uint64_t location[2];
+				const void *data = nullptr;
+				if( m_sharedMemory && payloadSize == sizeof( location ) )
+				{
+					memcpy( location, payload, sizeof( location ) );
+					data = location[1] % sizeof( float ) ? nullptr : m_sharedMemory->read( location[0], location[1] );
+				}
+				if( !data )
+				{
+					throw IECore::Exception( "Invalid shared memory location" );
+				}
+
+				m_displayDriver->imageData( box, static_cast<const float *>( data ), location[1] / sizeof( float ) );
+				m_sharedMemory->release( location[0], location[1] );
+				break;
+			}
+			default :
+				// call imageData passing the data
+				m_displayDriver->imageData( box, reinterpret_cast<const float *>( payload ), payloadSize / sizeof( float ) );
+		}
 
 		// prepare for getting more imageData packages or a imageClose.
-		boost::asio::async_read( m_socket,
-			boost::asio::buffer( m_header.buffer(), m_header.headerLength),
-			boost::bind(
-				&DisplayDriverServer::Session::handleReadHeader, SessionPtr(this),
-				boost::asio::placeholders::error
-			)
-		);
+		asyncReadHeader();
 	}
 	catch( std::exception &e )
 	{
@@ -0,0 +1,296 @@
+//////////////////////////////////////////////////////////////////////////
+//
+//  Copyright (c) 2026, Image Engine Design Inc. All rights reserved.
+//
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//
+//     * Redistributions of source code must retain the above copyright
+//       notice, this list of conditions and the following disclaimer.
+//
+//     * Redistributions in binary form must reproduce the above copyright
+//       notice, this list of conditions and the following disclaimer in the
+//       documentation and/or other materials provided with the distribution.
+//
+//     * Neither the name of Image Engine Design nor the names of any
+//       other contributors to this software may be used to endorse or
+//       promote products derived from this software without specific prior
+//       written permission.
+//
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//////////////////////////////////////////////////////////////////////////
+
+#include "IECoreImage/Private/DisplayDriverSharedMemory.h"
+
+#include "IECore/Exception.h"
+
+#include "boost/date_time/posix_time/posix_time_types.hpp"
+#include "boost/interprocess/sync/interprocess_semaphore.hpp"
+
+#include <algorithm>
+#include <atomic>
+#include <cstring>
+#include <new>
+#include <random>
+
+#ifndef _MSC_VER
+#include <fcntl.h>
+#include <unistd.h>
+#else
+#include <process.h>
+#endif
+
+using namespace boost::interprocess;
+using namespace IECoreImage;
+
+//////////////////////////////////////////////////////////////////////////
+// Internal utilities
+//////////////////////////////////////////////////////////////////////////
+
+namespace
+{
+
+// Buckets are aligned to cache lines, which also keeps
+// the float data suitably aligned for the server.
+const size_t g_alignment = 64;
+
+size_t align( size_t size )
+{
+	return ( size + g_alignment - 1 ) / g_alignment * g_alignment;
+}
+
+// Used to identify segments created by DisplayDriverSharedMemory, so that
+// the server never opens or writes to anything else.
+const std::string g_namePrefix = "IECI-";
+const uint32_t g_magic = 0x49454349; // "IECI"
+const uint32_t g_version = 1;
+
+// The longest the client waits for the server to release space
+// without any progress, before assuming that the server has died
+// without closing the buffer.
+const boost::posix_time::seconds g_maxWaitWithoutProgress( 10 );
+
+std::string uniqueName()
+{
+	// Names are limited to 31 characters on macOS, so we keep
+	// this short. The random component guards against clashes
+	// with segments created by processes on other hosts.
+	static std::atomic<unsigned> g_count( 0 );
+	std::random_device randomDevice;
+#ifndef _MSC_VER
+	const int pid = getpid();
+#else
+	const int pid = _getpid();
+#endif
+	return g_namePrefix + std::to_string( pid ) + "-" + std::to_string( g_count++ ) + "-" + std::to_string( randomDevice() % 1000000 );
+}
+
+} // namespace
+
+//////////////////////////////////////////////////////////////////////////
+// DisplayDriverSharedMemory
+//////////////////////////////////////////////////////////////////////////
+
+struct DisplayDriverSharedMemory::Header
+{
+
+	Header( uint64_t capacity )
+		:	magic( g_magic ), version( g_version ), readPosition( 0 ), closed( false ), spaceReleased( 0 ), capacity( capacity )
+	{
+	}
+
+	// Checked by the server before anything else is used.
+	const uint32_t magic;
+	const uint32_t version;
+	std::atomic<uint64_t> readPosition;
+	std::atomic<bool> closed;
+	interprocess_semaphore spaceReleased;
+	const uint64_t capacity;
+
+};
+
+DisplayDriverSharedMemory::DisplayDriverSharedMemory( size_t capacity )
+	:	m_name( uniqueName() ), m_owner( true ), m_capacity( align( std::max( capacity, g_alignment ) ) ), m_writePosition( 0 )
+{
+	const size_t size = align( sizeof( Header ) ) + m_capacity;
+
+	m_memory = shared_memory_object( create_only, m_name.c_str(), read_write );
+	try
+	{
+		m_memory.truncate( size );
+#ifdef __linux__
+		// Shared memory is allocated lazily, so a write to a page that can't
+		// be allocated raises SIGBUS rather than returning an error. We commit
+		// all the pages up front instead, so the client can fall back to the
+		// socket if there isn't enough memory.
+		if( posix_fallocate( m_memory.get_mapping_handle().handle, 0, size ) != 0 )
+		{
+			throw IECore::Exception( "DisplayDriverSharedMemory : Unable to allocate segment \"" + m_name + "\"" );
+		}
+#endif
+		m_region = mapped_region( m_memory, read_write );
+	}
+	catch( ... )
+	{
+		removeName();
+		throw;
+	}
+
+	new( header() ) Header( m_capacity );
+}
+
+DisplayDriverSharedMemory::DisplayDriverSharedMemory( const std::string &name )
+	:	m_name( name ), m_owner( false ), m_capacity( 0 ), m_writePosition( 0 )
+{
+	if( name.compare( 0, g_namePrefix.size(), g_namePrefix ) != 0 || name.find( '/' ) != std::string::npos )
+	{
+		throw IECore::Exception( "DisplayDriverSharedMemory : Invalid segment name \"" + name + "\"" );
+	}
+
+	m_memory = shared_memory_object( open_only, name.c_str(), read_write );
+	m_region = mapped_region( m_memory, read_write );
+
+	if(
+		m_region.get_size() < align( sizeof( Header ) ) ||
+		header()->magic != g_magic ||
+		header()->version != g_version ||
+		!header()->capacity ||
+		m_region.get_size() < align( sizeof( Header ) ) + header()->capacity
+	)
+	{
+		throw IECore::Exception( "DisplayDriverSharedMemory : Invalid segment \"" + name + "\"" );
+	}
+
+	// The header is writable by the client, so we only use
+	// the capacity we have validated against the region size.
+	m_capacity = header()->capacity;
+}
+
+DisplayDriverSharedMemory::~DisplayDriverSharedMemory()
+{
+	if( m_owner )
+	{
+		removeName();
+	}
+}
+
+const std::string &DisplayDriverSharedMemory::name() const
+{
+	return m_name;
+}
+
+size_t DisplayDriverSharedMemory::capacity() const
+{
+	return m_capacity;
+}
+
+void DisplayDriverSharedMemory::removeName()
+{
+	shared_memory_object::remove( m_name.c_str() );
+}
+
+bool DisplayDriverSharedMemory::write( const void *data, size_t size, uint64_t &position )
+{
+	Header *h = header();
+	const uint64_t capacity = m_capacity;
+	const uint64_t alignedSize = align( size );
+	if( alignedSize > capacity )
+	{
+		return false;
+	}
+
+	uint64_t start = m_writePosition;
+	const uint64_t offset = start % capacity;
+	if( offset + alignedSize > capacity )
+	{
+		// Skip to the start of the buffer. The server releases
+		// the skipped space along with this bucket.
+		start += capacity - offset;
+	}
+	const uint64_t end = start + alignedSize;
+
+	uint64_t readPosition = h->readPosition.load( std::memory_order_acquire );
+	boost::posix_time::ptime deadline = boost::posix_time::microsec_clock::universal_time() + g_maxWaitWithoutProgress;
+	while( end - readPosition > capacity )
+	{
+		if( h->closed.load() )
+		{
+			return false;
+		}
+
+		const boost::posix_time::ptime now = boost::posix_time::microsec_clock::universal_time();
+		if( now >= deadline )
+		{
+			// The server has stopped releasing space, most likely because
+			// it died without calling `close()`. Close the buffer ourselves
+			// so that the client uses the socket from now on.
+			h->closed = true;
+			return false;
+		}
+
+		// The timeout means we'll notice if the server is closed
+		// between the check above and the wait.
+		h->spaceReleased.timed_wait( std::min( now + boost::posix_time::milliseconds( 100 ), deadline ) );
+
+		const uint64_t newReadPosition = h->readPosition.load( std::memory_order_acquire );
+		if( newReadPosition != readPosition )
+		{
+			readPosition = newReadPosition;
+			deadline = boost::posix_time::microsec_clock::universal_time() + g_maxWaitWithoutProgress;
+		}
+	}
+
+	memcpy( buffer() + start % capacity, data, size );
+	std::atomic_thread_fence( std::memory_order_release );
+
+	m_writePosition = end;
+	position = start;
+	return true;
+}
+
+const void *DisplayDriverSharedMemory::read( uint64_t position, size_t size ) const
+{
+	const uint64_t capacity = m_capacity;
+	const uint64_t offset = position % capacity;
+	if( size > capacity || offset + size > capacity )
+	{
+		return nullptr;
+	}
+
+	std::atomic_thread_fence( std::memory_order_acquire );
+	return buffer() + offset;
+}
+
+void DisplayDriverSharedMemory::release( uint64_t position, size_t size )
+{
+	header()->readPosition.store( position + align( size ), std::memory_order_release );
+	header()->spaceReleased.post();
+}
+
+void DisplayDriverSharedMemory::close()
+{
+	header()->closed = true;
+	header()->spaceReleased.post();
+}
+
+DisplayDriverSharedMemory::Header *DisplayDriverSharedMemory::header() const
+{
+	return static_cast<Header *>( m_region.get_address() );
+}
+
+char *DisplayDriverSharedMemory::buffer() const
+{
+	return static_cast<char *>( m_region.get_address() ) + align( sizeof( Header ) );
+}
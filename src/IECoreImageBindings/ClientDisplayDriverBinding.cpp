@@ -75,10 +75,17 @@ namespace IECoreImageBindings
 
 void bindClientDisplayDriver()
 {
-	RunTimeTypedClass<ClientDisplayDriver>()
+	scope s = RunTimeTypedClass<ClientDisplayDriver>()
 		.def( "__init__", make_constructor( &clientDisplayDriverConstructor, default_call_policies(), ( boost::python::arg_( "displayWindow" ), boost::python::arg_( "dataWindow" ), boost::python::arg_( "channelNames" ), boost::python::arg_( "parameters" ) ) ) )
 		.def( "host", &ClientDisplayDriver::host )
 		.def( "port", &ClientDisplayDriver::port )
+		.def( "bucketsSent", &ClientDisplayDriver::bucketsSent )
+	;
+
+	enum_<ClientDisplayDriver::Transport>( "Transport" )
+		.value( "Socket", ClientDisplayDriver::Socket )
+		.value( "Compressed", ClientDisplayDriver::Compressed )
+		.value( "SharedMemory", ClientDisplayDriver::SharedMemory )
 	;
 }
 
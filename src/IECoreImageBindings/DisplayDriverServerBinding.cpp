@@ -82,8 +82,9 @@ void bindDisplayDriverServer()
 	using boost::python::arg;
 
 	RunTimeTypedClass<DisplayDriverServer>()
-		.def( init<DisplayDriverServer::Port>( ( arg( "portNumber" ) = 0 ) ) )
+		.def( init<DisplayDriverServer::Port, size_t>( ( arg( "portNumber" ) = 0, arg( "numThreads" ) = 1 ) ) )
 		.def( "portNumber", &DisplayDriverServer::portNumber )
+		.def( "numThreads", &DisplayDriverServer::numThreads )
 		.def( "setPortRange", &::setPortRange ).staticmethod( "setPortRange" )
 		.def( "getPortRange", &::getPortRange ).staticmethod( "getPortRange" )
 		.def( "registerPortRange", &::registerPortRange ).staticmethod( "registerPortRange" )
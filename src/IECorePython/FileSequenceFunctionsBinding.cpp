@@ -36,7 +36,10 @@
 
 #include "IECorePython/FileSequenceFunctionsBinding.h"
 
+#include "IECorePython/ExceptionAlgo.h"
 #include "IECorePython/IECoreBinding.h"
+#include "IECorePython/ScopedGILLock.h"
+#include "IECorePython/ScopedGILRelease.h"
 
 #include "IECore/Exception.h"
 #include "IECore/FileSequence.h"
@@ -108,6 +111,31 @@ struct FileSequenceFunctionsHelper
 		return object();
 	}
 
+	static void lsRecursive( const std::string &path, object function, size_t minSequenceSize, bool followLinks, size_t maxDepth, const Canceller *canceller )
+	{
+		ScopedGILRelease gilRelease;
+		IECore::lsRecursive(
+			path,
+			[&function]( const std::string &directory, std::vector<FileSequencePtr> &sequences ) {
+				ScopedGILLock gilLock;
+				list pythonSequences;
+				for( const auto &sequence : sequences )
+				{
+					pythonSequences.append( sequence );
+				}
+				try
+				{
+					function( directory, pythonSequences );
+				}
+				catch( const error_already_set & )
+				{
+					ExceptionAlgo::translatePythonException();
+				}
+			},
+			minSequenceSize, followLinks, maxDepth, canceller
+		);
+	}
+
 	static FrameListPtr frameListFromList( list l )
 	{
 		std::vector< FrameList::Frame > frameList;
@@ -131,6 +159,13 @@ void bindFileSequenceFunctions()
 {
 	def( "findSequences", &FileSequenceFunctionsHelper::findSequences, ( arg_("namesList"), arg_( "minSequenceSize" ) = 2 ) );
 	def( "ls", &FileSequenceFunctionsHelper::ls, ( arg_("path"), arg_( "minSequenceSize" ) = 2 ) );
+	def(
+		"lsRecursive", &FileSequenceFunctionsHelper::lsRecursive,
+		(
+			arg_( "path" ), arg_( "function" ), arg_( "minSequenceSize" ) = 2, arg_( "followLinks" ) = false,
+			arg_( "maxDepth" ) = std::numeric_limits<size_t>::max(), arg_( "canceller" ) = object()
+		)
+	);
 	def( "frameListFromList", &FileSequenceFunctionsHelper::frameListFromList );
 }
 
@@ -36,6 +36,9 @@
 
 #include "IECorePython/IndexedIOAlgoBinding.h"
 
+#include "IECorePython/ScopedGILRelease.h"
+
+#include "IECore/CompoundData.h"
 #include "IECore/IndexedIOAlgo.h"
 
 using namespace boost::python;
@@ -66,6 +69,18 @@ list parallelReadAll( const IndexedIO* src )
 	return result;
 }
 
+void repack( const IndexedIO *src, IndexedIO *dst, IndexedIOAlgo::RepackOrder order )
+{
+	IECorePython::ScopedGILRelease gilRelease;
+	IndexedIOAlgo::repack( src, dst, order );
+}
+
+void repackFile( const std::string &srcFileName, const std::string &dstFileName, IndexedIOAlgo::RepackOrder order, const CompoundData *options )
+{
+	IECorePython::ScopedGILRelease gilRelease;
+	IndexedIOAlgo::repack( srcFileName, dstFileName, order, options );
+}
+
 }
 
 namespace IECorePython
@@ -81,6 +96,14 @@ void bindIndexedIOAlgo()
 
 	def( "copy", &IndexedIOAlgo::copy );
 	def( "parallelReadAll", &::parallelReadAll );
+
+	enum_<IndexedIOAlgo::RepackOrder>( "RepackOrder" )
+		.value( "DepthFirst", IndexedIOAlgo::RepackOrder::DepthFirst )
+		.value( "TimeMajor", IndexedIOAlgo::RepackOrder::TimeMajor )
+	;
+
+	def( "repack", &::repack, ( arg( "src" ), arg( "dst" ), arg( "order" ) = IndexedIOAlgo::RepackOrder::DepthFirst ) );
+	def( "repack", &::repackFile, ( arg( "srcFileName" ), arg( "dstFileName" ), arg( "order" ) = IndexedIOAlgo::RepackOrder::DepthFirst, arg( "options" ) = object() ) );
 }
 
 } //IECorePython
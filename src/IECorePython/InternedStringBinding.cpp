@@ -111,6 +111,7 @@ void bindInternedString()
 		.def( self == self )
 		.def( self != self )
 		.def( "numUniqueStrings", &InternedString::numUniqueStrings ).staticmethod( "numUniqueStrings" )
+		.def( "memoryUsage", &InternedString::memoryUsage ).staticmethod( "memoryUsage" )
 		.def( "__repr__", &repr )
 		.def( "__hash__", &hash )
 		.def( "__len__", &len )
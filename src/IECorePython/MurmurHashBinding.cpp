@@ -58,6 +58,13 @@ static void appendArray( MurmurHash &hash, typename TypedData<std::vector<T> >::
 	hash.append( data->readable() );
 }
 
+template<typename T>
+static void appendTreeArray( MurmurHash &hash, typename TypedData<std::vector<T> >::ConstPtr data )
+{
+	const std::vector<T> &v = data->readable();
+	hash.appendTree( v.data(), v.size() );
+}
+
 static void appendInt( MurmurHash &hash, int64_t v )
 {
 	// Function that keeps backward compatibility for int types.
@@ -191,6 +198,39 @@ void IECorePython::bindMurmurHash()
 		.def( "append", &appendArray<Imath::Quatf>, return_self<>() )
 		.def( "append", &appendArray<Imath::Quatd>, return_self<>() )
 		.def( "append", &appendArray<bool>, return_self<>() )
+		.def( "appendTree", &appendTreeArray<char>, return_self<>() )
+		.def( "appendTree", &appendTreeArray<unsigned char>, return_self<>() )
+		.def( "appendTree", &appendTreeArray<short>, return_self<>() )
+		.def( "appendTree", &appendTreeArray<unsigned short>, return_self<>() )
+		.def( "appendTree", &appendTreeArray<int>, return_self<>() )
+		.def( "appendTree", &appendTreeArray<unsigned int>, return_self<>() )
+		.def( "appendTree", &appendTreeArray<int64_t>, return_self<>() )
+		.def( "appendTree", &appendTreeArray<uint64_t>, return_self<>() )
+		.def( "appendTree", &appendTreeArray<half>, return_self<>() )
+		.def( "appendTree", &appendTreeArray<float>, return_self<>() )
+		.def( "appendTree", &appendTreeArray<double>, return_self<>() )
+		.def( "appendTree", &appendTreeArray<std::string>, return_self<>() )
+		.def( "appendTree", &appendTreeArray<InternedString>, return_self<>() )
+		.def( "appendTree", &appendTreeArray<Imath::V2i>, return_self<>() )
+		.def( "appendTree", &appendTreeArray<Imath::V2f>, return_self<>() )
+		.def( "appendTree", &appendTreeArray<Imath::V2d>, return_self<>() )
+		.def( "appendTree", &appendTreeArray<Imath::V3i>, return_self<>() )
+		.def( "appendTree", &appendTreeArray<Imath::V3f>, return_self<>() )
+		.def( "appendTree", &appendTreeArray<Imath::V3d>, return_self<>() )
+		.def( "appendTree", &appendTreeArray<Imath::Color3f>, return_self<>() )
+		.def( "appendTree", &appendTreeArray<Imath::Color4f>, return_self<>() )
+		.def( "appendTree", &appendTreeArray<Imath::M33f>, return_self<>() )
+		.def( "appendTree", &appendTreeArray<Imath::M33d>, return_self<>() )
+		.def( "appendTree", &appendTreeArray<Imath::M44f>, return_self<>() )
+		.def( "appendTree", &appendTreeArray<Imath::M44d>, return_self<>() )
+		.def( "appendTree", &appendTreeArray<Imath::Box2i>, return_self<>() )
+		.def( "appendTree", &appendTreeArray<Imath::Box2f>, return_self<>() )
+		.def( "appendTree", &appendTreeArray<Imath::Box2d>, return_self<>() )
+		.def( "appendTree", &appendTreeArray<Imath::Box3i>, return_self<>() )
+		.def( "appendTree", &appendTreeArray<Imath::Box3f>, return_self<>() )
+		.def( "appendTree", &appendTreeArray<Imath::Box3d>, return_self<>() )
+		.def( "appendTree", &appendTreeArray<Imath::Quatf>, return_self<>() )
+		.def( "appendTree", &appendTreeArray<Imath::Quatd>, return_self<>() )
 		.def( self == self )
 		.def( self != self )
 		.def( self < self )
@@ -201,6 +241,10 @@ void IECorePython::bindMurmurHash()
 		.def( "toString", &MurmurHash::toString )
 		.def( "fromString", (MurmurHash (*)( const std::string & ))&MurmurHash::fromString )
 		.staticmethod( "fromString" )
+		.def( "setTreeHashThreshold", &MurmurHash::setTreeHashThreshold )
+		.staticmethod( "setTreeHashThreshold" )
+		.def( "treeHashThreshold", &MurmurHash::treeHashThreshold )
+		.staticmethod( "treeHashThreshold" )
 		.def( "h1", &MurmurHash::h1 )
 		.def( "h2", &MurmurHash::h2 )
 	;
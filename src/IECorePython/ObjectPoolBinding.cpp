@@ -87,6 +87,7 @@ void bindObjectPool()
 
 	objectPoolClass
 		.def( init<size_t>() )
+		.def( init<size_t, const std::string &>() )
 		.def( "erase", &ObjectPool::erase )
 		.def( "clear", &ObjectPool::clear )
 		.def( "retrieve", &retrieve, ( arg("key"), arg("_copy") = true ) )		/// _copy=false provides low level access to the pointer stored in the cache
@@ -95,6 +96,8 @@ void bindObjectPool()
 		.def( "memoryUsage", &ObjectPool::memoryUsage )
 		.def( "getMaxMemoryUsage", &ObjectPool::getMaxMemoryUsage)
 		.def( "setMaxMemoryUsage", &ObjectPool::setMaxMemoryUsage )
+		.def( "getMemoryGovernorPriority", &ObjectPool::getMemoryGovernorPriority )
+		.def( "setMemoryGovernorPriority", &ObjectPool::setMemoryGovernorPriority )
 		.def( "defaultObjectPool", &ObjectPool::defaultObjectPool, return_value_policy<CastToIntrusivePtr>() )
 		.staticmethod( "defaultObjectPool" )
 	;
@@ -152,6 +152,7 @@
 #include "IECorePython/PathMatcherBinding.h"
 #include "IECorePython/CancellerBinding.h"
 #include "IECorePython/IndexedIOAlgoBinding.h"
+#include "IECorePython/MemoryGovernorBinding.h"
 
 #include "IECore/IECore.h"
 #include "IECore/Version.h"
@@ -300,6 +301,7 @@ BOOST_PYTHON_MODULE(_IECore)
 	bindCanceller();
 	bindIndexedIOAlgo();
 	bindTBB();
+	bindMemoryGovernor();
 
 	def( "milestoneVersion", &IECore::milestoneVersion );
 	def( "majorVersion", &IECore::majorVersion );
@@ -43,6 +43,11 @@
 #include "IECore/DespatchTypedData.h"
 #include "IECore/TypeTraits.h"
 
+#include "tbb/blocked_range.h"
+#include "tbb/parallel_for.h"
+
+#include <numeric>
+
 using namespace IECore;
 using namespace IECoreScene;
 using namespace Imath;
@@ -102,11 +107,14 @@ Imath::Color3f evalPrimVar<Imath::Color3f>( PrimitiveEvaluator::Result *result,
 }
 
 
-struct  CurvesUniformToVertex
+// Fills each element of a curve with the uniform value for that curve. Used
+// for resampling Uniform to Vertex, Varying and FaceVarying.
+struct CurvesUniformToVertex
 {
 	typedef DataPtr ReturnType;
 
-	CurvesUniformToVertex( const std::vector<int> &offsets, const Canceller *canceller )	:	m_offsets( offsets ), m_canceller( canceller )
+	CurvesUniformToVertex( const CurvesPrimitive *curves, PrimitiveVariable::Interpolation interpolation, const Canceller *canceller )
+		:	m_offsets( PrimitiveVariableAlgos::curveOffsets( curves, interpolation ) ), m_canceller( canceller )
 	{
 	}
 
@@ -114,18 +122,25 @@ struct  CurvesUniformToVertex
 	{
 		typename From::Ptr result = static_cast< From* >( Object::create( data->typeId() ).get() );
 		typename From::ValueType &trg = result->writable();
-		typename From::ValueType::const_iterator srcIt = data->readable().begin();
+		const typename From::ValueType &src = data->readable();
 
-		trg.reserve( m_offsets.size() );
+		trg.resize( m_offsets.back() );
 
-		for ( std::vector<int>::const_iterator oIt = m_offsets.begin(); oIt != m_offsets.end(); oIt++, srcIt++ )
-		{
-			Canceller::check( m_canceller );
-			for ( int i = 0; i < *oIt; i++ )
+		const std::vector<int> &offsets = m_offsets;
+		const Canceller *canceller = m_canceller;
+		tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+		tbb::parallel_for(
+			tbb::blocked_range<size_t>( 0, offsets.size() - 1 ),
+			[&src, &trg, &offsets, canceller] ( const tbb::blocked_range<size_t> &range )
 			{
-				trg.push_back( *srcIt );
-			}
-		}
+				Canceller::check( canceller );
+				for( size_t i = range.begin(); i != range.end(); ++i )
+				{
+					std::fill( trg.begin() + offsets[i], trg.begin() + offsets[i+1], src[i] );
+				}
+			},
+			taskGroupContext
+		);
 
 		IECoreScene::PrimitiveVariableAlgos::GeometricInterpretationCopier<From> copier;
 		copier( data.get(), result.get() );
@@ -133,15 +148,18 @@ struct  CurvesUniformToVertex
 		return result;
 	}
 
-	const std::vector<int> &m_offsets;
+	const std::vector<int> m_offsets;
 	const Canceller *m_canceller;
 };
 
-struct  CurvesVertexToUniform
+// Averages the elements of each curve. Used for resampling Vertex, Varying and
+// FaceVarying to Uniform.
+struct CurvesVertexToUniform
 {
 	typedef DataPtr ReturnType;
 
-	CurvesVertexToUniform( const CurvesPrimitive *curves, const Canceller *canceller ) : m_curves( curves ), m_canceller( canceller )
+	CurvesVertexToUniform( const CurvesPrimitive *curves, PrimitiveVariable::Interpolation interpolation, const Canceller *canceller )
+		:	m_offsets( PrimitiveVariableAlgos::curveOffsets( curves, interpolation ) ), m_canceller( canceller )
 	{
 	}
 
@@ -149,107 +167,33 @@ struct  CurvesVertexToUniform
 	{
 		typename From::Ptr result = static_cast< From* >( Object::create( data->typeId() ).get() );
 		typename From::ValueType &trg = result->writable();
-		typename From::ValueType::const_iterator srcIt = data->readable().begin();
-
-		trg.reserve( m_curves->variableSize( PrimitiveVariable::Uniform ) );
-
-		const std::vector<int> &offsets = m_curves->verticesPerCurve()->readable();
-		for( std::vector<int>::const_iterator oIt = offsets.begin(); oIt != offsets.end(); ++oIt )
-		{
-			Canceller::check( m_canceller );
-			// initialize with the first value to avoid
-			// ambiguitity during default construction
-			typename From::ValueType::value_type total = *srcIt;
-			++srcIt;
-
-			for( int i = 1; i < *oIt; ++i, ++srcIt )
-			{
-				total += *srcIt;
-			}
-
-			trg.push_back( total / *oIt );
-		}
-
-		IECoreScene::PrimitiveVariableAlgos::GeometricInterpretationCopier<From> copier;
-		copier( data, result.get() );
+		const typename From::ValueType &src = data->readable();
 
-		return result;
-	}
-
-	const CurvesPrimitive *m_curves;
-	const Canceller *m_canceller;
-};
-
-struct  CurvesUniformToVarying
-{
-	typedef DataPtr ReturnType;
-
-	CurvesUniformToVarying( const CurvesPrimitive *curves, const Canceller *canceller ) : m_curves( curves ), m_canceller( canceller )
-	{
-	}
-
-	template<typename From> ReturnType operator()( typename From::ConstPtr data )
-	{
-		typename From::Ptr result = static_cast< From* >( Object::create( data->typeId() ).get() );
-		typename From::ValueType &trg = result->writable();
-		typename From::ValueType::const_iterator srcIt = data->readable().begin();
-
-		trg.reserve( m_curves->variableSize( PrimitiveVariable::Varying ) );
-
-		size_t numCurves = m_curves->numCurves();
-		for( size_t i = 0; i < numCurves; ++i, ++srcIt )
-		{
-			Canceller::check( m_canceller );
-			const size_t varyingSize = m_curves->variableSize( PrimitiveVariable::Varying, i );
-			for( size_t j = 0; j < varyingSize; ++j )
-			{
-				trg.push_back( *srcIt );
-			}
-		}
-
-		IECoreScene::PrimitiveVariableAlgos::GeometricInterpretationCopier<From> copier;
-		copier( data.get(), result.get() );
-
-		return result;
-	}
-
-	const CurvesPrimitive *m_curves;
-	const Canceller *m_canceller;
-};
-
-struct  CurvesVaryingToUniform
-{
-	typedef DataPtr ReturnType;
-
-	CurvesVaryingToUniform( const CurvesPrimitive *curves, const Canceller *canceller ) : m_curves( curves ), m_canceller( canceller )
-	{
-	}
-
-	template<typename From> ReturnType operator()( const From* data )
-	{
-		typename From::Ptr result = static_cast< From* >( Object::create( data->typeId() ).get() );
-		typename From::ValueType &trg = result->writable();
-		typename From::ValueType::const_iterator srcIt = data->readable().begin();
-
-		trg.reserve( m_curves->variableSize( PrimitiveVariable::Uniform ) );
-
-		size_t numCurves = m_curves->numCurves();
-		for( size_t i = 0; i < numCurves; ++i )
-		{
-			Canceller::check( m_canceller );
-			// initialize with the first value to avoid
-			// ambiguitity during default construction
-			typename From::ValueType::value_type total = *srcIt;
-			++srcIt;
+		trg.resize( m_offsets.size() - 1 );
 
-			const size_t varyingSize = m_curves->variableSize( PrimitiveVariable::Varying, i );
-			for( size_t j = 1; j < varyingSize; ++j, ++srcIt )
+		const std::vector<int> &offsets = m_offsets;
+		const Canceller *canceller = m_canceller;
+		tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+		tbb::parallel_for(
+			tbb::blocked_range<size_t>( 0, trg.size() ),
+			[&src, &trg, &offsets, canceller] ( const tbb::blocked_range<size_t> &range )
 			{
-				total += *srcIt;
-			}
-
-			trg.push_back( total / varyingSize );
-		}
+				Canceller::check( canceller );
+				for( size_t i = range.begin(); i != range.end(); ++i )
+				{
+					// initialize with the first value to avoid
+					// ambiguitity during default construction
+					typename From::ValueType::value_type total = src[offsets[i]];
+					for( int j = offsets[i] + 1; j < offsets[i+1]; ++j )
+					{
+						total += src[j];
+					}
+
+					trg[i] = total / ( offsets[i+1] - offsets[i] );
+				}
+			},
+			taskGroupContext
+		);
 
 		IECoreScene::PrimitiveVariableAlgos::GeometricInterpretationCopier<From> copier;
 		copier( data, result.get() );
@@ -257,15 +201,18 @@ struct  CurvesVaryingToUniform
 		return result;
 	}
 
-	const CurvesPrimitive *m_curves;
+	const std::vector<int> m_offsets;
 	const Canceller *m_canceller;
 };
 
-struct  CurvesVertexToVarying
+// Evaluates a primitive variable at evenly spaced positions along each curve.
+// Used for resampling between Vertex and Varying/FaceVarying.
+struct CurvesEvaluateAlongCurves
 {
 	typedef DataPtr ReturnType;
 
-	CurvesVertexToVarying( const CurvesPrimitive *curves, const Canceller *canceller ) : m_curves( curves ), m_canceller( canceller )
+	CurvesEvaluateAlongCurves( const CurvesPrimitive *curves, PrimitiveVariable::Interpolation interpolation, const Canceller *canceller )
+		:	m_curves( curves ), m_interpolation( interpolation ), m_canceller( canceller )
 	{
 	}
 
@@ -274,8 +221,6 @@ struct  CurvesVertexToVarying
 		typename From::Ptr result = static_cast< From* >( Object::create( data->typeId() ).get() );
 		typename From::ValueType &trg = result->writable();
 
-		trg.reserve( m_curves->variableSize( PrimitiveVariable::Varying ) );
-
 		const PrimitiveVariable *primVar = nullptr;
 		for( PrimitiveVariableMap::const_iterator it = m_curves->variables.begin(); it != m_curves->variables.end(); ++it )
 		{
@@ -293,22 +238,35 @@ struct  CurvesVertexToVarying
 		}
 
 		ConstCurvesPrimitiveEvaluatorPtr evaluator = new CurvesPrimitiveEvaluator( m_curves );
-		PrimitiveEvaluator::ResultPtr evaluatorResult = evaluator->createResult();
 
-		size_t numCurves = m_curves->numCurves();
-		for( size_t i = 0; i < numCurves; ++i )
-		{
-			Canceller::check( m_canceller );
-			size_t numSegments = m_curves->numSegments( i );
-			float step = 1.0f / numSegments;
-
-			const size_t varyingSize = m_curves->variableSize( PrimitiveVariable::Varying, i );
-			for( size_t j = 0; j < varyingSize; ++j )
+		const std::vector<int> offsets = PrimitiveVariableAlgos::curveOffsets( m_curves, m_interpolation );
+		trg.resize( offsets.back() );
+
+		// The Vertex samples are spaced by the number of vertices, and the Varying
+		// samples by the number of segments.
+		const CurvesPrimitive *curves = m_curves;
+		const bool toVertex = m_interpolation == PrimitiveVariable::Vertex;
+		const Canceller *canceller = m_canceller;
+		tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+		tbb::parallel_for(
+			tbb::blocked_range<size_t>( 0, offsets.size() - 1 ),
+			[&trg, &offsets, &evaluator, primVar, curves, toVertex, canceller] ( const tbb::blocked_range<size_t> &range )
 			{
-				evaluator->pointAtV( i, j * step, evaluatorResult.get() );
-				trg.push_back( evalPrimVar<typename From::ValueType::value_type>( evaluatorResult.get(), *primVar ) );
-			}
-		}
+				PrimitiveEvaluator::ResultPtr evaluatorResult = evaluator->createResult();
+				for( size_t i = range.begin(); i != range.end(); ++i )
+				{
+					Canceller::check( canceller );
+					const int size = offsets[i+1] - offsets[i];
+					const float step = 1.0f / ( toVertex ? size : curves->numSegments( i ) );
+					for( int j = 0; j < size; ++j )
+					{
+						evaluator->pointAtV( i, j * step, evaluatorResult.get() );
+						trg[offsets[i] + j] = evalPrimVar<typename From::ValueType::value_type>( evaluatorResult.get(), *primVar );
+					}
+				}
+			},
+			taskGroupContext
+		);
 
 		IECoreScene::PrimitiveVariableAlgos::GeometricInterpretationCopier<From> copier;
 		copier( data, result.get() );
@@ -317,88 +275,105 @@ struct  CurvesVertexToVarying
 	}
 
 	const CurvesPrimitive *m_curves;
+	const PrimitiveVariable::Interpolation m_interpolation;
 	const Canceller *m_canceller;
 };
 
-struct CurvesVaryingToVertex
+template<typename T>
+CurvesPrimitivePtr deleteCurves(
+	const CurvesPrimitive *curvesPrimitive,
+	PrimitiveVariable::IndexedView<T>& deleteFlagView,
+	bool invert,
+	const Canceller *canceller
+)
 {
-	typedef DataPtr ReturnType;
-
-	CurvesVaryingToVertex( const CurvesPrimitive *curves, const Canceller *canceller ) : m_curves( curves ), m_canceller( canceller )
-	{
-	}
-
-	template<typename From> ReturnType operator()( const From* data )
-	{
-		typename From::Ptr result = static_cast< From* >( Object::create( data->typeId() ).get() );
-		typename From::ValueType &trg = result->writable();
+	const std::vector<int> &inputVerticesPerCurve = curvesPrimitive->verticesPerCurve()->readable();
+	const int numCurves = inputVerticesPerCurve.size();
 
-		trg.reserve( m_curves->variableSize( PrimitiveVariable::Vertex ) );
+	tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
 
+	// Find the curves we're keeping, and number them in order
 
-		const PrimitiveVariable *primVar = nullptr;
-		for( PrimitiveVariableMap::const_iterator it = m_curves->variables.begin(); it != m_curves->variables.end(); ++it )
+	Canceller::check( canceller );
+	std::vector<int> keepCurve( numCurves );
+	tbb::parallel_for( tbb::blocked_range<int>( 0, numCurves ),
+		[&keepCurve, &deleteFlagView, invert] ( const tbb::blocked_range<int> &range )
 		{
-			if( it->second.data->isEqualTo( data ) )
+			for( int i = range.begin(); i != range.end(); ++i )
 			{
-				primVar = &it->second;
-				break;
+				keepCurve[i] = static_cast<bool>( deleteFlagView[i] ) == invert;
 			}
-		}
-
-		if( !primVar )
-		{
-			return nullptr;
-		}
+		},
+		taskGroupContext
+	);
 
-		ConstCurvesPrimitiveEvaluatorPtr evaluator = new CurvesPrimitiveEvaluator( m_curves );
-		PrimitiveEvaluator::ResultPtr evaluatorResult = evaluator->createResult();
+	Canceller::check( canceller );
+	std::vector<int> outputCurveIndices;
+	std::vector<int> keptCurves( PrimitiveVariableAlgos::exclusiveScan( keepCurve, outputCurveIndices ) );
 
-		size_t numCurves = m_curves->numCurves();
-		const std::vector<int> &verticesPerCurve = evaluator->verticesPerCurve();
-		for( size_t i = 0; i < numCurves; ++i )
+	tbb::parallel_for( tbb::blocked_range<int>( 0, numCurves ),
+		[&keepCurve, &outputCurveIndices, &keptCurves] ( const tbb::blocked_range<int> &range )
 		{
-			Canceller::check( m_canceller );
-			float step = 1.0f / verticesPerCurve[i];
-			for( int j = 0; j < verticesPerCurve[i]; ++j )
+			for( int i = range.begin(); i != range.end(); ++i )
 			{
-				evaluator->pointAtV( i, j * step, evaluatorResult.get() );
-				trg.push_back( evalPrimVar<typename From::ValueType::value_type>( evaluatorResult.get(), *primVar ) );
+				if( keepCurve[i] )
+				{
+					keptCurves[outputCurveIndices[i]] = i;
+				}
 			}
-		}
+		},
+		taskGroupContext
+	);
 
-		IECoreScene::PrimitiveVariableAlgos::GeometricInterpretationCopier<From> copier;
-		copier( data, result.get() );
+	// Find the vertex and varying elements we're keeping. Curves are variable
+	// length, so the output position of each curve comes from a prefix sum of
+	// the lengths of the kept curves.
 
-		return result;
-	}
+	auto keptElements = [&keptCurves, curvesPrimitive, &taskGroupContext, canceller] ( PrimitiveVariable::Interpolation interpolation )
+	{
+		Canceller::check( canceller );
+		const std::vector<int> inputOffsets = PrimitiveVariableAlgos::curveOffsets( curvesPrimitive, interpolation );
 
-	const CurvesPrimitive *m_curves;
-	const Canceller *m_canceller;
-};
+		std::vector<int> sizes( keptCurves.size() );
+		tbb::parallel_for( tbb::blocked_range<size_t>( 0, keptCurves.size() ),
+			[&sizes, &keptCurves, &inputOffsets] ( const tbb::blocked_range<size_t> &range )
+			{
+				for( size_t i = range.begin(); i != range.end(); ++i )
+				{
+					sizes[i] = inputOffsets[keptCurves[i]+1] - inputOffsets[keptCurves[i]];
+				}
+			},
+			taskGroupContext
+		);
 
+		Canceller::check( canceller );
+		std::vector<int> outputOffsets;
+		std::vector<int> result( PrimitiveVariableAlgos::exclusiveScan( sizes, outputOffsets ) );
 
-template<typename T>
-CurvesPrimitivePtr deleteCurves(
-	const CurvesPrimitive *curvesPrimitive,
-	PrimitiveVariable::IndexedView<T>& deleteFlagView,
-	bool invert,
-	const Canceller *canceller
-)
-{
-	IECoreScene::PrimitiveVariableAlgos::DeleteFlaggedUniformFunctor<T> deleteUniformFn( deleteFlagView, invert );
-	IECoreScene::PrimitiveVariableAlgos::DeleteFlaggedVaryingFunctor<T> deleteVaryingFn ( deleteFlagView, curvesPrimitive, invert );
-	IECoreScene::PrimitiveVariableAlgos::DeleteFlaggedVertexFunctor<T> deleteVertexFn(
-		curvesPrimitive->variableSize( PrimitiveVariable::Vertex ),
-		/* vertexIds */ nullptr,
-		curvesPrimitive->verticesPerCurve(),
-		deleteFlagView,
-		invert
-	);
+		tbb::parallel_for( tbb::blocked_range<size_t>( 0, keptCurves.size() ),
+			[&result, &keptCurves, &inputOffsets, &outputOffsets, &sizes, canceller] ( const tbb::blocked_range<size_t> &range )
+			{
+				Canceller::check( canceller );
+				for( size_t i = range.begin(); i != range.end(); ++i )
+				{
+					std::iota( result.begin() + outputOffsets[i], result.begin() + outputOffsets[i] + sizes[i], inputOffsets[keptCurves[i]] );
+				}
+			},
+			taskGroupContext
+		);
 
-	const IECore::Data *inputVertsPerCurve = IECore::runTimeCast<const IECore::Data>( curvesPrimitive->verticesPerCurve() );
+		return result;
+	};
+
+	const std::vector<int> keptVertices = keptElements( PrimitiveVariable::Vertex );
+	const std::vector<int> keptVaryings = keptElements( PrimitiveVariable::Varying );
 
-	IECoreScene::PrimitiveVariableAlgos::IndexedData outputVertsPerCurve = dispatch( inputVertsPerCurve, deleteUniformFn );
+	IECoreScene::PrimitiveVariableAlgos::GatherFunctor uniformFn( keptCurves, canceller );
+	IECoreScene::PrimitiveVariableAlgos::GatherFunctor varyingFn( keptVaryings, canceller );
+	IECoreScene::PrimitiveVariableAlgos::GatherFunctor vertexFn( keptVertices, canceller );
+
+	uniformFn.setIndices( nullptr );
+	IECoreScene::PrimitiveVariableAlgos::IndexedData outputVertsPerCurve = dispatch( curvesPrimitive->verticesPerCurve(), uniformFn );
 
 	IntVectorDataPtr verticesPerCurve = IECore::runTimeCast<IECore::IntVectorData>( outputVertsPerCurve.data );
 
@@ -424,8 +399,8 @@ CurvesPrimitivePtr deleteCurves(
 			case PrimitiveVariable::Uniform:
 			{
 				const IECore::Data *inputData = it->second.data.get();
-				deleteUniformFn.setIndices( it->second.indices.get() );
-				IECoreScene::PrimitiveVariableAlgos::IndexedData outputData = dispatch( inputData, deleteUniformFn );
+				uniformFn.setIndices( it->second.indices.get() );
+				IECoreScene::PrimitiveVariableAlgos::IndexedData outputData = dispatch( inputData, uniformFn );
 				outCurvesPrimitive->variables[it->first] = PrimitiveVariable( it->second.interpolation, outputData.data, outputData.indices );
 
 				break;
@@ -434,8 +409,8 @@ CurvesPrimitivePtr deleteCurves(
 			case PrimitiveVariable::FaceVarying:
 			{
 				const IECore::Data *inputData = it->second.data.get();
-				deleteVaryingFn.setIndices( it->second.indices.get() );
-				IECoreScene::PrimitiveVariableAlgos::IndexedData outputData = dispatch( inputData, deleteVaryingFn );
+				varyingFn.setIndices( it->second.indices.get() );
+				IECoreScene::PrimitiveVariableAlgos::IndexedData outputData = dispatch( inputData, varyingFn );
 				outCurvesPrimitive->variables[it->first] = PrimitiveVariable( it->second.interpolation, outputData.data, outputData.indices );
 
 				break;
@@ -443,8 +418,8 @@ CurvesPrimitivePtr deleteCurves(
 			case PrimitiveVariable::Vertex:
 			{
 				const IECore::Data *inputData = it->second.data.get();
-				deleteVertexFn.setIndices( it->second.indices.get() );
-				IECoreScene::PrimitiveVariableAlgos::IndexedData outputData = dispatch( inputData, deleteVertexFn );
+				vertexFn.setIndices( it->second.indices.get() );
+				IECoreScene::PrimitiveVariableAlgos::IndexedData outputData = dispatch( inputData, vertexFn );
 				outCurvesPrimitive->variables[it->first] = PrimitiveVariable( it->second.interpolation, outputData.data, outputData.indices );
 				break;
 			}
@@ -475,13 +450,13 @@ void resamplePrimitiveVariable( const CurvesPrimitive *curves, PrimitiveVariable
 	{
 		if( primitiveVariable.interpolation == PrimitiveVariable::Vertex && ( interpolation == PrimitiveVariable::Varying || interpolation == PrimitiveVariable::FaceVarying ) )
 		{
-			// \todo: fix CurvesVertexToVarying so it works with arbitrary PrimitiveVariables
+			// \todo: fix CurvesEvaluateAlongCurves so it works with arbitrary PrimitiveVariables
 			// rather than requiring the variables exist on the input CurvesPrimitive.
 			throw InvalidArgumentException( "CurvesAlgo::resamplePrimitiveVariable : Resampling indexed Vertex variables to FaceVarying/Varying is not currently supported. Expand indices first." );
 		}
 		else if( ( primitiveVariable.interpolation == PrimitiveVariable::Varying || primitiveVariable.interpolation == PrimitiveVariable::FaceVarying ) && interpolation == PrimitiveVariable::Vertex )
 		{
-			// \todo: fix CurvesVaryingToVertex so it works with arbitrary PrimitiveVariables
+			// \todo: fix CurvesEvaluateAlongCurves so it works with arbitrary PrimitiveVariables
 			// rather than requiring the variables exist on the input CurvesPrimitive.
 			throw InvalidArgumentException( "CurvesAlgo::resamplePrimitiveVariable : Resampling indexed FaceVarying/Varying variables to Vertex is not currently supported. Expand indices first." );
 		}
@@ -524,39 +499,39 @@ void resamplePrimitiveVariable( const CurvesPrimitive *curves, PrimitiveVariable
 	{
 		if ( primitiveVariable.interpolation == PrimitiveVariable::Vertex )
 		{
-			CurvesVertexToUniform fn( curves, canceller );
+			CurvesVertexToUniform fn( curves, PrimitiveVariable::Vertex, canceller );
 			dstData = despatchTypedData<CurvesVertexToUniform, Detail::IsArithmeticVectorTypedData>( const_cast< Data * >( srcData.get() ), fn );
 		}
 		else if ( primitiveVariable.interpolation == PrimitiveVariable::Varying || primitiveVariable.interpolation == PrimitiveVariable::FaceVarying )
 		{
-			CurvesVaryingToUniform fn( curves, canceller );
-			dstData = despatchTypedData<CurvesVaryingToUniform, Detail::IsArithmeticVectorTypedData>( const_cast< Data * >( srcData.get() ), fn );
+			CurvesVertexToUniform fn( curves, PrimitiveVariable::Varying, canceller );
+			dstData = despatchTypedData<CurvesVertexToUniform, Detail::IsArithmeticVectorTypedData>( const_cast< Data * >( srcData.get() ), fn );
 		}
 	}
 	else if ( interpolation == PrimitiveVariable::Vertex )
 	{
 		if ( primitiveVariable.interpolation == PrimitiveVariable::Uniform )
 		{
-			CurvesUniformToVertex fn( curves->verticesPerCurve()->readable(), canceller );
+			CurvesUniformToVertex fn( curves, PrimitiveVariable::Vertex, canceller );
 			dstData = despatchTypedData<CurvesUniformToVertex, TypeTraits::IsNumericBasedVectorTypedData>( const_cast< Data * >( srcData.get() ), fn );
 		}
 		else if ( primitiveVariable.interpolation == PrimitiveVariable::Varying || primitiveVariable.interpolation == PrimitiveVariable::FaceVarying )
 		{
-			CurvesVaryingToVertex fn( curves, canceller );
-			dstData = despatchTypedData<CurvesVaryingToVertex, IsPrimitiveEvaluatableTypedData>( const_cast< Data * >( srcData.get() ), fn );
+			CurvesEvaluateAlongCurves fn( curves, PrimitiveVariable::Vertex, canceller );
+			dstData = despatchTypedData<CurvesEvaluateAlongCurves, IsPrimitiveEvaluatableTypedData>( const_cast< Data * >( srcData.get() ), fn );
 		}
 	}
 	else if ( interpolation == PrimitiveVariable::Varying || interpolation == PrimitiveVariable::FaceVarying )
 	{
 		if ( primitiveVariable.interpolation == PrimitiveVariable::Uniform )
 		{
-			CurvesUniformToVarying fn( curves, canceller );
-			dstData = despatchTypedData<CurvesUniformToVarying, TypeTraits::IsNumericBasedVectorTypedData>( const_cast< Data * >( srcData.get()), fn );
+			CurvesUniformToVertex fn( curves, PrimitiveVariable::Varying, canceller );
+			dstData = despatchTypedData<CurvesUniformToVertex, TypeTraits::IsNumericBasedVectorTypedData>( const_cast< Data * >( srcData.get()), fn );
 		}
 		else if ( primitiveVariable.interpolation == PrimitiveVariable::Vertex )
 		{
-			CurvesVertexToVarying fn( curves, canceller );
-			dstData = despatchTypedData<CurvesVertexToVarying, IsPrimitiveEvaluatableTypedData>( const_cast< Data * >( srcData.get() ), fn );
+			CurvesEvaluateAlongCurves fn( curves, PrimitiveVariable::Varying, canceller );
+			dstData = despatchTypedData<CurvesEvaluateAlongCurves, IsPrimitiveEvaluatableTypedData>( const_cast< Data * >( srcData.get() ), fn );
 		}
 		else if ( primitiveVariable.interpolation == PrimitiveVariable::Varying || primitiveVariable.interpolation == PrimitiveVariable::FaceVarying )
 		{
@@ -34,11 +34,17 @@
 
 #include "IECoreScene/CurvesAlgo.h"
 
+#include "IECoreScene/private/PrimitiveVariableAlgos.h"
+
 #include "IECore/DataAlgo.h"
 
+#include "tbb/blocked_range.h"
 #include "tbb/concurrent_unordered_map.h"
+#include "tbb/parallel_for.h"
 #include "tbb/task_group.h"
 
+#include <type_traits>
+
 using namespace IECore;
 using namespace IECoreScene;
 using namespace Imath;
@@ -48,47 +54,63 @@ namespace
 
 // For each curve of the vertex or varying primvars, change the number of replicated values at
 // the end by "adjustment", either adding or removing values at both ends, depending on the sign of
-// "adjustment"
+// "adjustment". The input offsets of each curve are given by "offsets", and the output offsets
+// follow directly from them, as every curve changes size by the same amount.
 template<typename T>
-void adjustEndPoints( const std::vector<T> &in, std::vector<T> &out, const CurvesPrimitive *curves, PrimitiveVariable::Interpolation interpolation, int adjustment )
+void adjustEndPoints( const std::vector<T> &in, std::vector<T> &out, const std::vector<int> &offsets, int adjustment, const Canceller *canceller )
 {
-	size_t numCurves = curves->numCurves();
-	out.reserve( in.size() + numCurves * 2 * adjustment );
+	const int numCurves = offsets.size() - 1;
 
-	size_t curveOffset = 0;
-	for( size_t i = 0; i < numCurves; ++i )
+	auto adjustCurve = [&in, &offsets, adjustment] ( int i, typename std::vector<T>::iterator outIt )
 	{
-		size_t size = curves->variableSize( interpolation, i );
+		const int curveOffset = offsets[i];
+		const int size = offsets[i+1] - curveOffset;
 
 		if( adjustment < 0 )
 		{
 			// Skip -adjustment vertices at the start and end
-			for( size_t j = -adjustment; j < size + adjustment; ++j )
+			if( size + 2 * adjustment <= 0 )
 			{
-				out.push_back( in[curveOffset + j] );
+				return;
 			}
+			std::copy( in.begin() + curveOffset - adjustment, in.begin() + curveOffset + size + adjustment, outIt );
 		}
 		else
 		{
 			// duplicate the start point
-			for( size_t j = 0; j < (size_t)adjustment; ++j )
-			{
-				out.push_back( in[curveOffset] );
-			}
+			outIt = std::fill_n( outIt, adjustment, in[curveOffset] );
+			outIt = std::copy( in.begin() + curveOffset, in.begin() + curveOffset + size, outIt );
+			// duplicate the end point
+			std::fill_n( outIt, adjustment, in[curveOffset + size - 1] );
+		}
+	};
 
-			for( size_t j = 0; j < size; ++j )
-			{
-				out.push_back( in[curveOffset + j] );
-			}
+	out.resize( (int)in.size() + numCurves * 2 * adjustment );
 
-			// duplicate the end point 
-			for( size_t j = 0; j < (size_t)adjustment; ++j )
-			{
-				out.push_back( in[curveOffset + size - 1] );
-			}
+	if constexpr( std::is_same_v<T, bool> )
+	{
+		// Elements of `std::vector<bool>` can't be written
+		// concurrently, so we must process them serially.
+		for( int i = 0; i < numCurves; ++i )
+		{
+			adjustCurve( i, out.begin() + offsets[i] + i * 2 * adjustment );
 		}
-
-		curveOffset += size;
+	}
+	else
+	{
+		tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+		tbb::parallel_for(
+			tbb::blocked_range<int>( 0, numCurves ),
+			[&out, &offsets, &adjustCurve, adjustment, canceller] ( const tbb::blocked_range<int> &range )
+			{
+				Canceller::check( canceller );
+				for( int i = range.begin(); i != range.end(); ++i )
+				{
+					adjustCurve( i, out.begin() + offsets[i] + i * 2 * adjustment );
+				}
+			},
+			taskGroupContext
+		);
 	}
 }
 
@@ -119,8 +141,19 @@ int requiredMultiplicity( const IECore::CubicBasisf &cubicBasis )
 
 struct DuplicateEndPoints
 {
-	DuplicateEndPoints( int vertexAdjustment, int varyingAdjustment ) : m_vertexAdjustment( vertexAdjustment ), m_varyingAdjustment( varyingAdjustment )
+	DuplicateEndPoints( const CurvesPrimitive *curves, int vertexAdjustment, int varyingAdjustment, const Canceller *canceller )
+		:	m_vertexAdjustment( vertexAdjustment ), m_varyingAdjustment( varyingAdjustment ), m_canceller( canceller )
 	{
+		// The offsets are shared by all primitive variables, so we compute
+		// them up front rather than once per variable.
+		if( m_vertexAdjustment )
+		{
+			m_vertexOffsets = PrimitiveVariableAlgos::curveOffsets( curves, PrimitiveVariable::Vertex );
+		}
+		if( m_varyingAdjustment )
+		{
+			m_varyingOffsets = PrimitiveVariableAlgos::curveOffsets( curves, PrimitiveVariable::Varying );
+		}
 	}
 
 	// template template parameter 'S' to capture if the input type is either TypedData or GeometricTypedData
@@ -132,10 +165,16 @@ struct DuplicateEndPoints
 		const std::vector<T> &in = data->readable();
 		typename S<std::vector<T>>::Ptr newOut = new S<std::vector<T>>();
 
-
-		int adjustment = primVar.interpolation == PrimitiveVariable::Vertex ? m_vertexAdjustment : m_varyingAdjustment;
-
-		adjustEndPoints( in, newOut->writable(), curves, primVar.interpolation, adjustment );
+		const bool vertex = primVar.interpolation == PrimitiveVariable::Vertex;
+		const int adjustment = vertex ? m_vertexAdjustment : m_varyingAdjustment;
+		if( adjustment )
+		{
+			adjustEndPoints( in, newOut->writable(), vertex ? m_vertexOffsets : m_varyingOffsets, adjustment, m_canceller );
+		}
+		else
+		{
+			newOut->writable() = in;
+		}
 
 		setGeometricInterpretation( newOut.get(), getGeometricInterpretation( data ) );
 
@@ -148,6 +187,8 @@ struct DuplicateEndPoints
 	}
 
 	int m_vertexAdjustment, m_varyingAdjustment;
+	std::vector<int> m_vertexOffsets, m_varyingOffsets;
+	const Canceller *m_canceller;
 
 };
 
@@ -171,12 +212,10 @@ CurvesPrimitivePtr IECoreScene::CurvesAlgo::updateEndpointMultiplicity( const IE
 		return curves->copy();
 	}
 
-	DuplicateEndPoints endPointDuplicator( vertexAdjustment, varyingAdjustment );
+	DuplicateEndPoints endPointDuplicator( curves, vertexAdjustment, varyingAdjustment, canceller );
 
 	// enqueue a task for each primitive variable and another for the topology update
 	// note we have to write the new primvars to tbb concurrent_unordered map before updating the primitives primvars in serial
-	// todo : we should be able to thread the adjustEndPoint function but this would require a parallel reduce to calculate
-	// offsets.
 	tbb::task_group taskGroup;
 	tbb::concurrent_unordered_map<std::string, IECoreScene::PrimitiveVariable, std::hash<std::string>> newPrimVars;
 	for( const auto &it : curves->variables )
@@ -38,6 +38,11 @@
 #include "IECore/DespatchTypedData.h"
 #include "IECore/DataAlgo.h"
 
+#include "tbb/blocked_range.h"
+#include "tbb/parallel_for.h"
+
+#include <atomic>
+
 using namespace Imath;
 using namespace IECore;
 using namespace IECoreScene;
@@ -151,44 +156,148 @@ void deleteCreases( MeshPrimitive *out, const MeshPrimitive *in, const std::vect
 template<typename T>
 MeshPrimitivePtr deleteFaces( const MeshPrimitive *meshPrimitive, PrimitiveVariable::IndexedView<T> &deleteFlagView, bool invert, const Canceller *canceller )
 {
-	// construct 3 functors for deleting (uniform, vertex & face varying) primvars
-	IECoreScene::PrimitiveVariableAlgos::DeleteFlaggedUniformFunctor<T> uniformFunctor( deleteFlagView, invert );
-	IECoreScene::PrimitiveVariableAlgos::DeleteFlaggedFaceVaryingFunctor<T> faceVaryingFunctor( deleteFlagView, meshPrimitive->verticesPerFace(), invert );
-	IECoreScene::PrimitiveVariableAlgos::DeleteFlaggedVertexFunctor<T> vertexFunctor(
-		meshPrimitive->variableSize( PrimitiveVariable::Vertex ), meshPrimitive->vertexIds(), meshPrimitive->verticesPerFace(), deleteFlagView, invert );
-
-	// filter verticesPerFace using DeleteFlaggedUniformFunctor
-	const IECore::Data *inputVerticesPerFace = IECore::runTimeCast<const IECore::Data>( meshPrimitive->verticesPerFace() );
-	uniformFunctor.setIndices( nullptr );
-	IECoreScene::PrimitiveVariableAlgos::IndexedData outputVerticesPerFace = dispatch( inputVerticesPerFace, uniformFunctor );
-	IntVectorDataPtr verticesPerFace = IECore::runTimeCast<IECore::IntVectorData>( outputVerticesPerFace.data );
-
-	// filter VertexIds using DeleteFlaggedFaceVaryingFunctor
-	const IECore::Data *inputVertexIds = IECore::runTimeCast<const IECore::Data>( meshPrimitive->vertexIds() );
-	faceVaryingFunctor.setIndices( nullptr );
-	IECoreScene::PrimitiveVariableAlgos::IndexedData outputVertexIds = dispatch( inputVertexIds, faceVaryingFunctor );
-
-	// remap the indices also
-	ConstIntVectorDataPtr remappingData = vertexFunctor.getRemapping();
-	const std::vector<int> &remapping = remappingData->readable();
-	IntVectorDataPtr vertexIdsData = IECore::runTimeCast<IECore::IntVectorData>( outputVertexIds.data );
-	IntVectorData::ValueType &vertexIds = vertexIdsData->writable();
-	for( size_t i = 0; i < vertexIds.size(); ++i )
-	{
-		if( i % 1000 == 0 )
+	const std::vector<int> &inputVerticesPerFace = meshPrimitive->verticesPerFace()->readable();
+	const std::vector<int> &inputVertexIds = meshPrimitive->vertexIds()->readable();
+	const int numFaces = inputVerticesPerFace.size();
+	const int numVertices = meshPrimitive->variableSize( PrimitiveVariable::Vertex );
+
+	tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+
+	// Find the faces we're keeping, and number them in order
+
+	Canceller::check( canceller );
+	std::vector<int> keepFace( numFaces );
+	tbb::parallel_for( tbb::blocked_range<int>( 0, numFaces ),
+		[&keepFace, &deleteFlagView, invert] ( const tbb::blocked_range<int> &range )
+		{
+			for( int i = range.begin(); i != range.end(); ++i )
+			{
+				keepFace[i] = static_cast<bool>( deleteFlagView[i] ) == invert;
+			}
+		},
+		taskGroupContext
+	);
+
+	Canceller::check( canceller );
+	std::vector<int> outputFaceIndices;
+	std::vector<int> keptFaces( PrimitiveVariableAlgos::exclusiveScan( keepFace, outputFaceIndices ) );
+
+	Canceller::check( canceller );
+	std::vector<int> inputFaceOffsets;
+	PrimitiveVariableAlgos::exclusiveScan( inputVerticesPerFace, inputFaceOffsets );
+
+	IntVectorDataPtr verticesPerFaceData = new IntVectorData;
+	std::vector<int> &verticesPerFace = verticesPerFaceData->writable();
+	verticesPerFace.resize( keptFaces.size() );
+
+	tbb::parallel_for( tbb::blocked_range<int>( 0, numFaces ),
+		[&keepFace, &outputFaceIndices, &keptFaces, &verticesPerFace, &inputVerticesPerFace] ( const tbb::blocked_range<int> &range )
+		{
+			for( int i = range.begin(); i != range.end(); ++i )
+			{
+				if( keepFace[i] )
+				{
+					keptFaces[outputFaceIndices[i]] = i;
+					verticesPerFace[outputFaceIndices[i]] = inputVerticesPerFace[i];
+				}
+			}
+		},
+		taskGroupContext
+	);
+
+	// Find the face vertices we're keeping, and mark the vertices they use
+
+	Canceller::check( canceller );
+	std::vector<int> outputFaceOffsets;
+	std::vector<int> keptFaceVertices( PrimitiveVariableAlgos::exclusiveScan( verticesPerFace, outputFaceOffsets ) );
+
+	Canceller::check( canceller );
+	std::vector<std::atomic<bool>> usedVertices( numVertices );
+
+	tbb::parallel_for( tbb::blocked_range<size_t>( 0, keptFaces.size() ),
+		[&keptFaces, &verticesPerFace, &outputFaceOffsets, &inputFaceOffsets, &keptFaceVertices, &usedVertices, &inputVertexIds, canceller] ( const tbb::blocked_range<size_t> &range )
 		{
 			Canceller::check( canceller );
-		}
+			for( size_t i = range.begin(); i != range.end(); ++i )
+			{
+				const int inputOffset = inputFaceOffsets[keptFaces[i]];
+				const int outputOffset = outputFaceOffsets[i];
+				for( int v = 0; v < verticesPerFace[i]; ++v )
+				{
+					keptFaceVertices[outputOffset + v] = inputOffset + v;
+					usedVertices[inputVertexIds[inputOffset + v]].store( true, std::memory_order_relaxed );
+				}
+			}
+		},
+		taskGroupContext
+	);
 
-		vertexIds[i] = remapping[vertexIds[i]];
-	}
+	// Number the used vertices in order
+
+	Canceller::check( canceller );
+	std::vector<int> usedVertexFlags( numVertices );
+	tbb::parallel_for( tbb::blocked_range<int>( 0, numVertices ),
+		[&usedVertexFlags, &usedVertices] ( const tbb::blocked_range<int> &range )
+		{
+			for( int i = range.begin(); i != range.end(); ++i )
+			{
+				usedVertexFlags[i] = usedVertices[i].load( std::memory_order_relaxed );
+			}
+		},
+		taskGroupContext
+	);
+
+	Canceller::check( canceller );
+	std::vector<int> remapping;
+	std::vector<int> keptVertices( PrimitiveVariableAlgos::exclusiveScan( usedVertexFlags, remapping ) );
+
+	tbb::parallel_for( tbb::blocked_range<int>( 0, numVertices ),
+		[&usedVertexFlags, &remapping, &keptVertices] ( const tbb::blocked_range<int> &range )
+		{
+			for( int i = range.begin(); i != range.end(); ++i )
+			{
+				if( usedVertexFlags[i] )
+				{
+					keptVertices[remapping[i]] = i;
+				}
+				else
+				{
+					remapping[i] = -1;
+				}
+			}
+		},
+		taskGroupContext
+	);
+
+	// Remap the vertex ids
+
+	Canceller::check( canceller );
+	IntVectorDataPtr vertexIdsData = new IntVectorData;
+	std::vector<int> &vertexIds = vertexIdsData->writable();
+	vertexIds.resize( keptFaceVertices.size() );
+
+	tbb::parallel_for( tbb::blocked_range<size_t>( 0, keptFaceVertices.size() ),
+		[&vertexIds, &remapping, &inputVertexIds, &keptFaceVertices, canceller] ( const tbb::blocked_range<size_t> &range )
+		{
+			Canceller::check( canceller );
+			for( size_t i = range.begin(); i != range.end(); ++i )
+			{
+				vertexIds[i] = remapping[inputVertexIds[keptFaceVertices[i]]];
+			}
+		},
+		taskGroupContext
+	);
 
 	// construct mesh without positions as they'll be set when filtering the primvars
-	MeshPrimitivePtr outMeshPrimitive = new MeshPrimitive( verticesPerFace, vertexIdsData, meshPrimitive->interpolation() );
+	MeshPrimitivePtr outMeshPrimitive = new MeshPrimitive( verticesPerFaceData, vertexIdsData, meshPrimitive->interpolation() );
 
 	deleteCorners( outMeshPrimitive.get(), meshPrimitive, remapping, canceller );
 	deleteCreases( outMeshPrimitive.get(), meshPrimitive, remapping, canceller );
 
+	IECoreScene::PrimitiveVariableAlgos::GatherFunctor uniformFunctor( keptFaces, canceller );
+	IECoreScene::PrimitiveVariableAlgos::GatherFunctor vertexFunctor( keptVertices, canceller );
+	IECoreScene::PrimitiveVariableAlgos::GatherFunctor faceVaryingFunctor( keptFaceVertices, canceller );
+
 	for( PrimitiveVariableMap::const_iterator it = meshPrimitive->variables.begin(), e = meshPrimitive->variables.end(); it != e; ++it )
 	{
 		Canceller::check( canceller );
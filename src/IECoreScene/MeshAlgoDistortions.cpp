@@ -34,6 +34,12 @@
 
 #include "IECoreScene/MeshAlgo.h"
 #include "IECoreScene/PolygonIterator.h"
+#include "IECoreScene/private/PrimitiveVariableAlgos.h"
+
+#include "tbb/blocked_range.h"
+#include "tbb/parallel_for.h"
+
+#include <algorithm>
 
 using namespace std;
 using namespace Imath;
@@ -76,6 +82,68 @@ struct VertexDistortion
 	}
 };
 
+// Lists the edges touching each of `numValues` values, where the value for
+// face vertex `i` is `indices ? (*indices)[i] : i`, and the edge starting at
+// face vertex `i` runs to face vertex `nextFaceVertex[i]`. The edges for each
+// value are ordered in the same way as they would be visited by a serial loop
+// over the edges, so that the results of accumulating them are identical.
+// Each edge is stored as `edge * 2 + end`, where `end` is 0 for the start of
+// the edge and 1 for the end. Returns offsets to the end of the list for each
+// value.
+std::vector<int> edgesForValues(
+	const vector<int> *indices, size_t numValues,
+	const vector<int> &nextFaceVertex, vector<int> &edges,
+	tbb::task_group_context &taskGroupContext, const Canceller *canceller
+)
+{
+	const size_t numFaceVertices = nextFaceVertex.size();
+	auto valueIndex = [indices] ( int i ) { return indices ? (*indices)[i] : i; };
+
+	Canceller::check( canceller );
+	vector<int> offsets( numValues, 0 );
+	for( size_t i = 0; i < numFaceVertices; ++i )
+	{
+		offsets[valueIndex( i )] += 2;
+	}
+
+	Canceller::check( canceller );
+	int numEdges = 0;
+	for( int &o : offsets )
+	{
+		int count = o;
+		o = numEdges;
+		numEdges += count;
+	}
+
+	Canceller::check( canceller );
+	edges.resize( numEdges );
+	for( size_t i = 0; i < numFaceVertices; ++i )
+	{
+		if( i % 1000 == 0 )
+		{
+			Canceller::check( canceller );
+		}
+		edges[offsets[valueIndex( i )]++] = i * 2;
+		edges[offsets[valueIndex( nextFaceVertex[i] )]++] = i * 2 + 1;
+	}
+
+	// Each list is built in order of the starting face vertex, so ends are added out of
+	// order wherever an edge wraps around from the last face vertex to the first. Lists
+	// are short, so we just sort them.
+	tbb::parallel_for( tbb::blocked_range<size_t>( 0, numValues ),
+		[&offsets, &edges] ( const tbb::blocked_range<size_t> &range )
+		{
+			for( size_t i = range.begin(); i != range.end(); ++i )
+			{
+				std::sort( edges.begin() + ( i ? offsets[i-1] : 0 ), edges.begin() + offsets[i] );
+			}
+		},
+		taskGroupContext
+	);
+
+	return offsets;
+}
+
 std::pair<PrimitiveVariable, PrimitiveVariable> calculateDistortionInternal(
 	const vector<int> &vertsPerFace,
 	const vector<int> &vertIds,
@@ -87,105 +155,138 @@ std::pair<PrimitiveVariable, PrimitiveVariable> calculateDistortionInternal(
 {
 	PrimitiveVariable::IndexedView<V2f> uvs( uvPrimitiveVariable );
 
-	Canceller::check( canceller );
-	vector<VertexDistortion> distortions;
-	distortions.resize( p.size() );
-
-	Canceller::check( canceller );
-	vector<UVDistortion> uvDistortions;
-	uvDistortions.resize( uvs.data().size() );
+	tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
 
-	size_t fvi0 = 0;
+	// Find the next face vertex around each face
 
-	for( size_t faceIndex = 0; faceIndex < vertsPerFace.size() ; faceIndex++ )
-	{
-		Canceller::check( canceller );
-		size_t firstFvi = fvi0;
-		unsigned vertex0 = vertIds[ fvi0 ];
-		Imath::V2f uv0( uvs[ fvi0 ] );
+	Canceller::check( canceller );
+	vector<int> faceOffsets;
+	PrimitiveVariableAlgos::exclusiveScan( vertsPerFace, faceOffsets );
 
-		for ( int v = 1; v <= vertsPerFace[faceIndex]; v++, fvi0++ )
+	vector<int> nextFaceVertex( vertIds.size() );
+	tbb::parallel_for( tbb::blocked_range<size_t>( 0, vertsPerFace.size() ),
+		[&nextFaceVertex, &vertsPerFace, &faceOffsets] ( const tbb::blocked_range<size_t> &range )
 		{
-			size_t fvi1 = fvi0 + 1;
-			if ( v == vertsPerFace[faceIndex] )
-			{
-				// final edge must also be computed...
-				fvi1 = firstFvi;
-			}
-			unsigned vertex1 = vertIds[ fvi1 ];
-			// compute distortion along the edge
-			const V3f &p0 = p[ vertex0 ];
-			const V3f &refP0 = pRef[ vertex0 ];
-			const V3f &p1 = p[ vertex1 ];
-			const V3f &refP1 = pRef[ vertex1 ];
-			V3f edge = p1 - p0;
-			V3f refEdge = refP1 - refP0;
-			float edgeLen = edge.length();
-			float refEdgeLen = refEdge.length();
-			float distortion = 0;
-			if ( edgeLen >= refEdgeLen )
+			for( size_t faceIndex = range.begin(); faceIndex != range.end(); ++faceIndex )
 			{
-				distortion = fabs((edgeLen / refEdgeLen) - 1.0f);
+				const int firstFvi = faceOffsets[faceIndex];
+				for( int v = 1; v < vertsPerFace[faceIndex]; ++v )
+				{
+					nextFaceVertex[firstFvi + v - 1] = firstFvi + v;
+				}
+				if( vertsPerFace[faceIndex] )
+				{
+					// final edge must also be computed...
+					nextFaceVertex[firstFvi + vertsPerFace[faceIndex] - 1] = firstFvi;
+				}
 			}
-			else
+		},
+		taskGroupContext
+	);
+
+	// Compute the distortion and uv direction along each edge
+
+	Canceller::check( canceller );
+	vector<float> edgeDistortions( vertIds.size() );
+	vector<V2f> edgeUVDirections( vertIds.size() );
+
+	tbb::parallel_for( tbb::blocked_range<size_t>( 0, vertIds.size() ),
+		[&edgeDistortions, &edgeUVDirections, &nextFaceVertex, &vertIds, &p, &pRef, &uvs, canceller] ( const tbb::blocked_range<size_t> &range )
+		{
+			Canceller::check( canceller );
+			for( size_t fvi0 = range.begin(); fvi0 != range.end(); ++fvi0 )
 			{
-				distortion = -fabs( (refEdgeLen / edgeLen) - 1.0f );
+				const size_t fvi1 = nextFaceVertex[fvi0];
+				const unsigned vertex0 = vertIds[ fvi0 ];
+				const unsigned vertex1 = vertIds[ fvi1 ];
+				// compute distortion along the edge
+				const V3f &p0 = p[ vertex0 ];
+				const V3f &refP0 = pRef[ vertex0 ];
+				const V3f &p1 = p[ vertex1 ];
+				const V3f &refP1 = pRef[ vertex1 ];
+				V3f edge = p1 - p0;
+				V3f refEdge = refP1 - refP0;
+				float edgeLen = edge.length();
+				float refEdgeLen = refEdge.length();
+				float distortion = 0;
+				if ( edgeLen >= refEdgeLen )
+				{
+					distortion = fabs((edgeLen / refEdgeLen) - 1.0f);
+				}
+				else
+				{
+					distortion = -fabs( (refEdgeLen / edgeLen) - 1.0f );
+				}
+				edgeDistortions[fvi0] = distortion;
+
+				// compute uv vector
+				const Imath::V2f uv0( uvs[ fvi0 ] );
+				const Imath::V2f uv1( uvs[ fvi1 ] );
+				edgeUVDirections[fvi0] = (uv1 - uv0).normalized();
 			}
+		},
+		taskGroupContext
+	);
 
-			// accumulate vertex distortions
-			distortions[ vertex0 ].accumulateDistortion( distortion );
-			distortions[ vertex1 ].accumulateDistortion( distortion );
-			vertex0 = vertex1;
-
-			// compute uv vector
-			Imath::V2f uv1( uvs[ fvi1 ] );
-			const Imath::V2f uvDir = (uv1 - uv0).normalized();
-			// accumulate uv distortion
-			uvDistortions[ uvs.index( fvi0 ) ].accumulateDistortion( distortion, uvDir );
-			uvDistortions[ uvs.index( fvi1 ) ].accumulateDistortion( distortion, uvDir );
-			uv0 = uv1;
-		}
-		fvi0 = firstFvi + vertsPerFace[faceIndex];
-	}
-
-	// normalize distortions and build output vectors
+	// Accumulate the edges onto the vertices, and compute the average
 
-	// create the distortion prim var.
 	FloatVectorDataPtr distortionData = new FloatVectorData();
 	std::vector<float> &distortionVec = distortionData->writable();
-	distortionVec.reserve( distortions.size() );
+	distortionVec.resize( p.size() );
 
-	int cancelTestCounter = 0;
-
-	for( auto &dist : distortions )
 	{
-		if( cancelTestCounter++ == 1000 )
-		{
-			Canceller::check( canceller );
-			cancelTestCounter = 0;
-		}
-
-		float invCounter = 0;
-		if ( dist.counter )
-		{
-			invCounter = ( 1.0f / dist.counter );
-		}
-		distortionVec.push_back( dist.distortion * invCounter );
+		vector<int> edges;
+		const vector<int> offsets = edgesForValues( &vertIds, p.size(), nextFaceVertex, edges, taskGroupContext, canceller );
+		tbb::parallel_for( tbb::blocked_range<size_t>( 0, p.size() ),
+			[&distortionVec, &edges, &offsets, &edgeDistortions, canceller] ( const tbb::blocked_range<size_t> &range )
+			{
+				Canceller::check( canceller );
+				for( size_t i = range.begin(); i != range.end(); ++i )
+				{
+					VertexDistortion dist;
+					for( int j = i ? offsets[i-1] : 0; j < offsets[i]; ++j )
+					{
+						dist.accumulateDistortion( edgeDistortions[edges[j] / 2] );
+					}
+
+					float invCounter = 0;
+					if ( dist.counter )
+					{
+						invCounter = ( 1.0f / dist.counter );
+					}
+					distortionVec[i] = dist.distortion * invCounter;
+				}
+			},
+			taskGroupContext
+		);
 	}
 
-	// create U and V distortions
+	// Likewise for U and V distortions
+
 	V2fVectorDataPtr uvDistortionData = new V2fVectorData();
 	std::vector<Imath::V2f> &uvDistortionVec = uvDistortionData->writable();
-	uvDistortionVec.reserve( uvDistortions.size() );
-	for( const auto &uvDist : uvDistortions )
-	{
-		if( cancelTestCounter++ == 1000 )
-		{
-			Canceller::check( canceller );
-			cancelTestCounter = 0;
-		}
+	uvDistortionVec.resize( uvs.data().size() );
 
-		uvDistortionVec.push_back( uvDist.distortion / max( 1, uvDist.counter ) );
+	{
+		vector<int> edges;
+		const vector<int> offsets = edgesForValues( uvs.indices(), uvs.data().size(), nextFaceVertex, edges, taskGroupContext, canceller );
+		tbb::parallel_for( tbb::blocked_range<size_t>( 0, uvDistortionVec.size() ),
+			[&uvDistortionVec, &edges, &offsets, &edgeDistortions, &edgeUVDirections, canceller] ( const tbb::blocked_range<size_t> &range )
+			{
+				Canceller::check( canceller );
+				for( size_t i = range.begin(); i != range.end(); ++i )
+				{
+					UVDistortion uvDist;
+					for( int j = i ? offsets[i-1] : 0; j < offsets[i]; ++j )
+					{
+						const int edge = edges[j] / 2;
+						uvDist.accumulateDistortion( edgeDistortions[edge], edgeUVDirections[edge] );
+					}
+					uvDistortionVec[i] = uvDist.distortion / max( 1, uvDist.counter );
+				}
+			},
+			taskGroupContext
+		);
 	}
 
 	return std::make_pair(
@@ -34,6 +34,7 @@
 
 #include "IECoreScene/MeshAlgo.h"
 #include "IECoreScene/PolygonIterator.h"
+#include "IECoreScene/private/PrimitiveVariableAlgos.h"
 
 #include "IECore/PolygonAlgo.h"
 
@@ -42,6 +43,9 @@
 #include "boost/iterator/zip_iterator.hpp"
 #include "boost/tuple/tuple.hpp"
 
+#include "tbb/blocked_range.h"
+#include "tbb/parallel_for.h"
+
 using namespace Imath;
 using namespace IECore;
 using namespace IECoreScene;
@@ -74,22 +78,30 @@ PrimitiveVariable MeshAlgo::calculateFaceArea( const MeshPrimitive *mesh, const
 	}
 	const std::vector<V3f> &p = pData->readable();
 
+	const std::vector<int> &verticesPerFace = mesh->verticesPerFace()->readable();
+	const std::vector<int> &vertexIds = mesh->vertexIds()->readable();
+
+	Canceller::check( canceller );
+	std::vector<int> faceOffsets;
+	PrimitiveVariableAlgos::exclusiveScan( verticesPerFace, faceOffsets );
+
 	FloatVectorDataPtr areasData = new FloatVectorData;
 	std::vector<float> &areas = areasData->writable();
-	areas.reserve( mesh->variableSize( PrimitiveVariable::Uniform ) );
+	areas.resize( verticesPerFace.size() );
 
-	/// \todo: can MeshPrimitive::faceEnd() be const?
-	int faceIdx = 0;
-	PolygonIterator faceEnd = const_cast<MeshPrimitive*>( mesh )->faceEnd();
-	for( PolygonIterator pIt = const_cast<MeshPrimitive*>( mesh )->faceBegin(); pIt != faceEnd; pIt++, faceIdx++ )
-	{
-		if( ( faceIdx % 1000 ) == 0 )
+	tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+	tbb::parallel_for( tbb::blocked_range<size_t>( 0, verticesPerFace.size() ),
+		[&areas, &p, &verticesPerFace, &vertexIds, &faceOffsets, canceller] ( const tbb::blocked_range<size_t> &range )
 		{
 			Canceller::check( canceller );
-		}
-
-		areas.push_back( polygonArea( pIt.vertexBegin( p.begin() ), pIt.vertexEnd( p.begin() ) ) );
-	}
+			for( size_t i = range.begin(); i != range.end(); ++i )
+			{
+				PolygonIterator pIt( verticesPerFace.begin() + i, vertexIds.begin() + faceOffsets[i], faceOffsets[i] );
+				areas[i] = polygonArea( pIt.vertexBegin( p.begin() ), pIt.vertexEnd( p.begin() ) );
+			}
+		},
+		taskGroupContext
+	);
 
 	return PrimitiveVariable( PrimitiveVariable::Uniform, areasData );
 }
@@ -108,41 +120,49 @@ PrimitiveVariable MeshAlgo::calculateFaceTextureArea( const MeshPrimitive *mesh,
 		uvInterpolation = PrimitiveVariable::FaceVarying;
 	}
 
+	const std::vector<int> &verticesPerFace = mesh->verticesPerFace()->readable();
+	const std::vector<int> &vertexIds = mesh->vertexIds()->readable();
+
+	Canceller::check( canceller );
+	std::vector<int> faceOffsets;
+	PrimitiveVariableAlgos::exclusiveScan( verticesPerFace, faceOffsets );
+
 	FloatVectorDataPtr textureAreasData = new FloatVectorData;
 	std::vector<float> &textureAreas = textureAreasData->writable();
-	textureAreas.reserve( mesh->variableSize( PrimitiveVariable::Uniform ) );
+	textureAreas.resize( verticesPerFace.size() );
 
-	/// \todo: can MeshPrimitive::faceEnd() be const?
-	int faceIdx = 0;
-	PolygonIterator faceEnd = const_cast<MeshPrimitive*>( mesh )->faceEnd();
-	for( PolygonIterator pIt = const_cast<MeshPrimitive*>( mesh )->faceBegin(); pIt!=faceEnd; pIt++, faceIdx++ )
-	{
-		if( ( faceIdx % 1000 ) == 0 )
+	tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+	tbb::parallel_for( tbb::blocked_range<size_t>( 0, verticesPerFace.size() ),
+		[&textureAreas, &uvView, uvInterpolation, &verticesPerFace, &vertexIds, &faceOffsets, canceller] ( const tbb::blocked_range<size_t> &range )
 		{
 			Canceller::check( canceller );
-		}
-
-		if( uvInterpolation==PrimitiveVariable::Vertex )
-		{
-			typedef PolygonVertexIterator<PrimitiveVariable::IndexedView<V2f>::Iterator> VertexIterator;
-			typedef boost::transform_iterator<V2fToV3f, VertexIterator> STIterator;
-
-			STIterator begin( pIt.vertexBegin( uvView->begin() ) );
-			STIterator end( pIt.vertexEnd( uvView->begin() ) );
-
-			textureAreas.push_back( polygonArea( begin, end ) );
-		}
-		else
-		{
-			assert( uvInterpolation==PrimitiveVariable::FaceVarying );
-			typedef boost::transform_iterator<V2fToV3f, PrimitiveVariable::IndexedView<V2f>::Iterator> STIterator;
-
-			STIterator begin( pIt.faceVaryingBegin( uvView->begin() ) );
-			STIterator end( pIt.faceVaryingEnd( uvView->begin() ) );
-
-			textureAreas.push_back( polygonArea( begin, end ) );
-		}
-	}
+			for( size_t i = range.begin(); i != range.end(); ++i )
+			{
+				PolygonIterator pIt( verticesPerFace.begin() + i, vertexIds.begin() + faceOffsets[i], faceOffsets[i] );
+				if( uvInterpolation==PrimitiveVariable::Vertex )
+				{
+					typedef PolygonVertexIterator<PrimitiveVariable::IndexedView<V2f>::Iterator> VertexIterator;
+					typedef boost::transform_iterator<V2fToV3f, VertexIterator> STIterator;
+
+					STIterator begin( pIt.vertexBegin( uvView->begin() ) );
+					STIterator end( pIt.vertexEnd( uvView->begin() ) );
+
+					textureAreas[i] = polygonArea( begin, end );
+				}
+				else
+				{
+					assert( uvInterpolation==PrimitiveVariable::FaceVarying );
+					typedef boost::transform_iterator<V2fToV3f, PrimitiveVariable::IndexedView<V2f>::Iterator> STIterator;
+
+					STIterator begin( pIt.faceVaryingBegin( uvView->begin() ) );
+					STIterator end( pIt.faceVaryingEnd( uvView->begin() ) );
+
+					textureAreas[i] = polygonArea( begin, end );
+				}
+			}
+		},
+		taskGroupContext
+	);
 
 	return PrimitiveVariable( PrimitiveVariable::Uniform, textureAreasData );
 }
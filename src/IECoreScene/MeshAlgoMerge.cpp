@@ -40,7 +40,12 @@
 
 #include "boost/format.hpp"
 
+#include "tbb/blocked_range.h"
+#include "tbb/parallel_for.h"
+
 #include <algorithm>
+#include <map>
+#include <set>
 
 using namespace Imath;
 using namespace IECore;
@@ -80,20 +85,14 @@ struct AppendPrimVars
 {
 		typedef void ReturnType;
 
-		AppendPrimVars( MeshPrimitive *mesh, const MeshPrimitive *mesh2, const std::string &name, const PrimitiveVariable::Interpolation interpolation, IntVectorData *indices, std::set<DataPtr> &visitedData, const Canceller *canceller )
-			:	m_mesh2( mesh2 ), m_name( name ), m_interpolation( interpolation ), m_indices( indices ), m_visitedData( visitedData ), m_canceller( canceller )
+		AppendPrimVars( const MeshPrimitive *mesh2, const std::string &name, const PrimitiveVariable::Interpolation interpolation, IntVectorData *indices, const Canceller *canceller )
+			:	m_mesh2( mesh2 ), m_name( name ), m_interpolation( interpolation ), m_indices( indices ), m_canceller( canceller )
 		{
 		}
 
 		template<typename T>
 		ReturnType operator()( T *data )
 		{
-			if ( m_visitedData.find( data ) != m_visitedData.end() )
-			{
-				return;
-			}
-			m_visitedData.insert( data );
-
 			PrimitiveVariableMap::const_iterator it = m_mesh2->variables.find( m_name );
 			if( it != m_mesh2->variables.end() && it->second.data->isInstanceOf( data->staticTypeId() ) && it->second.interpolation == m_interpolation )
 			{
@@ -180,187 +179,194 @@ struct AppendPrimVars
 		const std::string m_name;
 		const PrimitiveVariable::Interpolation m_interpolation;
 		IntVectorData *m_indices;
-		std::set<DataPtr> &m_visitedData;
 		const Canceller *m_canceller;
 
 };
 
 struct PrependPrimVars
 {
-		typedef void ReturnType;
+		typedef DataPtr ReturnType;
 
-		PrependPrimVars( MeshPrimitive *mesh, const std::string &name, const PrimitiveVariable &primVar, std::map<ConstDataPtr, DataPtr> &visitedData, const Canceller *canceller )
-			:	m_mesh( mesh ), m_name( name ), m_primVar( primVar ), m_visitedData( visitedData ), m_canceller( canceller )
+		PrependPrimVars( size_t mergedSize, const PrimitiveVariable &primVar, const Canceller *canceller )
+			:	m_mergedSize( mergedSize ), m_primVar( primVar ), m_canceller( canceller )
 		{
 		}
 
 		template<typename T>
 		ReturnType operator()( const T *data )
 		{
-			PrimitiveVariableMap::iterator it = m_mesh->variables.find( m_name );
-			if( it == m_mesh->variables.end() )
-			{
-				typename T::Ptr data2 = nullptr;
-
-				std::map<ConstDataPtr, DataPtr>::iterator dataIt = m_visitedData.find( data );
-				if ( dataIt != m_visitedData.end() )
-				{
-					data2 = runTimeCast<T>( dataIt->second );
-				}
-
-				if ( !data2 )
-				{
-					typedef typename T::ValueType::value_type ValueType;
-					ValueType defaultValue = DefaultValue<ValueType>()();
-
-					Canceller::check( m_canceller );
-					typename T::Ptr expandedData = runTimeCast<T>( m_primVar.expandedData() );
-					size_t size = m_mesh->variableSize( m_primVar.interpolation ) - expandedData->readable().size();
-					data2 = new T();
-					data2->writable().insert( data2->writable().end(), size, defaultValue );
-
-					Canceller::check( m_canceller );
-					/// The first mesh dictates whether the PrimitiveVariable should
-					/// be indexed. If the second mesh has indices, we must expand them.
-					data2->writable().insert( data2->writable().end(), expandedData->readable().begin(), expandedData->readable().end() );
-				}
-
-				Canceller::check( m_canceller );
-				m_mesh->variables[m_name] = PrimitiveVariable( m_primVar.interpolation, data2 );
-
-				m_visitedData[data] = data2;
-			}
+			typedef typename T::ValueType::value_type ValueType;
+			ValueType defaultValue = DefaultValue<ValueType>()();
+
+			Canceller::check( m_canceller );
+			typename T::Ptr expandedData = runTimeCast<T>( m_primVar.expandedData() );
+			size_t size = m_mergedSize - expandedData->readable().size();
+			typename T::Ptr data2 = new T();
+			data2->writable().reserve( m_mergedSize );
+			data2->writable().insert( data2->writable().end(), size, defaultValue );
+
+			Canceller::check( m_canceller );
+			/// The first mesh dictates whether the PrimitiveVariable should
+			/// be indexed. If the second mesh has indices, we must expand them.
+			data2->writable().insert( data2->writable().end(), expandedData->readable().begin(), expandedData->readable().end() );
+
+			return data2;
 		}
 
 	private :
 
-		MeshPrimitive *m_mesh;
-		const std::string m_name;
+		const size_t m_mergedSize;
 		const PrimitiveVariable &m_primVar;
-		std::map<ConstDataPtr, DataPtr> &m_visitedData;
 		const Canceller *m_canceller;
 
 };
 
-void merge( MeshPrimitive *a, const MeshPrimitive *b, const Canceller *canceller )
+// The sizes of primitive variables for a mesh. Used to track the size of the
+// merged mesh as each input is added, without merging the topology each time.
+struct VariableSizes
 {
-	const auto &vertexIdsA = a->vertexIds()->readable();
-	const auto &verticesPerFaceA = a->verticesPerFace()->readable();
-
-	const auto &vertexIdsB = b->vertexIds()->readable();
-	const auto &verticesPerFaceB = b->verticesPerFace()->readable();
 
-	IntVectorDataPtr verticesPerFaceData = new IntVectorData;
-	auto &verticesPerFace = verticesPerFaceData->writable();
-	Canceller::check( canceller );
-	verticesPerFace.resize( verticesPerFaceA.size() + verticesPerFaceB.size() );
-	Canceller::check( canceller );
-	auto it = std::copy( verticesPerFaceA.begin(), verticesPerFaceA.end(), verticesPerFace.begin() );
-	Canceller::check( canceller );
-	std::copy( verticesPerFaceB.begin(), verticesPerFaceB.end(), it );
-
-	IntVectorDataPtr vertexIdsData = new IntVectorData;
-	auto &vertexIds = vertexIdsData->writable();
-	Canceller::check( canceller );
-	vertexIds.resize( vertexIdsA.size() + vertexIdsB.size() );
-	Canceller::check( canceller );
-	it = std::copy( vertexIdsA.begin(), vertexIdsA.end(), vertexIds.begin() );
-	int vertexIdOffset = a->variableSize( PrimitiveVariable::Vertex );
-	auto idShift = [vertexIdOffset]( int id ){ return id + vertexIdOffset; };
-	Canceller::check( canceller );
-	std::transform( vertexIdsB.begin(), vertexIdsB.end(), it, idShift );
+	VariableSizes( const MeshPrimitive *mesh )
+		:	uniform( mesh->variableSize( PrimitiveVariable::Uniform ) ),
+			vertex( mesh->variableSize( PrimitiveVariable::Vertex ) ),
+			faceVarying( mesh->variableSize( PrimitiveVariable::FaceVarying ) )
+	{
+	}
 
-	Canceller::check( canceller );
-	a->setTopologyUnchecked( verticesPerFaceData, vertexIdsData, a->variableSize( PrimitiveVariable::Vertex ) + b->variableSize( PrimitiveVariable::Vertex ), a->interpolation() );
+	VariableSizes &operator += ( const VariableSizes &other )
+	{
+		uniform += other.uniform;
+		vertex += other.vertex;
+		faceVarying += other.faceVarying;
+		return *this;
+	}
 
-	const auto &bCornerIds = b->cornerIds()->readable();
-	if( !bCornerIds.empty() )
+	size_t operator()( PrimitiveVariable::Interpolation interpolation ) const
 	{
-		const auto &aCornerIds = a->cornerIds()->readable();
-		IntVectorDataPtr idData = new IntVectorData;
-		auto &ids = idData->writable();
-		Canceller::check( canceller );
-		ids.resize( aCornerIds.size() + bCornerIds.size() );
-		Canceller::check( canceller );
-		it = std::copy( aCornerIds.begin(), aCornerIds.end(), ids.begin() );
-		Canceller::check( canceller );
-		std::transform( bCornerIds.begin(), bCornerIds.end(), it, idShift );
+		switch( interpolation )
+		{
+			case PrimitiveVariable::Constant :
+				return 1;
+			case PrimitiveVariable::Uniform :
+				return uniform;
+			case PrimitiveVariable::Vertex :
+			case PrimitiveVariable::Varying :
+				return vertex;
+			case PrimitiveVariable::FaceVarying :
+				return faceVarying;
+			default :
+				return 0;
+		}
+	}
 
-		const auto &aSharpnesses = a->cornerSharpnesses()->readable();
-		const auto &bSharpnesses = b->cornerSharpnesses()->readable();
-		FloatVectorDataPtr sharpnessData = new FloatVectorData;
-		auto &sharpnesses = sharpnessData->writable();
-		Canceller::check( canceller );
-		sharpnesses.resize( aSharpnesses.size() + bSharpnesses.size() );
-		Canceller::check( canceller );
-		auto fIt = std::copy( aSharpnesses.begin(), aSharpnesses.end(), sharpnesses.begin() );
-		Canceller::check( canceller );
-		std::copy( bSharpnesses.begin(), bSharpnesses.end(), fIt );
+	size_t uniform;
+	size_t vertex;
+	size_t faceVarying;
+
+};
 
-		a->setCorners( idData.get(), sharpnessData.get() );
+// Appends the primitive variables of `b` to those of `a`, where `mergedSizes`
+// gives the sizes of the variables after merging.
+void mergePrimitiveVariables( MeshPrimitive *a, const VariableSizes &mergedSizes, const MeshPrimitive *b, tbb::task_group_context &taskGroupContext, const Canceller *canceller )
+{
+	// Variables may share data, which must only be appended to once. Otherwise
+	// each variable is independent and can be appended to in parallel, unless
+	// it shares indices with another, in which case the indices are appended
+	// to serially, in the order of the variables.
+	std::set<DataPtr> visitedData;
+	std::map<IntVectorData *, int> indicesUseCount;
+	std::vector<PrimitiveVariableMap::iterator> toAppend;
+	for( auto it = a->variables.begin(); it != a->variables.end(); ++it )
+	{
+		if( it->second.interpolation != PrimitiveVariable::Constant && visitedData.insert( it->second.data ).second )
+		{
+			toAppend.push_back( it );
+			if( it->second.indices )
+			{
+				indicesUseCount[it->second.indices.get()]++;
+			}
+		}
 	}
 
-	const auto &bCreaseIds = b->creaseIds()->readable();
-	if( !bCreaseIds.empty() )
+	auto append = [b, canceller] ( PrimitiveVariableMap::iterator it )
 	{
-		const auto &aLengths = a->creaseLengths()->readable();
-		const auto &bLengths = b->creaseLengths()->readable();
-		IntVectorDataPtr lengthData = new IntVectorData;
-		auto &lengths = lengthData->writable();
-		Canceller::check( canceller );
-		lengths.resize( aLengths.size() + bLengths.size() );
-		Canceller::check( canceller );
-		it = std::copy( aLengths.begin(), aLengths.end(), lengths.begin() );
 		Canceller::check( canceller );
-		std::copy( bLengths.begin(), bLengths.end(), it );
+		IntVectorData *indices = it->second.indices ? it->second.indices.get() : nullptr;
+		AppendPrimVars f( b, it->first, it->second.interpolation, indices, canceller );
+		despatchTypedData<AppendPrimVars, TypeTraits::IsVectorTypedData, DespatchTypedDataIgnoreError>( it->second.data.get(), f );
+	};
 
-		const auto &aCreaseIds = a->creaseIds()->readable();
-		IntVectorDataPtr idData = new IntVectorData;
-		auto &ids = idData->writable();
-		Canceller::check( canceller );
-		ids.resize( aCreaseIds.size() + bCreaseIds.size() );
-		Canceller::check( canceller );
-		it = std::copy( aCreaseIds.begin(), aCreaseIds.end(), ids.begin() );
-		Canceller::check( canceller );
-		std::transform( bCreaseIds.begin(), bCreaseIds.end(), it, idShift );
+	auto sharesIndices = [&indicesUseCount] ( PrimitiveVariableMap::iterator it )
+	{
+		return it->second.indices && indicesUseCount[it->second.indices.get()] > 1;
+	};
 
-		const auto &aSharpnesses = a->creaseSharpnesses()->readable();
-		const auto &bSharpnesses = b->creaseSharpnesses()->readable();
-		FloatVectorDataPtr sharpnessData = new FloatVectorData;
-		auto &sharpnesses = sharpnessData->writable();
-		Canceller::check( canceller );
-		sharpnesses.resize( aSharpnesses.size() + bSharpnesses.size() );
-		Canceller::check( canceller );
-		auto fIt = std::copy( aSharpnesses.begin(), aSharpnesses.end(), sharpnesses.begin() );
-		Canceller::check( canceller );
-		std::copy( bSharpnesses.begin(), bSharpnesses.end(), fIt );
+	tbb::parallel_for( tbb::blocked_range<size_t>( 0, toAppend.size(), 1 ),
+		[&toAppend, &append, &sharesIndices] ( const tbb::blocked_range<size_t> &range )
+		{
+			for( size_t i = range.begin(); i != range.end(); ++i )
+			{
+				if( !sharesIndices( toAppend[i] ) )
+				{
+					append( toAppend[i] );
+				}
+			}
+		},
+		taskGroupContext
+	);
 
-		a->setCreases( lengthData.get(), idData.get(), sharpnessData.get() );
+	for( auto it : toAppend )
+	{
+		if( sharesIndices( it ) )
+		{
+			append( it );
+		}
 	}
 
-
-	/// \todo: can this be parallelized?
-	std::set<DataPtr> visitedData;
-	for( auto &pv : a->variables )
+	// Variables which only exist on `b` are prepended with default values. Again,
+	// shared data must only be processed once, after which it is shared by all
+	// the variables using it.
+	std::vector<PrimitiveVariableMap::const_iterator> toPrepend;
+	std::vector<PrimitiveVariableMap::const_iterator> uniqueToPrepend;
+	std::map<ConstDataPtr, DataPtr> prependedData;
+	for( auto it = b->variables.begin(); it != b->variables.end(); ++it )
 	{
-		Canceller::check( canceller );
-		if( pv.second.interpolation != PrimitiveVariable::Constant )
+		if( it->second.interpolation != PrimitiveVariable::Constant && a->variables.find( it->first ) == a->variables.end() )
 		{
-			IntVectorData *indices = pv.second.indices ? pv.second.indices.get() : nullptr;
-			AppendPrimVars f( a, b, pv.first, pv.second.interpolation, indices, visitedData, canceller );
-			despatchTypedData<AppendPrimVars, TypeTraits::IsVectorTypedData, DespatchTypedDataIgnoreError>( pv.second.data.get(), f );
+			toPrepend.push_back( it );
+			if( prependedData.insert( { it->second.data, nullptr } ).second )
+			{
+				uniqueToPrepend.push_back( it );
+			}
 		}
 	}
 
-	/// \todo: can this be parallelized?
-	std::map<ConstDataPtr, DataPtr> visitedData2;
-	for( auto &pv : b->variables )
+	std::vector<DataPtr> uniquePrepended( uniqueToPrepend.size() );
+	tbb::parallel_for( tbb::blocked_range<size_t>( 0, uniqueToPrepend.size(), 1 ),
+		[&uniqueToPrepend, &uniquePrepended, &mergedSizes, canceller] ( const tbb::blocked_range<size_t> &range )
+		{
+			for( size_t i = range.begin(); i != range.end(); ++i )
+			{
+				Canceller::check( canceller );
+				const PrimitiveVariable &primVar = uniqueToPrepend[i]->second;
+				PrependPrimVars f( mergedSizes( primVar.interpolation ), primVar, canceller );
+				uniquePrepended[i] = despatchTypedData<PrependPrimVars, TypeTraits::IsVectorTypedData, DespatchTypedDataIgnoreError>( primVar.data.get(), f );
+			}
+		},
+		taskGroupContext
+	);
+
+	for( size_t i = 0; i < uniqueToPrepend.size(); ++i )
+	{
+		prependedData[uniqueToPrepend[i]->second.data] = uniquePrepended[i];
+	}
+
+	for( auto it : toPrepend )
 	{
 		Canceller::check( canceller );
-		if( pv.second.interpolation != PrimitiveVariable::Constant )
+		if( DataPtr data = prependedData[it->second.data] )
 		{
-			PrependPrimVars f( a, pv.first, pv.second, visitedData2, canceller );
-			despatchTypedData<PrependPrimVars, TypeTraits::IsVectorTypedData, DespatchTypedDataIgnoreError>( pv.second.data.get(), f );
+			a->variables[it->first] = PrimitiveVariable( it->second.interpolation, data );
 		}
 	}
 }
@@ -374,16 +380,126 @@ MeshPrimitivePtr IECoreScene::MeshAlgo::merge( const std::vector<const MeshPrimi
 		throw IECore::InvalidArgumentException( "IECoreScene::MeshAlgo::merge : No Mesh Primitives were provided." );
 	}
 
-	/// \todo: This scales poorly with increasing numbers of meshes.
-	/// Rather than allocating enough memory for everything and filling
-	/// it once, we're re-allocating and re-copying from the start for
-	/// each mesh. Improve the algorithm.
+	// Compute the offsets of each mesh within the merged topology, so that
+	// the merged topology can be allocated once and filled in parallel.
+
+	const size_t numMeshes = meshes.size();
+	std::vector<size_t> faceOffsets( numMeshes + 1, 0 );
+	std::vector<size_t> faceVertexOffsets( numMeshes + 1, 0 );
+	std::vector<int> vertexOffsets( numMeshes + 1, 0 );
+	std::vector<size_t> cornerOffsets( numMeshes + 1, 0 );
+	std::vector<size_t> creaseOffsets( numMeshes + 1, 0 );
+	std::vector<size_t> creaseIdOffsets( numMeshes + 1, 0 );
+	bool mergeCorners = false;
+	bool mergeCreases = false;
+	for( size_t i = 0; i < numMeshes; ++i )
+	{
+		const MeshPrimitive *mesh = meshes[i];
+		faceOffsets[i+1] = faceOffsets[i] + mesh->verticesPerFace()->readable().size();
+		faceVertexOffsets[i+1] = faceVertexOffsets[i] + mesh->vertexIds()->readable().size();
+		vertexOffsets[i+1] = vertexOffsets[i] + mesh->variableSize( PrimitiveVariable::Vertex );
+		cornerOffsets[i+1] = cornerOffsets[i] + mesh->cornerIds()->readable().size();
+		creaseOffsets[i+1] = creaseOffsets[i] + mesh->creaseLengths()->readable().size();
+		creaseIdOffsets[i+1] = creaseIdOffsets[i] + mesh->creaseIds()->readable().size();
+		// Corners and creases from the first mesh are preserved by the copy below,
+		// so they only need merging if a subsequent mesh has some.
+		mergeCorners = mergeCorners || ( i && cornerOffsets[i+1] != cornerOffsets[i] );
+		mergeCreases = mergeCreases || ( i && creaseIdOffsets[i+1] != creaseIdOffsets[i] );
+	}
+
 	MeshPrimitivePtr result = meshes[0]->copy();
-	auto it = meshes.begin() + 1;
-	for( ; it != meshes.end(); ++it )
+	if( numMeshes == 1 )
+	{
+		return result;
+	}
+
+	IntVectorDataPtr verticesPerFaceData = new IntVectorData;
+	auto &verticesPerFace = verticesPerFaceData->writable();
+	verticesPerFace.resize( faceOffsets.back() );
+
+	IntVectorDataPtr vertexIdsData = new IntVectorData;
+	auto &vertexIds = vertexIdsData->writable();
+	vertexIds.resize( faceVertexOffsets.back() );
+
+	IntVectorDataPtr cornerIdsData = new IntVectorData;
+	FloatVectorDataPtr cornerSharpnessesData = new FloatVectorData;
+	if( mergeCorners )
+	{
+		cornerIdsData->writable().resize( cornerOffsets.back() );
+		cornerSharpnessesData->writable().resize( cornerOffsets.back() );
+	}
+
+	IntVectorDataPtr creaseLengthsData = new IntVectorData;
+	IntVectorDataPtr creaseIdsData = new IntVectorData;
+	FloatVectorDataPtr creaseSharpnessesData = new FloatVectorData;
+	if( mergeCreases )
+	{
+		creaseLengthsData->writable().resize( creaseOffsets.back() );
+		creaseIdsData->writable().resize( creaseIdOffsets.back() );
+		creaseSharpnessesData->writable().resize( creaseOffsets.back() );
+	}
+
+	tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+	tbb::parallel_for( tbb::blocked_range<size_t>( 0, numMeshes, 1 ),
+		[&] ( const tbb::blocked_range<size_t> &range )
+		{
+			for( size_t i = range.begin(); i != range.end(); ++i )
+			{
+				Canceller::check( canceller );
+				const MeshPrimitive *mesh = meshes[i];
+				const int vertexOffset = vertexOffsets[i];
+				auto idShift = [vertexOffset]( int id ){ return id + vertexOffset; };
+
+				const auto &meshVerticesPerFace = mesh->verticesPerFace()->readable();
+				std::copy( meshVerticesPerFace.begin(), meshVerticesPerFace.end(), verticesPerFace.begin() + faceOffsets[i] );
+
+				const auto &meshVertexIds = mesh->vertexIds()->readable();
+				std::transform( meshVertexIds.begin(), meshVertexIds.end(), vertexIds.begin() + faceVertexOffsets[i], idShift );
+
+				if( mergeCorners )
+				{
+					const auto &cornerIds = mesh->cornerIds()->readable();
+					std::transform( cornerIds.begin(), cornerIds.end(), cornerIdsData->writable().begin() + cornerOffsets[i], idShift );
+					const auto &cornerSharpnesses = mesh->cornerSharpnesses()->readable();
+					std::copy( cornerSharpnesses.begin(), cornerSharpnesses.end(), cornerSharpnessesData->writable().begin() + cornerOffsets[i] );
+				}
+
+				if( mergeCreases )
+				{
+					const auto &creaseLengths = mesh->creaseLengths()->readable();
+					std::copy( creaseLengths.begin(), creaseLengths.end(), creaseLengthsData->writable().begin() + creaseOffsets[i] );
+					const auto &creaseIds = mesh->creaseIds()->readable();
+					std::transform( creaseIds.begin(), creaseIds.end(), creaseIdsData->writable().begin() + creaseIdOffsets[i], idShift );
+					const auto &creaseSharpnesses = mesh->creaseSharpnesses()->readable();
+					std::copy( creaseSharpnesses.begin(), creaseSharpnesses.end(), creaseSharpnessesData->writable().begin() + creaseOffsets[i] );
+				}
+			}
+		},
+		taskGroupContext
+	);
+
+	// Primitive variables are merged one mesh at a time, as the indexing and
+	// defaults of each depend on the meshes that came before it.
+
+	VariableSizes mergedSizes( meshes[0] );
+	for( size_t i = 1; i < numMeshes; ++i )
 	{
 		Canceller::check( canceller );
-		::merge( result.get(), *it, canceller );
+		mergedSizes += VariableSizes( meshes[i] );
+		mergePrimitiveVariables( result.get(), mergedSizes, meshes[i], taskGroupContext, canceller );
+	}
+
+	Canceller::check( canceller );
+	result->setTopologyUnchecked( verticesPerFaceData, vertexIdsData, vertexOffsets.back(), meshes[0]->interpolation() );
+
+	if( mergeCorners )
+	{
+		result->setCorners( cornerIdsData.get(), cornerSharpnessesData.get() );
+	}
+
+	if( mergeCreases )
+	{
+		result->setCreases( creaseLengthsData.get(), creaseIdsData.get(), creaseSharpnessesData.get() );
 	}
 
 	return result;
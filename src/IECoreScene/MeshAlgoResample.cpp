@@ -32,7 +32,6 @@
 //
 //////////////////////////////////////////////////////////////////////////
 
-#include "IECoreScene/FaceVaryingPromotionOp.h"
 #include "IECoreScene/MeshAlgo.h"
 #include "IECoreScene/private/PrimitiveAlgoUtils.h"
 #include "IECoreScene/private/PrimitiveVariableAlgos.h"
@@ -40,6 +39,9 @@
 #include "IECore/DataAlgo.h"
 #include "IECore/DespatchTypedData.h"
 
+#include "tbb/blocked_range.h"
+#include "tbb/parallel_for.h"
+
 using namespace Imath;
 using namespace IECore;
 using namespace IECoreScene;
@@ -51,6 +53,15 @@ using namespace IECoreScene;
 namespace
 {
 
+// Returns the offset of the first face vertex of each face.
+std::vector<int> faceOffsets( const MeshPrimitive *mesh, const Canceller *canceller )
+{
+	Canceller::check( canceller );
+	std::vector<int> result;
+	IECoreScene::PrimitiveVariableAlgos::exclusiveScan( mesh->verticesPerFace()->readable(), result );
+	return result;
+}
+
 struct MeshVertexToUniform
 {
 	typedef DataPtr ReturnType;
@@ -65,27 +76,37 @@ struct MeshVertexToUniform
 		typename From::ValueType &trg = result->writable();
 		const typename From::ValueType &src = data->readable();
 
-		// TODO sipmlify this code by using polygon face & vertex iterators
-		trg.reserve( m_mesh->numFaces() );
-
-		std::vector<int>::const_iterator vId = m_mesh->vertexIds()->readable().begin();
+		const std::vector<int> &vertexIds = m_mesh->vertexIds()->readable();
 		const std::vector<int> &verticesPerFace = m_mesh->verticesPerFace()->readable();
-		for( std::vector<int>::const_iterator it = verticesPerFace.begin(); it < verticesPerFace.end(); ++it )
-		{
-			Canceller::check( m_canceller );
+		const std::vector<int> offsets = faceOffsets( m_mesh, m_canceller );
 
-			// initialize with the first value to avoid
-			// ambiguitity during default construction
-			typename From::ValueType::value_type total = src[ *vId ];
-			++vId;
+		trg.resize( verticesPerFace.size() );
 
-			for( int j = 1; j < *it; ++j, ++vId )
+		const Canceller *canceller = m_canceller;
+		tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+		tbb::parallel_for( tbb::blocked_range<size_t>( 0, verticesPerFace.size() ),
+			[&trg, &src, &vertexIds, &verticesPerFace, &offsets, canceller] ( const tbb::blocked_range<size_t> &range )
 			{
-				total += src[ *vId ];
-			}
-
-			trg.push_back( total / *it );
-		}
+				Canceller::check( canceller );
+				for( size_t i = range.begin(); i != range.end(); ++i )
+				{
+					const int *vId = vertexIds.data() + offsets[i];
+
+					// initialize with the first value to avoid
+					// ambiguitity during default construction
+					typename From::ValueType::value_type total = src[ *vId ];
+					++vId;
+
+					for( int j = 1; j < verticesPerFace[i]; ++j, ++vId )
+					{
+						total += src[ *vId ];
+					}
+
+					trg[i] = total / verticesPerFace[i];
+				}
+			},
+			taskGroupContext
+		);
 
 		IECoreScene::PrimitiveVariableAlgos::GeometricInterpretationCopier<From> copier;
 		copier( data, result.get() );
@@ -97,11 +118,15 @@ struct MeshVertexToUniform
 	const Canceller *m_canceller;
 };
 
-struct MeshUniformToVertex
+// Averages face varying or uniform values onto the vertices. Rather than scattering
+// values onto the vertices, we gather them for each vertex, so that vertices may be
+// processed in parallel.
+struct MeshToVertex
 {
 	typedef DataPtr ReturnType;
 
-	MeshUniformToVertex( const MeshPrimitive *mesh, const Canceller *canceller )	:	m_mesh( mesh ), m_canceller( canceller )
+	MeshToVertex( const MeshPrimitive *mesh, PrimitiveVariable::Interpolation srcInterpolation, const Canceller *canceller )
+		:	m_mesh( mesh ), m_srcInterpolation( srcInterpolation ), m_canceller( canceller )
 	{
 	}
 
@@ -111,86 +136,65 @@ struct MeshUniformToVertex
 		typename From::ValueType &trg = result->writable();
 		const typename From::ValueType &src = data->readable();
 
-		size_t numVerts = m_mesh->variableSize( PrimitiveVariable::Vertex );
-		std::vector<int> count( numVerts, 0 );
-		trg.resize( numVerts, typename From::ValueType::value_type( 0.0f ) );
+		std::vector<int> faceVertices;
+		const std::vector<int> offsets = IECoreScene::PrimitiveVariableAlgos::invertIndices(
+			m_mesh->vertexIds()->readable(), m_mesh->variableSize( PrimitiveVariable::Vertex ), faceVertices, m_canceller
+		);
 
-		typename From::ValueType::const_iterator srcIt = src.begin();
-		std::vector<int>::const_iterator vId = m_mesh->vertexIds()->readable().begin();
-		const std::vector<int> &verticesPerFace = m_mesh->verticesPerFace()->readable();
-		for( std::vector<int>::const_iterator it = verticesPerFace.begin(); it < verticesPerFace.end(); ++it, ++srcIt )
-		{
-			Canceller::check( m_canceller );
-
-			for( int j = 0; j < *it; ++j, ++vId )
-			{
-				trg[ *vId ] += *srcIt;
-				++count[ *vId ];
-			}
-		}
+		const Canceller *canceller = m_canceller;
+		tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
 
-		std::vector<int>::const_iterator cIt = count.begin();
-		typename From::ValueType::iterator trgIt = trg.begin(), trgEnd = trg.end();
-		for( trgIt = trg.begin(); trgIt != trgEnd ; ++trgIt, ++cIt )
+		if( m_srcInterpolation == PrimitiveVariable::Uniform )
 		{
-			*trgIt /= *cIt;
+			// Convert face vertices to faces. Faces are in the same
+			// order as their face vertices, so this preserves the
+			// order of accumulation.
+			const std::vector<int> &verticesPerFace = m_mesh->verticesPerFace()->readable();
+			const std::vector<int> faceVertexOffsets = faceOffsets( m_mesh, m_canceller );
+			std::vector<int> faceForFaceVertex( faceVertices.size() );
+			tbb::parallel_for( tbb::blocked_range<int>( 0, verticesPerFace.size() ),
+				[&faceForFaceVertex, &verticesPerFace, &faceVertexOffsets] ( const tbb::blocked_range<int> &range )
+				{
+					for( int i = range.begin(); i != range.end(); ++i )
+					{
+						std::fill_n( faceForFaceVertex.begin() + faceVertexOffsets[i], verticesPerFace[i], i );
+					}
+				},
+				taskGroupContext
+			);
+
+			tbb::parallel_for( tbb::blocked_range<size_t>( 0, faceVertices.size() ),
+				[&faceVertices, &faceForFaceVertex, canceller] ( const tbb::blocked_range<size_t> &range )
+				{
+					Canceller::check( canceller );
+					for( size_t i = range.begin(); i != range.end(); ++i )
+					{
+						faceVertices[i] = faceForFaceVertex[faceVertices[i]];
+					}
+				},
+				taskGroupContext
+			);
 		}
 
-		IECoreScene::PrimitiveVariableAlgos::GeometricInterpretationCopier<From> copier;
-		copier( data, result.get() );
-
-		return result;
-	}
-
-	const MeshPrimitive *m_mesh;
-	const Canceller *m_canceller;
-};
-
-struct MeshFaceVaryingToVertex
-{
-	typedef DataPtr ReturnType;
-
-	MeshFaceVaryingToVertex( const MeshPrimitive *mesh, const Canceller *canceller )	:	m_mesh( mesh ), m_canceller( canceller )
-	{
-	}
+		trg.resize( offsets.size() );
 
-	template<typename From> ReturnType operator()( const From* data )
-	{
-		typename From::Ptr result = static_cast< From* >( Object::create( data->typeId() ).get() );
-		typename From::ValueType &trg = result->writable();
-		const typename From::ValueType &src = data->readable();
-
-		size_t numVerts = m_mesh->variableSize( PrimitiveVariable::Vertex );
-		std::vector<int> count( numVerts, 0 );
-		trg.resize( numVerts, typename From::ValueType::value_type( 0.0f ) );
-
-		const std::vector<int>& vertexIds = m_mesh->vertexIds()->readable();
-		std::vector<int>::const_iterator vertexIdIt = vertexIds.begin();
-		typename From::ValueType::const_iterator srcIt = src.begin(), srcEnd = src.end();
-
-		int cancelTestCounter = 0;
-		for( ; srcIt != srcEnd ; ++srcIt, ++vertexIdIt )
-		{
-			if( cancelTestCounter++ == 1000 )
-			{
-				Canceller::check( m_canceller );
-				cancelTestCounter = 0;
-			}
-			trg[ *vertexIdIt ] += *srcIt;
-			++count[ *vertexIdIt ];
-		}
-
-		std::vector<int>::const_iterator cIt = count.begin();
-		typename From::ValueType::iterator trgIt = trg.begin(), trgEnd = trg.end();
-		for( trgIt = trg.begin(); trgIt != trgEnd ; ++trgIt, ++cIt )
-		{
-			if( cancelTestCounter++ == 1000 )
+		tbb::parallel_for( tbb::blocked_range<size_t>( 0, offsets.size() ),
+			[&trg, &src, &faceVertices, &offsets, canceller] ( const tbb::blocked_range<size_t> &range )
 			{
-				Canceller::check( m_canceller );
-				cancelTestCounter = 0;
-			}
-			*trgIt /= *cIt;
-		}
+				Canceller::check( canceller );
+				for( size_t i = range.begin(); i != range.end(); ++i )
+				{
+					const int begin = i ? offsets[i-1] : 0;
+					typename From::ValueType::value_type total( 0.0f );
+					for( int j = begin; j < offsets[i]; ++j )
+					{
+						total += src[faceVertices[j]];
+					}
+					trg[i] = total / ( offsets[i] - begin );
+				}
+			},
+			taskGroupContext
+		);
 
 		IECoreScene::PrimitiveVariableAlgos::GeometricInterpretationCopier<From> copier;
 		copier( data, result.get() );
@@ -199,6 +203,7 @@ struct MeshFaceVaryingToVertex
 	}
 
 	const MeshPrimitive *m_mesh;
+	PrimitiveVariable::Interpolation m_srcInterpolation;
 	const Canceller *m_canceller;
 };
 
@@ -216,27 +221,36 @@ struct MeshFaceVaryingToUniform
 		typename From::ValueType &trg = result->writable();
 		const typename From::ValueType &src = data->readable();
 
-		trg.reserve( m_mesh->numFaces() );
-
-		typename From::ValueType::const_iterator srcIt = src.begin();
-
 		const std::vector<int> &verticesPerFace = m_mesh->verticesPerFace()->readable();
-		for( std::vector<int>::const_iterator it = verticesPerFace.begin(); it < verticesPerFace.end(); ++it )
-		{
-			Canceller::check( m_canceller );
+		const std::vector<int> offsets = faceOffsets( m_mesh, m_canceller );
 
-			// initialize with the first value to avoid
-			// ambiguity during default construction
-			typename From::ValueType::value_type total = *srcIt;
-			++srcIt;
+		trg.resize( verticesPerFace.size() );
 
-			for( int j = 1; j < *it; ++j, ++srcIt )
+		const Canceller *canceller = m_canceller;
+		tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+		tbb::parallel_for( tbb::blocked_range<size_t>( 0, verticesPerFace.size() ),
+			[&trg, &src, &verticesPerFace, &offsets, canceller] ( const tbb::blocked_range<size_t> &range )
 			{
-				total += *srcIt;
-			}
-
-			trg.push_back( total / *it );
-		}
+				Canceller::check( canceller );
+				for( size_t i = range.begin(); i != range.end(); ++i )
+				{
+					typename From::ValueType::const_iterator srcIt = src.begin() + offsets[i];
+
+					// initialize with the first value to avoid
+					// ambiguity during default construction
+					typename From::ValueType::value_type total = *srcIt;
+					++srcIt;
+
+					for( int j = 1; j < verticesPerFace[i]; ++j, ++srcIt )
+					{
+						total += *srcIt;
+					}
+
+					trg[i] = total / verticesPerFace[i];
+				}
+			},
+			taskGroupContext
+		);
 
 		IECoreScene::PrimitiveVariableAlgos::GeometricInterpretationCopier<From> copier;
 		copier( data, result.get() );
@@ -259,20 +273,51 @@ struct MeshAnythingToFaceVarying
 
 	template<typename From> ReturnType operator()( const From* data )
 	{
+		typename From::Ptr result = static_cast< From* >( Object::create( data->typeId() ).get() );
+		typename From::ValueType &trg = result->writable();
+		const typename From::ValueType &src = data->readable();
 
-		// TODO replace the call to the IECore::FaceVaryingPromotionOpPtr and include the logic in this file ( with cancellation ).
+		const std::vector<int> &vertexIds = m_mesh->vertexIds()->readable();
+		const std::vector<int> &verticesPerFace = m_mesh->verticesPerFace()->readable();
 
-		// we need to duplicate because the Op expects a primvar to manipulate..
-		MeshPrimitivePtr tmpMesh = m_mesh->copy();
-		// cast OK due to read-only access.
-		tmpMesh->variables["tmpPrimVar"] = PrimitiveVariable( m_srcInterpolation, const_cast< From * >(data) );
-		FaceVaryingPromotionOpPtr promoteOp = new FaceVaryingPromotionOp();
-		promoteOp->inputParameter()->setValue( tmpMesh );
-		IECore::StringVectorDataPtr names = new StringVectorData();
-		names->writable().push_back( "tmpPrimVar" );
-		promoteOp->primVarNamesParameter()->setValue( names );
-		ReturnType result = runTimeCast< MeshPrimitive >( promoteOp->operate() )->variables["tmpPrimVar"].data;
+		Canceller::check( m_canceller );
+		trg.resize( vertexIds.size() );
 
+		const Canceller *canceller = m_canceller;
+		tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+		if( m_srcInterpolation == PrimitiveVariable::Uniform )
+		{
+			const std::vector<int> offsets = faceOffsets( m_mesh, m_canceller );
+			tbb::parallel_for( tbb::blocked_range<size_t>( 0, verticesPerFace.size() ),
+				[&trg, &src, &verticesPerFace, &offsets, canceller] ( const tbb::blocked_range<size_t> &range )
+				{
+					Canceller::check( canceller );
+					for( size_t i = range.begin(); i != range.end(); ++i )
+					{
+						std::fill_n( trg.begin() + offsets[i], verticesPerFace[i], src[i] );
+					}
+				},
+				taskGroupContext
+			);
+		}
+		else
+		{
+			assert( m_srcInterpolation == PrimitiveVariable::Vertex || m_srcInterpolation == PrimitiveVariable::Varying );
+			tbb::parallel_for( tbb::blocked_range<size_t>( 0, vertexIds.size() ),
+				[&trg, &src, &vertexIds, canceller] ( const tbb::blocked_range<size_t> &range )
+				{
+					Canceller::check( canceller );
+					for( size_t i = range.begin(); i != range.end(); ++i )
+					{
+						trg[i] = src[vertexIds[i]];
+					}
+				},
+				taskGroupContext
+			);
+		}
+
+		IECoreScene::PrimitiveVariableAlgos::GeometricInterpretationCopier<From> copier;
+		copier( data, result.get() );
 
 		return result;
 	}
@@ -353,15 +398,10 @@ void IECoreScene::MeshAlgo::resamplePrimitiveVariable( const MeshPrimitive *mesh
 	}
 	else if( interpolation == PrimitiveVariable::Varying || interpolation == PrimitiveVariable::Vertex )
 	{
-		if( srcInterpolation == PrimitiveVariable::Uniform )
-		{
-			MeshUniformToVertex fn( mesh, canceller );
-			dstData = despatchTypedData<MeshUniformToVertex, IECoreScene::Detail::IsArithmeticVectorTypedData>( srcData.get(), fn );
-		}
-		else if( srcInterpolation == PrimitiveVariable::FaceVarying )
+		if( srcInterpolation == PrimitiveVariable::Uniform || srcInterpolation == PrimitiveVariable::FaceVarying )
 		{
-			MeshFaceVaryingToVertex fn( mesh, canceller );
-			dstData = despatchTypedData<MeshFaceVaryingToVertex, IECoreScene::Detail::IsArithmeticVectorTypedData>( srcData.get(), fn );
+			MeshToVertex fn( mesh, srcInterpolation, canceller );
+			dstData = despatchTypedData<MeshToVertex, IECoreScene::Detail::IsArithmeticVectorTypedData>( srcData.get(), fn );
 		}
 		else if( srcInterpolation == PrimitiveVariable::Varying || srcInterpolation == PrimitiveVariable::Vertex )
 		{
@@ -39,6 +39,10 @@
 #include "IECoreScene/MeshAlgo.h"
 #include "IECoreScene/private/PrimitiveAlgoUtils.h"
 
+#include "tbb/blocked_range.h"
+#include "tbb/parallel_for.h"
+
+#include <numeric>
 #include <unordered_map>
 
 using namespace Imath;
@@ -49,20 +53,20 @@ std::vector<MeshPrimitivePtr> IECoreScene::MeshAlgo::segment( const MeshPrimitiv
 {
 	MeshSplitter ms( mesh, primitiveVariable, canceller );
 	int numMeshes = ms.numMeshes();
-	std::vector<MeshPrimitivePtr> ret;
-	ret.reserve( numMeshes );
+
+	// Indices into the results of the splitter for each output mesh,
+	// with -1 for segment values which don't occur.
+	std::vector<int> segmentIds;
 
 	if( !segmentValues )
 	{
-		for( int i = 0; i < numMeshes; i++ )
-		{
-			ret.push_back( ms.mesh( i ) );
-		}
+		segmentIds.resize( numMeshes );
+		std::iota( segmentIds.begin(), segmentIds.end(), 0 );
 	}
 	else
 	{
 		IECore::dispatch( segmentValues,
-			[ ms, numMeshes, &ret, canceller ]( auto *typedSegmentValues )
+			[ &ms, numMeshes, &segmentIds, canceller ]( auto *typedSegmentValues )
 			{
 				using DataType = typename std::remove_pointer_t< decltype( typedSegmentValues ) >;
 				if constexpr ( TypeTraits::IsVectorTypedData<DataType>::value )
@@ -80,14 +84,7 @@ std::vector<MeshPrimitivePtr> IECoreScene::MeshAlgo::segment( const MeshPrimitiv
 					for( const auto &i : typedSegmentValues->readable() )
 					{
 						auto f = idMap.find( i );
-						if( f == idMap.end() )
-						{
-							ret.push_back( nullptr );
-						}
-						else
-						{
-							ret.push_back( ms.mesh( idMap[i] ) );
-						}
+						segmentIds.push_back( f == idMap.end() ? -1 : f->second );
 					}
 				}
 				else
@@ -98,5 +95,23 @@ std::vector<MeshPrimitivePtr> IECoreScene::MeshAlgo::segment( const MeshPrimitiv
 		);
 	}
 
+	// MeshSplitter::mesh() is safe to call concurrently, so we
+	// build the output meshes in parallel.
+	std::vector<MeshPrimitivePtr> ret( segmentIds.size() );
+	tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+	tbb::parallel_for( tbb::blocked_range<size_t>( 0, segmentIds.size(), 1 ),
+		[&ms, &segmentIds, &ret, canceller] ( const tbb::blocked_range<size_t> &range )
+		{
+			for( size_t i = range.begin(); i != range.end(); ++i )
+			{
+				if( segmentIds[i] != -1 )
+				{
+					ret[i] = ms.mesh( segmentIds[i], canceller );
+				}
+			}
+		},
+		taskGroupContext
+	);
+
 	return ret;
 }
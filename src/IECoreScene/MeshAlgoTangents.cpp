@@ -33,8 +33,15 @@
 //////////////////////////////////////////////////////////////////////////
 
 #include "IECoreScene/MeshAlgo.h"
+#include "IECoreScene/private/PrimitiveVariableAlgos.h"
+
 #include "IECore/DataAlgo.h"
 
+#include "tbb/blocked_range.h"
+#include "tbb/parallel_for.h"
+
+#include <atomic>
+
 using namespace Imath;
 using namespace IECore;
 using namespace IECoreScene;
@@ -117,6 +124,8 @@ std::pair<PrimitiveVariable, PrimitiveVariable> IECoreScene::MeshAlgo::calculate
 
 	std::vector<int> tmpIndices;
 
+	tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+
 	PrimitiveVariable::Interpolation uvInterpolation = uvIt->second.interpolation;
 	if( uvInterpolation == IECoreScene::PrimitiveVariable::Interpolation::FaceVarying )
 	{
@@ -133,14 +142,19 @@ std::pair<PrimitiveVariable, PrimitiveVariable> IECoreScene::MeshAlgo::calculate
 
 		if( uvIt->second.indices )
 		{
+			const std::vector<int> &indices = uvIt->second.indices->readable();
 			Canceller::check( canceller );
-			tmpIndices.reserve( mesh->vertexIds()->readable().size() );
-
-			Canceller::check( canceller );
-			for( auto vertexId : mesh->vertexIds()->readable() )
-			{
-				tmpIndices.push_back( uvIt->second.indices->readable()[vertexId] );
-			}
+			tmpIndices.resize( vertIds.size() );
+			tbb::parallel_for( tbb::blocked_range<size_t>( 0, vertIds.size() ),
+				[&tmpIndices, &indices, &vertIds] ( const tbb::blocked_range<size_t> &range )
+				{
+					for( size_t i = range.begin(); i != range.end(); ++i )
+					{
+						tmpIndices[i] = indices[vertIds[i]];
+					}
+				},
+				taskGroupContext
+			);
 
 			uvIndices = &tmpIndices;
 		}
@@ -164,102 +178,138 @@ std::pair<PrimitiveVariable, PrimitiveVariable> IECoreScene::MeshAlgo::calculate
 
 	size_t numUVs = IECore::size( uvIt->second.data.get() );
 
-	Canceller::check( canceller );
-	std::vector<V3f> uTangents( numUVs, V3f( 0 ) );
-	Canceller::check( canceller );
-	std::vector<V3f> vTangents( numUVs, V3f( 0 ) );
-	Canceller::check( canceller );
-	std::vector<V3f> normals( numUVs, V3f( 0 ) );
+	// find the next face vertex around each face
 
-	size_t vertStart = 0;
-	for( size_t faceIndex = 0; faceIndex < vertsPerFace.size(); faceIndex++ )
-	{
-		if( ( faceIndex % 1000 ) == 0 )
-		{
-			Canceller::check( canceller );
-		}
+	Canceller::check( canceller );
+	std::vector<int> faceOffsets;
+	PrimitiveVariableAlgos::exclusiveScan( vertsPerFace, faceOffsets );
 
-		for ( size_t faceVertIndex = 0; faceVertIndex < (size_t)vertsPerFace[faceIndex]; ++faceVertIndex)
+	Canceller::check( canceller );
+	std::vector<int> nextFaceVertex( vertIds.size() );
+	tbb::parallel_for( tbb::blocked_range<size_t>( 0, vertsPerFace.size() ),
+		[&nextFaceVertex, &vertsPerFace, &faceOffsets] ( const tbb::blocked_range<size_t> &range )
 		{
-			// indices into the facevarying data for this *triangle*
-			size_t fvi0 = vertStart + faceVertIndex;
-			size_t fvi1 = vertStart + (faceVertIndex + 1) % vertsPerFace[faceIndex];
-			size_t fvi2 = vertStart + (faceVertIndex + 2) % vertsPerFace[faceIndex];
-
-			assert( fvi0 < vertIds.size() );
-			assert( fvi0 < uvIndexedView.size() );
-
-			assert( fvi1 < vertIds.size() );
-			assert( fvi1 < uvIndexedView.size() );
-
-			assert( fvi2 < vertIds.size() );
-			assert( fvi2 < uvIndexedView.size() );
-
-			// positions for each vertex of this face
-			const V3f &p0 = points[vertIds[fvi0]];
-			const V3f &p1 = points[vertIds[fvi1]];
-			const V3f &p2 = points[vertIds[fvi2]];
-
-			// uv coordinates for each vertex of this face
-			const V2f &uv0 = uvIndexedView[fvi0];
-			const V2f &uv1 = uvIndexedView[fvi1];
-			const V2f &uv2 = uvIndexedView[fvi2];
-
-			Basis basis;
-			calculcateBasis( p0, p1, p2, uv0, uv1, uv2, basis );
-
-			// and accumulate them into the computation so far
-			uTangents[uvIndexedView.index(fvi0)] += basis.tangent;
-			vTangents[uvIndexedView.index(fvi0)] += basis.bitangent;
-			normals[uvIndexedView.index(fvi0)] += basis.normal;
-		}
+			for( size_t faceIndex = range.begin(); faceIndex != range.end(); ++faceIndex )
+			{
+				const int vertStart = faceOffsets[faceIndex];
+				for( int faceVertIndex = 0; faceVertIndex < vertsPerFace[faceIndex]; ++faceVertIndex )
+				{
+					nextFaceVertex[vertStart + faceVertIndex] = vertStart + ( faceVertIndex + 1 ) % vertsPerFace[faceIndex];
+				}
+			}
+		},
+		taskGroupContext
+	);
 
-		vertStart += vertsPerFace[faceIndex];
-	}
+	// find the face vertices contributing to each uv. We gather the contributions
+	// for each uv rather than scattering them from each face, so that uvs can be
+	// processed in parallel, while accumulating in the same order as a serial loop.
 
-	// normalize and orthogonalize everything
-	for( size_t i = 0; i < uTangents.size(); i++ )
+	std::vector<int> uvFaceVertices;
+	std::vector<int> uvFaceVertexOffsets;
+	if( uvIndices )
 	{
-		if( ( i % 1000 ) == 0 )
-		{
-			Canceller::check( canceller );
-		}
-
-		normals[i].normalize();
-
-		uTangents[i].normalize();
-		vTangents[i].normalize();
-
-		// Make uTangent/vTangent orthogonal to normal
-		uTangents[i] -= normals[i] * uTangents[i].dot( normals[i] );
-		vTangents[i] -= normals[i] * vTangents[i].dot( normals[i] );
-
-		uTangents[i].normalize();
-		vTangents[i].normalize();
+		uvFaceVertexOffsets = PrimitiveVariableAlgos::invertIndices( *uvIndices, numUVs, uvFaceVertices, canceller );
+	}
 
-		if( orthoTangents )
-		{
-			vTangents[i] -= uTangents[i] * vTangents[i].dot( uTangents[i] );
-			vTangents[i].normalize();
-		}
+	Canceller::check( canceller );
+	std::vector<V3f> uTangents( numUVs, V3f( 0 ) );
+	Canceller::check( canceller );
+	std::vector<V3f> vTangents( numUVs, V3f( 0 ) );
 
-		// Ensure we have set of basis vectors (n, uT, vT) with the correct handedness.
-		if ( !leftHanded )
-		{
-			if( uTangents[i].cross( vTangents[i] ).dot( normals[i] ) < 0.0f )
-			{
-				uTangents[i] *= -1.0f;
-			}
-		}
-		else
+	tbb::parallel_for( tbb::blocked_range<size_t>( 0, numUVs ),
+		[&] ( const tbb::blocked_range<size_t> &range )
 		{
-			if( uTangents[i].cross( vTangents[i] ).dot( normals[i] ) > 0.0f )
+			Canceller::check( canceller );
+			for( size_t i = range.begin(); i != range.end(); ++i )
 			{
-				uTangents[i] *= -1.0f;
+				V3f normal( 0 );
+
+				auto accumulate = [&] ( size_t fvi0 )
+				{
+					// indices into the facevarying data for this *triangle*
+					size_t fvi1 = nextFaceVertex[fvi0];
+					size_t fvi2 = nextFaceVertex[fvi1];
+
+					assert( fvi0 < vertIds.size() );
+					assert( fvi0 < uvIndexedView.size() );
+
+					assert( fvi1 < vertIds.size() );
+					assert( fvi1 < uvIndexedView.size() );
+
+					assert( fvi2 < vertIds.size() );
+					assert( fvi2 < uvIndexedView.size() );
+
+					// positions for each vertex of this face
+					const V3f &p0 = points[vertIds[fvi0]];
+					const V3f &p1 = points[vertIds[fvi1]];
+					const V3f &p2 = points[vertIds[fvi2]];
+
+					// uv coordinates for each vertex of this face
+					const V2f &uv0 = uvIndexedView[fvi0];
+					const V2f &uv1 = uvIndexedView[fvi1];
+					const V2f &uv2 = uvIndexedView[fvi2];
+
+					Basis basis;
+					calculcateBasis( p0, p1, p2, uv0, uv1, uv2, basis );
+
+					// and accumulate them into the computation so far
+					uTangents[i] += basis.tangent;
+					vTangents[i] += basis.bitangent;
+					normal += basis.normal;
+				};
+
+				if( uvIndices )
+				{
+					for( int j = i ? uvFaceVertexOffsets[i-1] : 0; j < uvFaceVertexOffsets[i]; ++j )
+					{
+						accumulate( uvFaceVertices[j] );
+					}
+				}
+				else
+				{
+					accumulate( i );
+				}
+
+				// normalize and orthogonalize everything
+
+				normal.normalize();
+
+				uTangents[i].normalize();
+				vTangents[i].normalize();
+
+				// Make uTangent/vTangent orthogonal to normal
+				uTangents[i] -= normal * uTangents[i].dot( normal );
+				vTangents[i] -= normal * vTangents[i].dot( normal );
+
+				uTangents[i].normalize();
+				vTangents[i].normalize();
+
+				if( orthoTangents )
+				{
+					vTangents[i] -= uTangents[i] * vTangents[i].dot( uTangents[i] );
+					vTangents[i].normalize();
+				}
+
+				// Ensure we have set of basis vectors (n, uT, vT) with the correct handedness.
+				if ( !leftHanded )
+				{
+					if( uTangents[i].cross( vTangents[i] ).dot( normal ) < 0.0f )
+					{
+						uTangents[i] *= -1.0f;
+					}
+				}
+				else
+				{
+					if( uTangents[i].cross( vTangents[i] ).dot( normal ) > 0.0f )
+					{
+						uTangents[i] *= -1.0f;
+					}
+				}
 			}
-		}
-
-	}
+		},
+		taskGroupContext
+	);
 
 	// convert the tangents back to facevarying data and add that to the mesh
 	V3fVectorDataPtr fvUD = new V3fVectorData( uTangents );
@@ -326,51 +376,68 @@ std::pair<PrimitiveVariable, PrimitiveVariable> IECoreScene::MeshAlgo::calculate
 	Canceller::check( canceller );
 	std::vector<V3f> centroids( vertsPerFace.size(), V3f( 0 ) );
 	Canceller::check( canceller );
-	std::vector<int> faceIdPerVert( numPoints, -1 );
-
-	// calculate centroids
-	// TODO: generalize this to MeshAlgo::calculateCentroid
-	size_t vertStart = 0;
-	for( size_t faceIndex = 0; faceIndex < vertsPerFace.size(); ++faceIndex )
+	std::vector<std::atomic<int>> faceIdPerVert( numPoints );
+	for( auto &f : faceIdPerVert )
 	{
-		if( ( faceIndex % 1000 ) == 0 )
-		{
-			Canceller::check( canceller );
-		}
+		f.store( -1, std::memory_order_relaxed );
+	}
 
-		for ( size_t faceVertIndex = 0; faceVertIndex < (size_t)vertsPerFace[faceIndex]; ++faceVertIndex)
-		{
-			size_t fvi0 = vertStart + faceVertIndex;
-			centroids[faceIndex] += points[vertIds[fvi0]];
-			faceIdPerVert[vertIds[fvi0]] = faceIndex;
-		}
-		centroids[faceIndex] /= vertsPerFace[faceIndex];
+	Canceller::check( canceller );
+	std::vector<int> faceOffsets;
+	PrimitiveVariableAlgos::exclusiveScan( vertsPerFace, faceOffsets );
 
-		vertStart += vertsPerFace[faceIndex];
-	}
+	tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
 
-	// calculate per vertex tangents from centroids
-	for ( size_t i = 0; i < (size_t)points.size(); ++i )
-	{
-		if( ( i % 1000 ) == 0 )
+	// calculate centroids, and choose the last face using each vertex
+	// TODO: generalize this to MeshAlgo::calculateCentroid
+	tbb::parallel_for( tbb::blocked_range<int>( 0, vertsPerFace.size() ),
+		[&centroids, &faceIdPerVert, &faceOffsets, &vertsPerFace, &vertIds, &points, canceller] ( const tbb::blocked_range<int> &range )
 		{
 			Canceller::check( canceller );
-		}
-
-		tangents[i] = ( centroids[faceIdPerVert[i]] - points[i] ).normalized();
-		biTangents[i] = normals[i].cross( tangents[i] ).normalized();
-		if ( orthoTangents )
-		{
-			if ( leftHanded )
+			for( int faceIndex = range.begin(); faceIndex != range.end(); ++faceIndex )
 			{
-				tangents[i] = normals[i].cross( biTangents[i] ).normalized();
+				const size_t vertStart = faceOffsets[faceIndex];
+				for ( size_t faceVertIndex = 0; faceVertIndex < (size_t)vertsPerFace[faceIndex]; ++faceVertIndex)
+				{
+					size_t fvi0 = vertStart + faceVertIndex;
+					centroids[faceIndex] += points[vertIds[fvi0]];
+
+					std::atomic<int> &faceId = faceIdPerVert[vertIds[fvi0]];
+					int current = faceId.load( std::memory_order_relaxed );
+					while( current < faceIndex && !faceId.compare_exchange_weak( current, faceIndex, std::memory_order_relaxed ) )
+					{
+					}
+				}
+				centroids[faceIndex] /= vertsPerFace[faceIndex];
 			}
-			else
+		},
+		taskGroupContext
+	);
+
+	// calculate per vertex tangents from centroids
+	tbb::parallel_for( tbb::blocked_range<size_t>( 0, points.size() ),
+		[&] ( const tbb::blocked_range<size_t> &range )
+		{
+			Canceller::check( canceller );
+			for( size_t i = range.begin(); i != range.end(); ++i )
 			{
-				tangents[i] = biTangents[i].cross( normals[i] ).normalized();
+				tangents[i] = ( centroids[faceIdPerVert[i].load( std::memory_order_relaxed )] - points[i] ).normalized();
+				biTangents[i] = normals[i].cross( tangents[i] ).normalized();
+				if ( orthoTangents )
+				{
+					if ( leftHanded )
+					{
+						tangents[i] = normals[i].cross( biTangents[i] ).normalized();
+					}
+					else
+					{
+						tangents[i] = biTangents[i].cross( normals[i] ).normalized();
+					}
+				}
 			}
-		}
-	}
+		},
+		taskGroupContext
+	);
 
 	// construct the primvars
 	Canceller::check( canceller );
@@ -434,29 +501,32 @@ std::pair<PrimitiveVariable, PrimitiveVariable> IECoreScene::MeshAlgo::calculate
 	auto &offsetsR = offsets->readable();
 
 	// calculate tangents from first neighbor and biTangents as orthogonal vectors
-	for ( unsigned int i = 0; i < points.size(); ++i )
-	{
-		if( ( i % 1000 ) == 0 )
+	tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+	tbb::parallel_for( tbb::blocked_range<size_t>( 0, points.size() ),
+		[&] ( const tbb::blocked_range<size_t> &range )
 		{
 			Canceller::check( canceller );
-		}
-
-		int firstNeighborIndex = i > 0 ? offsetsR[i - 1] : 0;
-		const V3f &firstNeighbor = points[neighborListR[firstNeighborIndex]];
-		tangents[i] = ( firstNeighbor - points[i] ).normalized();
-		biTangents[i] = normals[i].cross( tangents[i] ).normalized();
-		if ( orthoTangents )
-		{
-			if ( leftHanded )
-			{
-				tangents[i] = normals[i].cross( biTangents[i] ).normalized();
-			}
-			else
+			for( size_t i = range.begin(); i != range.end(); ++i )
 			{
-				tangents[i] = biTangents[i].cross( normals[i] ).normalized();
+				int firstNeighborIndex = i > 0 ? offsetsR[i - 1] : 0;
+				const V3f &firstNeighbor = points[neighborListR[firstNeighborIndex]];
+				tangents[i] = ( firstNeighbor - points[i] ).normalized();
+				biTangents[i] = normals[i].cross( tangents[i] ).normalized();
+				if ( orthoTangents )
+				{
+					if ( leftHanded )
+					{
+						tangents[i] = normals[i].cross( biTangents[i] ).normalized();
+					}
+					else
+					{
+						tangents[i] = biTangents[i].cross( normals[i] ).normalized();
+					}
+				}
 			}
-		}
-	}
+		},
+		taskGroupContext
+	);
 
 	// construct the primvars
 	Canceller::check( canceller );
@@ -520,32 +590,35 @@ std::pair<PrimitiveVariable, PrimitiveVariable> IECoreScene::MeshAlgo::calculate
 	auto &offsetsR = offsets->readable();
 
 	// calculate tangents from first neighbor and biTangents as orthogonal vectors
-	for ( unsigned int i = 0; i < points.size(); ++i )
-	{
-		if( ( i % 1000 ) == 0 )
+	tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+	tbb::parallel_for( tbb::blocked_range<size_t>( 0, points.size() ),
+		[&] ( const tbb::blocked_range<size_t> &range )
 		{
 			Canceller::check( canceller );
-		}
-
-		int firstNeighborIndex = i > 0 ? offsetsR[i - 1] : 0;
-		int lastIndex =  offsetsR[i] > firstNeighborIndex ? firstNeighborIndex + 1 : firstNeighborIndex;  // if we only have one neighbor use the edge, else the next neighbor
-
-		const V3f &firstNeighbor = points[neighborListR[firstNeighborIndex]];
-		const V3f &secondNeighbor = points[neighborListR[lastIndex]];
-		tangents[i] = ( ( firstNeighbor + (secondNeighbor - firstNeighbor ) * 0.5 ) - points[i] ).normalized();
-		biTangents[i] = normals[i].cross( tangents[i] ).normalized();
-		if ( orthoTangents )
-		{
-			if ( leftHanded )
-			{
-				tangents[i] = normals[i].cross( biTangents[i] ).normalized();
-			}
-			else
+			for( size_t i = range.begin(); i != range.end(); ++i )
 			{
-				tangents[i] = biTangents[i].cross( normals[i] ).normalized();
+				int firstNeighborIndex = i > 0 ? offsetsR[i - 1] : 0;
+				int lastIndex =  offsetsR[i] > firstNeighborIndex ? firstNeighborIndex + 1 : firstNeighborIndex;  // if we only have one neighbor use the edge, else the next neighbor
+
+				const V3f &firstNeighbor = points[neighborListR[firstNeighborIndex]];
+				const V3f &secondNeighbor = points[neighborListR[lastIndex]];
+				tangents[i] = ( ( firstNeighbor + (secondNeighbor - firstNeighbor ) * 0.5 ) - points[i] ).normalized();
+				biTangents[i] = normals[i].cross( tangents[i] ).normalized();
+				if ( orthoTangents )
+				{
+					if ( leftHanded )
+					{
+						tangents[i] = normals[i].cross( biTangents[i] ).normalized();
+					}
+					else
+					{
+						tangents[i] = biTangents[i].cross( normals[i] ).normalized();
+					}
+				}
 			}
-		}
-	}
+		},
+		taskGroupContext
+	);
 
 	// construct the primvars
 	Canceller::check( canceller );
@@ -49,7 +49,16 @@ IECORE_POP_DEFAULT_VISIBILITY
 #include "Imath/ImathBoxAlgo.h"
 #include "Imath/ImathLineAlgo.h"
 
+#include "boost/container/small_vector.hpp"
+
+#include "tbb/blocked_range.h"
+#include "tbb/parallel_for.h"
+#include "tbb/task_arena.h"
+
+#include <algorithm>
 #include <cassert>
+#include <cmath>
+#include <memory>
 
 using namespace IECore;
 using namespace IECoreScene;
@@ -211,7 +220,31 @@ const V3i &MeshPrimitiveEvaluator::Result::vertexIds() const
 	return m_vertexIds;
 }
 
-MeshPrimitiveEvaluator::MeshPrimitiveEvaluator( ConstMeshPrimitivePtr mesh ) : m_uvTree(nullptr), m_haveMassProperties( false ), m_haveSurfaceArea( false ), m_haveAverageNormals( false )
+struct MeshPrimitiveEvaluator::LazyData : public MeshPrimitiveEvaluator::TriangleBoundTree
+{
+
+	LazyData( RayAcceleration rayAcceleration )
+		:	rayAcceleration( rayAcceleration )
+	{
+	}
+
+	const RayAcceleration rayAcceleration;
+
+	std::once_flag trianglesOnceFlag;
+	std::once_flag treeOnceFlag;
+	std::once_flag bvhOnceFlag;
+	std::unique_ptr<TriangleBVH> bvh;
+	std::once_flag uvTreeOnceFlag;
+
+};
+
+MeshPrimitiveEvaluator::MeshPrimitiveEvaluator( ConstMeshPrimitivePtr mesh )
+	:	MeshPrimitiveEvaluator( mesh, RayAcceleration::KDTree )
+{
+}
+
+MeshPrimitiveEvaluator::MeshPrimitiveEvaluator( ConstMeshPrimitivePtr mesh, RayAcceleration rayAcceleration )
+	:	m_tree( nullptr ), m_uvTree( nullptr ), m_haveMassProperties( false ), m_haveSurfaceArea( false ), m_haveAverageNormals( false )
 {
 	if (! mesh )
 	{
@@ -248,62 +281,18 @@ MeshPrimitiveEvaluator::MeshPrimitiveEvaluator( ConstMeshPrimitivePtr mesh ) : m
 		m_uv = primVarIt->second;
 	}
 
+	// We only validate the topology here. The bounds and trees are built
+	// lazily by `triangleBoundTree()`, `triangleBVH()` and `uvBoundTree()`.
 	const std::vector<int> &verticesPerFace = m_mesh->verticesPerFace()->readable();
-	m_triangles.reserve( verticesPerFace.size() );
-	m_uvTriangles.reserve( verticesPerFace.size() );
-	unsigned int triangleIdx = 0;
-	IntVectorData::ValueType::const_iterator vertexIdIt = m_meshVertexIds->begin();
-	for ( IntVectorData::ValueType::const_iterator it = verticesPerFace.begin();
-		it != verticesPerFace.end(); ++it, ++triangleIdx)
+	for( const int numVertices : verticesPerFace )
 	{
-
-		if (*it != 3 )
+		if( numVertices != 3 )
 		{
 			throw InvalidArgumentException( "Non-triangular mesh given to MeshPrimitiveEvaluator");
 		}
-
-		Imath::V3i triangleVertexIds;
-
-		triangleVertexIds[0] = *vertexIdIt++;
-		assert( triangleVertexIds[0] < (int)( m_verts->readable().size() ) );
-		triangleVertexIds[1] = *vertexIdIt++;
-		assert( triangleVertexIds[1] < (int)( m_verts->readable().size() ) );
-		triangleVertexIds[2] = *vertexIdIt++;
-		assert( triangleVertexIds[2] < (int)( m_verts->readable().size() ) );
-
-		const V3f &p0 = m_verts->readable()[ triangleVertexIds[0] ];
-		const V3f &p1 = m_verts->readable()[ triangleVertexIds[1] ];
-		const V3f &p2 = m_verts->readable()[ triangleVertexIds[2] ];
-
-		Box3f bound( p0 );
-		bound.extendBy( p1 );
-		bound.extendBy( p2 );
-
-		m_triangles.push_back( bound );
-
-		if( m_uv.interpolation != PrimitiveVariable::Invalid )
-		{
-			Imath::V2f uv[3];
-			triangleUVs( triangleIdx, triangleVertexIds, uv );
-
-			Box2f uvBound( uv[0] );
-			uvBound.extendBy( uv[1] );
-			uvBound.extendBy( uv[2] );
-
-			m_uvTriangles.push_back( uvBound );
-		}
 	}
 
-	m_tree = new TriangleBoundTree( m_triangles.begin(), m_triangles.end() );
-
-	if( m_uv.interpolation != PrimitiveVariable::Invalid )
-	{
-		m_uvTree = new UVBoundTree( m_uvTriangles.begin(), m_uvTriangles.end() );
-	}
-	else
-	{
-		m_uvTree = nullptr;
-	}
+	m_tree = new LazyData( rayAcceleration );
 }
 
 PrimitiveEvaluatorPtr MeshPrimitiveEvaluator::create( ConstPrimitivePtr primitive )
@@ -316,9 +305,7 @@ PrimitiveEvaluatorPtr MeshPrimitiveEvaluator::create( ConstPrimitivePtr primitiv
 
 MeshPrimitiveEvaluator::~MeshPrimitiveEvaluator()
 {
-	assert( m_tree );
-
-	delete m_tree;
+	delete lazyData();
 	m_tree = nullptr;
 
 	delete m_uvTree;
@@ -759,12 +746,12 @@ bool MeshPrimitiveEvaluator::closestPoint( const V3f &p, PrimitiveEvaluator::Res
 {
 	assert( dynamic_cast<Result *>( result ) );
 
-	if ( m_triangles.size() == 0)
+	if( m_mesh->numFaces() == 0 )
 	{
 		return false;
 	}
 
-	assert( m_tree );
+	triangleBoundTree();
 
 	Result *mr = static_cast<Result *>( result );
 
@@ -779,12 +766,12 @@ bool MeshPrimitiveEvaluator::pointAtUV( const Imath::V2f &uv, PrimitiveEvaluator
 {
 	assert( dynamic_cast<Result *>( result ) );
 
-	if ( ! m_uvTriangles.size() )
+	if( m_uv.interpolation == PrimitiveVariable::Invalid || m_mesh->numFaces() == 0 )
 	{
 		throw Exception("No uvs available for pointAtUV");
 	}
 
-	assert( m_uvTree );
+	uvBoundTree();
 	Result *mr = static_cast<Result *>( result );
 
 	return pointAtUVWalk( m_uvTree->rootIndex(), uv, mr );
@@ -795,12 +782,19 @@ bool MeshPrimitiveEvaluator::intersectionPoint( const Imath::V3f &origin, const
 {
 	assert( dynamic_cast<Result *>( result ) );
 
-	if ( m_triangles.size() == 0)
+	if( m_mesh->numFaces() == 0 )
 	{
 		return false;
 	}
 
-	assert( m_tree );
+	if( lazyData()->rayAcceleration == RayAcceleration::BVH )
+	{
+		bool hit = false;
+		intersectionPointPacket( 1, &origin, &direction, &result, &hit, maxDistance );
+		return hit;
+	}
+
+	triangleBoundTree();
 
 	Result *mr = static_cast<Result *>( result );
 
@@ -821,27 +815,33 @@ int MeshPrimitiveEvaluator::intersectionPoints( const Imath::V3f &origin, const
 {
 	results.clear();
 
-	if ( m_triangles.size() == 0)
+	if( m_mesh->numFaces() == 0 )
 	{
 		return 0;
 	}
 
-	assert( m_tree );
-
 	float maxDistSqrd = maxDistance * maxDistance;
 
 	Imath::Line3f ray;
 	ray.pos = origin;
 	ray.dir = direction.normalized();
 
-	intersectionPointsWalk( m_tree->rootIndex(), ray, maxDistSqrd, results );
+	if( lazyData()->rayAcceleration == RayAcceleration::BVH )
+	{
+		intersectionPointsBVH( ray, maxDistSqrd, results );
+	}
+	else
+	{
+		triangleBoundTree();
+		intersectionPointsWalk( m_tree->rootIndex(), ray, maxDistSqrd, results );
+	}
 
 	return results.size();
 }
 
 bool MeshPrimitiveEvaluator::barycentricPosition( unsigned int triangleIndex, const Imath::V3f &barycentricCoordinates, PrimitiveEvaluator::Result *result ) const
 {
-	if( triangleIndex >= m_triangles.size() )
+	if( triangleIndex >= m_mesh->numFaces() )
 	{
 		return false;
 	}
@@ -1270,35 +1270,394 @@ void MeshPrimitiveEvaluator::intersectionPointsWalk( TriangleBoundTree::NodeInde
 	}
 }
 
+//////////////////////////////////////////////////////////////////////////
+// BVH ray queries
+//////////////////////////////////////////////////////////////////////////
+
+namespace
+{
+
+// The number of rays traced together by `intersectionPointPacket()`.
+const size_t g_maxPacketSize = 16;
+const size_t g_noTriangle = std::numeric_limits<size_t>::max();
+
+// Slab test, returning true if the ray enters the box before `maxDistance`.
+// `inverseDirection` contains infinities for axis-aligned rays, and the NaNs
+// resulting from rays lying exactly on a slab are ignored by the order of
+// the arguments to `std::min()` and `std::max()`, keeping the test conservative.
+inline bool rayIntersectsBox( const Box3f &box, const V3f &origin, const V3f &inverseDirection, float maxDistance )
+{
+	float tNear = 0.0f;
+	float tFar = maxDistance;
+	for( int i = 0; i < 3; ++i )
+	{
+		float t0 = ( box.min[i] - origin[i] ) * inverseDirection[i];
+		float t1 = ( box.max[i] - origin[i] ) * inverseDirection[i];
+		if( t0 > t1 )
+		{
+			std::swap( t0, t1 );
+		}
+		// Allow for rounding error, so that we never miss
+		// triangles lying in the faces of the box.
+		t1 *= 1.0f + 4.0f * std::numeric_limits<float>::epsilon();
+
+		tNear = std::max( tNear, t0 );
+		tFar = std::min( tFar, t1 );
+		if( tNear > tFar )
+		{
+			return false;
+		}
+	}
+	return true;
+}
+
+} // namespace
+
+size_t MeshPrimitiveEvaluator::batchIntersectionPoint( size_t numRays, const Imath::V3f *origins, const Imath::V3f *directions, PrimitiveEvaluator::Result *const *results, bool *hits, float maxDistance ) const
+{
+	size_t numHits = 0;
+	if( lazyData()->rayAcceleration == RayAcceleration::KDTree || m_mesh->numFaces() == 0 )
+	{
+		for( size_t i = 0; i < numRays; ++i )
+		{
+			hits[i] = intersectionPoint( origins[i], directions[i], results[i], maxDistance );
+			numHits += hits[i];
+		}
+		return numHits;
+	}
+
+	for( size_t i = 0; i < numRays; i += g_maxPacketSize )
+	{
+		const size_t packetSize = std::min( g_maxPacketSize, numRays - i );
+		numHits += intersectionPointPacket( packetSize, origins + i, directions + i, results + i, hits + i, maxDistance );
+	}
+	return numHits;
+}
+
+size_t MeshPrimitiveEvaluator::intersectionPointPacket( size_t numRays, const Imath::V3f *origins, const Imath::V3f *directions, PrimitiveEvaluator::Result *const *results, bool *hits, float maxDistance ) const
+{
+	assert( numRays <= g_maxPacketSize );
+
+	const TriangleBVH *bvh = triangleBVH();
+	const std::vector<V3f> &p = m_verts->readable();
+	const std::vector<int> &vertexIds = *m_meshVertexIds;
+
+	V3f direction[g_maxPacketSize];
+	V3f inverseDirection[g_maxPacketSize];
+	float closestDistance[g_maxPacketSize];
+	size_t closestTriangle[g_maxPacketSize];
+	V3f closestPoint[g_maxPacketSize];
+	V3f closestBarycentric[g_maxPacketSize];
+
+	for( size_t i = 0; i < numRays; ++i )
+	{
+		assert( dynamic_cast<Result *>( results[i] ) );
+		direction[i] = directions[i].normalized();
+		inverseDirection[i] = V3f( 1.0f / direction[i].x, 1.0f / direction[i].y, 1.0f / direction[i].z );
+		closestDistance[i] = maxDistance;
+		closestTriangle[i] = g_noTriangle;
+	}
+
+	// Each entry holds a node along with a mask of the rays
+	// which intersected its parent.
+	struct StackEntry
+	{
+		TriangleBVH::NodeIndex node;
+		uint32_t rays;
+	};
+	boost::container::small_vector<StackEntry, 64> stack;
+	stack.push_back( { TriangleBVH::rootIndex(), ( 1u << numRays ) - 1 } );
+
+	while( !stack.empty() )
+	{
+		const StackEntry entry = stack.back();
+		stack.pop_back();
+
+		// Rays may have found a closer hit since this entry was pushed,
+		// so we test the bound now rather than before pushing.
+		const TriangleBVH::Node &node = bvh->node( entry.node );
+		uint32_t rays = 0;
+		for( size_t i = 0; i < numRays; ++i )
+		{
+			if( ( entry.rays & ( 1u << i ) ) && rayIntersectsBox( node.bound(), origins[i], inverseDirection[i], closestDistance[i] ) )
+			{
+				rays |= 1u << i;
+			}
+		}
+
+		if( !rays )
+		{
+			continue;
+		}
+
+		if( node.isLeaf() )
+		{
+			const TriangleBVH::Iterator *permLast = bvh->permLast( node );
+			for( const TriangleBVH::Iterator *perm = bvh->permFirst( node ); perm != permLast; ++perm )
+			{
+				const size_t triangleIndex = *perm - m_triangles.begin(); // triangle index is just the distance of the triangle from the beginning of the vector
+				const int *ids = vertexIds.data() + triangleIndex * 3;
+				const V3f &p0 = p[ids[0]];
+				const V3f &p1 = p[ids[1]];
+				const V3f &p2 = p[ids[2]];
+
+				for( size_t i = 0; i < numRays; ++i )
+				{
+					if( !( rays & ( 1u << i ) ) )
+					{
+						continue;
+					}
+
+					V3f hitPoint, bary;
+					bool front;
+					if( triangleRayIntersection( p0, p1, p2, origins[i], direction[i], hitPoint, bary, front ) )
+					{
+						const float distance = ( hitPoint - origins[i] ).length();
+						if( distance < closestDistance[i] )
+						{
+							closestDistance[i] = distance;
+							closestTriangle[i] = triangleIndex;
+							closestPoint[i] = hitPoint;
+							closestBarycentric[i] = bary;
+						}
+					}
+				}
+			}
+		}
+		else
+		{
+			// Visit the child on the near side of the split first, as judged by
+			// the first active ray. Coherent rays will mostly agree.
+			size_t firstRay = 0;
+			while( !( rays & ( 1u << firstRay ) ) )
+			{
+				++firstRay;
+			}
+
+			TriangleBVH::NodeIndex nearChild = TriangleBVH::firstChildIndex( entry.node );
+			TriangleBVH::NodeIndex farChild = bvh->secondChildIndex( entry.node );
+			if( direction[firstRay][node.splitAxis()] < 0.0f )
+			{
+				std::swap( nearChild, farChild );
+			}
+
+			stack.push_back( { farChild, rays } );
+			stack.push_back( { nearChild, rays } );
+		}
+	}
+
+	size_t numHits = 0;
+	for( size_t i = 0; i < numRays; ++i )
+	{
+		hits[i] = closestTriangle[i] != g_noTriangle;
+		if( hits[i] )
+		{
+			setIntersectionResult( static_cast<Result *>( results[i] ), closestTriangle[i], closestPoint[i], closestBarycentric[i] );
+			numHits++;
+		}
+	}
+
+	return numHits;
+}
+
+void MeshPrimitiveEvaluator::intersectionPointsBVH( const Imath::Line3f &ray, float maxDistSqrd, std::vector<PrimitiveEvaluator::ResultPtr> &results ) const
+{
+	const TriangleBVH *bvh = triangleBVH();
+	const std::vector<V3f> &p = m_verts->readable();
+	const std::vector<int> &vertexIds = *m_meshVertexIds;
+
+	const V3f inverseDirection( 1.0f / ray.dir.x, 1.0f / ray.dir.y, 1.0f / ray.dir.z );
+	const float maxDistance = std::sqrt( maxDistSqrd );
+
+	boost::container::small_vector<TriangleBVH::NodeIndex, 64> stack;
+	stack.push_back( TriangleBVH::rootIndex() );
+
+	while( !stack.empty() )
+	{
+		const TriangleBVH::NodeIndex nodeIndex = stack.back();
+		stack.pop_back();
+
+		const TriangleBVH::Node &node = bvh->node( nodeIndex );
+		if( !rayIntersectsBox( node.bound(), ray.pos, inverseDirection, maxDistance ) )
+		{
+			continue;
+		}
+
+		if( node.isLeaf() )
+		{
+			const TriangleBVH::Iterator *permLast = bvh->permLast( node );
+			for( const TriangleBVH::Iterator *perm = bvh->permFirst( node ); perm != permLast; ++perm )
+			{
+				const size_t triangleIndex = *perm - m_triangles.begin(); // triangle index is just the distance of the triangle from the beginning of the vector
+				const int *ids = vertexIds.data() + triangleIndex * 3;
+
+				V3f hitPoint, bary;
+				bool front;
+				if(
+					triangleRayIntersection( p[ids[0]], p[ids[1]], p[ids[2]], ray.pos, ray.dir, hitPoint, bary, front ) &&
+					vecDistance2( hitPoint, ray.pos ) < maxDistSqrd
+				)
+				{
+					ResultPtr result = new Result();
+					setIntersectionResult( result.get(), triangleIndex, hitPoint, bary );
+					results.push_back( result );
+				}
+			}
+		}
+		else
+		{
+			stack.push_back( bvh->secondChildIndex( nodeIndex ) );
+			stack.push_back( TriangleBVH::firstChildIndex( nodeIndex ) );
+		}
+	}
+}
+
+void MeshPrimitiveEvaluator::setIntersectionResult( Result *result, size_t triangleIndex, const Imath::V3f &point, const Imath::V3f &barycentric ) const
+{
+	const size_t vertIdOffset = triangleIndex * 3;
+	const Imath::V3i vertexIds( (*m_meshVertexIds)[vertIdOffset], (*m_meshVertexIds)[vertIdOffset+1], (*m_meshVertexIds)[vertIdOffset+2] );
+
+	result->m_bary = barycentric;
+	result->m_vertexIds = vertexIds;
+	result->m_triangleIdx = triangleIndex;
+	result->m_p = point;
+
+	if( m_uv.interpolation != PrimitiveVariable::Invalid )
+	{
+		result->m_uv = result->vec2PrimVar( m_uv );
+	}
+
+	const std::vector<V3f> &p = m_verts->readable();
+	result->m_n = triangleNormal( p[vertexIds[0]], p[vertexIds[1]], p[vertexIds[2]] );
+}
+
 const Imath::Box2f MeshPrimitiveEvaluator::uvBound() const
 {
-	if( !m_uvTree )
+	const UVBoundTree *tree = uvBoundTree();
+	if( !tree )
 	{
 		return Imath::Box2f();
 	}
-	return m_uvTree->node( m_uvTree->rootIndex() ).bound();
+	return tree->node( tree->rootIndex() ).bound();
 }
 
 const MeshPrimitiveEvaluator::TriangleBoundVector *MeshPrimitiveEvaluator::triangleBounds() const
 {
+	std::call_once(
+		lazyData()->trianglesOnceFlag,
+		[this] {
+			const std::vector<V3f> &p = m_verts->readable();
+			const std::vector<int> &vertexIds = *m_meshVertexIds;
+			m_triangles.resize( m_mesh->numFaces() );
+
+			tbb::this_task_arena::isolate(
+				[&] {
+					tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+					tbb::parallel_for(
+						tbb::blocked_range<size_t>( 0, m_triangles.size() ),
+						[&]( const tbb::blocked_range<size_t> &range ) {
+							for( size_t triangleIndex = range.begin(); triangleIndex != range.end(); ++triangleIndex )
+							{
+								const int *ids = vertexIds.data() + triangleIndex * 3;
+								assert( ids[0] < (int)p.size() && ids[1] < (int)p.size() && ids[2] < (int)p.size() );
+
+								Box3f &bound = m_triangles[triangleIndex];
+								bound = Box3f( p[ids[0]] );
+								bound.extendBy( p[ids[1]] );
+								bound.extendBy( p[ids[2]] );
+							}
+						},
+						taskGroupContext
+					);
+				}
+			);
+		}
+	);
 	return &m_triangles;
 }
 
 const MeshPrimitiveEvaluator::TriangleBoundTree *MeshPrimitiveEvaluator::triangleBoundTree() const
 {
+	std::call_once(
+		lazyData()->treeOnceFlag,
+		[this] {
+			triangleBounds();
+			m_tree->init( m_triangles.begin(), m_triangles.end() );
+		}
+	);
 	return m_tree;
 }
 
+const MeshPrimitiveEvaluator::TriangleBVH *MeshPrimitiveEvaluator::triangleBVH() const
+{
+	LazyData *data = lazyData();
+	std::call_once(
+		data->bvhOnceFlag,
+		[this, data] {
+			triangleBounds();
+			data->bvh.reset( new TriangleBVH( m_triangles.begin(), m_triangles.end() ) );
+		}
+	);
+	return data->bvh.get();
+}
+
+MeshPrimitiveEvaluator::RayAcceleration MeshPrimitiveEvaluator::rayAcceleration() const
+{
+	return lazyData()->rayAcceleration;
+}
+
 const MeshPrimitiveEvaluator::UVBoundVector *MeshPrimitiveEvaluator::uvBounds() const
 {
-	return m_uvTree ? &m_uvTriangles : nullptr;
+	return uvBoundTree() ? &m_uvTriangles : nullptr;
 }
 
 const MeshPrimitiveEvaluator::UVBoundTree *MeshPrimitiveEvaluator::uvBoundTree() const
 {
+	if( m_uv.interpolation == PrimitiveVariable::Invalid )
+	{
+		return nullptr;
+	}
+
+	std::call_once(
+		lazyData()->uvTreeOnceFlag,
+		[this] {
+			const std::vector<int> &vertexIds = *m_meshVertexIds;
+			m_uvTriangles.resize( m_mesh->numFaces() );
+
+			tbb::this_task_arena::isolate(
+				[&] {
+					tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+					tbb::parallel_for(
+						tbb::blocked_range<size_t>( 0, m_uvTriangles.size() ),
+						[&]( const tbb::blocked_range<size_t> &range ) {
+							for( size_t triangleIndex = range.begin(); triangleIndex != range.end(); ++triangleIndex )
+							{
+								const int *ids = vertexIds.data() + triangleIndex * 3;
+								Imath::V2f uv[3];
+								triangleUVs( triangleIndex, V3i( ids[0], ids[1], ids[2] ), uv );
+
+								Box2f &uvBound = m_uvTriangles[triangleIndex];
+								uvBound = Box2f( uv[0] );
+								uvBound.extendBy( uv[1] );
+								uvBound.extendBy( uv[2] );
+							}
+						},
+						taskGroupContext
+					);
+				}
+			);
+
+			m_uvTree = new UVBoundTree( m_uvTriangles.begin(), m_uvTriangles.end() );
+		}
+	);
 	return m_uvTree;
 }
 
+MeshPrimitiveEvaluator::LazyData *MeshPrimitiveEvaluator::lazyData() const
+{
+	return static_cast<LazyData *>( m_tree );
+}
+
 void MeshPrimitiveEvaluator::triangleUVs( size_t triangleIndex, const Imath::V3i &vertexIds, Imath::V2f uv[3] ) const
 {
 	PrimitiveVariable::IndexedView<V2f> uvs( m_uv );
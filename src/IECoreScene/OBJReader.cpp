@@ -32,330 +32,718 @@
 //
 //////////////////////////////////////////////////////////////////////////
 
-
 #include "IECoreScene/OBJReader.h"
 
 #include "IECoreScene/MeshPrimitive.h"
 
 #include "IECore/CompoundData.h"
-#include "IECore/CompoundParameter.h"
-#include "IECore/FileNameParameter.h"
+#include "IECore/Exception.h"
 #include "IECore/MessageHandler.h"
 #include "IECore/NullObject.h"
-#include "IECore/NumericParameter.h"
 #include "IECore/ObjectParameter.h"
-#include "IECore/SimpleTypedData.h"
-#include "IECore/TypedParameter.h"
 #include "IECore/VectorTypedData.h"
 
-#include "boost/bind/bind.hpp"
-#include "boost/version.hpp"
+#include "boost/filesystem/operations.hpp"
+#include "boost/format.hpp"
+#include "boost/interprocess/file_mapping.hpp"
+#include "boost/interprocess/mapped_region.hpp"
 
-#if BOOST_VERSION >= 103600
-#define BOOST_SPIRIT_USE_OLD_NAMESPACE
-#include "boost/spirit/include/classic.hpp"
-#else
-#include "boost/spirit.hpp"
-#endif
+#include "tbb/blocked_range.h"
+#include "tbb/parallel_for.h"
+#include "tbb/task_arena.h"
 
+#include <cmath>
+#include <cstdint>
+#include <cstring>
 #include <fstream>
-#include <iostream>
-#include <iterator>
+#include <limits>
+#include <vector>
 
 using namespace std;
 using namespace IECore;
 using namespace IECoreScene;
 using namespace Imath;
-using namespace boost;
-using namespace boost::placeholders;
-using namespace boost::spirit;
 
-IE_CORE_DEFINERUNTIMETYPED(OBJReader);
+//////////////////////////////////////////////////////////////////////////
+// Internal utilities
+//////////////////////////////////////////////////////////////////////////
 
-// syntactic sugar for specifying our grammar
-typedef boost::spirit::rule<boost::spirit::phrase_scanner_t> srule;
+namespace
+{
 
-const Reader::ReaderDescription<OBJReader> OBJReader::m_readerDescription("obj");
+// Files are parsed in parallel, in chunks of approximately this
+// many bytes. Each chunk is extended to end on a line boundary.
+const size_t g_chunkSize = 4 * 1024 * 1024;
 
-OBJReader::OBJReader( const std::string &fileName )
-	: Reader( "Alias Wavefront OBJ 3D data reader", new ObjectParameter("result", "the loaded 3D object", new
-	NullObject, MeshPrimitive::staticTypeId()))
+// Indices are stored as zero-based ints, with this value
+// representing a missing texture coordinate or normal.
+const int g_noIndex = -1;
+
+bool isSpace( char c )
 {
-	m_fileNameParameter->setTypedValue( fileName );
+	return c == ' ' || c == '\t' || c == '\r';
 }
 
-bool OBJReader::canRead( const string &fileName )
+bool isDigit( char c )
 {
-	// there really are no magic numbers, .obj is a simple ascii text file
+	return c >= '0' && c <= '9';
+}
 
-	// so: enforce at least that the file has '.obj' extension
-	if(fileName.rfind(".obj") != fileName.length() - 4)
-		return false;
+const char *skipSpace( const char *p, const char *end )
+{
+	while( p != end && isSpace( *p ) )
+	{
+		++p;
+	}
+	return p;
+}
 
-	// attempt to open the file
-	ifstream in(fileName.c_str());
-	return in.is_open();
+const char *lineEnd( const char *p, const char *end )
+{
+	const char *result = static_cast<const char *>( memchr( p, '\n', end - p ) );
+	return result ? result : end;
 }
 
-ObjectPtr OBJReader::doOperation(const CompoundObject * operands)
+// Returns the end of the statement on the line between `p` and `end`,
+// excluding any trailing comment.
+const char *statementEnd( const char *p, const char *end )
 {
-	// for now we are going to retrieve vertex, texture, normal coordinates, faces.
-	// later (when we have the primitives), we will handle a larger subset of the
-	// OBJ format
+	const char *result = static_cast<const char *>( memchr( p, '#', end - p ) );
+	return result ? result : end;
+}
 
-	IntVectorDataPtr vpf = new IntVectorData();
-	m_vpf = &vpf->writable();
+enum class LineType
+{
+	Vertex,
+	TextureCoordinate,
+	Normal,
+	Face,
+	Other
+};
+
+// Returns the type of the line between `p` and `end`, advancing
+// `p` past the keyword at the start of the line. See
+// http://paulbourke.net/dataformats/obj for details of the format.
+// We only read the subset of statements needed for polygon meshes,
+// and everything else (including groups) is ignored.
+LineType lineType( const char *&p, const char *end )
+{
+	p = skipSpace( p, end );
+	const char *keyword = p;
+	while( p != end && !isSpace( *p ) )
+	{
+		++p;
+	}
 
-	IntVectorDataPtr vids = new IntVectorData();
-	m_vids = &vids->writable();
+	if( p - keyword == 1 )
+	{
+		if( *keyword == 'v' )
+		{
+			return LineType::Vertex;
+		}
+		else if( *keyword == 'f' )
+		{
+			return LineType::Face;
+		}
+	}
+	else if( p - keyword == 2 && keyword[0] == 'v' )
+	{
+		if( keyword[1] == 't' )
+		{
+			return LineType::TextureCoordinate;
+		}
+		else if( keyword[1] == 'n' )
+		{
+			return LineType::Normal;
+		}
+	}
 
-	V3fVectorDataPtr vertices = new V3fVectorData();
-	m_vertices = &vertices->writable();
+	return LineType::Other;
+}
 
- 	// separate texture coordinates
-	FloatVectorDataPtr sTextureCoordinates = new FloatVectorData();
-	m_sTextureCoordinates = &sTextureCoordinates->writable();
+const double g_powersOfTen[] = {
+	1e0, 1e1, 1e2, 1e3, 1e4, 1e5, 1e6, 1e7, 1e8, 1e9, 1e10, 1e11,
+	1e12, 1e13, 1e14, 1e15, 1e16, 1e17, 1e18, 1e19, 1e20, 1e21, 1e22
+};
+
+// Parses a float in the form `[+-]digits[.digits][(e|E)[+-]digits]`, skipping
+// leading whitespace. Returns false without advancing `p` if there isn't one.
+// This is much faster than `strtof()`, and independent of the locale, at the
+// expense of occasionally differing from the correctly rounded value in the
+// last bit.
+bool parseFloat( const char *&p, const char *end, float &result )
+{
+	const char *c = skipSpace( p, end );
 
-	FloatVectorDataPtr tTextureCoordinates = new FloatVectorData();
-	m_tTextureCoordinates = &tTextureCoordinates->writable();
+	bool negative = false;
+	if( c != end && ( *c == '-' || *c == '+' ) )
+	{
+		negative = *c++ == '-';
+	}
 
-	// build normals
-	V3fVectorDataPtr normals = new V3fVectorData();
-	m_normals = &normals->writable();
+	// Accumulate up to 18 significant digits into the mantissa,
+	// accounting for the rest in the exponent.
+	const uint64_t mantissaLimit = 100000000000000000;
+	uint64_t mantissa = 0;
+	int exponent = 0;
+	int numDigits = 0;
+	for( ; c != end && isDigit( *c ); ++c, ++numDigits )
+	{
+		if( mantissa < mantissaLimit )
+		{
+			mantissa = mantissa * 10 + ( *c - '0' );
+		}
+		else
+		{
+			exponent++;
+		}
+	}
 
-	// parse the file
-	parseOBJ();
+	if( c != end && *c == '.' )
+	{
+		for( ++c; c != end && isDigit( *c ); ++c, ++numDigits )
+		{
+			if( mantissa < mantissaLimit )
+			{
+				mantissa = mantissa * 10 + ( *c - '0' );
+				exponent--;
+			}
+		}
+	}
 
-	// create our MeshPrimitive
-	MeshPrimitivePtr mesh = new MeshPrimitive( vpf, vids, "linear", vertices );
-	if( sTextureCoordinates->readable().size() )
+	if( !numDigits )
 	{
-		mesh->variables.insert(PrimitiveVariableMap::value_type("s", PrimitiveVariable( PrimitiveVariable::FaceVarying, sTextureCoordinates)));
+		return false;
+	}
 
+	if( c != end && ( *c == 'e' || *c == 'E' ) )
+	{
+		const char *e = c + 1;
+		bool negativeExponent = false;
+		if( e != end && ( *e == '-' || *e == '+' ) )
+		{
+			negativeExponent = *e++ == '-';
+		}
+		if( e != end && isDigit( *e ) )
+		{
+			int value = 0;
+			for( ; e != end && isDigit( *e ); ++e )
+			{
+				if( value < 10000 )
+				{
+					value = value * 10 + ( *e - '0' );
+				}
+			}
+			exponent += negativeExponent ? -value : value;
+			c = e;
+		}
 	}
-	if( tTextureCoordinates->readable().size() )
+
+	double value = mantissa;
+	if( exponent < 0 )
 	{
-		mesh->variables.insert(PrimitiveVariableMap::value_type("t", PrimitiveVariable(  PrimitiveVariable::FaceVarying, tTextureCoordinates)));
+		value = exponent >= -22 ? value / g_powersOfTen[-exponent] : value * std::pow( 10.0, exponent );
 	}
-	if( normals->readable().size() )
+	else if( exponent > 0 )
 	{
-		mesh->variables.insert(PrimitiveVariableMap::value_type("N", PrimitiveVariable(  PrimitiveVariable::FaceVarying, normals)));
+		value = exponent <= 22 ? value * g_powersOfTen[exponent] : value * std::pow( 10.0, exponent );
 	}
-	return mesh;
-}
 
+	result = negative ? -value : value;
+	p = c;
+	return true;
+}
 
-// parse a vertex
-void OBJReader::parseVertex(const char * begin, const char * end)
+bool parseInt( const char *&p, const char *end, int64_t &result )
 {
-	vector<float> vec;
-	srule vertex = "v" >> real_p[append(vec)] >> real_p[append(vec)] >> real_p[append(vec)];
-	parse(begin, vertex, space_p);
-
-	// build v
-	V3f v;
-	v[0] = vec[0];
- 	v[1] = vec[1];
- 	v[2] = vec[2];
-
-	// add this vertex
-	m_vertices->push_back(v);
+	const char *c = p;
+	bool negative = false;
+	if( c != end && ( *c == '-' || *c == '+' ) )
+	{
+		negative = *c++ == '-';
+	}
+
+	if( c == end || !isDigit( *c ) )
+	{
+		return false;
+	}
+
+	int64_t value = 0;
+	for( ; c != end && isDigit( *c ); ++c )
+	{
+		if( value <= std::numeric_limits<int>::max() )
+		{
+			value = value * 10 + ( *c - '0' );
+		}
+	}
+
+	result = negative ? -value : value;
+	p = c;
+	return true;
 }
 
-// parse a texture coordinate
-void OBJReader::parseTextureCoordinate(const char * begin, const char * end)
+// Parses the components of a `v`, `vt` or `vn` line, returning false
+// if there are too few. Vertices and normals require three components,
+// and for texture coordinates `v` and `w` are optional, defaulting to 0.
+// Any `w` coordinate for vertices is ignored.
+bool parseElement( LineType type, const char *p, const char *end, V3f &result )
 {
-	vector<float> vec;
-	srule vertex = "vt" >> real_p[append(vec)] >> real_p[append(vec)] >> *(real_p[append(vec)]);
-	parse(begin, vertex, space_p);
-
-	// build v
-	V3f vt;
-	vt[0] = vec[0];
- 	vt[1] = vec[1];
-	vt[2] = vec.size() == 3 ? vec[2] : 0.0f;
-
-	// add this texture coordinate
-	m_introducedTextureCoordinates.push_back(vt);
+	result = V3f( 0 );
+	if( !parseFloat( p, end, result[0] ) )
+	{
+		return false;
+	}
+
+	if( type == LineType::TextureCoordinate )
+	{
+		if( parseFloat( p, end, result[1] ) )
+		{
+			parseFloat( p, end, result[2] );
+		}
+		return true;
+	}
+
+	return parseFloat( p, end, result[1] ) && parseFloat( p, end, result[2] );
 }
 
-// parse a normal
-void OBJReader::parseNormal(const char * begin, const char * end)
+// Converts a one-based or negative (relative) OBJ index into
+// an absolute zero-based index.
+int resolveIndex( int64_t index, size_t count )
 {
-	vector<float> vec;
-	srule vertex = "vn" >> real_p[append(vec)] >> real_p[append(vec)] >> real_p[append(vec)];
-	parse(begin, vertex, space_p);
-
-	// build v
-	V3f vn;
-	vn[0] = vec[0];
-	vn[1] = vec[1];
-	vn[2] = vec[2];
-
-	// add this normal
-	m_introducedNormals.push_back(vn);
+	const int64_t result = index > 0 ? index - 1 : (int64_t)count + index;
+	if( !index || result < 0 || result > std::numeric_limits<int>::max() )
+	{
+		throw Exception( "invalid face specification" );
+	}
+	return result;
 }
 
-// parse face
-void OBJReader::parseFace(const char * begin, const char * end)
+struct Chunk
 {
-	vector<int> vec;
-	vector<int> tvec;
-	vector<int> nvec;
-
-	srule entry = int_p[append(vec)] >>
-		(
-			("/" >> (int_p[append(tvec)] | epsilon_p) >> "/" >> (int_p[append(nvec)] | epsilon_p))
-			| epsilon_p
-		);
 
-	srule face = "f"  >> entry >> entry >> entry >> *(entry);
-	parse(begin, face, space_p);
+	const char *begin;
+	const char *end;
+
+	// Number of each element in the chunk, counted by `countElements()`.
+	size_t numVertices = 0;
+	size_t numTextureCoordinates = 0;
+	size_t numNormals = 0;
+	// Number of element lines with too few components. These
+	// are skipped, as they were by previous versions.
+	size_t numInvalidElements = 0;
+
+	// Index of the first element of each type in the whole file,
+	// computed from the counts of the preceding chunks.
+	size_t firstVertex = 0;
+	size_t firstTextureCoordinate = 0;
+	size_t firstNormal = 0;
+
+	// Faces, as parsed by `parseChunk()`. Indices are absolute, so
+	// these can be merged without reference to the other chunks.
+	// `textureCoordinateIds` and `normalIds` are only populated as
+	// far as the last face which specified them.
+	vector<int> verticesPerFace;
+	vector<int> vertexIds;
+	vector<int> textureCoordinateIds;
+	vector<int> normalIds;
+
+	// Index of the first face and face-vertex in the whole file.
+	size_t firstFace = 0;
+	size_t firstFaceVertex = 0;
+
+};
+
+vector<Chunk> splitChunks( const char *begin, const char *end )
+{
+	vector<Chunk> result;
+	while( begin != end )
+	{
+		Chunk chunk;
+		chunk.begin = begin;
+		chunk.end = (size_t)( end - begin ) > g_chunkSize ? lineEnd( begin + g_chunkSize, end ) : end;
+		if( chunk.end != end )
+		{
+			// Include the newline.
+			chunk.end++;
+		}
+		result.push_back( chunk );
+		begin = chunk.end;
+	}
+	return result;
+}
 
-	// push back the degree of the face
-	m_vpf->push_back(vec.size());
+template<typename F>
+void parallelForEachChunk( vector<Chunk> &chunks, F &&f )
+{
+	tbb::this_task_arena::isolate(
+		[&] {
+			tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+			tbb::parallel_for(
+				tbb::blocked_range<size_t>( 0, chunks.size(), 1 ),
+				[&]( const tbb::blocked_range<size_t> &range ) {
+					for( size_t i = range.begin(); i != range.end(); ++i )
+					{
+						f( chunks[i] );
+					}
+				},
+				taskGroupContext
+			);
+		}
+	);
+}
 
-	// merge in the edges.  we index from 0, so shift them down.
-	// also, vertices may be indexed negatively, in which case they are relative to
-	// the current set of vertices
-	for(vector<int>::const_iterator i = vec.begin(); i != vec.end(); ++i)
+void countElements( Chunk &chunk )
+{
+	for( const char *line = chunk.begin; line < chunk.end; )
 	{
-		m_vids->push_back(*i > 0 ? *i - 1 : m_vertices->size() + *i);
+		const char *end = lineEnd( line, chunk.end );
+		const char *p = line;
+		const char *statement = statementEnd( line, end );
+		const LineType type = lineType( p, statement );
+		size_t *count = nullptr;
+		switch( type )
+		{
+			case LineType::Vertex :
+				count = &chunk.numVertices;
+				break;
+			case LineType::TextureCoordinate :
+				count = &chunk.numTextureCoordinates;
+				break;
+			case LineType::Normal :
+				count = &chunk.numNormals;
+				break;
+			default :
+				break;
+		}
+
+		if( count )
+		{
+			// We must validate the elements here, so that the
+			// counts match the elements stored by `parseChunk()`.
+			V3f element;
+			if( parseElement( type, p, statement, element ) )
+			{
+				(*count)++;
+			}
+			else
+			{
+				chunk.numInvalidElements++;
+			}
+		}
+
+		line = end + 1;
 	}
+}
 
+void parseFace( const char *p, const char *end, Chunk &chunk, size_t numVertices, size_t numTextureCoordinates, size_t numNormals )
+{
+	// Each entry is of the form `v`, `v/vt`, `v/vt/vn` or `v//vn`,
+	// and the same form must be used for every entry in the face.
+
+	int numEntries = 0;
+	int numTextureCoordinateEntries = 0;
+	int numNormalEntries = 0;
+	const size_t firstFaceVertex = chunk.vertexIds.size();
 
-	// merge in texture coordinates and normals, if present
-	// OBJ format requires an encoding for faces which uses one of the vertex/texture/normal specifications
-	// consistently across the entire face.  eg. we can have all v/vt/vn, or all v//vn, or all v, but not
-	// v//vn then v/vt/vn ...
-	if(!nvec.empty())
+	for( p = skipSpace( p, end ); p != end; p = skipSpace( p, end ) )
 	{
-		if(nvec.size() != vec.size())
-			throw Exception("invalid face specification");
+		int64_t index;
+		if( !parseInt( p, end, index ) )
+		{
+			throw Exception( "invalid face specification" );
+		}
+		chunk.vertexIds.push_back( resolveIndex( index, numVertices ) );
+		numEntries++;
+
+		if( p != end && *p == '/' )
+		{
+			++p;
+			if( parseInt( p, end, index ) )
+			{
+				chunk.textureCoordinateIds.resize( firstFaceVertex + numEntries - 1, g_noIndex );
+				chunk.textureCoordinateIds.push_back( resolveIndex( index, numTextureCoordinates ) );
+				numTextureCoordinateEntries++;
+			}
+			if( p != end && *p == '/' )
+			{
+				++p;
+				if( parseInt( p, end, index ) )
+				{
+					chunk.normalIds.resize( firstFaceVertex + numEntries - 1, g_noIndex );
+					chunk.normalIds.push_back( resolveIndex( index, numNormals ) );
+					numNormalEntries++;
+				}
+			}
+		}
 
-		// copy in these references to normal vectors to the mesh's normal vector
-		for(vector<int>::const_iterator i = nvec.begin(); i != nvec.end(); ++i)
+		if( p != end && !isSpace( *p ) )
 		{
-			m_normals->push_back(m_introducedNormals[*i > 0 ? *i - 1 : m_introducedNormals.size() + *i]);
+			throw Exception( "invalid face specification" );
 		}
 	}
-	// otherwise, check if we have specified normals in some previous face
-	// if so, and no normals were given here (examples, encoders that do this?), pump in
-	// default normal.  the default normal defined here is the zero normal, which is by
-	// definition orthogonal to every other vector.  this might result in odd lighting.
-	else
+
+	if(
+		numEntries < 3 ||
+		( numTextureCoordinateEntries && numTextureCoordinateEntries != numEntries ) ||
+		( numNormalEntries && numNormalEntries != numEntries )
+	)
+	{
+		throw Exception( "invalid face specification" );
+	}
+
+	chunk.verticesPerFace.push_back( numEntries );
+}
+
+void parseChunk( Chunk &chunk, V3f *vertices, V3f *textureCoordinates, V3f *normals )
+{
+	size_t vertexIndex = chunk.firstVertex;
+	size_t textureCoordinateIndex = chunk.firstTextureCoordinate;
+	size_t normalIndex = chunk.firstNormal;
+
+	for( const char *line = chunk.begin; line < chunk.end; )
 	{
-		V3f zero(0.0f, 0.0f, 0.0f);
-		for(unsigned int i = 0; i < nvec.size(); ++i)
+		const char *end = lineEnd( line, chunk.end );
+		const char *p = line;
+		const char *statement = statementEnd( line, end );
+		V3f element;
+		const LineType type = lineType( p, statement );
+		switch( type )
 		{
-			m_normals->push_back(zero);
+			case LineType::Vertex :
+				if( parseElement( type, p, statement, element ) )
+				{
+					vertices[vertexIndex++] = element;
+				}
+				break;
+			case LineType::TextureCoordinate :
+				if( parseElement( type, p, statement, element ) )
+				{
+					textureCoordinates[textureCoordinateIndex++] = element;
+				}
+				break;
+			case LineType::Normal :
+				if( parseElement( type, p, statement, element ) )
+				{
+					normals[normalIndex++] = element;
+				}
+				break;
+			case LineType::Face :
+				// Relative indices are resolved using the number
+				// of elements read so far, so we pass those along.
+				parseFace( p, statement, chunk, vertexIndex, textureCoordinateIndex, normalIndex );
+				break;
+			case LineType::Other :
+				break;
 		}
+		line = end + 1;
 	}
+}
 
-	//
-	// merge in texture coordinates, if present
-	//
-	if(!tvec.empty())
+int checkedIndex( int index, size_t count )
+{
+	if( (size_t)index >= count )
 	{
-		if(tvec.size() != vec.size())
-			throw Exception("invalid face specification");
+		throw Exception( "invalid face specification" );
+	}
+	return index;
+}
+
+} // namespace
+
+//////////////////////////////////////////////////////////////////////////
+// OBJReader
+//////////////////////////////////////////////////////////////////////////
+
+IE_CORE_DEFINERUNTIMETYPED(OBJReader);
+
+const Reader::ReaderDescription<OBJReader> OBJReader::m_readerDescription("obj");
+
+OBJReader::OBJReader( const std::string &fileName )
+	: Reader( "Alias Wavefront OBJ 3D data reader", new ObjectParameter("result", "the loaded 3D object", new
+	NullObject, MeshPrimitive::staticTypeId()))
+{
+	m_fileNameParameter->setTypedValue( fileName );
+}
+
+bool OBJReader::canRead( const string &fileName )
+{
+	// there really are no magic numbers, .obj is a simple ascii text file
 
-		for(unsigned int i = 0; i < tvec.size(); ++i)
+	// so: enforce at least that the file has '.obj' extension
+	if(fileName.rfind(".obj") != fileName.length() - 4)
+		return false;
+
+	// attempt to open the file
+	ifstream in(fileName.c_str());
+	return in.is_open();
+}
+
+ObjectPtr OBJReader::doOperation(const CompoundObject * operands)
+{
+	// for now we are going to retrieve vertex, texture, normal coordinates, faces.
+	// later (when we have the primitives), we will handle a larger subset of the
+	// OBJ format
+
+	// Map the file into memory, and split it into
+	// chunks which can be parsed in parallel.
+
+	boost::interprocess::mapped_region region;
+	try
+	{
+		// Mapping an empty file is an error, so we don't bother.
+		if( boost::filesystem::file_size( fileName() ) )
 		{
-			int index = tvec[i] > 0 ? tvec[i] - 1 : m_introducedTextureCoordinates.size() + tvec[i];
-			m_sTextureCoordinates->push_back(m_introducedTextureCoordinates[index][0]);
-			m_tTextureCoordinates->push_back(m_introducedTextureCoordinates[index][1]);
+			boost::interprocess::file_mapping file( fileName().c_str(), boost::interprocess::read_only );
+			region = boost::interprocess::mapped_region( file, boost::interprocess::read_only );
 		}
 	}
-	else
+	catch( const std::exception &e )
 	{
-		for(unsigned int i = 0; i < tvec.size(); ++i)
-		{
-			m_sTextureCoordinates->push_back(0.0f);
-			m_tTextureCoordinates->push_back(0.0f);
+		throw IOException( "OBJReader : Unable to open \"" + fileName() + "\" : " + e.what() );
+	}
+
+	const char *begin = static_cast<const char *>( region.get_address() );
+	vector<Chunk> chunks = splitChunks( begin, begin + region.get_size() );
+
+	// Count the vertices, texture coordinates and normals in each chunk,
+	// so we know where each chunk's elements are in the whole file.
+	// This is necessary because faces may reference elements relative
+	// to the current position in the file.
+
+	parallelForEachChunk( chunks, countElements );
+
+	size_t numVertices = 0;
+	size_t numTextureCoordinates = 0;
+	size_t numNormals = 0;
+	size_t numInvalidElements = 0;
+	for( auto &chunk : chunks )
+	{
+		chunk.firstVertex = numVertices;
+		chunk.firstTextureCoordinate = numTextureCoordinates;
+		chunk.firstNormal = numNormals;
+		numVertices += chunk.numVertices;
+		numTextureCoordinates += chunk.numTextureCoordinates;
+		numNormals += chunk.numNormals;
+		numInvalidElements += chunk.numInvalidElements;
+	}
+
+	if( numInvalidElements )
+	{
+		msg(
+			Msg::Warning, "OBJReader",
+			boost::format( "Ignoring %1% invalid vertex, texture coordinate or normal specifications in \"%2%\"" ) % numInvalidElements % fileName()
+		);
+	}
+
+	// Parse the elements directly into their final location,
+	// and the faces into per-chunk storage.
+
+	V3fVectorDataPtr vertices = new V3fVectorData();
+	vertices->writable().resize( numVertices );
+	vector<V3f> textureCoordinates( numTextureCoordinates );
+	vector<V3f> normals( numNormals );
+	V3f *verticesPointer = vertices->writable().data();
+
+	parallelForEachChunk(
+		chunks,
+		[&]( Chunk &chunk ) {
+			parseChunk( chunk, verticesPointer, textureCoordinates.data(), normals.data() );
 		}
+	);
+
+	// Merge the faces from all chunks.
+
+	size_t numFaces = 0;
+	size_t numFaceVertices = 0;
+	bool haveTextureCoordinates = false;
+	bool haveNormals = false;
+	for( auto &chunk : chunks )
+	{
+		chunk.firstFace = numFaces;
+		chunk.firstFaceVertex = numFaceVertices;
+		numFaces += chunk.verticesPerFace.size();
+		numFaceVertices += chunk.vertexIds.size();
+		haveTextureCoordinates = haveTextureCoordinates || chunk.textureCoordinateIds.size();
+		haveNormals = haveNormals || chunk.normalIds.size();
 	}
-}
 
-void OBJReader::parseGroup(const char *begin, const char *end)
-{
-	// set current group
-	vector<string> groupNames;
-	srule grouping = "g" >> *(lexeme_d[alnum_p >> *(alnum_p)][append(groupNames)]);
+	IntVectorDataPtr verticesPerFaceData = new IntVectorData();
+	vector<int> &verticesPerFace = verticesPerFaceData->writable();
+	verticesPerFace.resize( numFaces );
 
-	parse(begin, grouping, space_p);
+	IntVectorDataPtr vertexIdsData = new IntVectorData();
+	vector<int> &vertexIds = vertexIdsData->writable();
+	vertexIds.resize( numFaceVertices );
 
-	// from 'http://local.wasp.uwa.edu.au/~pbourke/dataformats/obj/':
-	// The default group name is default.
-	if(groupNames.empty())
+	// Faces which don't specify texture coordinates or normals are
+	// given zero values if other faces do specify them.
+
+	FloatVectorDataPtr sData = new FloatVectorData();
+	FloatVectorDataPtr tData = new FloatVectorData();
+	vector<float> &s = sData->writable();
+	vector<float> &t = tData->writable();
+	if( haveTextureCoordinates )
 	{
-		groupNames.push_back("default");
+		s.resize( numFaceVertices );
+		t.resize( numFaceVertices );
 	}
 
-	// \todo associate mesh objects with group names
-}
+	V3fVectorDataPtr normalsData = new V3fVectorData();
+	vector<V3f> &n = normalsData->writable();
+	if( haveNormals )
+	{
+		n.resize( numFaceVertices );
+	}
+
+	parallelForEachChunk(
+		chunks,
+		[&]( Chunk &chunk ) {
+
+			std::copy( chunk.verticesPerFace.begin(), chunk.verticesPerFace.end(), verticesPerFace.begin() + chunk.firstFace );
+
+			for( size_t i = 0, e = chunk.vertexIds.size(); i < e; ++i )
+			{
+				const size_t faceVertex = chunk.firstFaceVertex + i;
+				vertexIds[faceVertex] = checkedIndex( chunk.vertexIds[i], numVertices );
+
+				if( haveTextureCoordinates )
+				{
+					const int index = i < chunk.textureCoordinateIds.size() ? chunk.textureCoordinateIds[i] : g_noIndex;
+					if( index != g_noIndex )
+					{
+						const V3f &vt = textureCoordinates[checkedIndex( index, numTextureCoordinates )];
+						s[faceVertex] = vt[0];
+						t[faceVertex] = vt[1];
+					}
+				}
+
+				if( haveNormals )
+				{
+					const int index = i < chunk.normalIds.size() ? chunk.normalIds[i] : g_noIndex;
+					if( index != g_noIndex )
+					{
+						n[faceVertex] = normals[checkedIndex( index, numNormals )];
+					}
+				}
+			}
+
+			// Free memory as we go.
+			vector<int>().swap( chunk.vertexIds );
+			vector<int>().swap( chunk.textureCoordinateIds );
+			vector<int>().swap( chunk.normalIds );
+		}
+	);
 
-void OBJReader::parseOBJ() {
-
-	srule comment = comment_p("#");
-
-	// see
-	// http://local.wasp.uwa.edu.au/~pbourke/dataformats/obj/
-
-	// vertices
-	srule vertex         = ("v"  >> real_p >> real_p >> real_p) [bind(&OBJReader::parseVertex,            this, _1, _2)];
-	srule vertex_texture = ("vt" >> real_p >> real_p)           [bind(&OBJReader::parseTextureCoordinate, this, _1, _2)];
-	srule vertex_normal  = ("vn" >> real_p >> real_p >> real_p) [bind(&OBJReader::parseNormal,            this, _1, _2)];
-	//srule vertex_parameter_space  = "vp" >> real_p >> real_p >> real_p;
-
-	// srule cs_types = ("bmatrix" | "bezier" | "bspline" | "cardinal" | "taylor");
-	// srule vertex_curve_or_surface = "cstype" >> "rat" >> cs_types;
-	// srule vertex_degree  = "deg" >> real_p >> real_p;
-	// srule vertex_basis_matrix  = "bmat";
-	// srule vertex_step_size  = "step" >> int_p >> int_p;
-	srule vertex_type = vertex | vertex_texture | vertex_normal;
-
-	// elements
-	srule point = "p" >> real_p >> *(real_p);
-	srule  line = "l" >> int_p >> int_p >> *(int_p);
-	srule  face = (ch_p('f') >> *(anychar_p))[bind(&OBJReader::parseFace, this, _1, _2)];
-	// srule curve = "curv";
-	// srule curve_2d = "curv2";
-	// srule surface = "surf";
-	srule element = point | line | face;
-
- 	// free-form curve / surface statements
-	// srule parameter = "parm";
-	// srule trim_loop = "trim";
-	// srule hole_loop = "hole";
-	// srule special_curve = "scrv";
-	// srule special_point = "sp";
-	// srule end_statement = "end";
-
-	// connectivity
-	//srule connect = "con";
-
-	// grouping
-	srule group_name = ("g" >> *(anychar_p))[bind(&OBJReader::parseGroup, this, _1, _2)];
-	//	srule smoothing_group = "s";
-	//	srule merging_group = "mg";
-	srule object_name = "o" >> int_p;
-	srule grouping = group_name | object_name;
-
-	// display and render attributes
-	// srule bevel_interpretation = "bevel";
-	// srule color_interpolation = "c_interp";
-	// srule dissolve_interpolation = "d_interp";
-	// srule level_of_detail = "lod";
-	// srule material_name = "usemtl";
-	// srule material_library = "mtllib";
-	// srule shadow_casting = "shadow_obj";
-	// srule ray_tracing = "trace_obj";
-	// srule curve_approximation_technique = "ctech";
-	// srule surface_approximation_technique = "stech";
-
-	ifstream in(fileName().c_str());
-	string str;
-	while(getline(in, str))
-		parse(str.c_str(), vertex_type | element | grouping | comment, space_p);
+	// create our MeshPrimitive
+	MeshPrimitivePtr mesh = new MeshPrimitive( verticesPerFaceData, vertexIdsData, "linear", vertices );
+	if( haveTextureCoordinates )
+	{
+		mesh->variables.insert(PrimitiveVariableMap::value_type("s", PrimitiveVariable( PrimitiveVariable::FaceVarying, sData)));
+		mesh->variables.insert(PrimitiveVariableMap::value_type("t", PrimitiveVariable(  PrimitiveVariable::FaceVarying, tData)));
+	}
+	if( haveNormals )
+	{
+		mesh->variables.insert(PrimitiveVariableMap::value_type("N", PrimitiveVariable(  PrimitiveVariable::FaceVarying, normalsData)));
+	}
+	return mesh;
 }
@@ -45,6 +45,9 @@
 
 #include "boost/format.hpp"
 
+#include "tbb/blocked_range.h"
+#include "tbb/parallel_for.h"
+
 #include <numeric>
 
 using namespace IECore;
@@ -112,7 +115,43 @@ PointsPrimitivePtr deletePoints( const PointsPrimitive *pointsPrimitive, IECoreS
 {
 	PointsPrimitivePtr outPointsPrimitive = new PointsPrimitive( 0 );
 
-	IECoreScene::PrimitiveVariableAlgos::DeleteFlaggedUniformFunctor<T> vertexFunctor( deleteFlagView, invert );
+	// Find the points we're keeping, and number them in order
+
+	const int numPoints = pointsPrimitive->getNumPoints();
+	tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+
+	Canceller::check( canceller );
+	std::vector<int> keepPoint( numPoints );
+	tbb::parallel_for( tbb::blocked_range<int>( 0, numPoints ),
+		[&keepPoint, &deleteFlagView, invert] ( const tbb::blocked_range<int> &range )
+		{
+			for( int i = range.begin(); i != range.end(); ++i )
+			{
+				keepPoint[i] = static_cast<bool>( deleteFlagView[i] ) == invert;
+			}
+		},
+		taskGroupContext
+	);
+
+	Canceller::check( canceller );
+	std::vector<int> outputPointIndices;
+	std::vector<int> keptPoints( IECoreScene::PrimitiveVariableAlgos::exclusiveScan( keepPoint, outputPointIndices ) );
+
+	tbb::parallel_for( tbb::blocked_range<int>( 0, numPoints ),
+		[&keepPoint, &outputPointIndices, &keptPoints] ( const tbb::blocked_range<int> &range )
+		{
+			for( int i = range.begin(); i != range.end(); ++i )
+			{
+				if( keepPoint[i] )
+				{
+					keptPoints[outputPointIndices[i]] = i;
+				}
+			}
+		},
+		taskGroupContext
+	);
+
+	IECoreScene::PrimitiveVariableAlgos::GatherFunctor vertexFunctor( keptPoints, canceller );
 
 	for( PrimitiveVariableMap::const_iterator it = pointsPrimitive->variables.begin(), e = pointsPrimitive->variables.end(); it != e; ++it )
 	{
@@ -153,57 +192,114 @@ PointsPrimitivePtr deletePoints( const PointsPrimitive *pointsPrimitive, IECoreS
 	return outPointsPrimitive;
 }
 
-struct CollectDataFn
+// Allocates storage for a merged primitive variable, matching the type of `data`.
+struct AllocateDataFn
 {
-	CollectDataFn( size_t size ) : offset( 0 ), m_size( size )
+	typedef DataPtr ReturnType;
+
+	AllocateDataFn( size_t size ) : m_size( size )
 	{
 	}
 
+	template<typename T>
+	ReturnType operator()( const T *data )
+	{
+		typename T::Ptr result = new T();
+		result->writable().resize( m_size );
+		return result;
+	}
+
+	size_t m_size;
+};
+
+// Copies `data` into `m_outputData` at `m_offset`. Different offsets may be
+// written to concurrently.
+struct CollectDataFn
+{
 	typedef void ReturnType;
 
+	CollectDataFn( Data *outputData, size_t offset ) : m_outputData( outputData ), m_offset( offset )
+	{
+	}
+
 	template<typename T>
 	ReturnType operator()( const T *data )
 	{
-		T *container = nullptr;
-		if( !outputData )
-		{
-			container = new T();
-			outputData = container;
+		T *container = runTimeCast<T>( m_outputData );
+		std::copy( data->readable().begin(), data->readable().end(), container->writable().begin() + m_offset );
+	}
 
-			container->writable().resize( m_size );
-		}
-		else
+	Data *m_outputData;
+	size_t m_offset;
+};
+
+DataPtr mergePrimVars( const std::vector<const PrimitiveVariableMap *> &variables, const std::vector<size_t> &offsets, const std::string &primVarName, const Canceller *canceller )
+{
+	// Find the variables to merge, and allocate the result from the first one.
+
+	std::vector<const Data *> sources( variables.size(), nullptr );
+	for( size_t i = 0; i < variables.size(); ++i )
+	{
+		PrimitiveVariableMap::const_iterator it = variables[i]->find( primVarName );
+		if( it != variables[i]->end() )
 		{
-			container = runTimeCast<T>( outputData.get() );
+			sources[i] = it->second.data.get();
 		}
+	}
 
-		std::copy( data->readable().begin(), data->readable().end(), container->writable().begin() + offset );
+	DataPtr result;
+	for( const auto &source : sources )
+	{
+		if( source )
+		{
+			AllocateDataFn fn( offsets.back() );
+			result = despatchTypedData<AllocateDataFn, TypeTraits::IsVectorTypedData>( const_cast<Data *>( source ), fn );
+			break;
+		}
 	}
 
-	DataPtr outputData;
-	size_t offset;
-	size_t m_size;
-};
+	if( !result )
+	{
+		return result;
+	}
 
-DataPtr mergePrimVars( const std::vector<PointsPrimitivePtr> &pointsPrimitives, const std::string &primVarName, size_t totalCount, const Canceller *canceller )
-{
-	CollectDataFn fn( totalCount );
+	// Copy each variable into place.
 
-	for( size_t i = 0; i < pointsPrimitives.size(); ++i )
+	auto collect = [&sources, &offsets, &result, canceller] ( size_t i )
 	{
 		Canceller::check( canceller );
-		PrimitiveVariableMap::const_iterator it = pointsPrimitives[i]->variables.find( primVarName );
-
-		if( it != pointsPrimitives[i]->variables.end() )
+		if( sources[i] )
 		{
-			PrimitiveVariable primVar = it->second;
-			despatchTypedData<CollectDataFn, TypeTraits::IsVectorTypedData>( const_cast< Data * >( primVar.data.get() ), fn );
+			CollectDataFn fn( result.get(), offsets[i] );
+			despatchTypedData<CollectDataFn, TypeTraits::IsVectorTypedData>( const_cast<Data *>( sources[i] ), fn );
 		}
+	};
 
-		fn.offset += pointsPrimitives[i]->getNumPoints();
+	if( result->isInstanceOf( BoolVectorData::staticTypeId() ) )
+	{
+		// Elements of `std::vector<bool>` can't be written
+		// concurrently, so we must copy them serially.
+		for( size_t i = 0; i < sources.size(); ++i )
+		{
+			collect( i );
+		}
+	}
+	else
+	{
+		tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+		tbb::parallel_for( tbb::blocked_range<size_t>( 0, sources.size(), 1 ),
+			[&collect] ( const tbb::blocked_range<size_t> &range )
+			{
+				for( size_t i = range.begin(); i != range.end(); ++i )
+				{
+					collect( i );
+				}
+			},
+			taskGroupContext
+		);
 	}
 
-	return fn.outputData;
+	return result;
 }
 
 } // anonymous namespace
@@ -332,21 +428,30 @@ PointsPrimitivePtr deletePoints( const PointsPrimitive *pointsPrimitive, const P
 
 PointsPrimitivePtr mergePoints( const std::vector<const PointsPrimitive *> &pointsPrimitives, const Canceller *canceller /* = nullptr */ )
 {
-	size_t totalPointCount = 0;
 	typedef std::map<std::string, IECore::TypeId> FoundPrimvars;
 	FoundPrimvars foundPrimvars;
 
 	PrimitiveVariableMap constantPrimVars;
 
-	std::vector<PointsPrimitivePtr> validatedPointsPrimitives( pointsPrimitives.size() );
+	// We take shallow copies of the primitive variables, so that we can
+	// substitute cast data without copying the input primitives.
+	std::vector<PrimitiveVariableMap> validatedVariables( pointsPrimitives.size() );
+	std::vector<size_t> offsets( pointsPrimitives.size() + 1, 0 );
+
+	// Primitive variables which need casting to the type of the first occurrence.
+	struct Cast
+	{
+		const std::string *name;
+		PrimitiveVariable *primitiveVariable;
+		IECore::TypeId typeId;
+	};
+	std::vector<Cast> toCast;
 
 	// find out which primvars can be merged
 	for( size_t i = 0; i < pointsPrimitives.size(); ++i )
 	{
-		PointsPrimitivePtr pointsPrimitive = validatedPointsPrimitives[i] = pointsPrimitives[i]->copy();
-
-		totalPointCount += pointsPrimitive->getNumPoints();
-		PrimitiveVariableMap &variables = pointsPrimitive->variables;
+		offsets[i+1] = offsets[i] + pointsPrimitives[i]->getNumPoints();
+		PrimitiveVariableMap &variables = validatedVariables[i] = pointsPrimitives[i]->variables;
 		for( PrimitiveVariableMap::iterator it = variables.begin(); it != variables.end(); ++it )
 		{
 			DataPtr data = it->second.data;
@@ -387,33 +492,44 @@ PointsPrimitivePtr mergePoints( const std::vector<const PointsPrimitive *> &poin
 				{
 					foundPrimvars[name] = typeId;
 				}
-				else
+				else if( fIt->second != typeId )
 				{
-					if( fIt->second != typeId )
-					{
-						Canceller::check( canceller );
-						DataCastOpPtr castOp = new DataCastOp();
-
-						castOp->objectParameter()->setValue( data );
-						castOp->targetTypeParameter()->setNumericValue( fIt->second );
-
-						try
-						{
-							it->second.data = runTimeCast<Data>( castOp->operate() );
-						}
-						catch( const IECore::Exception &e )
-						{
-							std::string msg = boost::str( boost::format( "PointsAlgo::mergePoints unable to cast primvar %s (%s) " ) % name % e.what() );
-							throw InvalidArgumentException( msg );
-						}
-					}
+					toCast.push_back( { &name, &it->second, fIt->second } );
 				}
 			}
 		}
 	}
 
+	// cast primvars in parallel
+	tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+	tbb::parallel_for( tbb::blocked_range<size_t>( 0, toCast.size(), 1 ),
+		[&toCast, canceller] ( const tbb::blocked_range<size_t> &range )
+		{
+			for( size_t i = range.begin(); i != range.end(); ++i )
+			{
+				Canceller::check( canceller );
+				PrimitiveVariable &primVar = *toCast[i].primitiveVariable;
+				DataCastOpPtr castOp = new DataCastOp();
+
+				castOp->objectParameter()->setValue( primVar.data );
+				castOp->targetTypeParameter()->setNumericValue( toCast[i].typeId );
+
+				try
+				{
+					primVar.data = runTimeCast<Data>( castOp->operate() );
+				}
+				catch( const IECore::Exception &e )
+				{
+					std::string msg = boost::str( boost::format( "PointsAlgo::mergePoints unable to cast primvar %s (%s) " ) % *toCast[i].name % e.what() );
+					throw InvalidArgumentException( msg );
+				}
+			}
+		},
+		taskGroupContext
+	);
+
 	// allocate the new points primitive and copy the primvars
-	PointsPrimitivePtr newPoints = new PointsPrimitive( totalPointCount );
+	PointsPrimitivePtr newPoints = new PointsPrimitive( offsets.back() );
 
 	// copy constant primvars
 	for( PrimitiveVariableMap::const_iterator it = constantPrimVars.begin(); it != constantPrimVars.end(); ++it )
@@ -422,10 +538,33 @@ PointsPrimitivePtr mergePoints( const std::vector<const PointsPrimitive *> &poin
 	}
 
 	// merge vertex primvars
+	std::vector<const PrimitiveVariableMap *> variables;
+	for( const auto &v : validatedVariables )
+	{
+		variables.push_back( &v );
+	}
+
+	std::vector<FoundPrimvars::const_iterator> primvarsToMerge;
 	for( FoundPrimvars::const_iterator it = foundPrimvars.begin(); it != foundPrimvars.end(); ++it )
 	{
-		DataPtr mergedData = mergePrimVars( validatedPointsPrimitives, it->first, totalPointCount, canceller );
-		newPoints->variables[it->first] = PrimitiveVariable( PrimitiveVariable::Vertex, mergedData );
+		primvarsToMerge.push_back( it );
+	}
+
+	std::vector<DataPtr> mergedData( primvarsToMerge.size() );
+	tbb::parallel_for( tbb::blocked_range<size_t>( 0, primvarsToMerge.size(), 1 ),
+		[&primvarsToMerge, &mergedData, &variables, &offsets, canceller] ( const tbb::blocked_range<size_t> &range )
+		{
+			for( size_t i = range.begin(); i != range.end(); ++i )
+			{
+				mergedData[i] = mergePrimVars( variables, offsets, primvarsToMerge[i]->first, canceller );
+			}
+		},
+		taskGroupContext
+	);
+
+	for( size_t i = 0; i < primvarsToMerge.size(); ++i )
+	{
+		newPoints->variables[primvarsToMerge[i]->first] = PrimitiveVariable( PrimitiveVariable::Vertex, mergedData[i] );
 	}
 
 	return newPoints;
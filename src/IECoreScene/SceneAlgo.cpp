@@ -39,8 +39,13 @@
 #include "IECoreScene/PointsPrimitive.h"
 #include "IECoreScene/SceneInterface.h"
 
+#include "tbb/blocked_range.h"
+#include "tbb/parallel_for.h"
 #include "tbb/task.h"
+#include "tbb/task_arena.h"
+#include "tbb/task_group.h"
 
+#include <algorithm>
 #include <atomic>
 
 using namespace IECore;
@@ -125,29 +130,30 @@ struct CopyInfo
 	T setCount;
 };
 
-CopyInfo<size_t> handleLocation( const SceneInterface *src, SceneInterface *dst, double time, unsigned int flags )
+// The data for a single location at a single time, read from
+// the source scene and awaiting writing to the destination.
+struct LocationData
+{
+	Imath::Box3d bound;
+	IECore::ConstDataPtr transform;
+	std::vector<std::pair<SceneInterface::Name, IECore::ConstObjectPtr>> attributes;
+	SceneInterface::NameList tags;
+	std::vector<std::pair<SceneInterface::Name, PathMatcher>> sets;
+	IECore::ConstObjectPtr object;
+};
+
+CopyInfo<size_t> readLocation( const SceneInterface *src, double time, unsigned int flags, bool isRoot, LocationData &data )
 {
-	SceneInterface::Path path;
-	src->path( path );
-	bool isRoot = path.empty();
 	CopyInfo<size_t> copyInfo;
 
 	if( flags & SceneAlgo::Bounds )
 	{
-		auto bound = src->readBound( time );
-		if( dst )
-		{
-			dst->writeBound( bound, time );
-		}
+		data.bound = src->readBound( time );
 	}
 
 	if( flags & SceneAlgo::Transforms )
 	{
-		IECore::ConstDataPtr transform = src->readTransform( time );
-		if( dst && !isRoot )
-		{
-			dst->writeTransform( transform.get(), time );
-		}
+		data.transform = src->readTransform( time );
 	}
 
 	if( flags & SceneAlgo::Attributes )
@@ -156,71 +162,114 @@ CopyInfo<size_t> handleLocation( const SceneInterface *src, SceneInterface *dst,
 		src->attributeNames( attributeNames );
 
 		copyInfo.attributeCount += attributeNames.size();
+		data.attributes.reserve( attributeNames.size() );
 		for( const auto &attributeName : attributeNames )
 		{
-			IECore::ConstObjectPtr attr = src->readAttribute( attributeName, time );
-			if( dst )
-			{
-				dst->writeAttribute( attributeName, attr.get(), time );
-			}
+			data.attributes.emplace_back( attributeName, src->readAttribute( attributeName, time ) );
 		}
 	}
 
 	if( flags & SceneAlgo::Tags )
 	{
-		SceneInterface::NameList tags;
-		src->readTags( tags );
-		copyInfo.tagCount += tags.size();
-		if( dst )
-		{
-			dst->writeTags( tags );
-		}
+		src->readTags( data.tags );
+		copyInfo.tagCount += data.tags.size();
 	}
 
 	if( flags & SceneAlgo::Sets && isRoot )
 	{
 		SceneInterface::NameList setNames = src->setNames();
 		copyInfo.setCount += setNames.size();
+		data.sets.reserve( setNames.size() );
 		for( const auto &setName : setNames )
 		{
-			PathMatcher set = src->readSet( setName );
-			if( dst )
-			{
-				dst->writeSet( setName, set );
-			}
+			data.sets.emplace_back( setName, src->readSet( setName ) );
 		}
 	}
 
 	if( flags & SceneAlgo::Objects && src->hasObject() )
 	{
-		IECore::ConstObjectPtr obj = src->readObject( time );
+		data.object = src->readObject( time );
 
-		if( IECoreScene::MeshPrimitive::ConstPtr mesh = IECore::runTimeCast<const IECoreScene::MeshPrimitive>( obj ) )
+		if( const IECoreScene::MeshPrimitive *mesh = IECore::runTimeCast<const IECoreScene::MeshPrimitive>( data.object.get() ) )
 		{
 			copyInfo.polygonCount += mesh->numFaces();
 		}
-		else if( IECoreScene::CurvesPrimitive::ConstPtr curves = IECore::runTimeCast<const IECoreScene::CurvesPrimitive>( obj ) )
+		else if( const IECoreScene::CurvesPrimitive *curves = IECore::runTimeCast<const IECoreScene::CurvesPrimitive>( data.object.get() ) )
 		{
 			copyInfo.curveCount += curves->numCurves();
 		}
-		else if( IECoreScene::PointsPrimitive::ConstPtr points = IECore::runTimeCast<const IECoreScene::PointsPrimitive>( obj ) )
+		else if( const IECoreScene::PointsPrimitive *points = IECore::runTimeCast<const IECoreScene::PointsPrimitive>( data.object.get() ) )
 		{
 			copyInfo.pointCount += points->getNumPoints();
 		}
-		if( dst )
-		{
-			dst->writeObject( obj.get(), time );
-		}
 	}
 
 	return copyInfo;
+}
 
+void writeLocation( const LocationData &data, SceneInterface *dst, double time, unsigned int flags, bool isRoot )
+{
+	if( flags & SceneAlgo::Bounds )
+	{
+		dst->writeBound( data.bound, time );
+	}
+
+	if( flags & SceneAlgo::Transforms && !isRoot )
+	{
+		dst->writeTransform( data.transform.get(), time );
+	}
+
+	for( const auto &attribute : data.attributes )
+	{
+		dst->writeAttribute( attribute.first, attribute.second.get(), time );
+	}
+
+	if( flags & SceneAlgo::Tags )
+	{
+		dst->writeTags( data.tags );
+	}
+
+	for( const auto &set : data.sets )
+	{
+		dst->writeSet( set.first, set.second );
+	}
+
+	if( data.object )
+	{
+		dst->writeObject( data.object.get(), time );
+	}
 }
 
-template<typename LocationFn>
-void copy( const SceneInterface *src, SceneInterface *dst, double time, unsigned int flags, LocationFn &locationFn )
+CopyInfo<size_t> handleLocation( const SceneInterface *src, SceneInterface *dst, double time, unsigned int flags )
 {
-	locationFn( src, dst, time, flags );
+	SceneInterface::Path path;
+	src->path( path );
+	const bool isRoot = path.empty();
+
+	LocationData data;
+	CopyInfo<size_t> copyInfo = readLocation( src, time, flags, isRoot, data );
+	if( dst )
+	{
+		writeLocation( data, dst, time, flags, isRoot );
+	}
+
+	return copyInfo;
+}
+
+struct CopyLocation
+{
+	ConstSceneInterfacePtr src;
+	SceneInterfacePtr dst;
+	bool isRoot;
+};
+
+// Appends `src` and all its descendants to `locations` in depth-first
+// order, creating the corresponding locations in `dst`.
+void gatherLocations( const SceneInterface *src, SceneInterface *dst, std::vector<CopyLocation> &locations )
+{
+	SceneInterface::Path path;
+	src->path( path );
+	locations.push_back( { src, dst, path.empty() } );
 
 	SceneInterface::NameList childNames;
 	src->childNames( childNames );
@@ -228,10 +277,14 @@ void copy( const SceneInterface *src, SceneInterface *dst, double time, unsigned
 	for( const auto &childName : childNames )
 	{
 		SceneInterfacePtr dstChild = dst->child( childName, SceneInterface::CreateIfMissing );
-		::copy( src->child( childName ).get(), dstChild.get(), time, flags, locationFn );
+		gatherLocations( src->child( childName ).get(), dstChild.get(), locations );
 	}
 }
 
+// Number of location samples read in parallel while the
+// previous batch is being written.
+const size_t g_copyBatchSize = 256;
+
 } // namespace
 
 namespace IECoreScene
@@ -278,17 +331,104 @@ SceneStats parallelReadAll( const SceneInterface *src, int startFrame, int endFr
 
 void copy( const SceneInterface *src, SceneInterface *dst, int startFrame, int endFrame, float frameRate, unsigned int flags )
 {
-	for( int f = startFrame; f <= endFrame; ++f )
-	{
-		double time = f / frameRate;
-		// disable copying tags for all frame apart from the first.
-		if( f != startFrame )
-		{
-			flags &= ~Tags;
-		}
+	// Flatten the hierarchy so that we can address each location
+	// sample by index. The samples are ordered frame by frame, and
+	// depth-first within each frame, which is the order in which
+	// they are written.
 
-		::copy( src, dst, time, flags, ::handleLocation );
+	std::vector<CopyLocation> locations;
+	gatherLocations( src, dst, locations );
+
+	if( endFrame < startFrame )
+	{
+		return;
 	}
+
+	const size_t numFrames = endFrame - startFrame + 1;
+	const size_t numSamples = numFrames * locations.size();
+
+	auto sampleTime = [&] ( size_t frameIndex ) {
+		const int frame = startFrame + (int)frameIndex;
+		return frame / frameRate;
+	};
+
+	auto sampleFlags = [&] ( size_t frameIndex ) {
+		// Only copy tags on the first frame.
+		return frameIndex ? flags & ~Tags : flags;
+	};
+
+	// Reading is done in parallel, one batch of samples at a time,
+	// while the previous batch is written serially on this thread.
+	// Scene writers are not generally threadsafe, and many require
+	// samples to be written in order.
+
+	std::vector<LocationData> readBatch( g_copyBatchSize );
+	std::vector<LocationData> writeBatch( g_copyBatchSize );
+
+	auto read = [&] ( size_t batchBegin ) {
+		const size_t batchEnd = std::min( batchBegin + g_copyBatchSize, numSamples );
+		tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+		tbb::parallel_for(
+			tbb::blocked_range<size_t>( batchBegin, batchEnd, 1 ),
+			[&] ( const tbb::blocked_range<size_t> &range ) {
+				for( size_t i = range.begin(); i != range.end(); ++i )
+				{
+					const size_t frameIndex = i / locations.size();
+					const CopyLocation &location = locations[i % locations.size()];
+					LocationData &data = readBatch[i - batchBegin];
+					data = LocationData();
+					::readLocation( location.src.get(), sampleTime( frameIndex ), sampleFlags( frameIndex ), location.isRoot, data );
+				}
+			},
+			taskGroupContext
+		);
+	};
+
+	tbb::this_task_arena::isolate(
+		[&] {
+			read( 0 );
+			for( size_t batchBegin = 0; batchBegin < numSamples; batchBegin += g_copyBatchSize )
+			{
+				std::swap( readBatch, writeBatch );
+
+				tbb::task_group readTasks;
+				const size_t nextBatchBegin = batchBegin + g_copyBatchSize;
+				if( nextBatchBegin < numSamples )
+				{
+					readTasks.run( [&read, nextBatchBegin] { read( nextBatchBegin ); } );
+				}
+
+				try
+				{
+					const size_t batchEnd = std::min( nextBatchBegin, numSamples );
+					for( size_t i = batchBegin; i < batchEnd; ++i )
+					{
+						const size_t frameIndex = i / locations.size();
+						const CopyLocation &location = locations[i % locations.size()];
+						::writeLocation( writeBatch[i - batchBegin], location.dst.get(), sampleTime( frameIndex ), sampleFlags( frameIndex ), location.isRoot );
+						// Release memory as soon as possible.
+						writeBatch[i - batchBegin] = LocationData();
+					}
+				}
+				catch( ... )
+				{
+					readTasks.cancel();
+					// The reads must finish before we leave this scope, but
+					// any error from them mustn't replace the original one.
+					try
+					{
+						readTasks.wait();
+					}
+					catch( ... )
+					{
+					}
+					throw;
+				}
+
+				readTasks.wait();
+			}
+		}
+	);
 }
 
 } // SceneAlgo
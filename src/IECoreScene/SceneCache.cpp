@@ -55,7 +55,10 @@
 #include "boost/core/demangle.hpp"
 #include "boost/tuple/tuple.hpp"
 
+#include "tbb/blocked_range.h"
 #include "tbb/concurrent_hash_map.h"
+#include "tbb/parallel_for.h"
+#include "tbb/task_arena.h"
 
 using namespace IECore;
 using namespace IECoreScene;
@@ -836,8 +839,100 @@ class SceneCache::ReaderImplementation : public SceneCache::Implementation
 			return NameList( setNames.begin(), std::unique( setNames.begin(), setNames.end() ) );
 		}
 
+		void prefetch( const std::vector<Path> &paths, const std::vector<double> &times, int flags, const Canceller *canceller )
+		{
+			tbb::this_task_arena::isolate(
+				[this, &paths, &times, flags, canceller] {
+					tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+					tbb::parallel_for(
+						tbb::blocked_range<size_t>( 0, paths.size(), 1 ),
+						[this, &paths, &times, flags, canceller]( const tbb::blocked_range<size_t> &range ) {
+							for( size_t i = range.begin(); i != range.end(); ++i )
+							{
+								Canceller::check( canceller );
+								SceneCache::ImplementationPtr location = scene( paths[i], SceneInterface::NullIfMissing );
+								if( location )
+								{
+									static_cast<ReaderImplementation *>( location.get() )->prefetchLocation( times, flags, canceller );
+								}
+							}
+						},
+						taskGroupContext
+					);
+				}
+			);
+		}
+
 	private :
 
+		/// Calls 'f' with each sample index required to interpolate
+		/// the given sample times at the given times.
+		template<typename F>
+		static void forEachSample( const SampleTimes &sampleTimes, const std::vector<double> &times, F &&f )
+		{
+			std::vector<size_t> samples;
+			for( double time : times )
+			{
+				size_t s0, s1;
+				const double x = sampleInterval( sampleTimes, time, s0, s1 );
+				if( x < 1 )
+				{
+					samples.push_back( s0 );
+				}
+				if( x > 0 )
+				{
+					samples.push_back( s1 );
+				}
+			}
+
+			std::sort( samples.begin(), samples.end() );
+			samples.erase( std::unique( samples.begin(), samples.end() ), samples.end() );
+			for( size_t sample : samples )
+			{
+				f( sample );
+			}
+		}
+
+		void prefetchLocation( const std::vector<double> &times, int flags, const Canceller *canceller ) const
+		{
+			if( ( flags & SceneCache::PrefetchTransform ) && m_indexedIO->hasEntry( transformEntry ) )
+			{
+				forEachSample(
+					transformSampleTimes(), times,
+					[this, canceller]( size_t sample ) {
+						Canceller::check( canceller );
+						readTransformAtSample( sample );
+					}
+				);
+			}
+
+			if( flags & SceneCache::PrefetchAttributes )
+			{
+				NameList names;
+				attributeNames( names );
+				for( const auto &name : names )
+				{
+					forEachSample(
+						attributeSampleTimes( name ), times,
+						[this, &name, canceller]( size_t sample ) {
+							Canceller::check( canceller );
+							readAttributeAtSample( name, sample );
+						}
+					);
+				}
+			}
+
+			if( ( flags & SceneCache::PrefetchObject ) && hasObject() )
+			{
+				forEachSample(
+					objectSampleTimes(), times,
+					[this, canceller]( size_t sample ) {
+						readObjectAtSample( sample, canceller );
+					}
+				);
+			}
+		}
+
 		/// read a set set explicitly defined at this location
 		PathMatcherDataPtr readLocalSet( const Name &name ) const
 		{
@@ -861,53 +956,117 @@ class SceneCache::ReaderImplementation : public SceneCache::Implementation
 		typedef std::map< IndexedIO::EntryID, const SampleTimes* > AttributeSamplesMap;
 		typedef tbb::spin_rw_mutex AttributeMapMutex;
 
-		typedef std::pair< const ReaderImplementation *, size_t > SimpleCacheKey;
-		typedef tuple< const ReaderImplementation *, const SceneCache::Name &, size_t > AttributeCacheKey;
+	public :
 
-		typedef IECore::ComputationCache< SimpleCacheKey > SimpleCache;
-		typedef IECore::ComputationCache< AttributeCacheKey > AttributeCache;
+		enum CacheEntryType
+		{
+			TransformCacheEntry,
+			AttributeCacheEntry,
+			ObjectCacheEntry,
+			NumCacheEntryTypes
+		};
+
+		struct CacheKey
+		{
+			CacheKey( const ReaderImplementation *reader, CacheEntryType type, size_t sample, const SceneCache::Name &name = SceneCache::Name() )
+				:	reader( reader ), type( type ), sample( sample ), name( name )
+			{
+			}
+
+			const ReaderImplementation *reader;
+			CacheEntryType type;
+			size_t sample;
+			SceneCache::Name name;
+		};
+
+		typedef IECore::ComputationCache< CacheKey > Cache;
+
+		/// The cache of objects, attributes and transforms shared by all readers. Results
+		/// are priced by their memory usage, so that large meshes and small transforms
+		/// compete fairly for a single memory budget. They are stored in a dedicated
+		/// ObjectPool with the same limit, so that the budget bounds the memory actually
+		/// held, and so that the MemoryGovernor can govern SceneCache independently.
+		static Cache &cache()
+		{
+			static Cache::Ptr g_cache = []() {
+				const size_t maxMemoryUsage = defaultMaxCacheMemoryUsage();
+				Cache::Ptr result = new Cache( doRead, cacheHash, cacheCost, maxMemoryUsage, new ObjectPool( maxMemoryUsage, "SceneCache" ) );
+				result->setStatisticsCategories( cacheCategory, NumCacheEntryTypes );
+				return result;
+			}();
+			return *g_cache;
+		}
+
+	private :
+
+		static size_t defaultMaxCacheMemoryUsage()
+		{
+			size_t mi = 500;
+			if( const char *m = getenv( "IECORE_SCENECACHE_MEMORY" ) )
+			{
+				char *end = nullptr;
+				const unsigned long long v = strtoull( m, &end, 10 );
+				if( end != m && *end == '\0' )
+				{
+					mi = v;
+				}
+				else
+				{
+					IECore::msg( IECore::Msg::Warning, "SceneCache", boost::format( "Ignoring invalid IECORE_SCENECACHE_MEMORY value \"%1%\"" ) % m );
+				}
+			}
+			return 1024 * 1024 * mi;
+		}
+
+		static size_t cacheCategory( const CacheKey &key )
+		{
+			return key.type;
+		}
+
+		static size_t cacheCost( const Object *object )
+		{
+			return object->memoryUsage();
+		}
 
 		/// Hold pointers to values allocated/deallocated by the root scene object (the last one to die)
 		class SharedData : public RefCounted
 		{
 			public :
 
-				SharedData() :
-					objectCache( new SimpleCache( doReadObjectAtSample, simpleHash,  10000 )  ),
-					attributeCache( new AttributeCache( doReadAttributeAtSample, attributeHash, 1000) ),
-					transformCache( new SimpleCache(  doReadTransformAtSample, simpleHash, 1000) )
+				SharedData() : id( g_nextId++ )
 				{
 				}
 
 				/// utility function used by the ReaderImplementation to use the LRUCache for transform reading
 				IECore::ConstDataPtr readTransformAtSample( const ReaderImplementation *reader, size_t sample )
 				{
-					return runTimeCast< const Data >( transformCache->get( SimpleCacheKey(reader, sample) ) );
+					return runTimeCast< const Data >( cache().get( CacheKey( reader, TransformCacheEntry, sample ) ) );
 				}
 
 				/// utility function used by the ReaderImplementation to use the LRUCache for object reading
 				IECore::ConstObjectPtr readObjectAtSample( const ReaderImplementation *reader, size_t sample, const Canceller *canceller )
 				{
 					// \todo - we should pass the Canceller through to Object::load, but this is currently
-					// complicated by the objectCache.  We should perhaps remove the objectCache anyway, since it
+					// complicated by the cache.  We should perhaps remove the object caching anyway, since it
 					// is redundant with Gaffer's cache?  Though caching the topology for the special
 					// "animatedObjectPrimVars" mode could still be valuable?
 					const size_t defaultSample = (size_t) - 1;
-					SimpleCacheKey currentKey( reader, sample );
+					Cache &objectCache = cache();
+					CacheKey currentKey( reader, ObjectCacheEntry, sample );
 
 					// if constant topology and the object is not in the cache, we try to build it from another frame
 					if ( reader->hasAttribute(animatedObjectPrimVarsAttribute) )
 					{
 						/// Could not create the object from another time sample... so we load the entire object
-						SimpleCacheKey defaultKey( reader, defaultSample );
+						CacheKey defaultKey( reader, ObjectCacheEntry, defaultSample );
 
 						Canceller::check( canceller );
-						ConstObjectPtr obj = objectCache->get( currentKey, SimpleCache::NullIfMissing );
+						ConstObjectPtr obj = objectCache.get( currentKey, Cache::NullIfMissing );
 						if ( !obj )
 						{
 							/// ok, try to build the object from another frame...
 							Canceller::check( canceller );
-							ConstObjectPtr defaultObj = objectCache->get( defaultKey, SimpleCache::NullIfMissing );
+							ConstObjectPtr defaultObj = objectCache.get( defaultKey, Cache::NullIfMissing );
 							if ( defaultObj )
 							{
 								IECore::ConstInternedStringVectorDataPtr varNames = runTimeCast<const InternedStringVectorData>( reader->readAttributeAtSample(animatedObjectPrimVarsAttribute, 0) );
@@ -918,38 +1077,41 @@ class SceneCache::ReaderImplementation : public SceneCache::Implementation
 									{
 										// we managed to load the object from a different time sample from the cache, just have to load the changing prim vars...
 										mergeMaps( prim->variables, readObjectPrimitiveVariablesAtSample( reader->m_indexedIO, varNames->readable(), sample, canceller ) );
-										objectCache->set( currentKey, prim.get(), ObjectPool::StoreReference );
+										objectCache.set( currentKey, prim.get(), ObjectPool::StoreReference );
 										return prim;
 									}
 								}
 							}
 							/// ok, we don't have the object even from other times in the cache... load it from the file then.
 							Canceller::check( canceller );
-							obj = objectCache->get( currentKey );
+							obj = objectCache.get( currentKey );
 						}
 						/// register the object as the default, so next frames could reuse them
-						objectCache->set( defaultKey, obj.get(), ObjectPool::StoreReference );
+						objectCache.set( defaultKey, obj.get(), ObjectPool::StoreReference );
 						return obj;
 					}
 					/// The object has animated topology... so we load the entire object
-					ConstObjectPtr obj = objectCache->get(currentKey);
+					ConstObjectPtr obj = objectCache.get(currentKey);
 					return obj;
 				}
 
 				/// utility function used by the ReaderImplementation to use the LRUCache for attribute reading
 				IECore::ConstObjectPtr readAttributeAtSample( const ReaderImplementation *reader, const SceneCache::Name &name, size_t sample )
 				{
-					return attributeCache->get( AttributeCacheKey(reader,name,sample) );
+					return cache().get( CacheKey( reader, AttributeCacheEntry, sample, name ) );
 				}
 
 				// \todo Consider adding "ReaderImplementation *rootScene" to optimize the scene() calls.
 				SampleTimesMap sampleTimesMap;
-				SimpleCache::Ptr objectCache;
-				AttributeCache::Ptr attributeCache;
-				SimpleCache::Ptr transformCache;
+
+				/// Unique identifier used to distinguish this file from previous
+				/// openings of the same file in the shared cache.
+				const uint64_t id;
 
 			private :
 
+			static std::atomic<uint64_t> g_nextId;
+
 			// utility function that copies all the values from the rhs dictionary to the lhs.
 			template< typename T >
 			static void mergeMaps ( T& lhs, const T& rhs)
@@ -1085,23 +1247,43 @@ class SceneCache::ReaderImplementation : public SceneCache::Implementation
 			h.append( currScene->name() );
 		}
 
-		static MurmurHash simpleHash( const SimpleCacheKey &key )
+		static MurmurHash cacheHash( const CacheKey &key )
 		{
-			const ReaderImplementation *reader = key.first;
-			size_t sample = key.second;
 			MurmurHash h;
-			reader->sceneHash( h );
-			h.append( (uint64_t)sample );
+			key.reader->sceneHash( h );
+			// The cache is shared by all files, and a file may have been
+			// rewritten since it was last opened, so we must also identify
+			// this particular opening of the file.
+			h.append( key.reader->m_sharedData->id );
+			h.append( (int)key.type );
+			if( key.type == AttributeCacheEntry )
+			{
+				h.append( key.name.value() );
+			}
+			h.append( (uint64_t)key.sample );
 			return h;
 		}
 
-		// static function used by the cache mechanism to actually load the object data from file.
-		static ObjectPtr doReadTransformAtSample( const SimpleCacheKey &key )
+		// static function used by the cache mechanism to actually load the data from file.
+		static ObjectPtr doRead( const CacheKey &key )
+		{
+			switch( key.type )
+			{
+				case TransformCacheEntry :
+					return doReadTransformAtSample( key );
+				case AttributeCacheEntry :
+					return doReadAttributeAtSample( key );
+				default :
+					return doReadObjectAtSample( key );
+			}
+		}
+
+		static ObjectPtr doReadTransformAtSample( const CacheKey &key )
 		{
-			IndexedIOPtr io = key.first->m_indexedIO->subdirectory( transformEntry, IndexedIO::NullIfMissing );
+			IndexedIOPtr io = key.reader->m_indexedIO->subdirectory( transformEntry, IndexedIO::NullIfMissing );
 			if ( !io )
 			{
-				if ( key.second==0 )
+				if ( key.sample==0 )
 				{
 					return g_defaults.defaultTransform;
 				}
@@ -1110,35 +1292,20 @@ class SceneCache::ReaderImplementation : public SceneCache::Implementation
 					throw Exception( "Sample index out of bounds!" );
 				}
 			}
-			return Object::load( io, sampleEntry(key.second) );
+			return Object::load( io, sampleEntry(key.sample) );
 		}
 
-		// static function used by the cache mechanism to actually load the object data from file.
-		static ObjectPtr doReadObjectAtSample( const SimpleCacheKey &key )
+		static ObjectPtr doReadObjectAtSample( const CacheKey &key )
 		{
-			return Object::load( key.first->m_indexedIO->subdirectory( objectEntry ), sampleEntry(key.second) );
-		}
-
-		static MurmurHash attributeHash( const AttributeCacheKey &key )
-		{
-			const ReaderImplementation *reader = get<0>( key );
-			const SceneInterface::Name &name = get<1>( key );
-			size_t sample = get<2>( key );
-
-			MurmurHash h;
-			reader->sceneHash( h );
-			h.append(name.value());
-			h.append( (uint64_t)sample );
-			return h;
+			return Object::load( key.reader->m_indexedIO->subdirectory( objectEntry ), sampleEntry(key.sample) );
 		}
 
-		// static function used by the cache mechanism to actually load the attribute data from file.
-		static ObjectPtr doReadAttributeAtSample( const AttributeCacheKey &key )
+		static ObjectPtr doReadAttributeAtSample( const CacheKey &key )
 		{
-			const SceneInterface::Name &name = get<1>( key );
+			const SceneInterface::Name &name = key.name;
 			ObjectPtr result = Object::load(
-				get<0>( key )->m_indexedIO->subdirectory( attributesEntry )->subdirectory( name ),
-				sampleEntry( get<2>( key ) )
+				key.reader->m_indexedIO->subdirectory( attributesEntry )->subdirectory( name ),
+				sampleEntry( key.sample )
 			);
 
 			if( const ObjectVector *objectVector = runTimeCast<const ObjectVector>( result.get() ) )
@@ -1180,6 +1347,7 @@ class SceneCache::ReaderImplementation : public SceneCache::Implementation
 };
 
 SceneCache::ReaderImplementation::Defaults SceneCache::ReaderImplementation::g_defaults;
+std::atomic<uint64_t> SceneCache::ReaderImplementation::SharedData::g_nextId( 0 );
 
 /// Writer implementation for SceneCache
 /// Each location keeps refcount pointers to their child locations, so they can always return the same (unfinished child) and when the root is destroyed, it
@@ -2536,6 +2704,69 @@ ConstObjectPtr SceneCache::readObjectAtSample( size_t sampleIndex, const Cancell
 	return reader->readObjectAtSample( sampleIndex, canceller );
 }
 
+void SceneCache::prefetch( const std::vector<Path> &paths, const std::vector<double> &times, int flags, const Canceller *canceller ) const
+{
+	ReaderImplementation *reader = ReaderImplementation::reader( m_implementation.get() );
+	reader->prefetch( paths, times, flags, canceller );
+}
+
+size_t SceneCache::getMaxCacheMemoryUsage()
+{
+	return ReaderImplementation::cache().getMaxComputations();
+}
+
+void SceneCache::setMaxCacheMemoryUsage( size_t maxMemoryUsage )
+{
+	ReaderImplementation::Cache &cache = ReaderImplementation::cache();
+	cache.setMaxComputations( maxMemoryUsage );
+	cache.objectPool()->setMaxMemoryUsage( maxMemoryUsage );
+}
+
+size_t SceneCache::cacheMemoryUsage()
+{
+	return ReaderImplementation::cache().cachedComputations();
+}
+
+CompoundDataPtr SceneCache::cacheStatistics()
+{
+	auto statisticsData = [] ( const ReaderImplementation::Cache::Statistics &statistics ) {
+		CompoundDataPtr result = new CompoundData;
+		result->writable()["hits"] = new UInt64Data( statistics.hits );
+		result->writable()["misses"] = new UInt64Data( statistics.misses );
+		result->writable()["evictions"] = new UInt64Data( statistics.evictions );
+		return result;
+	};
+
+	const ReaderImplementation::Cache &cache = ReaderImplementation::cache();
+	CompoundDataPtr result = statisticsData( cache.statistics() );
+	result->writable()["transforms"] = statisticsData( cache.statistics( ReaderImplementation::TransformCacheEntry ) );
+	result->writable()["attributes"] = statisticsData( cache.statistics( ReaderImplementation::AttributeCacheEntry ) );
+	result->writable()["objects"] = statisticsData( cache.statistics( ReaderImplementation::ObjectCacheEntry ) );
+	return result;
+}
+
+void SceneCache::resetCacheStatistics()
+{
+	ReaderImplementation::cache().resetStatistics();
+}
+
+void SceneCache::clearCache()
+{
+	ReaderImplementation::Cache &cache = ReaderImplementation::cache();
+	cache.clear();
+	cache.objectPool()->clear();
+}
+
+float SceneCache::getCacheMemoryGovernorPriority()
+{
+	return ReaderImplementation::cache().objectPool()->getMemoryGovernorPriority();
+}
+
+void SceneCache::setCacheMemoryGovernorPriority( float priority )
+{
+	ReaderImplementation::cache().objectPool()->setMemoryGovernorPriority( priority );
+}
+
 PrimitiveVariableMap SceneCache::readObjectPrimitiveVariables( const std::vector<InternedString> &primVarNames, double time ) const
 {
 	ReaderImplementation *reader = ReaderImplementation::reader( m_implementation.get() );
@@ -60,13 +60,20 @@ void bindMeshPrimitiveEvaluator()
 {
 	object m = RunTimeTypedClass<MeshPrimitiveEvaluator>()
 		.def( init< MeshPrimitivePtr > () )
+		.def( init< MeshPrimitivePtr, MeshPrimitiveEvaluator::RayAcceleration >( ( arg( "mesh" ), arg( "rayAcceleration" ) ) ) )
 		.def( "barycentricPosition", &barycentricPosition )
 		.def( "uvBound", &MeshPrimitiveEvaluator::uvBound )
+		.def( "rayAcceleration", &MeshPrimitiveEvaluator::rayAcceleration )
 	;
 
 	{
 		scope ms( m );
 
+		enum_<MeshPrimitiveEvaluator::RayAcceleration>( "RayAcceleration" )
+			.value( "KDTree", MeshPrimitiveEvaluator::RayAcceleration::KDTree )
+			.value( "BVH", MeshPrimitiveEvaluator::RayAcceleration::BVH )
+		;
+
 		RefCountedClass<MeshPrimitiveEvaluator::Result, PrimitiveEvaluator::Result>( "Result" )
 			.def( "triangleIndex", &MeshPrimitiveEvaluator::Result::triangleIndex )
 			.def( "barycentricCoordinates", &MeshPrimitiveEvaluator::Result::barycentricCoordinates, return_value_policy<copy_const_reference>() )
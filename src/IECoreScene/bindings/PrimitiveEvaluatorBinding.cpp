@@ -36,9 +36,23 @@
 
 #include "PrimitiveEvaluatorBinding.h"
 
+#include "IECoreScene/CurvesPrimitiveEvaluator.h"
+#include "IECoreScene/MeshPrimitiveEvaluator.h"
+#include "IECoreScene/PointsPrimitiveEvaluator.h"
 #include "IECoreScene/PrimitiveEvaluator.h"
 
 #include "IECorePython/RunTimeTypedBinding.h"
+#include "IECorePython/ScopedGILRelease.h"
+
+#include "IECore/CompoundData.h"
+#include "IECore/VectorTypedData.h"
+
+#include "tbb/blocked_range.h"
+#include "tbb/parallel_for.h"
+#include "tbb/task_arena.h"
+
+#include <algorithm>
+#include <limits>
 
 using namespace IECore;
 using namespace IECorePython;
@@ -48,6 +62,10 @@ using namespace boost::python;
 namespace IECoreSceneModule
 {
 
+// The number of queries passed to each call made by
+// `PrimitiveEvaluatorHelper::batchChunkQuery()`.
+const size_t g_batchChunkSize = 64;
+
 struct PrimitiveEvaluatorHelper
 {
 	static PrimitiveEvaluatorPtr create( PrimitivePtr primitive )
@@ -136,6 +154,244 @@ struct PrimitiveEvaluatorHelper
 		return evaluator.primitive()->copy();
 	}
 
+	// Batch queries
+	// =============
+	//
+	// These perform many queries in parallel with the GIL released, returning
+	// the results as a CompoundData of vectors with one element per query.
+	// This avoids the overhead of calling into Python and allocating a Result
+	// for every query.
+
+	static CompoundDataPtr batchClosestPoint( const PrimitiveEvaluator &evaluator, const V3fVectorData *points )
+	{
+		const std::vector<Imath::V3f> &p = checkedReadable( points, "points" );
+		return batchQuery(
+			evaluator, p.size(),
+			[&p] ( const PrimitiveEvaluator &evaluator, size_t i, PrimitiveEvaluator::Result *result, float &distance ) {
+				if( !evaluator.closestPoint( p[i], result ) )
+				{
+					return false;
+				}
+				distance = ( result->point() - p[i] ).length();
+				return true;
+			}
+		);
+	}
+
+	static CompoundDataPtr batchSignedDistance( const PrimitiveEvaluator &evaluator, const V3fVectorData *points )
+	{
+		const std::vector<Imath::V3f> &p = checkedReadable( points, "points" );
+		return batchQuery(
+			evaluator, p.size(),
+			[&p] ( const PrimitiveEvaluator &evaluator, size_t i, PrimitiveEvaluator::Result *result, float &distance ) {
+				return evaluator.signedDistance( p[i], distance, result );
+			}
+		);
+	}
+
+	static CompoundDataPtr batchPointAtUV( const PrimitiveEvaluator &evaluator, const V2fVectorData *uvs )
+	{
+		const std::vector<Imath::V2f> &uv = checkedReadable( uvs, "uvs" );
+		return batchQuery(
+			evaluator, uv.size(),
+			[&uv] ( const PrimitiveEvaluator &evaluator, size_t i, PrimitiveEvaluator::Result *result, float &distance ) {
+				return evaluator.pointAtUV( uv[i], result );
+			},
+			/* withDistance = */ false
+		);
+	}
+
+	static CompoundDataPtr batchIntersectionPoint( const PrimitiveEvaluator &evaluator, const V3fVectorData *origins, const V3fVectorData *directions, float maxDistance )
+	{
+		const std::vector<Imath::V3f> &o = checkedReadable( origins, "origins" );
+		const std::vector<Imath::V3f> &d = checkedReadable( directions, "directions" );
+		if( o.size() != d.size() )
+		{
+			throw InvalidArgumentException( "PrimitiveEvaluator : Number of origins does not match number of directions" );
+		}
+
+		const MeshPrimitiveEvaluator *meshEvaluator = runTimeCast<const MeshPrimitiveEvaluator>( &evaluator );
+		if( !meshEvaluator )
+		{
+			return batchQuery(
+				evaluator, o.size(),
+				[&o, &d, maxDistance] ( const PrimitiveEvaluator &evaluator, size_t i, PrimitiveEvaluator::Result *result, float &distance ) {
+					if( !evaluator.intersectionPoint( o[i], d[i], result, maxDistance ) )
+					{
+						return false;
+					}
+					distance = ( result->point() - o[i] ).length();
+					return true;
+				}
+			);
+		}
+
+		// Meshes can trace a whole chunk of rays at once, which allows
+		// coherent rays to share the cost of traversal.
+		return batchChunkQuery(
+			evaluator, o.size(),
+			[&o, &d, maxDistance, meshEvaluator] ( const PrimitiveEvaluator &evaluator, size_t begin, size_t end, PrimitiveEvaluator::Result *const *results, bool *success, float *distance ) {
+				meshEvaluator->batchIntersectionPoint( end - begin, o.data() + begin, d.data() + begin, results, success, maxDistance );
+				for( size_t i = begin; i != end; ++i )
+				{
+					if( success[i-begin] )
+					{
+						distance[i-begin] = ( results[i-begin]->point() - o[i] ).length();
+					}
+				}
+			}
+		);
+	}
+
+	private :
+
+		template<typename T>
+		static const std::vector<T> &checkedReadable( const TypedData<std::vector<T>> *data, const char *name )
+		{
+			if( !data )
+			{
+				throw InvalidArgumentException( std::string( "PrimitiveEvaluator : Null " ) + name );
+			}
+			return data->readable();
+		}
+
+		// Query is called as `query( evaluator, index, result, distance )`, and
+		// must return true on success.
+		template<typename Query>
+		static CompoundDataPtr batchQuery( const PrimitiveEvaluator &evaluator, size_t size, Query &&query, bool withDistance = true )
+		{
+			return batchChunkQuery(
+				evaluator, size,
+				[&query] ( const PrimitiveEvaluator &evaluator, size_t begin, size_t end, PrimitiveEvaluator::Result *const *results, bool *success, float *distance ) {
+					for( size_t i = begin; i != end; ++i )
+					{
+						success[i-begin] = query( evaluator, i, results[i-begin], distance[i-begin] );
+					}
+				},
+				withDistance
+			);
+		}
+
+		// ChunkQuery is called as `query( evaluator, begin, end, results, success, distance )`
+		// for consecutive ranges of at most `g_batchChunkSize` queries, and must fill the
+		// success and distance arrays, which are indexed relative to `begin`.
+		template<typename ChunkQuery>
+		static CompoundDataPtr batchChunkQuery( const PrimitiveEvaluator &evaluator, size_t size, ChunkQuery &&query, bool withDistance = true )
+		{
+			// Not all evaluators support all outputs, and some provide
+			// an index for the component that was hit.
+			const MeshPrimitiveEvaluator *meshEvaluator = runTimeCast<const MeshPrimitiveEvaluator>( &evaluator );
+			const CurvesPrimitiveEvaluator *curvesEvaluator = runTimeCast<const CurvesPrimitiveEvaluator>( &evaluator );
+			const PointsPrimitiveEvaluator *pointsEvaluator = runTimeCast<const PointsPrimitiveEvaluator>( &evaluator );
+
+			std::vector<char> success( size, 0 );
+			V3fVectorDataPtr pointData = new V3fVectorData( std::vector<Imath::V3f>( size, Imath::V3f( 0 ) ) );
+			V3fVectorDataPtr normalData = !curvesEvaluator && !pointsEvaluator ? new V3fVectorData( std::vector<Imath::V3f>( size, Imath::V3f( 0 ) ) ) : nullptr;
+			V2fVectorDataPtr uvData = !pointsEvaluator ? new V2fVectorData( std::vector<Imath::V2f>( size, Imath::V2f( 0 ) ) ) : nullptr;
+			FloatVectorDataPtr distanceData = withDistance ? new FloatVectorData( std::vector<float>( size, 0.0f ) ) : nullptr;
+			IntVectorDataPtr indexData = meshEvaluator || curvesEvaluator || pointsEvaluator ? new IntVectorData( std::vector<int>( size, -1 ) ) : nullptr;
+
+			std::vector<Imath::V3f> *point = &pointData->writable();
+			std::vector<Imath::V3f> *normal = normalData ? &normalData->writable() : nullptr;
+			std::vector<Imath::V2f> *uv = uvData ? &uvData->writable() : nullptr;
+			std::vector<float> *distance = distanceData ? &distanceData->writable() : nullptr;
+			std::vector<int> *index = indexData ? &indexData->writable() : nullptr;
+
+			{
+				IECorePython::ScopedGILRelease gilRelease;
+				// Isolate so that this thread doesn't pick up unrelated outer
+				// tasks while waiting, which might require the GIL.
+				tbb::this_task_arena::isolate(
+					[&]
+					{
+						tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+						tbb::parallel_for(
+							tbb::blocked_range<size_t>( 0, size ),
+							[&] ( const tbb::blocked_range<size_t> &range ) {
+								PrimitiveEvaluator::ResultPtr resultPtrs[g_batchChunkSize];
+								PrimitiveEvaluator::Result *results[g_batchChunkSize];
+								const size_t numResults = std::min( g_batchChunkSize, range.size() );
+								for( size_t j = 0; j < numResults; ++j )
+								{
+									resultPtrs[j] = evaluator.createResult();
+									results[j] = resultPtrs[j].get();
+								}
+
+								bool chunkSuccess[g_batchChunkSize];
+								float chunkDistance[g_batchChunkSize];
+								for( size_t begin = range.begin(); begin < range.end(); begin += g_batchChunkSize )
+								{
+									const size_t end = std::min( begin + g_batchChunkSize, range.end() );
+									std::fill( chunkDistance, chunkDistance + g_batchChunkSize, 0.0f );
+									query( evaluator, begin, end, results, chunkSuccess, chunkDistance );
+
+									for( size_t i = begin; i != end; ++i )
+									{
+										if( !chunkSuccess[i-begin] )
+										{
+											continue;
+										}
+
+										const PrimitiveEvaluator::Result *result = results[i-begin];
+										success[i] = 1;
+										(*point)[i] = result->point();
+										if( normal )
+										{
+											(*normal)[i] = result->normal();
+										}
+										if( uv )
+										{
+											(*uv)[i] = result->uv();
+										}
+										if( distance )
+										{
+											(*distance)[i] = chunkDistance[i-begin];
+										}
+										if( meshEvaluator )
+										{
+											(*index)[i] = static_cast<const MeshPrimitiveEvaluator::Result *>( result )->triangleIndex();
+										}
+										else if( curvesEvaluator )
+										{
+											(*index)[i] = static_cast<const CurvesPrimitiveEvaluator::Result *>( result )->curveIndex();
+										}
+										else if( pointsEvaluator )
+										{
+											(*index)[i] = static_cast<const PointsPrimitiveEvaluator::Result *>( result )->pointIndex();
+										}
+									}
+								}
+							},
+							taskGroupContext
+						);
+					}
+				);
+			}
+
+			CompoundDataPtr resultData = new CompoundData;
+			resultData->writable()["success"] = new BoolVectorData( std::vector<bool>( success.begin(), success.end() ) );
+			resultData->writable()["point"] = pointData;
+			if( normalData )
+			{
+				resultData->writable()["normal"] = normalData;
+			}
+			if( uvData )
+			{
+				resultData->writable()["uv"] = uvData;
+			}
+			if( distanceData )
+			{
+				resultData->writable()["distance"] = distanceData;
+			}
+			if( indexData )
+			{
+				const char *indexName = meshEvaluator ? "faceIndex" : ( curvesEvaluator ? "curveIndex" : "pointIndex" );
+				resultData->writable()[indexName] = indexData;
+			}
+
+			return resultData;
+		}
+
 };
 
 static object primVar( PrimitiveEvaluator::Result &r, PrimitiveVariable &v )
@@ -188,6 +444,13 @@ void bindPrimitiveEvaluator()
 		.def( "volume", &PrimitiveEvaluator::volume )
 		.def( "centerOfGravity", &PrimitiveEvaluator::centerOfGravity )
 		.def( "surfaceArea", &PrimitiveEvaluator::surfaceArea )
+		.def( "batchClosestPoint", &PrimitiveEvaluatorHelper::batchClosestPoint )
+		.def( "batchSignedDistance", &PrimitiveEvaluatorHelper::batchSignedDistance )
+		.def( "batchPointAtUV", &PrimitiveEvaluatorHelper::batchPointAtUV )
+		.def(
+			"batchIntersectionPoint", &PrimitiveEvaluatorHelper::batchIntersectionPoint,
+			( arg( "self" ), arg( "origins" ), arg( "directions" ), arg( "maxDistance" ) = std::numeric_limits<float>::max() )
+		)
 	;
 
 	{
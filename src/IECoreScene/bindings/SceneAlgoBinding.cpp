@@ -65,6 +65,12 @@ dict parallelReadAll( const SceneInterface *src, int startFrame, int endFrame, f
 	return result;
 }
 
+void copy( const SceneInterface *src, SceneInterface *dst, int startFrame, int endFrame, float frameRate, unsigned int flags )
+{
+	IECorePython::ScopedGILRelease scopedGILRelease;
+	SceneAlgo::copy( src, dst, startFrame, endFrame, frameRate, flags );
+}
+
 } // namespace
 
 namespace IECoreSceneModule
@@ -92,7 +98,7 @@ void bindSceneAlgo()
 		.export_values()
 		;
 
-	def( "copy", &SceneAlgo::copy );
+	def( "copy", &::copy );
 
 	def( "parallelReadAll", &::parallelReadAll);
 }
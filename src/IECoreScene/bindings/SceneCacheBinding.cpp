@@ -42,6 +42,9 @@
 #include "IECoreScene/SharedSceneInterfaces.h"
 
 #include "IECorePython/RunTimeTypedBinding.h"
+#include "IECorePython/ScopedGILRelease.h"
+
+#include "boost/python/suite/indexing/container_utils.hpp"
 
 #include "tbb/blocked_range.h"
 #include "tbb/parallel_reduce.h"
@@ -69,6 +72,32 @@ SceneCachePtr constructor2( IECore::IndexedIOPtr indexedIO )
 	return new SceneCache( indexedIO );
 }
 
+void prefetch( const SceneCache &s, object pythonPaths, object pythonTimes, int flags, const IECore::Canceller *canceller )
+{
+	std::vector<SceneInterface::Path> paths;
+	for( size_t i = 0, e = len( pythonPaths ); i < e; ++i )
+	{
+		object pythonPath = pythonPaths[i];
+		SceneInterface::Path path;
+		extract<std::string> stringPath( pythonPath );
+		if( stringPath.check() )
+		{
+			SceneInterface::stringToPath( stringPath(), path );
+		}
+		else
+		{
+			container_utils::extend_container( path, pythonPath );
+		}
+		paths.push_back( path );
+	}
+
+	std::vector<double> times;
+	container_utils::extend_container( times, pythonTimes );
+
+	ScopedGILRelease gilRelease;
+	s.prefetch( paths, times, flags, canceller );
+}
+
 } // namespace
 
 //////////////////////////////////////////////////////////////////////////
@@ -165,14 +194,29 @@ namespace IECoreSceneModule
 
 void bindSceneCache()
 {
-	RunTimeTypedClass<SceneCache>()
+	def( "testSceneCacheParallelAttributeRead", &testSceneCacheParallelAttributeRead );
+	def( "testSceneCacheParallelFakeAttributeRead", &testSceneCacheParallelFakeAttributeRead );
+
+	scope s = RunTimeTypedClass<SceneCache>()
 		.def( "__init__", make_constructor( &constructor ), "Opens a scene file for read or write." )
 		.def( "__init__", make_constructor( &constructor2 ), "Opens a scene from a previously opened file handle." )
+		.def( "prefetch", &prefetch, ( arg( "paths" ), arg( "times" ), arg( "flags" ) = SceneCache::PrefetchAll, arg( "canceller" ) = object() ) )
+		.def( "getMaxCacheMemoryUsage", &SceneCache::getMaxCacheMemoryUsage ).staticmethod( "getMaxCacheMemoryUsage" )
+		.def( "setMaxCacheMemoryUsage", &SceneCache::setMaxCacheMemoryUsage ).staticmethod( "setMaxCacheMemoryUsage" )
+		.def( "cacheMemoryUsage", &SceneCache::cacheMemoryUsage ).staticmethod( "cacheMemoryUsage" )
+		.def( "cacheStatistics", &SceneCache::cacheStatistics ).staticmethod( "cacheStatistics" )
+		.def( "resetCacheStatistics", &SceneCache::resetCacheStatistics ).staticmethod( "resetCacheStatistics" )
+		.def( "clearCache", &SceneCache::clearCache ).staticmethod( "clearCache" )
+		.def( "getCacheMemoryGovernorPriority", &SceneCache::getCacheMemoryGovernorPriority ).staticmethod( "getCacheMemoryGovernorPriority" )
+		.def( "setCacheMemoryGovernorPriority", &SceneCache::setCacheMemoryGovernorPriority ).staticmethod( "setCacheMemoryGovernorPriority" )
 	;
 
-	def( "testSceneCacheParallelAttributeRead", &testSceneCacheParallelAttributeRead );
-	def( "testSceneCacheParallelFakeAttributeRead", &testSceneCacheParallelFakeAttributeRead );
-
+	enum_<SceneCache::PrefetchFlags>( "PrefetchFlags" )
+		.value( "Transform", SceneCache::PrefetchTransform )
+		.value( "Attributes", SceneCache::PrefetchAttributes )
+		.value( "Object", SceneCache::PrefetchObject )
+		.value( "All", SceneCache::PrefetchAll )
+	;
 }
 
 } // namespace IECoreSceneModule
@@ -35,17 +35,24 @@
 #include "IECoreVDB/VDBObject.h"
 
 #include "IECore/Exception.h"
+#include "IECore/FileIndexedIO.h"
 #include "IECore/MessageHandler.h"
 #include "IECore/MurmurHash.h"
 #include "IECore/SimpleTypedData.h"
 
-#include "openvdb/io/Stream.h"
+#include "openvdb/io/io.h"
 #include "openvdb/openvdb.h"
 
+#include "boost/filesystem/operations.hpp"
 #include "boost/iostreams/categories.hpp"
+#include "boost/iostreams/device/array.hpp"
 #include "boost/iostreams/stream.hpp"
 
+#include "tbb/blocked_range.h"
+#include "tbb/parallel_for.h"
+
 #include <algorithm>
+#include <sstream>
 
 using namespace IECore;
 using namespace IECoreVDB;
@@ -90,11 +97,171 @@ struct MurmurHashSink
 	MurmurHash &hash;
 };
 
+//! Hashes the leaf buffers of a grid of type GridType in parallel, returning false
+//! if the grid is of a different type.
+template<typename GridType>
+bool appendLeafBuffers( const openvdb::GridBase *grid, MurmurHash &h )
+{
+	if( !grid->isType<GridType>() )
+	{
+		return false;
+	}
+
+	using LeafType = typename GridType::TreeType::LeafNodeType;
+	using ValueType = typename LeafType::ValueType;
+
+	std::vector<const LeafType *> leaves;
+	static_cast<const GridType *>( grid )->tree().getNodes( leaves );
+
+	std::vector<MurmurHash> leafHashes( leaves.size() );
+
+	tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+	tbb::parallel_for(
+		tbb::blocked_range<size_t>( 0, leaves.size() ),
+		[&leaves, &leafHashes]( const tbb::blocked_range<size_t> &range )
+		{
+			for( size_t i = range.begin(); i != range.end(); ++i )
+			{
+				const LeafType *leaf = leaves[i];
+				MurmurHash &leafHash = leafHashes[i];
+				leafHash.append( leaf->origin().x() );
+				leafHash.append( leaf->origin().y() );
+				leafHash.append( leaf->origin().z() );
+				if( const ValueType *data = leaf->buffer().data() )
+				{
+					leafHash.append( reinterpret_cast<const char *>( data ), LeafType::SIZE * sizeof( ValueType ) );
+				}
+			}
+		},
+		taskGroupContext
+	);
+
+	h.append( leafHashes.data(), leafHashes.size() );
+	return true;
+}
+
+//! Hashes the grid. The topology is streamed through a MurmurHashSink, but
+//! the leaf buffers, which hold the bulk of the data, are hashed directly
+//! and in parallel for the common grid types.
+MurmurHash gridHash( const openvdb::GridBase *grid )
+{
+	MurmurHash h;
+
+	MurmurHashSink sink( h );
+	boost::iostreams::stream<MurmurHashSink> hashStream( sink );
+
+	openvdb::io::StreamMetadata::Ptr streamMetadata ( new openvdb::io::StreamMetadata() );
+	openvdb::io::setStreamMetadataPtr( hashStream, streamMetadata );
+
+	grid->writeMeta( hashStream );
+	grid->writeTopology( hashStream );
+	grid->writeTransform( hashStream );
+	hashStream.flush();
+
+	const bool hashedBuffers =
+		appendLeafBuffers<openvdb::FloatGrid>( grid, h ) ||
+		appendLeafBuffers<openvdb::DoubleGrid>( grid, h ) ||
+		appendLeafBuffers<openvdb::Int32Grid>( grid, h ) ||
+		appendLeafBuffers<openvdb::Int64Grid>( grid, h ) ||
+		appendLeafBuffers<openvdb::Vec3SGrid>( grid, h ) ||
+		appendLeafBuffers<openvdb::Vec3DGrid>( grid, h ) ||
+		appendLeafBuffers<openvdb::Vec3IGrid>( grid, h )
+	;
+
+	if( !hashedBuffers )
+	{
+		grid->writeBuffers( hashStream );
+		hashStream.flush();
+	}
+
+	return h;
+}
+
+// We leave general purpose compression to the IndexedIO, so only use the
+// lossless active mask compression when serialising grids.
+const uint32_t g_gridCompression = openvdb::io::COMPRESS_ACTIVE_MASK;
+
+//! Serialises a single grid in the same way as the VDB file format, but without
+//! the archive header, which contains a random UUID. This means that identical
+//! grids produce identical blocks, which the IndexedIO can then deduplicate.
+void writeGrid( const openvdb::GridBase *grid, IndexedIO *container, const IndexedIO::EntryID &name )
+{
+	std::ostringstream stream( std::ios_base::out | std::ios_base::binary );
+
+	openvdb::io::StreamMetadata::Ptr streamMetadata( new openvdb::io::StreamMetadata() );
+	openvdb::io::setStreamMetadataPtr( stream, streamMetadata );
+	openvdb::io::setDataCompression( stream, g_gridCompression );
+	openvdb::io::setGridClass( stream, grid->getGridClass() );
+	openvdb::io::setHalfFloat( stream, grid->saveFloatAsHalf() );
+
+	const uint32_t fileVersion = OPENVDB_FILE_VERSION;
+	const char saveFloatAsHalf = grid->saveFloatAsHalf();
+	stream.write( reinterpret_cast<const char *>( &fileVersion ), sizeof( fileVersion ) );
+	openvdb::writeString( stream, grid->type() );
+	stream.write( &saveFloatAsHalf, sizeof( saveFloatAsHalf ) );
+
+	grid->writeMeta( stream );
+	grid->writeTransform( stream );
+	grid->writeTopology( stream );
+	grid->writeBuffers( stream );
+
+	const std::string buffer = stream.str();
+	container->write( name, buffer.data(), buffer.size() );
+}
+
+openvdb::GridBase::Ptr readGrid( const IndexedIO *container, const IndexedIO::EntryID &name )
+{
+	std::vector<char> buffer( container->entry( name ).arrayLength() );
+	char *data = buffer.data();
+	container->read( name, data, buffer.size() );
+
+	boost::iostreams::stream<boost::iostreams::array_source> stream( buffer.data(), buffer.size() );
+
+	uint32_t fileVersion = 0;
+	stream.read( reinterpret_cast<char *>( &fileVersion ), sizeof( fileVersion ) );
+	if( !stream || fileVersion > OPENVDB_FILE_VERSION )
+	{
+		throw IECore::Exception( boost::str( boost::format( "VDBObject::load - unsupported grid format version %1%" ) % fileVersion ) );
+	}
+
+	const openvdb::Name type = openvdb::readString( stream );
+	char saveFloatAsHalf = 0;
+	stream.read( &saveFloatAsHalf, sizeof( saveFloatAsHalf ) );
+
+	openvdb::io::StreamMetadata::Ptr streamMetadata( new openvdb::io::StreamMetadata() );
+	openvdb::io::setStreamMetadataPtr( stream, streamMetadata );
+	openvdb::io::setVersion( stream, openvdb::VersionId( OPENVDB_LIBRARY_MAJOR_VERSION, OPENVDB_LIBRARY_MINOR_VERSION ), fileVersion );
+	openvdb::io::setDataCompression( stream, g_gridCompression );
+	openvdb::io::setHalfFloat( stream, saveFloatAsHalf );
+	openvdb::io::setGridBackgroundValuePtr( stream, nullptr );
+
+	openvdb::GridBase::Ptr grid = openvdb::GridBase::createGrid( type );
+	grid->setSaveFloatAsHalf( saveFloatAsHalf );
+
+	grid->readMeta( stream );
+	openvdb::io::setGridClass( stream, grid->getGridClass() );
+	grid->readTransform( stream );
+	grid->readTopology( stream );
+	grid->readBuffers( stream );
+
+	if( !stream )
+	{
+		throw IECore::Exception( "VDBObject::load - truncated grid data" );
+	}
+
+	return grid;
+}
+
+IndexedIO::EntryID g_gridsEntry( "grids" );
+IndexedIO::EntryID g_metadataEntry( "metadata" );
+IndexedIO::EntryID g_dataEntry( "data" );
+IndexedIO::EntryID g_hashEntry( "hash" );
+
 }
 
 IE_CORE_DEFINEOBJECTTYPEDESCRIPTION( VDBObject );
 
-const unsigned int VDBObject::m_ioVersion = 0;
+const unsigned int VDBObject::m_ioVersion = 1;
 
 VDBObject::VDBObject() : m_unmodifiedFromFile( false )
 {
@@ -355,13 +522,87 @@ void VDBObject::copyFrom( const IECore::Object *other, IECore::Object::CopyConte
 void VDBObject::save( IECore::Object::SaveContext *context ) const
 {
 	IECoreScene::VisibleRenderable::save( context );
-	throw IECore::NotImplementedException( "VDBObject::save" );
+	IndexedIOPtr container = context->container( staticTypeName(), m_ioVersion );
+	IndexedIOPtr gridsContainer = container->subdirectory( g_gridsEntry, IndexedIO::CreateIfMissing );
+
+	// Save in sorted order so that identical objects produce identical files.
+	std::vector<std::string> names = gridNames();
+	std::sort( names.begin(), names.end() );
+
+	for( const auto &name : names )
+	{
+		const HashedGrid &hashedGrid = m_grids.find( name )->second;
+		IndexedIOPtr gridContainer = gridsContainer->subdirectory( name, IndexedIO::CreateIfMissing );
+
+		// Each grid is stored twice : once in full for reading on demand, and
+		// once with an empty tree so that load() can read just the metadata.
+		// The latter carries up to date stats metadata so that bound() can
+		// be computed without loading the tree.
+
+		openvdb::GridBase::Ptr grid = hashedGrid.grid();
+
+		openvdb::GridBase::Ptr metadataGrid = grid->copyGridWithNewTree();
+
+		// Grids which are unmodified since being read will already have
+		// stats metadata, in which case we avoid the cost of recomputing it.
+		openvdb::GridBase::ConstPtr statsGrid = hashedGrid.statsMetadata();
+		if(
+			statsGrid &&
+			(*statsGrid)[openvdb::GridBase::META_FILE_BBOX_MIN] &&
+			(*statsGrid)[openvdb::GridBase::META_FILE_BBOX_MAX]
+		)
+		{
+			for( const auto &key : { openvdb::GridBase::META_FILE_BBOX_MIN, openvdb::GridBase::META_FILE_BBOX_MAX, openvdb::GridBase::META_FILE_MEM_BYTES, openvdb::GridBase::META_FILE_VOXEL_COUNT } )
+			{
+				if( openvdb::Metadata::ConstPtr value = (*statsGrid)[key] )
+				{
+					metadataGrid->insertMeta( key, *value );
+				}
+			}
+		}
+		else
+		{
+			openvdb::MetaMap::Ptr statsMetadata = grid->getStatsMetadata();
+			for( auto metaIt = statsMetadata->beginMeta(); metaIt != statsMetadata->endMeta(); ++metaIt )
+			{
+				metadataGrid->insertMeta( metaIt->first, *metaIt->second );
+			}
+		}
+
+		writeGrid( metadataGrid.get(), gridContainer.get(), g_metadataEntry );
+		writeGrid( grid.get(), gridContainer.get(), g_dataEntry );
+		gridContainer->write( g_hashEntry, hashedGrid.hash().toString() );
+	}
 }
 
 void VDBObject::load( IECore::Object::LoadContextPtr context )
 {
 	IECoreScene::VisibleRenderable::load( context );
-	throw IECore::NotImplementedException( "VDBObject::load" );
+	unsigned int v = m_ioVersion;
+	ConstIndexedIOPtr container = context->container( staticTypeName(), v );
+	ConstIndexedIOPtr gridsContainer = container->subdirectory( g_gridsEntry );
+
+	openvdb::initialize();
+
+	m_grids.clear();
+	m_lockedFile.reset();
+	m_unmodifiedFromFile = false;
+
+	IndexedIO::EntryIDList gridNames;
+	gridsContainer->entryIds( gridNames, IndexedIO::Directory );
+	for( const auto &gridName : gridNames )
+	{
+		ConstIndexedIOPtr gridContainer = gridsContainer->subdirectory( gridName );
+
+		std::string hash;
+		gridContainer->read( g_hashEntry, hash );
+
+		m_grids[gridName.string()] = HashedGrid(
+			readGrid( gridContainer.get(), g_metadataEntry ),
+			std::make_shared<LockedContainer>( gridContainer ),
+			MurmurHash( hash )
+		);
+	}
 }
 
 void VDBObject::memoryUsage( IECore::Object::MemoryAccumulator &acc ) const
@@ -392,6 +633,51 @@ std::string VDBObject::fileName() const
 }
 
 
+VDBObject::LockedContainer::LockedContainer( IECore::ConstIndexedIOPtr container )
+	:	container( container ), fileSize( 0 ), fileTime( 0 )
+{
+	const FileIndexedIO *fileIndexedIO = runTimeCast<const FileIndexedIO>( container.get() );
+	if( !fileIndexedIO )
+	{
+		return;
+	}
+
+	boost::system::error_code ec;
+	fileSize = boost::filesystem::file_size( fileIndexedIO->fileName(), ec );
+	if( !ec )
+	{
+		fileTime = boost::filesystem::last_write_time( fileIndexedIO->fileName(), ec );
+	}
+	if( !ec )
+	{
+		fileName = fileIndexedIO->fileName();
+	}
+}
+
+void VDBObject::LockedContainer::checkUnmodified( const std::string &gridName ) const
+{
+	if( fileName.empty() )
+	{
+		return;
+	}
+
+	// Overwriting the file truncates it in place, leaving the container
+	// with an index that refers to data that no longer exists. Reading
+	// from it would give garbage, or a SIGBUS for memory mapped files.
+	boost::system::error_code ec;
+	const uintmax_t size = boost::filesystem::file_size( fileName, ec );
+	const std::time_t time = ec ? 0 : boost::filesystem::last_write_time( fileName, ec );
+	if( ec || size != fileSize || time != fileTime )
+	{
+		throw IECore::Exception(
+			boost::str(
+				boost::format( "VDBObject : Unable to load grid \"%1%\" because \"%2%\" has been modified since it was read" ) %
+					gridName % fileName
+			)
+		);
+	}
+}
+
 openvdb::GridBase::Ptr VDBObject::HashedGrid::metadata() const
 {
 	return m_grid;
@@ -407,6 +693,17 @@ openvdb::GridBase::Ptr VDBObject::HashedGrid::grid() const
 		m_grid = tmp->file->readGrid( m_grid->getName() );
 		m_lockedFile.reset();
 	}
+
+	auto tmpContainer = m_lockedContainer;
+	if( tmpContainer )
+	{
+		std::lock_guard<std::recursive_mutex> l( tmpContainer->mutex );
+
+		tmpContainer->checkUnmodified( m_grid->getName() );
+		m_grid = readGrid( tmpContainer->container.get(), g_dataEntry );
+		m_lockedContainer.reset();
+	}
+
 	return m_grid;
 }
 
@@ -414,31 +711,42 @@ IECore::MurmurHash VDBObject::HashedGrid::hash() const
 {
 	if( !m_hashValid )
 	{
-		m_hash = IECore::MurmurHash();
-
-		MurmurHashSink sink( m_hash );
-		boost::iostreams::stream<MurmurHashSink> hashStream( sink );
-
-		openvdb::io::StreamMetadata::Ptr streamMetadata ( new openvdb::io::StreamMetadata() );
-		openvdb::io::setStreamMetadataPtr( hashStream, streamMetadata );
-
-		m_grid->writeMeta( hashStream );
-		m_grid->writeTopology( hashStream );
-		m_grid->writeBuffers( hashStream );
-		m_grid->writeTransform( hashStream );
-
+		// Use grid() rather than m_grid, so that we hash the full
+		// grid rather than just the metadata.
+		m_hash = gridHash( grid().get() );
 		m_hashValid = true;
 	}
 
 	return m_hash;
 }
 
+bool VDBObject::HashedGrid::unmodifiedFromFile() const
+{
+	return m_unmodifiedFromFile;
+}
+
+openvdb::GridBase::ConstPtr VDBObject::HashedGrid::statsMetadata() const
+{
+	if( !m_unmodifiedFromFile )
+	{
+		return nullptr;
+	}
+	// Grids read from a vdb file carry the stats written with the file.
+	return m_metadataGrid ? m_metadataGrid : m_grid;
+}
+
 void VDBObject::HashedGrid::markedAsEdited()
 {
+	m_unmodifiedFromFile = false;
+	m_metadataGrid.reset();
+
 	if( m_grid.use_count() > 1 )
 	{
 		m_grid = m_grid->deepCopyGrid();
-		m_hash = IECore::MurmurHash();
-		m_hashValid = false;
 	}
+
+	// The grid may be about to be modified, so we can't rely on
+	// any previously computed hash, including one loaded from file.
+	m_hash = IECore::MurmurHash();
+	m_hashValid = false;
 }
@@ -141,6 +141,7 @@ from TimeCodeDataTest import TimeCodeDataTest
 from NullObjectTest import NullObjectTest
 from StandardRadialLensModelTest import StandardRadialLensModelTest
 from ObjectPoolTest import ObjectPoolTest
+from MemoryGovernorTest import MemoryGovernorTest
 from RefCountedTest import RefCountedTest
 from DataAlgoTest import DataAlgoTest
 from PolygonAlgoTest import PolygonAlgoTest
@@ -151,6 +152,7 @@ from StringAlgoTest import StringAlgoTest
 from PathMatcherTest import PathMatcherTest
 from PathMatcherDataTest import PathMatcherDataTest
 from CancellerTest import CancellerTest
+from ImportTest import ImportTest
 
 unittest.TestProgram(
 	testRunner = unittest.TextTestRunner(
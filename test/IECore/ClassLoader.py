@@ -33,6 +33,9 @@
 ##########################################################################
 
 import os
+import json
+import shutil
+import tempfile
 import unittest
 import IECore
 
@@ -105,5 +108,80 @@ class TestClassLoader( unittest.TestCase ) :
 		s.paths = [ "a", "b", "c" ]
 		self.assertEqual( l.searchPath(), IECore.SearchPath( os.path.join( "test", "IECore", "ops" ) ) )
 
+	def testIndex( self ) :
+
+		opsPath = os.path.join( self.__tempDir, "ops" )
+		for name, versions in [ ( "a", [ 1 ] ), ( os.path.join( "b", "c" ), [ 1, 2 ] ) ] :
+			os.makedirs( os.path.join( opsPath, name ) )
+			for version in versions :
+				with open( os.path.join( opsPath, name, "{}-{}.py".format( os.path.basename( name ), version ) ), "w" ) :
+					pass
+
+		# Indices aren't written for recently modified directories,
+		# so make everything look old.
+		for root, dirs, files in os.walk( opsPath ) :
+			os.utime( root, ( 0, 0 ) )
+
+		l = IECore.ClassLoader( IECore.SearchPath( opsPath ) )
+		self.assertEqual( l.classNames(), [ "a", os.path.join( "b", "c" ) ] )
+		self.assertEqual( l.versions( os.path.join( "b", "c" ) ), [ 1, 2 ] )
+
+		indexFiles = os.listdir( self.__indexPath )
+		self.assertEqual( len( indexFiles ), 1 )
+
+		# The index should be trusted while the directories are unchanged.
+		# We check this by adding a class to the index directly.
+
+		indexFileName = os.path.join( self.__indexPath, indexFiles[0] )
+		with open( indexFileName ) as f :
+			index = json.load( f )
+		index["classes"]["fromIndex"] = [ 3 ]
+		with open( indexFileName, "w" ) as f :
+			json.dump( index, f )
+
+		l = IECore.ClassLoader( IECore.SearchPath( opsPath ) )
+		self.assertEqual( l.classNames(), [ "a", os.path.join( "b", "c" ), "fromIndex" ] )
+
+		# But changes to the directories should trigger a rescan.
+
+		os.makedirs( os.path.join( opsPath, "b", "d" ) )
+		with open( os.path.join( opsPath, "b", "d", "d-1.py" ), "w" ) :
+			pass
+
+		l.refresh()
+		self.assertEqual( l.classNames(), [ "a", os.path.join( "b", "c" ), os.path.join( "b", "d" ) ] )
+
+		# As should removing class versions.
+
+		os.remove( os.path.join( opsPath, "b", "c", "c-2.py" ) )
+		l.refresh()
+		self.assertEqual( l.versions( os.path.join( "b", "c" ) ), [ 1 ] )
+
+	def testIndexDisabled( self ) :
+
+		os.environ["IECORE_CLASSLOADER_INDEX_PATH"] = ""
+
+		l = IECore.ClassLoader( IECore.SearchPath( os.path.join( "test", "IECore", "ops" ) ) )
+		self.assertIn( os.path.join( "maths", "multiply" ), l.classNames() )
+		self.assertEqual( os.listdir( self.__indexPath ), [] )
+
+	def setUp( self ) :
+
+		self.__tempDir = tempfile.mkdtemp()
+		self.__indexPath = os.path.join( self.__tempDir, "index" )
+		os.makedirs( self.__indexPath )
+
+		self.__originalIndexPath = os.environ.get( "IECORE_CLASSLOADER_INDEX_PATH" )
+		os.environ["IECORE_CLASSLOADER_INDEX_PATH"] = self.__indexPath
+
+	def tearDown( self ) :
+
+		if self.__originalIndexPath is not None :
+			os.environ["IECORE_CLASSLOADER_INDEX_PATH"] = self.__originalIndexPath
+		else :
+			del os.environ["IECORE_CLASSLOADER_INDEX_PATH"]
+
+		shutil.rmtree( self.__tempDir )
+
 if __name__ == "__main__":
         unittest.main()
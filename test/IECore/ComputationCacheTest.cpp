@@ -204,6 +204,82 @@ struct ComputationCacheTest
 		BOOST_CHECK_EQUAL( size_t(500), cache.cachedComputations() );
 	}
 
+	static size_t cost( const Object *object )
+	{
+		return static_cast<const IntData *>( object )->readable();
+	}
+
+	void testCostAndStatistics()
+	{
+		Cache cache( get, hash, cost, 10, new ObjectPool( 10000 ) );
+
+		cache.get( ComputationParams( 4 ) );
+		cache.get( ComputationParams( 5 ) );
+		BOOST_CHECK_EQUAL( size_t(9), cache.cachedComputations() );
+
+		cache.get( ComputationParams( 4 ) );
+		Cache::Statistics statistics = cache.statistics();
+		BOOST_CHECK_EQUAL( size_t(1), statistics.hits );
+		BOOST_CHECK_EQUAL( size_t(2), statistics.misses );
+		BOOST_CHECK_EQUAL( size_t(0), statistics.evictions );
+
+		/// exceeds the maximum cost, so the least recently used computation is evicted
+		cache.get( ComputationParams( 3 ) );
+		BOOST_CHECK_EQUAL( size_t(7), cache.cachedComputations() );
+		BOOST_CHECK( !cache.get( ComputationParams( 5 ), Cache::NullIfMissing ) );
+		BOOST_CHECK( cache.get( ComputationParams( 4 ), Cache::NullIfMissing ) );
+
+		statistics = cache.statistics();
+		BOOST_CHECK_EQUAL( size_t(2), statistics.hits );
+		BOOST_CHECK_EQUAL( size_t(4), statistics.misses );
+		BOOST_CHECK_EQUAL( size_t(1), statistics.evictions );
+
+		cache.resetStatistics();
+		statistics = cache.statistics();
+		BOOST_CHECK_EQUAL( size_t(0), statistics.hits );
+		BOOST_CHECK_EQUAL( size_t(0), statistics.misses );
+		BOOST_CHECK_EQUAL( size_t(0), statistics.evictions );
+	}
+
+	static size_t parity( const ComputationParams &params )
+	{
+		return params % 2;
+	}
+
+	void testCategoryStatistics()
+	{
+		Cache cache( get, hash, cost, 10, new ObjectPool( 10000 ) );
+		cache.setStatisticsCategories( parity, 2 );
+
+		cache.get( ComputationParams( 4 ) );
+		cache.get( ComputationParams( 5 ) );
+		cache.get( ComputationParams( 4 ) );
+
+		Cache::Statistics even = cache.statistics( 0 );
+		Cache::Statistics odd = cache.statistics( 1 );
+		BOOST_CHECK_EQUAL( size_t(1), even.hits );
+		BOOST_CHECK_EQUAL( size_t(1), even.misses );
+		BOOST_CHECK_EQUAL( size_t(0), odd.hits );
+		BOOST_CHECK_EQUAL( size_t(1), odd.misses );
+
+		/// evicts the least recently used computation, which is odd
+		cache.get( ComputationParams( 3 ) );
+
+		even = cache.statistics( 0 );
+		odd = cache.statistics( 1 );
+		BOOST_CHECK_EQUAL( size_t(0), even.evictions );
+		BOOST_CHECK_EQUAL( size_t(1), odd.evictions );
+		BOOST_CHECK_EQUAL( size_t(2), odd.misses );
+		BOOST_CHECK_EQUAL( size_t(1), cache.statistics().evictions );
+
+		BOOST_CHECK_THROW( cache.statistics( 2 ), InvalidArgumentException );
+
+		cache.resetStatistics();
+		odd = cache.statistics( 1 );
+		BOOST_CHECK_EQUAL( size_t(0), odd.misses );
+		BOOST_CHECK_EQUAL( size_t(0), odd.evictions );
+	}
+
 };
 
 int ComputationCacheTest::getCount(0);
@@ -217,6 +293,8 @@ struct ComputationCacheTestSuite : public boost::unit_test::test_suite
 
 		add( BOOST_CLASS_TEST_CASE( &ComputationCacheTest::test, instance ) );
 		add( BOOST_CLASS_TEST_CASE( &ComputationCacheTest::testThreadedGet, instance ) );
+		add( BOOST_CLASS_TEST_CASE( &ComputationCacheTest::testCostAndStatistics, instance ) );
+		add( BOOST_CLASS_TEST_CASE( &ComputationCacheTest::testCategoryStatistics, instance ) );
 	}
 };
 
@@ -33,6 +33,9 @@
 ##########################################################################
 
 import os
+import sys
+import shutil
+import tempfile
 import unittest
 
 import IECore
@@ -255,6 +258,41 @@ class ConfigLoaderTest( unittest.TestCase ) :
 
 		)
 
+	def testBytecodeCache( self ) :
+
+		tempDir = tempfile.mkdtemp()
+		self.addCleanup( shutil.rmtree, tempDir )
+
+		dontWriteBytecode = sys.dont_write_bytecode
+		sys.dont_write_bytecode = False
+		self.addCleanup( setattr, sys, "dont_write_bytecode", dontWriteBytecode )
+
+		fileName = os.path.join( tempDir, "config.py" )
+		with open( fileName, "w" ) as f :
+			f.write( "config['a'] = 1\n" )
+
+		config = {}
+		IECore.loadConfig( IECore.SearchPath( tempDir ), contextDict = { "config" : config } )
+		self.assertEqual( config["a"], 1 )
+
+		self.assertTrue( os.path.isdir( os.path.join( tempDir, "__pycache__" ) ) )
+		self.assertEqual( len( os.listdir( os.path.join( tempDir, "__pycache__" ) ) ), 1 )
+
+		# Loading again should use the cache, and produce the same results.
+
+		config = {}
+		IECore.loadConfig( IECore.SearchPath( tempDir ), contextDict = { "config" : config } )
+		self.assertEqual( config["a"], 1 )
+
+		# Modifying the file should invalidate the cache.
+
+		with open( fileName, "w" ) as f :
+			f.write( "config['a'] = 100\n" )
+
+		config = {}
+		IECore.loadConfig( IECore.SearchPath( tempDir ), contextDict = { "config" : config } )
+		self.assertEqual( config["a"], 100 )
+
 if __name__ == "__main__":
 	unittest.main()
 
@@ -465,6 +465,70 @@ class testLs( unittest.TestCase ) :
 		l = IECore.ls( os.path.join( "test", "sequences", "lsTest", "a.###.tif" ) )
 		self.assertFalse( l )
 
+	def doSequenceTree( self ) :
+
+		self.tearDown()
+		root = os.path.join( "test", "sequences", "lsTest" )
+		for directory in [ "", "a", os.path.join( "a", "b" ), os.path.join( "a", "b", "c" ), "d" ] :
+			for f in IECore.FileSequence( os.path.join( root, directory, "seq.####.exr" ), IECore.FrameRange( 1, 5 ) ).fileNames() :
+				self.touch( f )
+
+		# A single file, which isn't a sequence unless `minSequenceSize` is 1.
+		self.touch( os.path.join( root, "d", "single.0001.exr" ) )
+
+		return root
+
+	def testWalkSequences( self ) :
+
+		root = self.doSequenceTree()
+
+		walked = {}
+		for directory, sequences in IECore.walkSequences( root ) :
+			self.assertNotIn( directory, walked )
+			walked[directory] = sorted( str( s ) for s in sequences )
+
+		expectedDirectories = [ "", "a", os.path.join( "a", "b" ), os.path.join( "a", "b", "c" ), "d" ]
+		self.assertEqual(
+			sorted( walked.keys() ),
+			sorted( os.path.normpath( os.path.join( root, d ) ) for d in expectedDirectories )
+		)
+		for sequences in walked.values() :
+			self.assertEqual( sequences, [ "seq.####.exr 1-5" ] )
+
+		walked = dict( IECore.walkSequences( root, minSequenceSize = 1 ) )
+		self.assertEqual(
+			sorted( str( s ) for s in walked[os.path.join( root, "d" )] ),
+			[ "seq.####.exr 1-5", "single.####.exr 1" ]
+		)
+
+	def testWalkSequencesMaxDepth( self ) :
+
+		root = self.doSequenceTree()
+
+		for maxDepth, expectedDirectories in [
+			( 0, [ "" ] ),
+			( 1, [ "", "a", "d" ] ),
+			( 2, [ "", "a", os.path.join( "a", "b" ), "d" ] ),
+		] :
+			self.assertEqual(
+				sorted( d for d, s in IECore.walkSequences( root, maxDepth = maxDepth ) ),
+				sorted( os.path.normpath( os.path.join( root, d ) ) for d in expectedDirectories )
+			)
+
+	def testWalkSequencesEarlyExit( self ) :
+
+		root = self.doSequenceTree()
+
+		walk = IECore.walkSequences( root )
+		directory, sequences = next( walk )
+		self.assertEqual( len( sequences ), 1 )
+		# Closing the generator must cancel the scan and return promptly.
+		walk.close()
+
+	def testWalkSequencesMissingDirectory( self ) :
+
+		self.assertEqual( list( IECore.walkSequences( os.path.join( "test", "sequences", "iDontExist" ) ) ), [] )
+
 	def tearDown( self ) :
 
 		if os.path.exists( os.path.join( "test", "sequences" ) ) :
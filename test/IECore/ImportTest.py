@@ -0,0 +1,124 @@
+##########################################################################
+#
+#  Copyright (c) 2026, Image Engine Design Inc. All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are
+#  met:
+#
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#
+#     * Neither the name of Image Engine Design nor the names of any
+#       other contributors to this software may be used to endorse or
+#       promote products derived from this software without specific prior
+#       written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+#  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+#  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+#  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+#  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+#  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+#  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+#  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+#  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+#  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+#  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+##########################################################################
+
+import os
+import subprocess
+import sys
+import time
+import unittest
+
+import IECore
+
+class ImportTest( unittest.TestCase ) :
+
+	def __runPython( self, code ) :
+
+		return subprocess.check_output( [ sys.executable, "-c", code ], universal_newlines = True ).strip()
+
+	def testLazyAttributes( self ) :
+
+		self.assertEqual(
+			self.__runPython( "import sys, IECore; print( 'IECore.ParameterAlgo' in sys.modules )" ),
+			"False"
+		)
+
+		self.assertEqual(
+			self.__runPython( "import sys, IECore; IECore.ParameterAlgo; print( 'IECore.ParameterAlgo' in sys.modules )" ),
+			"True"
+		)
+
+	def testRunTimeTypedRegisteredOnImport( self ) :
+
+		# Classes registered with `registerRunTimeTyped()` must be
+		# available by name without being accessed first.
+		self.assertEqual(
+			self.__runPython(
+				"import IECore; print( *[ IECore.RunTimeTyped.typeIdFromTypeName( n ) != IECore.TypeId.Invalid for n in ( 'SequenceLsOp', 'BasicPreset', 'IndexedIORepackOp' ) ] )"
+			),
+			"True True True"
+		)
+
+	def testLazyAttributeValues( self ) :
+
+		self.assertTrue( issubclass( IECore.SequenceLsOp, IECore.Op ) )
+		self.assertTrue( issubclass( IECore.BasicPreset, IECore.Preset ) )
+		self.assertTrue( callable( IECore.formatParameterHelp ) )
+		self.assertTrue( callable( IECore.StringUtil.wrap ) )
+
+		self.assertTrue( callable( IECore.ParameterAlgo.copyClasses ) )
+
+		self.assertIn( "CapturingMessageHandler", dir( IECore ) )
+		self.assertRaises( AttributeError, getattr, IECore, "NonExistentAttribute" )
+
+	def testSubmoduleImportedFirst( self ) :
+
+		# Importing a submodule directly mustn't hide the class of the
+		# same name.
+		self.assertEqual(
+			self.__runPython(
+				"import IECore.Struct, IECore.MenuItemDefinition, IECore.MenuDefinition; print( *[ isinstance( c, type ) for c in ( IECore.Struct, IECore.MenuItemDefinition, IECore.MenuDefinition ) ] )"
+			),
+			"True True True"
+		)
+
+		self.assertEqual(
+			self.__runPython(
+				"from IECore.MenuDefinition import MenuDefinition; import IECore; print( IECore.MenuDefinition is MenuDefinition )"
+			),
+			"True"
+		)
+
+	def testStarImport( self ) :
+
+		self.assertEqual(
+			self.__runPython( "from IECore import *; print( Struct.__name__, curry.__name__ )" ),
+			"Struct curry"
+		)
+
+	@unittest.skipIf( True, "Not running slow perf tests by default" )
+	def testImportPerformance( self ) :
+
+		# Benchmark for the time taken by `import IECore` in a fresh
+		# process, which matters for short-lived processes.
+
+		times = []
+		for i in range( 0, 5 ) :
+			t = time.perf_counter()
+			self.__runPython( "import IECore" )
+			times.append( time.perf_counter() - t )
+
+		sys.stderr.write( "\nimport IECore : {:.3f}s\n".format( min( times ) ) )
+
+if __name__ == "__main__":
+	unittest.main()
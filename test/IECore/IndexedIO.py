@@ -670,6 +670,65 @@ class TestFileIndexedIO(unittest.TestCase):
 		self.assertEqual( f.metadata(),
 			IECore.CompoundData( { "compressor" : "lz4", "compressionLevel" : 0, 'version': IECore.IntData( 7 ), "compressionThreadCount" : 1, "decompressionThreadCount" : 1 } ) )
 
+	def testMemoryMappedRead( self ):
+
+		filePath = os.path.join( ".", "test", "FileIndexedIO.fio" )
+
+		options = IECore.CompoundData( { "compressor" : "lz4", "compressionLevel" : 9, "maxCompressedBlockSize" : IECore.UIntData( 1024 ) } )
+		f = IECore.IndexedIO.create( filePath, [], IECore.IndexedIO.OpenMode.Write, options = options )
+		g = f.subdirectory( "sub1", IECore.IndexedIO.MissingBehaviour.CreateIfMissing )
+
+		compressed = IECore.IntVectorData( range( 4096 ) )
+		uncompressed = IECore.FloatVectorData( [ random.random() for i in range( 100 ) ] )
+		g.write( "compressed", compressed )
+		g.write( "uncompressed", uncompressed )
+		g.write( "string", "hello" )
+		g.write( "float", 1.5 )
+
+		del g, f
+
+		f = IECore.IndexedIO.create( filePath, [], IECore.IndexedIO.OpenMode.Read, options = IECore.CompoundData( { "memoryMapped" : True } ) )
+		g = f.subdirectory( "sub1" )
+
+		self.assertEqual( g.read( "compressed" ), compressed )
+		self.assertEqual( g.read( "uncompressed" ), uncompressed )
+		self.assertEqual( g.read( "string" ).value, "hello" )
+		self.assertEqual( g.read( "float" ).value, 1.5 )
+
+	def testPipelinedWrites( self ):
+
+		filePath = os.path.join( ".", "test", "FileIndexedIO.fio" )
+		filePath2 = os.path.join( ".", "test", "FileIndexedIO2.fio" )
+
+		data = [ IECore.IntVectorData( range( i, i + 1024 * ( i % 7 + 1 ) ) ) for i in range( 200 ) ]
+		# Duplicates should still be stored only once.
+		data += data[:50]
+
+		for path, pipelinedWrites in ( ( filePath, False ), ( filePath2, True ) ) :
+
+			options = IECore.CompoundData( { "compressor" : "lz4", "compressionLevel" : 9, "pipelinedWrites" : pipelinedWrites } )
+			f = IECore.IndexedIO.create( path, [], IECore.IndexedIO.OpenMode.Write, options = options )
+			for i, d in enumerate( data ) :
+				g = f.subdirectory( "sub{}".format( i % 10 ), IECore.IndexedIO.MissingBehaviour.CreateIfMissing )
+				g.write( "data{}".format( i ), d )
+				g.write( "small{}".format( i ), i )
+
+			# Reading back while writing must wait for pending data.
+			self.assertEqual( f.subdirectory( "sub3" ).read( "data3" ), data[3] )
+			# As must committing a directory.
+			f.subdirectory( "sub4" ).commit()
+
+			del f, g
+
+		# The pipeline changes where blocks are stored, but not what is stored.
+		self.assertAlmostEqual( os.path.getsize( filePath2 ), os.path.getsize( filePath ), delta = 1024 )
+
+		f = IECore.IndexedIO.create( filePath2, [], IECore.IndexedIO.OpenMode.Read )
+		for i, d in enumerate( data ) :
+			g = f.subdirectory( "sub{}".format( i % 10 ) )
+			self.assertEqual( g.read( "data{}".format( i ) ), d )
+			self.assertEqual( g.read( "small{}".format( i ) ).value, i )
+
 	def setUp( self ):
 
 		if os.path.isfile(os.path.join( ".", "test", "FileIndexedIO.fio" )) :
@@ -680,6 +739,8 @@ class TestFileIndexedIO(unittest.TestCase):
 		# cleanup
 		if os.path.isfile(os.path.join( ".", "test", "FileIndexedIO.fio" )) :
 			os.remove(os.path.join( ".", "test", "FileIndexedIO.fio" ))
+		if os.path.isfile(os.path.join( ".", "test", "FileIndexedIO2.fio" )) :
+			os.remove(os.path.join( ".", "test", "FileIndexedIO2.fio" ))
 
 
 if __name__ == "__main__":
@@ -189,5 +189,122 @@ class TestIndexedIOAlgo( unittest.TestCase ) :
 		self.assertEqual( stats[0], [0, 0, 0, 0, 1, 1] )
 		self.assertEqual( stats[1], [0, 0, 0, 0, 9, 18] )
 
+	def makeFragmentedTestFile( self ) :
+
+		fileName = os.path.join( ".", "test", "FileIndexedIO.fio" )
+
+		f = IECore.FileIndexedIO( fileName, [], IECore.IndexedIO.OpenMode.Write )
+		for location in range( 3 ) :
+			d = f.subdirectory( "location{0}".format( location ), IECore.IndexedIO.MissingBehaviour.CreateIfMissing )
+			d.write( "name", "location{0}".format( location ) )
+			for sample in range( 3 ) :
+				d.write( str( sample ), IECore.FloatVectorData( [ location * 1000 + sample * 100 + i for i in range( 1024 ) ] ) )
+				s = d.subdirectory( "sampleDirectory", IECore.IndexedIO.MissingBehaviour.CreateIfMissing )
+				s = s.subdirectory( str( sample ), IECore.IndexedIO.MissingBehaviour.CreateIfMissing )
+				s.write( "data", IECore.IntVectorData( [ location * 1000 + sample * 100 + i for i in range( 512 ) ] ) )
+		del f, d, s
+
+		# Remove and rewrite some data to leave free pages behind.
+		f = IECore.FileIndexedIO( fileName, [], IECore.IndexedIO.OpenMode.Append )
+		d = f.subdirectory( "location1" )
+		d.remove( "1" )
+		d.write( "1", IECore.FloatVectorData( [ -i for i in range( 2048 ) ] ) )
+		f.subdirectory( "location2" ).remove( "0" )
+		del f, d
+
+		return fileName
+
+	def assertIndexedIOEqual( self, a, b ) :
+
+		self.assertEqual(
+			sorted( a.entryIds( IECore.IndexedIO.EntryType.File ) ),
+			sorted( b.entryIds( IECore.IndexedIO.EntryType.File ) )
+		)
+		for name in a.entryIds( IECore.IndexedIO.EntryType.File ) :
+			self.assertEqual( a.read( name ), b.read( name ) )
+
+		self.assertEqual(
+			sorted( a.entryIds( IECore.IndexedIO.EntryType.Directory ) ),
+			sorted( b.entryIds( IECore.IndexedIO.EntryType.Directory ) )
+		)
+		for name in a.entryIds( IECore.IndexedIO.EntryType.Directory ) :
+			self.assertIndexedIOEqual( a.subdirectory( name ), b.subdirectory( name ) )
+
+	def testRepack( self ) :
+
+		srcFileName = self.makeFragmentedTestFile()
+		dstFileName = os.path.join( ".", "test", "FileIndexedIO2.fio" )
+
+		for order in IECore.IndexedIOAlgo.RepackOrder.values.values() :
+
+			IECore.IndexedIOAlgo.repack( srcFileName, dstFileName, order )
+
+			self.assertLess( os.path.getsize( dstFileName ), os.path.getsize( srcFileName ) )
+
+			src = IECore.FileIndexedIO( srcFileName, [], IECore.IndexedIO.OpenMode.Read )
+			dst = IECore.FileIndexedIO( dstFileName, [], IECore.IndexedIO.OpenMode.Read )
+			self.assertIndexedIOEqual( src, dst )
+			self.assertEqual( dst.metadata()["compressor"], src.metadata()["compressor"] )
+			self.assertEqual( dst.metadata()["compressionLevel"], src.metadata()["compressionLevel"] )
+
+	def testRepackIndexedIO( self ) :
+
+		srcFileName = self.makeFragmentedTestFile()
+		dstFileName = os.path.join( ".", "test", "FileIndexedIO2.fio" )
+
+		src = IECore.FileIndexedIO( srcFileName, [], IECore.IndexedIO.OpenMode.Read )
+		dst = IECore.FileIndexedIO( dstFileName, [], IECore.IndexedIO.OpenMode.Write )
+		IECore.IndexedIOAlgo.repack( src, dst, IECore.IndexedIOAlgo.RepackOrder.TimeMajor )
+		del dst
+
+		dst = IECore.FileIndexedIO( dstFileName, [], IECore.IndexedIO.OpenMode.Read )
+		self.assertIndexedIOEqual( src, dst )
+
+	def testRepackInPlace( self ) :
+
+		fileName = self.makeFragmentedTestFile()
+		originalSize = os.path.getsize( fileName )
+		os.chmod( fileName, 0o640 )
+
+		IECore.IndexedIOAlgo.repack( fileName, fileName )
+		self.assertLess( os.path.getsize( fileName ), originalSize )
+		self.assertEqual( os.stat( fileName ).st_mode & 0o777, 0o640 )
+
+		f = IECore.FileIndexedIO( fileName, [], IECore.IndexedIO.OpenMode.Read )
+		self.assertEqual( f.subdirectory( "location1" ).read( "1" ), IECore.FloatVectorData( [ -i for i in range( 2048 ) ] ) )
+		self.assertEqual( sorted( f.subdirectory( "location2" ).entryIds( IECore.IndexedIO.EntryType.File ) ), [ "1", "2", "name" ] )
+
+		self.assertEqual( [ f for f in os.listdir( os.path.join( ".", "test" ) ) if ".repack" in f ], [] )
+
+	def testRepackRecompress( self ) :
+
+		srcFileName = self.makeFragmentedTestFile()
+		dstFileName = os.path.join( ".", "test", "FileIndexedIO2.fio" )
+
+		IECore.IndexedIOAlgo.repack(
+			srcFileName, dstFileName, IECore.IndexedIOAlgo.RepackOrder.DepthFirst,
+			IECore.CompoundData( { "compressor" : "zlib", "compressionLevel" : 9 } )
+		)
+
+		src = IECore.FileIndexedIO( srcFileName, [], IECore.IndexedIO.OpenMode.Read )
+		dst = IECore.FileIndexedIO( dstFileName, [], IECore.IndexedIO.OpenMode.Read )
+		self.assertIndexedIOEqual( src, dst )
+		self.assertEqual( dst.metadata()["compressor"], IECore.StringData( "zlib" ) )
+		self.assertEqual( dst.metadata()["compressionLevel"], IECore.IntData( 9 ) )
+
+	def testRepackOp( self ) :
+
+		srcFileName = self.makeFragmentedTestFile()
+		dstFileName = os.path.join( ".", "test", "FileIndexedIO2.fio" )
+
+		result = IECore.IndexedIORepackOp()( src = srcFileName, dst = dstFileName, order = "timeMajor", compressor = "lz4hc" )
+		self.assertEqual( result, IECore.StringData( dstFileName ) )
+
+		src = IECore.FileIndexedIO( srcFileName, [], IECore.IndexedIO.OpenMode.Read )
+		dst = IECore.FileIndexedIO( dstFileName, [], IECore.IndexedIO.OpenMode.Read )
+		self.assertIndexedIOEqual( src, dst )
+		self.assertEqual( dst.metadata()["compressor"], IECore.StringData( "lz4hc" ) )
+		self.assertEqual( dst.metadata()["compressionLevel"], src.metadata()["compressionLevel"] )
+
 if __name__ == "__main__" :
 	unittest.main()
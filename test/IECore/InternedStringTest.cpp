@@ -96,6 +96,28 @@ struct InternedStringTest
 
 	};
 
+	void testBulkIntern()
+	{
+		std::vector<std::string> strings;
+		for( size_t i = 0; i < 10000; ++i )
+		{
+			strings.push_back( "testBulkIntern" + lexical_cast<std::string>( i % 5000 ) );
+		}
+
+		const size_t numUniqueStrings = InternedString::numUniqueStrings();
+		const std::vector<InternedString> interned = InternedString::intern( strings );
+		BOOST_CHECK_EQUAL( InternedString::numUniqueStrings(), numUniqueStrings + 5000 );
+
+		BOOST_CHECK_EQUAL( interned.size(), strings.size() );
+		for( size_t i = 0; i < strings.size(); ++i )
+		{
+			BOOST_CHECK_EQUAL( interned[i], InternedString( strings[i] ) );
+			BOOST_CHECK_EQUAL( interned[i].string(), strings[i] );
+		}
+
+		BOOST_CHECK( InternedString::intern( std::vector<std::string>() ).empty() );
+	}
+
 };
 
 
@@ -108,6 +130,7 @@ struct InternedStringTestSuite : public boost::unit_test::test_suite
 
 		add( BOOST_CLASS_TEST_CASE( &InternedStringTest::testConcurrentConstruction, instance ) );
 		add( BOOST_CLASS_TEST_CASE( &InternedStringTest::testRangeConstruction, instance ) );
+		add( BOOST_CLASS_TEST_CASE( &InternedStringTest::testBulkIntern, instance ) );
 
 	}
 };
@@ -107,6 +107,14 @@ class InternedStringTest( unittest.TestCase ) :
 		i = IECore.InternedString( s )
 		self.assertEqual( str( i ), s )
 
+	def testMemoryUsage( self ) :
+
+		m = IECore.InternedString.memoryUsage()
+		self.assertGreater( m, 0 )
+
+		strings = [ IECore.InternedString( "testMemoryUsage{}".format( i ) ) for i in range( 0, 1000 ) ]
+		self.assertGreater( IECore.InternedString.memoryUsage(), m + 1000 * len( "testMemoryUsage" ) )
+
 if __name__ == "__main__":
 	unittest.main()
 
@@ -0,0 +1,129 @@
+##########################################################################
+#
+#  Copyright (c) 2026, Image Engine Design Inc. All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are
+#  met:
+#
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#
+#     * Neither the name of Image Engine Design nor the names of any
+#       other contributors to this software may be used to endorse or
+#       promote products derived from this software without specific prior
+#       written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+#  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+#  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+#  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+#  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+#  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+#  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+#  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+#  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+#  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+#  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+##########################################################################
+
+import unittest
+
+import IECore
+
+class MemoryGovernorTest( unittest.TestCase ) :
+
+	def setUp( self ) :
+
+		self.addCleanup( IECore.MemoryGovernor.setMaxMemoryUsage, IECore.MemoryGovernor.getMaxMemoryUsage() )
+		IECore.MemoryGovernor.setMaxMemoryUsage( 0 )
+
+	def testClientMemoryUsage( self ) :
+
+		p = IECore.ObjectPool( 1024 * 1024 )
+		usage = IECore.MemoryGovernor.clientMemoryUsage()["ObjectPool"].value
+
+		a = p.store( IECore.IntVectorData( range( 0, 1000 ) ), IECore.ObjectPool.StoreReference )
+		self.assertEqual( IECore.MemoryGovernor.clientMemoryUsage()["ObjectPool"].value, usage + a.memoryUsage() )
+		self.assertGreaterEqual( IECore.MemoryGovernor.memoryUsage(), p.memoryUsage() )
+
+		del p
+		self.assertEqual( IECore.MemoryGovernor.clientMemoryUsage()["ObjectPool"].value, usage )
+
+	def testLimit( self ) :
+
+		p = IECore.ObjectPool( 100 * 1024 * 1024 )
+		for i in range( 0, 100 ) :
+			p.store( IECore.IntVectorData( [ i ] * 1000 ), IECore.ObjectPool.StoreCopy )
+
+		poolUsage = p.memoryUsage()
+		total = IECore.MemoryGovernor.memoryUsage()
+		self.assertGreaterEqual( total, poolUsage )
+
+		# Setting the limit reclaims memory immediately.
+
+		IECore.MemoryGovernor.setMaxMemoryUsage( total // 2 )
+		self.assertEqual( IECore.MemoryGovernor.getMaxMemoryUsage(), total // 2 )
+		self.assertLessEqual( IECore.MemoryGovernor.memoryUsage(), total // 2 )
+		self.assertGreater( p.memoryUsage(), 0 )
+
+		# And the limit is maintained as the pools grow again, even
+		# though they are still below their individual limits.
+
+		for i in range( 100, 200 ) :
+			p.store( IECore.IntVectorData( [ i ] * 1000 ), IECore.ObjectPool.StoreCopy )
+			self.assertLessEqual( IECore.MemoryGovernor.memoryUsage(), total // 2 )
+
+		self.assertEqual( p.getMaxMemoryUsage(), 100 * 1024 * 1024 )
+
+		# Removing the limit allows the pools to grow again.
+
+		IECore.MemoryGovernor.setMaxMemoryUsage( 0 )
+		p.clear()
+		for i in range( 0, 100 ) :
+			p.store( IECore.IntVectorData( [ i ] * 1000 ), IECore.ObjectPool.StoreCopy )
+		self.assertEqual( p.memoryUsage(), poolUsage )
+
+	def testPriority( self ) :
+
+		p = IECore.ObjectPool( 1024 * 1024, "MemoryGovernorTestPool" )
+		self.assertIn( "MemoryGovernorTestPool", IECore.MemoryGovernor.clientMemoryUsage() )
+		self.assertEqual( p.getMemoryGovernorPriority(), 1.0 )
+		self.assertEqual( IECore.MemoryGovernor.getPriority( "MemoryGovernorTestPool" ), 1.0 )
+
+		p.setMemoryGovernorPriority( 2.0 )
+		self.assertEqual( p.getMemoryGovernorPriority(), 2.0 )
+		self.assertEqual( IECore.MemoryGovernor.getPriority( "MemoryGovernorTestPool" ), 2.0 )
+
+		IECore.MemoryGovernor.setPriority( "MemoryGovernorTestPool", 0.5 )
+		self.assertEqual( p.getMemoryGovernorPriority(), 0.5 )
+
+		self.assertRaises( Exception, p.setMemoryGovernorPriority, 0 )
+		self.assertRaises( Exception, IECore.MemoryGovernor.setPriority, "MemoryGovernorTestPool", -1 )
+		self.assertRaises( Exception, IECore.MemoryGovernor.setPriority, "nonexistent", 1 )
+		self.assertRaises( Exception, IECore.MemoryGovernor.getPriority, "nonexistent" )
+		self.assertEqual( p.getMemoryGovernorPriority(), 0.5 )
+
+	def testPriorityAffectsReclaim( self ) :
+
+		lowPool = IECore.ObjectPool( 100 * 1024 * 1024, "MemoryGovernorTestLow" )
+		highPool = IECore.ObjectPool( 100 * 1024 * 1024, "MemoryGovernorTestHigh" )
+		highPool.setMemoryGovernorPriority( 10.0 )
+
+		for i in range( 0, 100 ) :
+			lowPool.store( IECore.IntVectorData( [ i ] * 1000 ), IECore.ObjectPool.StoreCopy )
+			highPool.store( IECore.IntVectorData( [ i + 1000 ] * 1000 ), IECore.ObjectPool.StoreCopy )
+
+		self.assertEqual( lowPool.memoryUsage(), highPool.memoryUsage() )
+
+		total = IECore.MemoryGovernor.memoryUsage()
+		IECore.MemoryGovernor.setMaxMemoryUsage( total - lowPool.memoryUsage() // 2 )
+		self.assertLess( lowPool.memoryUsage(), highPool.memoryUsage() )
+
+if __name__ == "__main__":
+	unittest.main()
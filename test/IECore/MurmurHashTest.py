@@ -33,6 +33,7 @@
 ##########################################################################
 
 import unittest
+import time
 import imath
 
 import IECore
@@ -312,6 +313,75 @@ class MurmurHashTest( unittest.TestCase ) :
 	def testMurmurHashDispatch( self ):
 		IECore.testMurmurHashDispatch()
 
+	def testTreeHash( self ) :
+
+		self.assertEqual( IECore.MurmurHash.treeHashThreshold(), 0 )
+
+		# Several chunks' worth of data, with a partial chunk at the end.
+		# We make new objects each time rather than using `copy()`, because
+		# copies share the cached result of `Object.hash()`.
+		makeData = lambda : IECore.FloatVectorData( [ i * 0.5 for i in range( 1000000 ) ] )
+		makeSmallData = lambda : IECore.IntVectorData( [ 1, 2, 3 ] )
+
+		data = makeData()
+
+		serial = IECore.MurmurHash()
+		serial.append( data )
+
+		tree = IECore.MurmurHash()
+		tree.appendTree( data )
+		self.assertNotEqual( tree, serial )
+
+		# Results must not depend on the number of threads.
+
+		with IECore.tbb_global_control( IECore.tbb_global_control.parameter.max_allowed_parallelism, 1 ) :
+			tree2 = IECore.MurmurHash()
+			tree2.appendTree( data )
+
+		self.assertEqual( tree2, tree )
+
+		# Small arrays and empty arrays are valid too.
+
+		for d in [ IECore.FloatVectorData(), IECore.V3fVectorData( [ imath.V3f( 1, 2, 3 ) ] ), IECore.StringVectorData( [ "a", "b" ] ) ] :
+			h1 = IECore.MurmurHash()
+			h1.appendTree( d )
+			h2 = IECore.MurmurHash()
+			h2.append( d )
+			self.assertNotEqual( h1, h2 )
+
+		# Tree hashing is used by `Object.hash()` for vectors above the
+		# threshold, and not for those below it.
+
+		dataHash = data.hash()
+		smallDataHash = makeSmallData().hash()
+
+		IECore.MurmurHash.setTreeHashThreshold( 1024 )
+		try :
+			self.assertEqual( IECore.MurmurHash.treeHashThreshold(), 1024 )
+			treeDataHash = makeData().hash()
+			self.assertNotEqual( treeDataHash, dataHash )
+			self.assertEqual( makeData().hash(), treeDataHash )
+			self.assertEqual( makeSmallData().hash(), smallDataHash )
+		finally :
+			IECore.MurmurHash.setTreeHashThreshold( 0 )
+
+		self.assertEqual( makeData().hash(), dataHash )
+
+	@unittest.skipIf( True, "Not running slow perf tests by default" )
+	def testTreeHashPerformance( self ) :
+
+		data = IECore.V3fVectorData( [ imath.V3f( i ) for i in range( 10000000 ) ] )
+
+		startTime = time.time()
+		IECore.MurmurHash().append( data )
+		elapsed = time.time() - startTime
+		print( "\nTime for append : ", elapsed )
+
+		startTime = time.time()
+		IECore.MurmurHash().appendTree( data )
+		elapsed = time.time() - startTime
+		print( "Time for appendTree : ", elapsed )
+
 if __name__ == "__main__":
 	unittest.main()
 
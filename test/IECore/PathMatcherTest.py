@@ -976,5 +976,65 @@ class PathMatcherTest( unittest.TestCase ) :
 		m.clear()
 		self.assertEqual( m.size(), 0 )
 
+	def testIntersectionWithWildcardsAndSelf( self ) :
+
+		m1 = IECore.PathMatcher( [ "/a/*", "/a/b", "/a/.../c", "/d" ] )
+		m2 = IECore.PathMatcher( [ "/a/*", "/a/.../c", "/a/b/c", "/e" ] )
+
+		self.assertEqual( set( m1.intersection( m2 ).paths() ), { "/a/*", "/a/.../c" } )
+		self.assertEqual( m1.intersection( m1 ), m1 )
+		self.assertTrue( m1.intersection( IECore.PathMatcher() ).isEmpty() )
+
+		m3 = IECore.PathMatcher( [ "/" ] )
+		self.assertEqual( m3.intersection( IECore.PathMatcher( [ "/", "/a" ] ) ).paths(), [ "/" ] )
+
+	def testRemovePathsFromSelf( self ) :
+
+		m = IECore.PathMatcher( [ "/a/b", "/a/c", "/d" ] )
+		self.assertTrue( m.removePaths( m ) )
+		self.assertTrue( m.isEmpty() )
+		self.assertFalse( m.removePaths( m ) )
+
+	def testManyChildren( self ) :
+
+		# Enough children to exercise the parallel set operations.
+
+		paths = [ "/a/child{}".format( i ) for i in range( 0, 10000 ) ]
+		evenPaths = paths[::2]
+		oddPaths = paths[1::2]
+
+		m = IECore.PathMatcher( paths + [ "/a/child*" ] )
+		self.assertEqual( m.size(), len( paths ) + 1 )
+		for path in paths[:100] :
+			self.assertEqual( m.match( path ), IECore.PathMatcher.Result.ExactMatch )
+		self.assertEqual( m.match( "/a/childX" ), IECore.PathMatcher.Result.ExactMatch )
+
+		even = IECore.PathMatcher( evenPaths )
+		odd = IECore.PathMatcher( oddPaths )
+
+		m2 = IECore.PathMatcher( even )
+		self.assertTrue( m2.addPaths( odd ) )
+		self.assertFalse( m2.addPaths( odd ) )
+		self.assertEqual( m2, IECore.PathMatcher( paths ) )
+		self.assertEqual( even.size(), len( evenPaths ) )
+
+		self.assertEqual( m.intersection( even ), even )
+		self.assertTrue( even.intersection( odd ).isEmpty() )
+
+		self.assertTrue( m2.removePaths( even ) )
+		self.assertEqual( m2, odd )
+
+		for path in oddPaths :
+			self.assertTrue( m2.removePath( path ) )
+		self.assertTrue( m2.isEmpty() )
+
+		# Removing most children should leave matching intact.
+		for path in evenPaths[3:] :
+			self.assertTrue( even.removePath( path ) )
+		self.assertEqual( set( even.paths() ), set( evenPaths[:3] ) )
+		for path in evenPaths[:3] :
+			self.assertEqual( even.match( path ), IECore.PathMatcher.Result.ExactMatch )
+		self.assertEqual( even.match( evenPaths[3] ), IECore.PathMatcher.Result.NoMatch )
+
 if __name__ == "__main__":
 	unittest.main()
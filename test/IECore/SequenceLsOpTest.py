@@ -79,6 +79,36 @@ class SequenceLsOpTest( unittest.TestCase ) :
 		self.assertEqual( str( sequences[0] ), os.path.join( "test", "IECore", "sequences", "sequenceLsTest", "s.#.tif 1-10" ) )
 
 
+	def testRecurse( self ) :
+
+		root = os.path.join( "test", "IECore", "sequences", "sequenceLsTest" )
+		for directory in [ "", "a", os.path.join( "a", "b" ), os.path.join( "a", "b", "c" ) ] :
+			for f in IECore.FileSequence( os.path.join( root, directory, "s.#.tif" ), IECore.FrameRange( 1, 10 ) ).fileNames() :
+				self.touch( f )
+
+		op = IECore.SequenceLsOp()
+		op['dir'] = IECore.StringData( root )
+		op['resultType'] = IECore.StringData( "stringVector" )
+
+		self.assertEqual( list( op() ), [ os.path.join( root, "s.#.tif 1-10" ) ] )
+
+		op['recurse'] = True
+		op['maxDepth'] = 2
+		self.assertEqual(
+			list( op() ),
+			[
+				os.path.join( root, "a", "b", "s.#.tif 1-10" ),
+				os.path.join( root, "a", "s.#.tif 1-10" ),
+				os.path.join( root, "s.#.tif 1-10" ),
+			]
+		)
+
+		op['type'] = "files"
+		self.assertEqual( len( op() ), 3 )
+		op['type'] = "directories"
+		self.assertEqual( len( op() ), 0 )
+
+
 	def setUp( self ) :
 
 		if os.path.exists( os.path.join( "test", "IECore", "sequences", "sequenceLsTest" ) ) :
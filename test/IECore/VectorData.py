@@ -41,6 +41,11 @@ import imath
 
 import IECore
 
+try :
+	import numpy
+except ImportError :
+	numpy = None
+
 
 class BaseVectorDataTest:
 
@@ -1341,6 +1346,101 @@ class TestInternedStringVectorData( unittest.TestCase ) :
 
 		self.assertEqual( d2, d )
 
+class TestVectorDataBuffer( unittest.TestCase ) :
+
+	def testMemoryView( self ) :
+
+		d = IECore.FloatVectorData( [ 1, 2, 3 ] )
+		m = memoryview( d )
+		self.assertEqual( m.format, "f" )
+		self.assertEqual( m.itemsize, 4 )
+		self.assertEqual( m.shape, ( 3, ) )
+		self.assertEqual( m.tolist(), [ 1, 2, 3 ] )
+
+		self.assertEqual( memoryview( IECore.IntVectorData( [ 1, 2 ] ) ).format, "i" )
+		self.assertEqual( memoryview( IECore.Int64VectorData( [ 1, 2 ] ) ).format, "q" )
+		self.assertEqual( memoryview( IECore.HalfVectorData( [ 1, 2 ] ) ).format, "e" )
+
+		self.assertRaises( TypeError, memoryview, IECore.StringVectorData( [ "a" ] ) )
+		self.assertRaises( TypeError, memoryview, IECore.BoolVectorData( [ True ] ) )
+
+	def testCompoundTypes( self ) :
+
+		d = IECore.V3fVectorData( [ imath.V3f( 1, 2, 3 ), imath.V3f( 4, 5, 6 ) ] )
+		m = memoryview( d )
+		self.assertEqual( m.format, "f" )
+		self.assertEqual( m.shape, ( 2, 3 ) )
+		self.assertEqual( m.tolist(), [ [ 1, 2, 3 ], [ 4, 5, 6 ] ] )
+
+		m = memoryview( IECore.Color4fVectorData( [ imath.Color4f( 1 ) ] ) )
+		self.assertEqual( m.shape, ( 1, 4 ) )
+
+		m = memoryview( IECore.M44dVectorData( [ imath.M44d() ] * 3 ) )
+		self.assertEqual( m.format, "d" )
+		self.assertEqual( m.shape, ( 3, 16 ) )
+
+	def testEmpty( self ) :
+
+		m = memoryview( IECore.V3fVectorData() )
+		self.assertEqual( m.shape, ( 0, 3 ) )
+		self.assertEqual( m.tolist(), [] )
+
+	def testViewIsReadOnlySnapshot( self ) :
+
+		d = IECore.IntVectorData( [ 1, 2, 3 ] )
+		d2 = d.copy()
+
+		m = memoryview( d )
+		self.assertTrue( m.readonly )
+		with self.assertRaises( TypeError ) :
+			m[0] = 10
+
+		d[0] = 10
+		d.append( 4 )
+		self.assertEqual( m.tolist(), [ 1, 2, 3 ] )
+		self.assertEqual( d2, IECore.IntVectorData( [ 1, 2, 3 ] ) )
+
+		del d
+		self.assertEqual( m.tolist(), [ 1, 2, 3 ] )
+
+	def testConstructFromBuffer( self ) :
+
+		d = IECore.FloatVectorData( [ 1, 2, 3, 4, 5, 6 ] )
+		self.assertEqual( IECore.FloatVectorData( memoryview( d ) ), d )
+
+		v = IECore.V3fVectorData( memoryview( d ) )
+		self.assertEqual( v, IECore.V3fVectorData( [ imath.V3f( 1, 2, 3 ), imath.V3f( 4, 5, 6 ) ] ) )
+
+		e = IECore.FloatVectorData()
+		e.extend( memoryview( d ) )
+		self.assertEqual( e, d )
+
+		e[0:2] = memoryview( IECore.FloatVectorData( [ 10, 20 ] ) )
+		self.assertEqual( e, IECore.FloatVectorData( [ 10, 20, 3, 4, 5, 6 ] ) )
+
+	@unittest.skipIf( numpy is None, "NumPy not available" )
+	def testNumPy( self ) :
+
+		d = IECore.V3fVectorData( [ imath.V3f( i ) for i in range( 0, 10 ) ] )
+		a = numpy.asarray( d )
+		self.assertEqual( a.dtype, numpy.float32 )
+		self.assertEqual( a.shape, ( 10, 3 ) )
+		self.assertFalse( a.flags.writeable )
+		self.assertEqual( a[5].tolist(), [ 5, 5, 5 ] )
+
+		# Round trip
+		d[:] = a * 2
+		self.assertEqual( d[5], imath.V3f( 10 ) )
+		self.assertEqual( a[5].tolist(), [ 5, 5, 5 ] )
+
+		# Bulk construction
+		p = IECore.V3fVectorData( numpy.ones( ( 100, 3 ), dtype = numpy.float32 ) )
+		self.assertEqual( len( p ), 100 )
+		self.assertEqual( p[99], imath.V3f( 1 ) )
+
+		i = IECore.Int64VectorData( numpy.arange( 0, 10, dtype = numpy.int64 ) )
+		self.assertEqual( i, IECore.Int64VectorData( range( 0, 10 ) ) )
+
 if __name__ == "__main__":
     unittest.main()
 
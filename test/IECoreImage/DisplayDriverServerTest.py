@@ -33,7 +33,10 @@
 ##########################################################################
 
 import unittest
+import socket
+import struct
 import sys
+import imath
 
 import IECore
 import IECoreImage
@@ -118,6 +121,151 @@ class DisplayDriverServerTest( unittest.TestCase ) :
 		s2 = IECoreImage.DisplayDriverServer()
 		self.assertEqual( s2.portNumber(), 45021 )
 
+	def testNumThreads( self ) :
+
+		s1 = IECoreImage.DisplayDriverServer()
+		self.assertEqual( s1.numThreads(), 1 )
+
+		s2 = IECoreImage.DisplayDriverServer( numThreads = 4 )
+		self.assertEqual( s2.numThreads(), 4 )
+
+		s3 = IECoreImage.DisplayDriverServer( numThreads = 0 )
+		self.assertGreaterEqual( s3.numThreads(), 1 )
+
+	def testConcurrentSessions( self ) :
+
+		server = IECoreImage.DisplayDriverServer( numThreads = 4 )
+
+		window = imath.Box2i( imath.V2i( 0 ), imath.V2i( 63 ) )
+		drivers = []
+		for i in range( 0, 8 ) :
+			drivers.append(
+				IECoreImage.ClientDisplayDriver(
+					window, window, [ "Y" ],
+					IECore.CompoundData( {
+						"displayHost" : "localhost",
+						"displayPort" : str( server.portNumber() ),
+						"remoteDisplayType" : "ImageDisplayDriver",
+						"handle" : "concurrentSession{}".format( i ),
+					} )
+				)
+			)
+
+		# Interleave the buckets from each session.
+		for y in range( 0, 64, 16 ) :
+			for x in range( 0, 64, 16 ) :
+				bucket = imath.Box2i( imath.V2i( x, y ), imath.V2i( x + 15, y + 15 ) )
+				for i, driver in enumerate( drivers ) :
+					driver.imageData( bucket, IECore.FloatVectorData( [ float( i ) ] * 256 ) )
+
+		for driver in drivers :
+			driver.imageClose()
+
+		for i in range( 0, len( drivers ) ) :
+			image = IECoreImage.ImageDisplayDriver.removeStoredImage( "concurrentSession{}".format( i ) )
+			self.assertEqual( image["Y"], IECore.FloatVectorData( [ float( i ) ] * 64 * 64 ) )
+
+	def testTransports( self ) :
+
+		server = IECoreImage.DisplayDriverServer()
+		window = imath.Box2i( imath.V2i( 0 ), imath.V2i( 63 ) )
+
+		Transport = IECoreImage.ClientDisplayDriver.Transport
+		for name, transportParameters, expectedTransport in [
+			( "socket", { "displaySharedMemorySize" : IECore.IntData( 0 ) }, Transport.Socket ),
+			( "compressed", { "displaySharedMemorySize" : IECore.IntData( 0 ), "displayCompression" : IECore.StringData( "lz4" ) }, Transport.Compressed ),
+			( "unknownCompressor", { "displaySharedMemorySize" : IECore.IntData( 0 ), "displayCompression" : IECore.StringData( "notACompressor" ) }, Transport.Socket ),
+			( "sharedMemory", {}, Transport.SharedMemory ),
+			# Small enough to force the ring buffer to wrap around.
+			( "sharedMemoryWrapped", { "displaySharedMemorySize" : IECore.IntData( 3000 ) }, Transport.SharedMemory ),
+			# Too small for any bucket, forcing a fallback to compression.
+			( "sharedMemoryTooSmall", { "displaySharedMemorySize" : IECore.IntData( 512 ), "displayCompression" : IECore.StringData( "lz4" ) }, Transport.Compressed ),
+		] :
+
+			with self.subTest( transport = name ) :
+
+				parameters = IECore.CompoundData( {
+					"displayHost" : "localhost",
+					"displayPort" : str( server.portNumber() ),
+					"remoteDisplayType" : "ImageDisplayDriver",
+					"handle" : "transport" + name,
+				} )
+				parameters.update( transportParameters )
+
+				driver = IECoreImage.ClientDisplayDriver( window, window, [ "Y" ], parameters )
+
+				expected = IECore.FloatVectorData( [ 0 ] * 64 * 64 )
+				for y in range( 0, 64, 16 ) :
+					for x in range( 0, 64, 16 ) :
+						bucket = imath.Box2i( imath.V2i( x, y ), imath.V2i( x + 15, y + 15 ) )
+						data = IECore.FloatVectorData()
+						for by in range( y, y + 16 ) :
+							for bx in range( x, x + 16 ) :
+								value = ( by // 4 ) * 0.25
+								data.append( value )
+								expected[by*64+bx] = value
+						driver.imageData( bucket, data )
+
+				driver.imageClose()
+
+				for transport in Transport.values.values() :
+					self.assertEqual( driver.bucketsSent( transport ), 16 if transport == expectedTransport else 0 )
+
+				image = IECoreImage.ImageDisplayDriver.removeStoredImage( "transport" + name )
+				self.assertEqual( image["Y"], expected )
+
+	def testClientWithoutTransportNegotiation( self ) :
+
+		# Clients predating the transport negotiation forward all their
+		# parameters to the server, including any "displayCompression"
+		# parameter, and expect a single byte acceptsRepeatedData reply.
+		# Emulate one with a raw socket.
+
+		server = IECoreImage.DisplayDriverServer()
+		window = imath.Box2i( imath.V2i( 0 ), imath.V2i( 15 ) )
+
+		io = IECore.MemoryIndexedIO( IECore.CharVectorData(), [], IECore.IndexedIO.OpenMode.Write )
+		IECore.Box2iData( window ).save( io, "displayWindow" )
+		IECore.Box2iData( window ).save( io, "dataWindow" )
+		IECore.StringVectorData( [ "Y" ] ).save( io, "channelNames" )
+		IECore.CompoundData( {
+			"remoteDisplayType" : "ImageDisplayDriver",
+			"handle" : "clientWithoutTransportNegotiation",
+			"displayCompression" : "lz4",
+			"displaySharedMemoryName" : "IECI-notNegotiated",
+		} ).save( io, "parameters" )
+
+		def send( connection, messageType, payload ) :
+			connection.sendall( struct.pack( "<BBBI", 0x82, 1, messageType, len( payload ) ) + payload )
+
+		def receive( connection, size ) :
+			result = b""
+			while len( result ) < size :
+				chunk = connection.recv( size - len( result ) )
+				self.assertTrue( chunk )
+				result += chunk
+			return result
+
+		def receiveReply( connection, messageType ) :
+			magic, version, replyType, size = struct.unpack( "<BBBI", receive( connection, 7 ) )
+			self.assertEqual( replyType, messageType )
+			return receive( connection, size )
+
+		with socket.create_connection( ( "localhost", server.portNumber() ) ) as connection :
+
+			send( connection, 1, memoryview( io.buffer() ).tobytes() )
+			self.assertEqual( len( receiveReply( connection, 1 ) ), 1 ) # scanLineOrderOnly
+			self.assertEqual( len( receiveReply( connection, 1 ) ), 1 ) # acceptsRepeatedData
+
+			data = IECore.FloatVectorData( [ 0.5 ] * 16 * 16 )
+			send( connection, 2, struct.pack( "<4i", 0, 0, 15, 15 ) + memoryview( data ).tobytes() )
+
+			send( connection, 3, b"" )
+			receiveReply( connection, 3 )
+
+		image = IECoreImage.ImageDisplayDriver.removeStoredImage( "clientWithoutTransportNegotiation" )
+		self.assertEqual( image["Y"], data )
+
 if __name__ == "__main__":
 	unittest.main()
 
@@ -37,6 +37,8 @@ import IECoreScene
 import IECore
 
 import imath
+import random
+import time
 import unittest
 
 class CurvesAlgoTest( unittest.TestCase ) :
@@ -2021,5 +2023,115 @@ class CurvesAlgoUpdateEndpointMultiplicityTest( unittest.TestCase ):
 
 
 
+	def testDeletePeriodicCurvesWithVaryingPrimitiveVariable( self ) :
+
+		curves = IECoreScene.CurvesPrimitive( IECore.IntVectorData( [ 3, 4 ] ), IECore.CubicBasisf.linear(), True )
+		curves["P"] = IECoreScene.PrimitiveVariable(
+			IECoreScene.PrimitiveVariable.Interpolation.Vertex,
+			IECore.V3fVectorData( [ imath.V3f( i ) for i in range( 0, 7 ) ] )
+		)
+		curves["v"] = IECoreScene.PrimitiveVariable( IECoreScene.PrimitiveVariable.Interpolation.Varying, IECore.IntVectorData( range( 0, 7 ) ) )
+		curves["delete"] = IECoreScene.PrimitiveVariable( IECoreScene.PrimitiveVariable.Interpolation.Uniform, IECore.IntVectorData( [ 1, 0 ] ) )
+		self.assertTrue( curves.arePrimitiveVariablesValid() )
+
+		deleted = IECoreScene.CurvesAlgo.deleteCurves( curves, curves["delete"] )
+		self.assertTrue( deleted.arePrimitiveVariablesValid() )
+		self.assertEqual( deleted["v"].data, IECore.IntVectorData( [ 3, 4, 5, 6 ] ) )
+
+	def createManyCurves( self, numCurves ) :
+
+		random.seed( 0 )
+		verticesPerCurve = IECore.IntVectorData( [ random.randint( 4, 10 ) for i in range( 0, numCurves ) ] )
+		numVertices = sum( verticesPerCurve )
+
+		curves = IECoreScene.CurvesPrimitive( verticesPerCurve, IECore.CubicBasisf.bSpline() )
+		curves["P"] = IECoreScene.PrimitiveVariable(
+			IECoreScene.PrimitiveVariable.Interpolation.Vertex,
+			IECore.V3fVectorData( [ imath.V3f( random.random(), random.random(), random.random() ) for i in range( 0, numVertices ) ] )
+		)
+		curves["width"] = IECoreScene.PrimitiveVariable(
+			IECoreScene.PrimitiveVariable.Interpolation.Varying,
+			IECore.FloatVectorData( [ random.random() for i in range( 0, curves.variableSize( IECoreScene.PrimitiveVariable.Interpolation.Varying ) ) ] )
+		)
+		curves["id"] = IECoreScene.PrimitiveVariable(
+			IECoreScene.PrimitiveVariable.Interpolation.Uniform,
+			IECore.IntVectorData( range( 0, numCurves ) )
+		)
+		curves["indexed"] = IECoreScene.PrimitiveVariable(
+			IECoreScene.PrimitiveVariable.Interpolation.Vertex,
+			IECore.StringVectorData( [ "a", "b", "c" ] ),
+			IECore.IntVectorData( [ random.randint( 0, 2 ) for i in range( 0, numVertices ) ] )
+		)
+		curves["delete"] = IECoreScene.PrimitiveVariable(
+			IECoreScene.PrimitiveVariable.Interpolation.Uniform,
+			IECore.BoolVectorData( [ random.random() > 0.5 for i in range( 0, numCurves ) ] )
+		)
+		curves["segment"] = IECoreScene.PrimitiveVariable(
+			IECoreScene.PrimitiveVariable.Interpolation.Uniform,
+			IECore.IntVectorData( [ i % 17 for i in range( 0, numCurves ) ] )
+		)
+
+		return curves
+
+	def testSerialAndParallelResultsMatch( self ) :
+
+		curves = self.createManyCurves( 10000 )
+
+		def resample() :
+			result = []
+			for name in ( "P", "width", "id" ) :
+				for interpolation in (
+					IECoreScene.PrimitiveVariable.Interpolation.Uniform,
+					IECoreScene.PrimitiveVariable.Interpolation.Vertex,
+					IECoreScene.PrimitiveVariable.Interpolation.Varying,
+				) :
+					p = IECoreScene.PrimitiveVariable( curves[name] )
+					IECoreScene.CurvesAlgo.resamplePrimitiveVariable( curves, p, interpolation )
+					result.append( p )
+			return result
+
+		functions = [
+			resample,
+			lambda : IECoreScene.CurvesAlgo.deleteCurves( curves, curves["delete"] ),
+			lambda : IECoreScene.CurvesAlgo.deleteCurves( curves, curves["delete"], invert = True ),
+			lambda : IECoreScene.CurvesAlgo.segment( curves, curves["segment"] ),
+			lambda : IECoreScene.CurvesAlgo.updateEndpointMultiplicity( curves, IECore.CubicBasisf.linear() ),
+			lambda : IECoreScene.CurvesAlgo.updateEndpointMultiplicity( curves, IECore.CubicBasisf.catmullRom() ),
+		]
+
+		for f in functions :
+			with IECore.tbb_global_control( IECore.tbb_global_control.parameter.max_allowed_parallelism, 1 ) :
+				serial = f()
+			self.assertEqual( f(), serial )
+
+	@unittest.skipIf( True, "Not running slow perf tests by default" )
+	def testPerformance( self ) :
+
+		curves = self.createManyCurves( 1000000 )
+
+		functions = [
+			( "deleteCurves", lambda : IECoreScene.CurvesAlgo.deleteCurves( curves, curves["delete"] ) ),
+			( "segment", lambda : IECoreScene.CurvesAlgo.segment( curves, curves["segment"] ) ),
+			( "updateEndpointMultiplicity", lambda : IECoreScene.CurvesAlgo.updateEndpointMultiplicity( curves, IECore.CubicBasisf.linear() ) ),
+			(
+				"resamplePrimitiveVariable",
+				lambda : IECoreScene.CurvesAlgo.resamplePrimitiveVariable(
+					curves, IECoreScene.PrimitiveVariable( curves["P"] ), IECoreScene.PrimitiveVariable.Interpolation.Uniform
+				)
+			),
+		]
+
+		for name, f in functions :
+			with IECore.tbb_global_control( IECore.tbb_global_control.parameter.max_allowed_parallelism, 1 ) :
+				startTime = time.time()
+				f()
+				elapsed = time.time() - startTime
+			print( "\nTime for {} with 1000000 curves, serial".format( name ), elapsed )
+
+			startTime = time.time()
+			f()
+			elapsed = time.time() - startTime
+			print( "Time for {} with 1000000 curves, parallel".format( name ), elapsed )
+
 if __name__ == "__main__":
 	unittest.main()
@@ -36,6 +36,8 @@ import IECore
 
 import IECoreScene
 
+import time
+import random
 import unittest
 import imath
 
@@ -390,5 +392,50 @@ class MeshAlgoDeleteFacesTest( unittest.TestCase ) :
 
 		self.assertRaises( RuntimeError, IECoreScene.MeshAlgo.deleteFaces, planeMesh, primvarDelete  )
 
+	def testSerialAndParallelResultsMatch( self ) :
+
+		mesh = IECoreScene.MeshPrimitive.createPlane( imath.Box2f( imath.V2f( 0 ), imath.V2f( 10 ) ), imath.V2i( 200 ) )
+		random.seed( 0 )
+		mesh["delete"] = IECoreScene.PrimitiveVariable(
+			IECoreScene.PrimitiveVariable.Interpolation.Uniform,
+			IECore.IntVectorData( [ random.randint( 0, 1 ) for i in range( mesh.numFaces() ) ] )
+		)
+		mesh["indexed"] = IECoreScene.PrimitiveVariable(
+			IECoreScene.PrimitiveVariable.Interpolation.Vertex,
+			IECore.FloatVectorData( range( 0, 100 ) ),
+			IECore.IntVectorData( [ random.randint( 0, 99 ) for i in range( mesh.variableSize( IECoreScene.PrimitiveVariable.Interpolation.Vertex ) ) ] )
+		)
+		mesh["flags"] = IECoreScene.PrimitiveVariable(
+			IECoreScene.PrimitiveVariable.Interpolation.Uniform,
+			IECore.BoolVectorData( [ bool( i % 3 ) for i in range( mesh.numFaces() ) ] )
+		)
+
+		for invert in ( False, True ) :
+			with IECore.tbb_global_control( IECore.tbb_global_control.parameter.max_allowed_parallelism, 1 ) :
+				serial = IECoreScene.MeshAlgo.deleteFaces( mesh, mesh["delete"], invert )
+			parallel = IECoreScene.MeshAlgo.deleteFaces( mesh, mesh["delete"], invert )
+			self.assertTrue( parallel.arePrimitiveVariablesValid() )
+			self.assertEqual( parallel, serial )
+
+	@unittest.skipIf( True, "Not running slow perf tests by default" )
+	def testPerformance( self ) :
+
+		mesh = IECoreScene.MeshPrimitive.createPlane( imath.Box2f( imath.V2f( -1 ), imath.V2f( 1 ) ), imath.V2i( 4000 ) )
+		mesh["delete"] = IECoreScene.PrimitiveVariable(
+			IECoreScene.PrimitiveVariable.Interpolation.Uniform,
+			IECore.IntVectorData( [ i % 2 for i in range( mesh.numFaces() ) ] )
+		)
+
+		with IECore.tbb_global_control( IECore.tbb_global_control.parameter.max_allowed_parallelism, 1 ) :
+			startTime = time.time()
+			IECoreScene.MeshAlgo.deleteFaces( mesh, mesh["delete"] )
+			elapsed = time.time() - startTime
+		print( "\nTime for deleting from 16000000 faces, serial", elapsed )
+
+		startTime = time.time()
+		IECoreScene.MeshAlgo.deleteFaces( mesh, mesh["delete"] )
+		elapsed = time.time() - startTime
+		print( "Time for deleting from 16000000 faces, parallel", elapsed )
+
 if __name__ == "__main__":
 	unittest.main()
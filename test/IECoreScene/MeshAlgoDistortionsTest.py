@@ -33,6 +33,7 @@
 ##########################################################################
 
 import math
+import time
 import unittest
 import random
 import imath
@@ -144,5 +145,38 @@ class MeshAlgoDistortionsTest( unittest.TestCase ) :
 		for d in uvDistortion.data :
 			self.assertEqual( d, imath.V2f( -0.5, 0 ) )
 
+	def testSerialAndParallelResultsMatch( self ) :
+
+		mesh = IECoreScene.MeshPrimitive.createPlane( imath.Box2f( imath.V2f( 0 ), imath.V2f( 10 ) ), imath.V2i( 200 ) )
+		random.seed( 0 )
+		mesh["Pref"] = IECoreScene.PrimitiveVariable(
+			IECoreScene.PrimitiveVariable.Interpolation.Vertex,
+			IECore.V3fVectorData( [ p + imath.V3f( random.random(), random.random(), random.random() ) * 0.01 for p in mesh["P"].data ] )
+		)
+
+		with IECore.tbb_global_control( IECore.tbb_global_control.parameter.max_allowed_parallelism, 1 ) :
+			serial = IECoreScene.MeshAlgo.calculateDistortion( mesh )
+		parallel = IECoreScene.MeshAlgo.calculateDistortion( mesh )
+
+		self.assertEqual( parallel[0], serial[0] )
+		self.assertEqual( parallel[1], serial[1] )
+
+	@unittest.skipIf( True, "Not running slow perf tests by default" )
+	def testPerformance( self ) :
+
+		mesh = IECoreScene.MeshPrimitive.createPlane( imath.Box2f( imath.V2f( -1 ), imath.V2f( 1 ) ), imath.V2i( 1000 ) )
+		mesh["Pref"] = IECoreScene.PrimitiveVariable( IECoreScene.PrimitiveVariable.Interpolation.Vertex, mesh["P"].data.copy() )
+
+		with IECore.tbb_global_control( IECore.tbb_global_control.parameter.max_allowed_parallelism, 1 ) :
+			startTime = time.time()
+			IECoreScene.MeshAlgo.calculateDistortion( mesh )
+			elapsed = time.time() - startTime
+		print( "\nTime for distortion of 1000000 faces, serial", elapsed )
+
+		startTime = time.time()
+		IECoreScene.MeshAlgo.calculateDistortion( mesh )
+		elapsed = time.time() - startTime
+		print( "Time for distortion of 1000000 faces, parallel", elapsed )
+
 if __name__ == "__main__":
     unittest.main()
@@ -159,5 +159,32 @@ class MeshAlgoFaceAreaTest( unittest.TestCase ) :
 			self.assertLess( time.time() - startTime, 0.03 )
 			self.assertTrue( cancelled[0] )
 
+	def testSerialAndParallelResultsMatch( self ) :
+
+		mesh = IECoreScene.MeshPrimitive.createSphere( 1, divisions = imath.V2i( 100, 200 ) )
+
+		with IECore.tbb_global_control( IECore.tbb_global_control.parameter.max_allowed_parallelism, 1 ) :
+			serialArea = IECoreScene.MeshAlgo.calculateFaceArea( mesh )
+			serialTextureArea = IECoreScene.MeshAlgo.calculateFaceTextureArea( mesh )
+
+		self.assertEqual( IECoreScene.MeshAlgo.calculateFaceArea( mesh ), serialArea )
+		self.assertEqual( IECoreScene.MeshAlgo.calculateFaceTextureArea( mesh ), serialTextureArea )
+
+	@unittest.skipIf( True, "Not running slow perf tests by default" )
+	def testPerformance( self ) :
+
+		mesh = IECoreScene.MeshPrimitive.createPlane( imath.Box2f( imath.V2f( -1 ), imath.V2f( 1 ) ), imath.V2i( 4000 ) )
+
+		with IECore.tbb_global_control( IECore.tbb_global_control.parameter.max_allowed_parallelism, 1 ) :
+			startTime = time.time()
+			IECoreScene.MeshAlgo.calculateFaceArea( mesh )
+			elapsed = time.time() - startTime
+		print( "\nTime for face area of 16000000 faces, serial", elapsed )
+
+		startTime = time.time()
+		IECoreScene.MeshAlgo.calculateFaceArea( mesh )
+		elapsed = time.time() - startTime
+		print( "Time for face area of 16000000 faces, parallel", elapsed )
+
 if __name__ == "__main__":
     unittest.main()
@@ -32,6 +32,7 @@
 #
 ##########################################################################
 
+import time
 import unittest
 
 import IECore
@@ -230,5 +231,42 @@ class MeshAlgoMergeTest( unittest.TestCase ) :
 		self.assertEqual( merged.creaseIds(), IECore.IntVectorData( [ 1, 2, 3, 4, 5, 9, 10, 11, 12, 13, 14, 15 ] ) )
 		self.assertEqual( merged.creaseSharpnesses(), IECore.FloatVectorData( [ 1, 5, 3, 2, 0.5 ] ) )
 
+	def testSerialAndParallelResultsMatch( self ) :
+
+		meshes = []
+		for i in range( 0, 20 ) :
+			mesh = IECoreScene.MeshPrimitive.createPlane( imath.Box2f( imath.V2f( i ), imath.V2f( i + 1 ) ), imath.V2i( 20 ) )
+			mesh["a"] = IECoreScene.PrimitiveVariable( IECoreScene.PrimitiveVariable.Interpolation.Uniform, IECore.IntVectorData( [ i ] * mesh.numFaces() ) )
+			if i % 2 :
+				mesh["b"] = IECoreScene.PrimitiveVariable( IECoreScene.PrimitiveVariable.Interpolation.Vertex, mesh["P"].data )
+				mesh.setCorners( IECore.IntVectorData( [ 0 ] ), IECore.FloatVectorData( [ float( i ) ] ) )
+			meshes.append( mesh )
+
+		with IECore.tbb_global_control( IECore.tbb_global_control.parameter.max_allowed_parallelism, 1 ) :
+			serial = IECoreScene.MeshAlgo.merge( meshes )
+		parallel = IECoreScene.MeshAlgo.merge( meshes )
+
+		self.verifyPrimvars( parallel )
+		self.assertEqual( parallel, serial )
+
+	@unittest.skipIf( True, "Not running slow perf tests by default" )
+	def testPerformance( self ) :
+
+		meshes = [
+			IECoreScene.MeshPrimitive.createPlane( imath.Box2f( imath.V2f( i ), imath.V2f( i + 1 ) ), imath.V2i( 100 ) )
+			for i in range( 0, 1000 )
+		]
+
+		with IECore.tbb_global_control( IECore.tbb_global_control.parameter.max_allowed_parallelism, 1 ) :
+			startTime = time.time()
+			IECoreScene.MeshAlgo.merge( meshes )
+			elapsed = time.time() - startTime
+		print( "\nTime for merging 1000 meshes of 10000 faces, serial", elapsed )
+
+		startTime = time.time()
+		IECoreScene.MeshAlgo.merge( meshes )
+		elapsed = time.time() - startTime
+		print( "Time for merging 1000 meshes of 10000 faces, parallel", elapsed )
+
 if __name__ == "__main__" :
 	unittest.main()
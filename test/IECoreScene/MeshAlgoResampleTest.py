@@ -36,6 +36,8 @@ import IECore
 import IECoreScene
 
 import imath
+import time
+import random
 import unittest
 
 class MeshAlgoResampleTest( unittest.TestCase ) :
@@ -423,5 +425,51 @@ class MeshAlgoResampleTest( unittest.TestCase ) :
 				for v in pv.data :
 					self.assertEqual( v, imath.V2f( 0 ) )
 
+	def testSerialAndParallelResultsMatch( self ) :
+
+		mesh = IECoreScene.MeshPrimitive.createPlane( imath.Box2f( imath.V2f( 0 ), imath.V2f( 10 ) ), imath.V2i( 200 ) )
+		random.seed( 0 )
+		numFaceVertices = mesh.variableSize( IECoreScene.PrimitiveVariable.Interpolation.FaceVarying )
+		mesh["f"] = IECoreScene.PrimitiveVariable(
+			IECoreScene.PrimitiveVariable.Interpolation.FaceVarying,
+			IECore.FloatVectorData( [ random.random() for i in range( numFaceVertices ) ] )
+		)
+		mesh["u"] = IECoreScene.PrimitiveVariable(
+			IECoreScene.PrimitiveVariable.Interpolation.Uniform,
+			IECore.V3fVectorData( [ imath.V3f( random.random() ) for i in range( mesh.numFaces() ) ] )
+		)
+
+		for name in ( "P", "uv", "f", "u" ) :
+			for interpolation in (
+				IECoreScene.PrimitiveVariable.Interpolation.Uniform,
+				IECoreScene.PrimitiveVariable.Interpolation.Vertex,
+				IECoreScene.PrimitiveVariable.Interpolation.FaceVarying,
+			) :
+				with IECore.tbb_global_control( IECore.tbb_global_control.parameter.max_allowed_parallelism, 1 ) :
+					serial = IECoreScene.PrimitiveVariable( mesh[name] )
+					IECoreScene.MeshAlgo.resamplePrimitiveVariable( mesh, serial, interpolation )
+				parallel = IECoreScene.PrimitiveVariable( mesh[name] )
+				IECoreScene.MeshAlgo.resamplePrimitiveVariable( mesh, parallel, interpolation )
+				self.assertEqual( parallel, serial )
+
+	@unittest.skipIf( True, "Not running slow perf tests by default" )
+	def testPerformance( self ) :
+
+		mesh = IECoreScene.MeshPrimitive.createPlane( imath.Box2f( imath.V2f( -1 ), imath.V2f( 1 ) ), imath.V2i( 4000 ) )
+
+		for interpolation in ( IECoreScene.PrimitiveVariable.Interpolation.Uniform, IECoreScene.PrimitiveVariable.Interpolation.Vertex ) :
+			with IECore.tbb_global_control( IECore.tbb_global_control.parameter.max_allowed_parallelism, 1 ) :
+				primitiveVariable = IECoreScene.PrimitiveVariable( mesh["uv"] )
+				startTime = time.time()
+				IECoreScene.MeshAlgo.resamplePrimitiveVariable( mesh, primitiveVariable, interpolation )
+				elapsed = time.time() - startTime
+			print( "\nTime for resampling 16000000 faces to {}, serial".format( interpolation ), elapsed )
+
+			primitiveVariable = IECoreScene.PrimitiveVariable( mesh["uv"] )
+			startTime = time.time()
+			IECoreScene.MeshAlgo.resamplePrimitiveVariable( mesh, primitiveVariable, interpolation )
+			elapsed = time.time() - startTime
+			print( "Time for resampling 16000000 faces to {}, parallel".format( interpolation ), elapsed )
+
 if __name__ == "__main__":
 	unittest.main()
@@ -32,6 +32,7 @@
 #
 ##########################################################################
 
+import time
 import unittest
 
 import IECore
@@ -203,5 +204,34 @@ class MeshAlgoSegmentTest( unittest.TestCase ) :
 		self.assertEqual( segments[0].numFaces(), 5)
 		self.assertEqual( segments[1].numFaces(), 4)
 
+	def testSerialAndParallelResultsMatch( self ) :
+
+		mesh = IECoreScene.MeshPrimitive.createPlane( imath.Box2f( imath.V2f( 0 ), imath.V2f( 10 ) ), imath.V2i( 100 ) )
+		mesh["s"] = IECoreScene.PrimitiveVariable( IECoreScene.PrimitiveVariable.Interpolation.Uniform, IECore.IntVectorData( [ i % 37 for i in range( mesh.numFaces() ) ] ) )
+
+		with IECore.tbb_global_control( IECore.tbb_global_control.parameter.max_allowed_parallelism, 1 ) :
+			serial = IECoreScene.MeshAlgo.segment( mesh, mesh["s"] )
+		parallel = IECoreScene.MeshAlgo.segment( mesh, mesh["s"] )
+
+		self.assertEqual( len( parallel ), 37 )
+		self.assertEqual( parallel, serial )
+
+	@unittest.skipIf( True, "Not running slow perf tests by default" )
+	def testPerformance( self ) :
+
+		mesh = IECoreScene.MeshPrimitive.createPlane( imath.Box2f( imath.V2f( -1 ), imath.V2f( 1 ) ), imath.V2i( 1000 ) )
+		mesh["s"] = IECoreScene.PrimitiveVariable( IECoreScene.PrimitiveVariable.Interpolation.Uniform, IECore.IntVectorData( [ i % 100 for i in range( mesh.numFaces() ) ] ) )
+
+		with IECore.tbb_global_control( IECore.tbb_global_control.parameter.max_allowed_parallelism, 1 ) :
+			startTime = time.time()
+			IECoreScene.MeshAlgo.segment( mesh, mesh["s"] )
+			elapsed = time.time() - startTime
+		print( "\nTime for segmenting 1000000 faces into 100 meshes, serial", elapsed )
+
+		startTime = time.time()
+		IECoreScene.MeshAlgo.segment( mesh, mesh["s"] )
+		elapsed = time.time() - startTime
+		print( "Time for segmenting 1000000 faces into 100 meshes, parallel", elapsed )
+
 if __name__ == "__main__" :
 	unittest.main()
@@ -386,5 +386,40 @@ class MeshAlgoTangentsTest( unittest.TestCase ) :
 			self.assertLess( time.time() - startTime, 0.2 )
 			self.assertTrue( cancelled[0] )
 
+	def testSerialAndParallelResultsMatch( self ) :
+
+		mesh = IECoreScene.MeshPrimitive.createSphere( 1, divisions = imath.V2i( 100, 200 ) )
+		mesh["N"] = IECoreScene.MeshAlgo.calculateNormals( mesh )
+
+		functions = [
+			lambda : IECoreScene.MeshAlgo.calculateTangentsFromUV( mesh ),
+			lambda : IECoreScene.MeshAlgo.calculateTangentsFromFirstEdge( mesh ),
+			lambda : IECoreScene.MeshAlgo.calculateTangentsFromTwoEdges( mesh ),
+			lambda : IECoreScene.MeshAlgo.calculateTangentsFromPrimitiveCentroid( mesh ),
+		]
+
+		for f in functions :
+			with IECore.tbb_global_control( IECore.tbb_global_control.parameter.max_allowed_parallelism, 1 ) :
+				serial = f()
+			parallel = f()
+			self.assertEqual( parallel[0], serial[0] )
+			self.assertEqual( parallel[1], serial[1] )
+
+	@unittest.skipIf( True, "Not running slow perf tests by default" )
+	def testPerformance( self ) :
+
+		mesh = IECoreScene.MeshPrimitive.createPlane( imath.Box2f( imath.V2f( -1 ), imath.V2f( 1 ) ), imath.V2i( 1000 ) )
+
+		with IECore.tbb_global_control( IECore.tbb_global_control.parameter.max_allowed_parallelism, 1 ) :
+			startTime = time.time()
+			IECoreScene.MeshAlgo.calculateTangentsFromUV( mesh )
+			elapsed = time.time() - startTime
+		print( "\nTime for tangents from UV for 1000000 faces, serial", elapsed )
+
+		startTime = time.time()
+		IECoreScene.MeshAlgo.calculateTangentsFromUV( mesh )
+		elapsed = time.time() - startTime
+		print( "Time for tangents from UV for 1000000 faces, parallel", elapsed )
+
 if __name__ == "__main__":
 	unittest.main()
@@ -446,6 +446,88 @@ class TestMeshPrimitiveEvaluator( unittest.TestCase ) :
 		result = meshEvaluator.createResult()
 		self.assertAlmostEqual( meshEvaluator.signedDistance( imath.V3f( 0.23601509630680084, -0.5, 0.23528452217578888), result ), 0 )
 
+	def testLargeMesh( self ) :
+
+		# Large enough for the acceleration trees to be built in parallel.
+		m = IECoreScene.MeshPrimitive.createPlane( imath.Box2f( imath.V2f( 0 ), imath.V2f( 1 ) ), imath.V2i( 100 ) )
+		m = IECoreScene.MeshAlgo.triangulate( m )
+		mpe = IECoreScene.MeshPrimitiveEvaluator( m )
+
+		self.assertEqual( mpe.uvBound(), imath.Box2f( imath.V2f( 0 ), imath.V2f( 1 ) ) )
+
+		result = mpe.createResult()
+		random.seed( 1 )
+		for i in range( 0, 100 ) :
+
+			p = imath.V3f( random.random(), random.random(), random.uniform( -1, 1 ) )
+			self.assertTrue( mpe.closestPoint( p, result ) )
+			self.assertTrue( result.point().equalWithAbsError( imath.V3f( p.x, p.y, 0 ), 1e-5 ) )
+
+			uv = imath.V2f( random.random(), random.random() )
+			self.assertTrue( mpe.pointAtUV( uv, result ) )
+			self.assertTrue( result.uv().equalWithAbsError( uv, 1e-5 ) )
+
+	def testBVH( self ) :
+
+		m = IECoreScene.MeshPrimitive.createSphere( 1, divisions = imath.V2i( 60, 120 ) )
+		m = IECoreScene.MeshAlgo.triangulate( m )
+		kdTree = IECoreScene.MeshPrimitiveEvaluator( m )
+		bvh = IECoreScene.MeshPrimitiveEvaluator( m, IECoreScene.MeshPrimitiveEvaluator.RayAcceleration.BVH )
+		self.assertEqual( kdTree.rayAcceleration(), IECoreScene.MeshPrimitiveEvaluator.RayAcceleration.KDTree )
+		self.assertEqual( bvh.rayAcceleration(), IECoreScene.MeshPrimitiveEvaluator.RayAcceleration.BVH )
+
+		random.seed( 2 )
+		origins = IECore.V3fVectorData()
+		directions = IECore.V3fVectorData()
+		for i in range( 0, 500 ) :
+			origins.append( imath.V3f( random.uniform( -2, 2 ), random.uniform( -2, 2 ), random.uniform( -2, 2 ) ) )
+			directions.append( imath.V3f( random.uniform( -1, 1 ), random.uniform( -1, 1 ), random.uniform( -1, 1 ) ) )
+
+		kdTreeResult = kdTree.createResult()
+		bvhResult = bvh.createResult()
+		for o, d in zip( origins, directions ) :
+
+			for maxDistance in ( 0.5, 100 ) :
+
+				hit = kdTree.intersectionPoint( o, d, kdTreeResult, maxDistance )
+				self.assertEqual( bvh.intersectionPoint( o, d, bvhResult, maxDistance ), hit )
+				if hit :
+					self.assertTrue( bvhResult.point().equalWithAbsError( kdTreeResult.point(), 1e-5 ) )
+
+				self.assertEqual(
+					len( bvh.intersectionPoints( o, d, maxDistance ) ),
+					len( kdTree.intersectionPoints( o, d, maxDistance ) )
+				)
+
+		kdTreeBatch = kdTree.batchIntersectionPoint( origins, directions )
+		bvhBatch = bvh.batchIntersectionPoint( origins, directions )
+		self.assertEqual( bvhBatch["success"], kdTreeBatch["success"] )
+		for i in range( 0, len( origins ) ) :
+			self.assertTrue( bvhBatch["point"][i].equalWithAbsError( kdTreeBatch["point"][i], 1e-5 ) )
+			self.assertAlmostEqual( bvhBatch["distance"][i], kdTreeBatch["distance"][i], 5 )
+
+	def testBVHCoherentRays( self ) :
+
+		m = IECoreScene.MeshPrimitive.createPlane( imath.Box2f( imath.V2f( -1 ), imath.V2f( 1 ) ), imath.V2i( 50 ) )
+		m = IECoreScene.MeshAlgo.triangulate( m )
+		e = IECoreScene.MeshPrimitiveEvaluator( m, IECoreScene.MeshPrimitiveEvaluator.RayAcceleration.BVH )
+
+		origins = IECore.V3fVectorData()
+		directions = IECore.V3fVectorData()
+		for x in range( -10, 11 ) :
+			for y in range( -10, 11 ) :
+				origins.append( imath.V3f( x * 0.15, y * 0.15 + 0.013, 1 ) )
+				directions.append( imath.V3f( 0, 0, -1 ) )
+
+		r = e.batchIntersectionPoint( origins, directions )
+		self.assertTrue( all( r["success"] ) )
+		for i, o in enumerate( origins ) :
+			self.assertTrue( r["point"][i].equalWithAbsError( imath.V3f( o.x, o.y, 0 ), 1e-5 ) )
+			self.assertAlmostEqual( r["distance"][i], 1, 5 )
+
+		r = e.batchIntersectionPoint( origins, directions, maxDistance = 0.5 )
+		self.assertFalse( any( r["success"] ) )
+
 if __name__ == "__main__":
 	unittest.main()
 
@@ -35,6 +35,9 @@
 import unittest
 import sys
 import os
+import shutil
+import tempfile
+import imath
 import IECore
 import IECoreScene
 
@@ -98,6 +101,134 @@ class TestOBJReader( unittest.TestCase ) :
 		self.assertTrue( mesh.isInstanceOf( IECoreScene.MeshPrimitive.staticTypeId() ) )
 		self.assertTrue( mesh.arePrimitiveVariablesValid() )
 
+	def testRelativeIndices( self ) :
+
+		mesh = IECore.Reader.create( os.path.join( "test", "IECore", "data", "obj", "groups.obj" ) ).read()
+
+		self.assertEqual( mesh.verticesPerFace, IECore.IntVectorData( [ 3, 3, 3 ] ) )
+		self.assertEqual( mesh.vertexIds, IECore.IntVectorData( range( 0, 9 ) ) )
+		self.assertEqual( mesh["P"].data[0], imath.V3f( 10, 10, 0 ) )
+		self.assertEqual( mesh["P"].data[8], imath.V3f( 0, 1, 0 ) )
+
+	def testValues( self ) :
+
+		mesh = IECore.Reader.create( os.path.join( "test", "IECore", "data", "obj", "triangle_normals.obj" ) ).read()
+
+		self.assertEqual( mesh["P"].data, IECore.V3fVectorData( [ imath.V3f( 0 ), imath.V3f( 2, 0, 0 ), imath.V3f( 2, 0, 2 ) ] ) )
+		self.assertEqual( mesh["N"].data, IECore.V3fVectorData( [ imath.V3f( 1, 0, 0 ), imath.V3f( 0, 1, 0 ), imath.V3f( 0, 1, 0 ) ] ) )
+		self.assertEqual( mesh["s"].data, IECore.FloatVectorData( [ 0, 1, 1 ] ) )
+		self.assertEqual( mesh["t"].data, IECore.FloatVectorData( [ 0, 0, 1 ] ) )
+
+	def testLargeFile( self ) :
+
+		# Large enough to be split into several chunks which are
+		# parsed in parallel. The second half of the faces use
+		# relative indices, and only some faces have normals.
+
+		resolution = 400
+		fileName = os.path.join( self.tempDir, "large.obj" )
+
+		expectedP = []
+		expectedVerticesPerFace = []
+		expectedVertexIds = []
+		expectedS = []
+		expectedN = []
+
+		with open( fileName, "w" ) as f :
+
+			f.write( "# grid\r\n" )
+			for y in range( 0, resolution + 1 ) :
+				f.write( "g row{}\n".format( y ) )
+				for x in range( 0, resolution + 1 ) :
+					f.write( "v {} {} -1.5e-1\nvt {} 0.5\n".format( x, y * 0.5, x ) )
+					expectedP.append( imath.V3f( x, y * 0.5, -0.15 ) )
+			f.write( "vn 0 0 1\n" )
+
+			numVertices = ( resolution + 1 ) * ( resolution + 1 )
+			for y in range( 0, resolution ) :
+				for x in range( 0, resolution ) :
+					ids = [ y * ( resolution + 1 ) + x, y * ( resolution + 1 ) + x + 1, ( y + 1 ) * ( resolution + 1 ) + x + 1, ( y + 1 ) * ( resolution + 1 ) + x ]
+					expectedVerticesPerFace.append( 4 )
+					expectedVertexIds.extend( ids )
+					expectedS.extend( [ i % ( resolution + 1 ) for i in ids ] )
+					if y < resolution // 2 :
+						f.write( "f " + " ".join( "{0}/{0}/1".format( i + 1 ) for i in ids ) + "\n" )
+						expectedN.extend( [ imath.V3f( 0, 0, 1 ) ] * 4 )
+					else :
+						f.write( "f " + " ".join( "{0}/{0}".format( i - numVertices ) for i in ids ) + "\n" )
+						expectedN.extend( [ imath.V3f( 0 ) ] * 4 )
+
+		self.assertGreater( os.path.getsize( fileName ), 8 * 1024 * 1024 )
+
+		mesh = IECoreScene.OBJReader( fileName ).read()
+		self.assertTrue( mesh.arePrimitiveVariablesValid() )
+		self.assertEqual( mesh.verticesPerFace, IECore.IntVectorData( expectedVerticesPerFace ) )
+		self.assertEqual( mesh.vertexIds, IECore.IntVectorData( expectedVertexIds ) )
+		self.assertEqual( mesh["P"].data, IECore.V3fVectorData( expectedP ) )
+		self.assertEqual( mesh["s"].data, IECore.FloatVectorData( expectedS ) )
+		self.assertEqual( mesh["t"].data, IECore.FloatVectorData( [ 0.5 ] * len( expectedS ) ) )
+		self.assertEqual( mesh["N"].data, IECore.V3fVectorData( expectedN ) )
+
+	def testInvalidFace( self ) :
+
+		fileName = os.path.join( self.tempDir, "invalid.obj" )
+		with open( fileName, "w" ) as f :
+			f.write( "v 0 0 0\nv 1 0 0\nv 1 1 0\nf 1 2\n" )
+
+		self.assertRaisesRegex( RuntimeError, "invalid face specification", IECoreScene.OBJReader( fileName ).read )
+
+		with open( fileName, "w" ) as f :
+			f.write( "v 0 0 0\nv 1 0 0\nv 1 1 0\nf 1 2 4\n" )
+
+		self.assertRaisesRegex( RuntimeError, "invalid face specification", IECoreScene.OBJReader( fileName ).read )
+
+	def testTrailingComments( self ) :
+
+		fileName = os.path.join( self.tempDir, "comments.obj" )
+		with open( fileName, "w" ) as f :
+			f.write( "v 0 0 0 # origin\nv 1 0 0\nv 1 1 0#corner\nvt 0 1 # uv\nf 1/1 2/1 3/1 # triangle\n" )
+
+		mesh = IECoreScene.OBJReader( fileName ).read()
+		self.assertTrue( mesh.arePrimitiveVariablesValid() )
+		self.assertEqual( mesh.verticesPerFace, IECore.IntVectorData( [ 3 ] ) )
+		self.assertEqual( mesh.vertexIds, IECore.IntVectorData( [ 0, 1, 2 ] ) )
+		self.assertEqual( mesh["P"].data, IECore.V3fVectorData( [ imath.V3f( 0 ), imath.V3f( 1, 0, 0 ), imath.V3f( 1, 1, 0 ) ] ) )
+		self.assertEqual( mesh["t"].data, IECore.FloatVectorData( [ 1, 1, 1 ] ) )
+
+	def testShortElementsSkipped( self ) :
+
+		fileName = os.path.join( self.tempDir, "short.obj" )
+		with open( fileName, "w" ) as f :
+			f.write( "v 0 0 0\nv 1 2\nv 1 0 0\nv 1 1 0\nvn 0 0\nf 1 2 3\n" )
+
+		with IECore.CapturingMessageHandler() as mh :
+			mesh = IECoreScene.OBJReader( fileName ).read()
+
+		self.assertEqual( len( mh.messages ), 1 )
+		self.assertEqual( mh.messages[0].level, IECore.Msg.Level.Warning )
+		self.assertEqual( mh.messages[0].context, "OBJReader" )
+		self.assertIn( "Ignoring 2 invalid", mh.messages[0].message )
+
+		self.assertTrue( mesh.arePrimitiveVariablesValid() )
+		self.assertEqual( mesh["P"].data, IECore.V3fVectorData( [ imath.V3f( 0 ), imath.V3f( 1, 0, 0 ), imath.V3f( 1, 1, 0 ) ] ) )
+		self.assertNotIn( "N", mesh )
+
+	def testEmptyFile( self ) :
+
+		fileName = os.path.join( self.tempDir, "empty.obj" )
+		open( fileName, "w" ).close()
+
+		mesh = IECoreScene.OBJReader( fileName ).read()
+		self.assertEqual( mesh.numFaces(), 0 )
+
+	def setUp( self ) :
+
+		self.tempDir = tempfile.mkdtemp()
+
+	def tearDown( self ) :
+
+		shutil.rmtree( self.tempDir )
+
 if __name__ == "__main__":
 
 	unittest.main()
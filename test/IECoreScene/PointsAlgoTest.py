@@ -37,6 +37,8 @@ import IECoreScene
 import IECore
 
 import imath
+import random
+import time
 import unittest
 
 
@@ -704,5 +706,70 @@ class SegmentPointsTest( unittest.TestCase ) :
 		self.assertEqual( len(segments[1]["P"].data), 25 )
 
 
+	def createManyPoints( self, numPoints ) :
+
+		random.seed( 0 )
+		points = IECoreScene.PointsPrimitive(
+			IECore.V3fVectorData( [ imath.V3f( random.random(), random.random(), random.random() ) for i in range( 0, numPoints ) ] )
+		)
+		points["id"] = IECoreScene.PrimitiveVariable( IECoreScene.PrimitiveVariable.Interpolation.Vertex, IECore.IntVectorData( range( 0, numPoints ) ) )
+		points["indexed"] = IECoreScene.PrimitiveVariable(
+			IECoreScene.PrimitiveVariable.Interpolation.Vertex,
+			IECore.StringVectorData( [ "a", "b", "c" ] ),
+			IECore.IntVectorData( [ random.randint( 0, 2 ) for i in range( 0, numPoints ) ] )
+		)
+		points["delete"] = IECoreScene.PrimitiveVariable(
+			IECoreScene.PrimitiveVariable.Interpolation.Vertex,
+			IECore.BoolVectorData( [ random.random() > 0.5 for i in range( 0, numPoints ) ] )
+		)
+		points["segment"] = IECoreScene.PrimitiveVariable(
+			IECoreScene.PrimitiveVariable.Interpolation.Vertex,
+			IECore.IntVectorData( [ i % 17 for i in range( 0, numPoints ) ] )
+		)
+
+		return points
+
+	def testSerialAndParallelResultsMatch( self ) :
+
+		points = self.createManyPoints( 100000 )
+		toMerge = [ points ] * 10
+		toMerge[3] = points.copy()
+		toMerge[3]["id"] = IECoreScene.PrimitiveVariable( IECoreScene.PrimitiveVariable.Interpolation.Vertex, IECore.FloatVectorData( range( 0, 100000 ) ) )
+
+		functions = [
+			lambda : IECoreScene.PointsAlgo.deletePoints( points, points["delete"] ),
+			lambda : IECoreScene.PointsAlgo.deletePoints( points, points["delete"], invert = True ),
+			lambda : IECoreScene.PointsAlgo.segment( points, points["segment"] ),
+			lambda : IECoreScene.PointsAlgo.mergePoints( toMerge ),
+		]
+
+		for f in functions :
+			with IECore.tbb_global_control( IECore.tbb_global_control.parameter.max_allowed_parallelism, 1 ) :
+				serial = f()
+			self.assertEqual( f(), serial )
+
+	@unittest.skipIf( True, "Not running slow perf tests by default" )
+	def testPerformance( self ) :
+
+		points = self.createManyPoints( 10000000 )
+
+		functions = [
+			( "deletePoints", lambda : IECoreScene.PointsAlgo.deletePoints( points, points["delete"] ) ),
+			( "segment", lambda : IECoreScene.PointsAlgo.segment( points, points["segment"] ) ),
+			( "mergePoints", lambda : IECoreScene.PointsAlgo.mergePoints( [ points ] * 10 ) ),
+		]
+
+		for name, f in functions :
+			with IECore.tbb_global_control( IECore.tbb_global_control.parameter.max_allowed_parallelism, 1 ) :
+				startTime = time.time()
+				f()
+				elapsed = time.time() - startTime
+			print( "\nTime for {} with 10000000 points, serial".format( name ), elapsed )
+
+			startTime = time.time()
+			f()
+			elapsed = time.time() - startTime
+			print( "Time for {} with 10000000 points, parallel".format( name ), elapsed )
+
 if __name__ == "__main__":
 	unittest.main()
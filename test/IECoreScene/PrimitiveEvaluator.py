@@ -33,6 +33,7 @@
 ##########################################################################
 
 import unittest
+import imath
 import IECore
 import IECoreScene
 
@@ -46,6 +47,66 @@ class TestPrimitiveEvaluator( unittest.TestCase ) :
 
 		self.assertRaises( ValueError, IECoreScene.PrimitiveEvaluator.create, None )
 
+	def testBatchQueries( self ) :
+
+		mesh = IECoreScene.MeshPrimitive.createPlane( imath.Box2f( imath.V2f( -1 ), imath.V2f( 1 ) ), imath.V2i( 4 ) )
+		mesh = IECoreScene.MeshAlgo.triangulate( mesh )
+		evaluator = IECoreScene.PrimitiveEvaluator.create( mesh )
+		result = evaluator.createResult()
+
+		points = IECore.V3fVectorData( [ imath.V3f( x * 0.01, -x * 0.005, ( x % 7 ) - 3 ) for x in range( 0, 1000 ) ] )
+
+		closest = evaluator.batchClosestPoint( points )
+		self.assertEqual( set( closest.keys() ), { "success", "point", "normal", "uv", "distance", "faceIndex" } )
+		signed = evaluator.batchSignedDistance( points )
+		for i, p in enumerate( points ) :
+			self.assertTrue( evaluator.closestPoint( p, result ) )
+			self.assertTrue( closest["success"][i] )
+			self.assertEqual( closest["point"][i], result.point() )
+			self.assertEqual( closest["normal"][i], result.normal() )
+			self.assertEqual( closest["uv"][i], result.uv() )
+			self.assertEqual( closest["faceIndex"][i], result.triangleIndex() )
+			self.assertAlmostEqual( closest["distance"][i], ( result.point() - p ).length(), places = 5 )
+			self.assertAlmostEqual( signed["distance"][i], evaluator.signedDistance( p, result ), places = 5 )
+
+		uvs = IECore.V2fVectorData( [ imath.V2f( 0.25, 0.75 ), imath.V2f( 0.5 ), imath.V2f( 2 ) ] )
+		atUV = evaluator.batchPointAtUV( uvs )
+		self.assertNotIn( "distance", atUV )
+		for i, uv in enumerate( uvs ) :
+			success = evaluator.pointAtUV( uv, result )
+			self.assertEqual( atUV["success"][i], success )
+			if success :
+				self.assertTrue( atUV["point"][i].equalWithAbsError( result.point(), 1e-6 ) )
+
+		origins = IECore.V3fVectorData( [ imath.V3f( 0.1, 0.2, 1 ), imath.V3f( 0.5, 0.5, 1 ), imath.V3f( 5, 0, 1 ) ] )
+		directions = IECore.V3fVectorData( [ imath.V3f( 0, 0, -1 ) ] * 3 )
+		intersections = evaluator.batchIntersectionPoint( origins, directions )
+		self.assertEqual( list( intersections["success"] ), [ True, True, False ] )
+		self.assertTrue( intersections["point"][0].equalWithAbsError( imath.V3f( 0.1, 0.2, 0 ), 1e-6 ) )
+		self.assertAlmostEqual( intersections["distance"][1], 1, places = 6 )
+		self.assertEqual( intersections["faceIndex"][2], -1 )
+
+		intersections = evaluator.batchIntersectionPoint( origins, directions, maxDistance = 0.5 )
+		self.assertEqual( list( intersections["success"] ), [ False, False, False ] )
+
+		with self.assertRaisesRegex( Exception, "Number of origins" ) :
+			evaluator.batchIntersectionPoint( origins, IECore.V3fVectorData() )
+
+	def testBatchQueryOutputs( self ) :
+
+		points = IECoreScene.PointsPrimitive( IECore.V3fVectorData( [ imath.V3f( x, 0, 0 ) for x in range( 0, 10 ) ] ) )
+		evaluator = IECoreScene.PrimitiveEvaluator.create( points )
+		closest = evaluator.batchClosestPoint( IECore.V3fVectorData( [ imath.V3f( 2.1, 1, 0 ) ] ) )
+		self.assertEqual( set( closest.keys() ), { "success", "point", "distance", "pointIndex" } )
+		self.assertEqual( closest["pointIndex"][0], 2 )
+
+		sphere = IECoreScene.SpherePrimitive( 1 )
+		evaluator = IECoreScene.PrimitiveEvaluator.create( sphere )
+		closest = evaluator.batchClosestPoint( IECore.V3fVectorData( [ imath.V3f( 2, 0, 0 ) ] ) )
+		self.assertEqual( set( closest.keys() ), { "success", "point", "normal", "uv", "distance" } )
+		self.assertTrue( closest["point"][0].equalWithAbsError( imath.V3f( 1, 0, 0 ), 1e-6 ) )
+		self.assertAlmostEqual( closest["distance"][0], 1, places = 6 )
+
 if __name__ == "__main__":
 	unittest.main()
 
@@ -150,6 +150,39 @@ class SceneAlgoTest( unittest.TestCase ) :
 		self.assertEqual( len( t.childNames()), 4096 )
 
 
+	def testCopyMultipleFrames( self ) :
+
+		# Enough locations and frames to span several batches
+		# of parallel reads.
+
+		m = IECoreScene.SceneCache( self.__testFile, IECore.IndexedIO.OpenMode.Write )
+		t = m.createChild( "t" )
+		for i in range( 0, 300 ) :
+			c = t.createChild( "c{0}".format( i ) )
+			for frame in range( 1, 4 ) :
+				c.writeTransform( IECore.M44dData( imath.M44d().translate( imath.V3d( i, frame, 0 ) ) ), frame / 24.0 )
+				c.writeAttribute( "frame", IECore.IntData( frame ), frame / 24.0 )
+		del c, t, m
+
+		src = IECoreScene.SceneCache( self.__testFile, IECore.IndexedIO.OpenMode.Read )
+		dst = IECoreScene.SceneCache( self.__testFile2, IECore.IndexedIO.OpenMode.Write )
+		IECoreScene.SceneAlgo.copy( src, dst, 1, 3, 24.0, IECoreScene.SceneAlgo.ProcessFlags.All )
+		del src, dst
+
+		src = IECoreScene.SceneCache( self.__testFile2, IECore.IndexedIO.OpenMode.Read )
+		t = src.child( "t" )
+		self.assertEqual( len( t.childNames() ), 300 )
+		for i in range( 0, 300 ) :
+			c = t.child( "c{0}".format( i ) )
+			self.assertEqual( c.numTransformSamples(), 3 )
+			self.assertEqual( c.numAttributeSamples( "frame" ), 3 )
+			for frame in range( 1, 4 ) :
+				self.assertEqual(
+					c.readTransformAsMatrix( frame / 24.0 ),
+					imath.M44d().translate( imath.V3d( i, frame, 0 ) )
+				)
+				self.assertEqual( c.readAttribute( "frame", frame / 24.0 ), IECore.IntData( frame ) )
+
 	def testMultithreadedRead( self ):
 
 		self.writeBigSCC()
@@ -1235,6 +1235,147 @@ class SceneCacheTest( unittest.TestCase ) :
 			child.readTransform( 1, _copy = False ).isSame( child.readTransform( 1, _copy = False ) )
 		)
 
+	def testPrefetch( self ) :
+
+		fileName = os.path.join( self.tempDir, "test.scc" )
+		box = IECoreScene.MeshPrimitive.createBox( imath.Box3f( imath.V3f( 0 ), imath.V3f( 1 ) ) )
+		plane = IECoreScene.MeshPrimitive.createPlane( imath.Box2f( imath.V2f( 0 ), imath.V2f( 1 ) ) )
+
+		m = IECoreScene.SceneCache( fileName, IECore.IndexedIO.OpenMode.Write )
+		for name in [ "a", "b", "c" ] :
+			child = m.createChild( name )
+			for time in [ 0, 1, 2 ] :
+				child.writeObject( box if time % 2 else plane, time )
+				child.writeTransform( IECore.M44dData( imath.M44d().translate( imath.V3d( time, 0, 0 ) ) ), time )
+				child.writeAttribute( "w", IECore.FloatData( time ), time )
+		del m, child
+
+		m = IECoreScene.SceneCache( fileName, IECore.IndexedIO.OpenMode.Read )
+
+		IECoreScene.SceneCache.clearCache()
+		IECoreScene.SceneCache.resetCacheStatistics()
+
+		m.prefetch( [ [ "a" ], "/b", [ "c" ], [ "nonexistent" ] ], [ 0, 1.5 ] )
+		self.assertGreater( IECoreScene.SceneCache.cacheMemoryUsage(), 0 )
+		self.assertGreater( IECore.MemoryGovernor.clientMemoryUsage()["SceneCache"].value, 0 )
+
+		statistics = IECoreScene.SceneCache.cacheStatistics()
+		for entryType in ( "transforms", "attributes", "objects" ) :
+			self.assertGreater( statistics[entryType]["misses"].value, 0 )
+
+		# Reads of prefetched samples must be served from the cache
+		# without computing anything new.
+
+		IECoreScene.SceneCache.resetCacheStatistics()
+
+		for name in [ "a", "b", "c" ] :
+			child = m.child( name )
+			self.assertEqual( child.readObject( 0 ), plane )
+			self.assertEqual( child.readTransformAsMatrix( 1 ), imath.M44d().translate( imath.V3d( 1, 0, 0 ) ) )
+			self.assertEqual( child.readAttribute( "w", 1 ), IECore.FloatData( 1 ) )
+
+		statistics = IECoreScene.SceneCache.cacheStatistics()
+		self.assertEqual( statistics["misses"].value, 0 )
+		for entryType in ( "transforms", "attributes", "objects" ) :
+			self.assertGreaterEqual( statistics[entryType]["hits"].value, 3 )
+
+		m.prefetch( [ [ "a" ] ], [ 2 ], IECoreScene.SceneCache.PrefetchFlags.Transform | IECoreScene.SceneCache.PrefetchFlags.Object )
+
+		writer = IECoreScene.SceneCache( os.path.join( self.tempDir, "write.scc" ), IECore.IndexedIO.OpenMode.Write )
+		self.assertRaises( RuntimeError, writer.prefetch, [ [ "a" ] ], [ 0 ] )
+
+	def testCacheMemoryUsage( self ) :
+
+		fileName = os.path.join( self.tempDir, "cacheMemory.scc" )
+
+		m = IECoreScene.SceneCache( fileName, IECore.IndexedIO.OpenMode.Write )
+		a = m.createChild( "a" )
+		a.writeObject( IECoreScene.MeshPrimitive.createPlane( imath.Box2f( imath.V2f( -1 ), imath.V2f( 1 ) ), imath.V2i( 100 ) ), 0 )
+		a.writeTransform( IECore.M44dData( imath.M44d().translate( imath.V3d( 1, 0, 0 ) ) ), 0 )
+		del m, a
+
+		originalMaxMemory = IECoreScene.SceneCache.getMaxCacheMemoryUsage()
+		self.addCleanup( IECoreScene.SceneCache.setMaxCacheMemoryUsage, originalMaxMemory )
+
+		IECoreScene.SceneCache.clearCache()
+		IECoreScene.SceneCache.resetCacheStatistics()
+		self.assertEqual( IECoreScene.SceneCache.cacheMemoryUsage(), 0 )
+
+		m = IECoreScene.SceneCache( fileName, IECore.IndexedIO.OpenMode.Read )
+		a = m.child( "a" )
+
+		mesh = a.readObjectAtSample( 0 )
+		transform = a.readTransformAtSample( 0 )
+		self.assertEqual( IECoreScene.SceneCache.cacheMemoryUsage(), mesh.memoryUsage() + transform.memoryUsage() )
+
+		a.readObjectAtSample( 0 )
+		a.readTransformAtSample( 0 )
+		statistics = IECoreScene.SceneCache.cacheStatistics()
+		self.assertEqual( statistics["hits"].value, 2 )
+		self.assertEqual( statistics["misses"].value, 2 )
+		self.assertEqual( statistics["evictions"].value, 0 )
+		for entryType in ( "objects", "transforms" ) :
+			self.assertEqual( statistics[entryType]["hits"].value, 1 )
+			self.assertEqual( statistics[entryType]["misses"].value, 1 )
+			self.assertEqual( statistics[entryType]["evictions"].value, 0 )
+		self.assertEqual( statistics["attributes"]["hits"].value, 0 )
+		self.assertEqual( statistics["attributes"]["misses"].value, 0 )
+
+		# Limiting the cache to less than the size of the mesh must evict it,
+		# while the more recently used transform remains.
+
+		IECoreScene.SceneCache.setMaxCacheMemoryUsage( mesh.memoryUsage() - 1 )
+		self.assertLessEqual( IECoreScene.SceneCache.cacheMemoryUsage(), mesh.memoryUsage() - 1 )
+		statistics = IECoreScene.SceneCache.cacheStatistics()
+		self.assertEqual( statistics["evictions"].value, 1 )
+		self.assertEqual( statistics["objects"]["evictions"].value, 1 )
+		self.assertEqual( statistics["transforms"]["evictions"].value, 0 )
+
+		self.assertEqual( a.readObjectAtSample( 0 ), mesh )
+		self.assertEqual( a.readTransformAtSample( 0 ), transform )
+
+		IECoreScene.SceneCache.clearCache()
+		self.assertEqual( IECoreScene.SceneCache.cacheMemoryUsage(), 0 )
+
+	def testCacheNotStaleAfterRewrite( self ) :
+
+		fileName = os.path.join( self.tempDir, "rewrite.scc" )
+
+		for value in range( 0, 2 ) :
+
+			m = IECoreScene.SceneCache( fileName, IECore.IndexedIO.OpenMode.Write )
+			m.writeAttribute( "value", IECore.IntData( value ), 0 )
+			del m
+
+			m = IECoreScene.SceneCache( fileName, IECore.IndexedIO.OpenMode.Read )
+			self.assertEqual( m.readAttributeAtSample( "value", 0 ), IECore.IntData( value ) )
+			del m
+
+	def testPipelinedWrites( self ) :
+
+		fileName = os.path.join( self.tempDir, "pipelined.scc" )
+
+		options = IECore.CompoundData( { "compressor" : "lz4", "compressionLevel" : 5, "pipelinedWrites" : True } )
+		m = IECoreScene.SceneCache( IECore.IndexedIO.create( fileName, [], IECore.IndexedIO.OpenMode.Write, options = options ) )
+
+		objects = {}
+		for name in [ "a", "b", "c" ] :
+			child = m.createChild( name )
+			for time in range( 0, 10 ) :
+				mesh = IECoreScene.MeshPrimitive.createPlane( imath.Box2f( imath.V2f( -1 ), imath.V2f( time + 1 ) ), imath.V2i( 50 ) )
+				objects[name, time] = mesh
+				child.writeObject( mesh, time )
+				child.writeAttribute( "w", IECore.FloatVectorData( [ time ] * 1000 ), time )
+		del m, child
+
+		m = IECoreScene.SceneCache( fileName, IECore.IndexedIO.OpenMode.Read )
+		for name in [ "a", "b", "c" ] :
+			child = m.child( name )
+			for time in range( 0, 10 ) :
+				self.assertEqual( child.readObject( time ), objects[name, time] )
+				self.assertEqual( child.readAttribute( "w", time ), IECore.FloatVectorData( [ time ] * 1000 ) )
+			self.assertEqual( child.readBound( 9 ), imath.Box3d( imath.V3d( -1, -1, 0 ), imath.V3d( 10, 10, 0 ) ) )
+
 
 	def setUp( self ) :
 		self.tempDir = tempfile.mkdtemp()
@@ -35,10 +35,13 @@
 ##########################################################################
 
 import os
+import shutil
+import tempfile
 import unittest
 import imath
 
 import IECore
+import IECoreScene
 import IECoreVDB
 from VDBTestCase import VDBTestCase
 
@@ -46,6 +49,10 @@ class VDBObjectTest( VDBTestCase ) :
 
 	def setUp( self ) :
 		VDBTestCase.setUp( self )
+		self.tempDir = tempfile.mkdtemp()
+
+	def tearDown( self ) :
+		shutil.rmtree( self.tempDir )
 
 	def testCanLoadVDBFromFile( self ) :
 		sourcePath = os.path.join( self.dataDir, "sphere.vdb" )
@@ -272,6 +279,132 @@ class VDBObjectTest( VDBTestCase ) :
 		self.assertNotEqual( o2, o )
 		self.assertEqual( o2, o2 )
 
+	def testSaveAndLoad( self ) :
+
+		vdb = IECoreVDB.VDBObject( os.path.join( self.dataDir, "smoke.vdb" ) )
+		vdb.insertGrid( IECoreVDB.VDBObject( os.path.join( self.dataDir, "sphere.vdb" ) ).findGrid( "ls_sphere" ) )
+
+		fileName = os.path.join( self.tempDir, "vdb.cob" )
+		IECore.ObjectWriter( vdb, fileName ).write()
+		loaded = IECore.ObjectReader( fileName ).read()
+
+		self.assertIsInstance( loaded, IECoreVDB.VDBObject )
+		self.assertEqual( set( loaded.gridNames() ), { "density", "ls_sphere" } )
+		self.assertFalse( loaded.unmodifiedFromFile() )
+		self.assertEqual( loaded.fileName(), "" )
+
+		# Only the grid metadata should have been loaded, but that is
+		# enough for the bound and for a hash that matches the original.
+
+		memoryUsage = loaded.memoryUsage()
+		self.assertLess( memoryUsage, 10000 )
+		self.assertEqual( loaded.bound(), vdb.bound() )
+		self.assertEqual( loaded, vdb )
+		self.assertEqual( loaded.memoryUsage(), memoryUsage )
+
+		# Grid data is loaded on demand.
+
+		for name in [ "density", "ls_sphere" ] :
+			grid = loaded.findGrid( name )
+			original = vdb.findGrid( name )
+			self.assertEqual( grid.leafCount(), original.leafCount() )
+			self.assertEqual( grid.activeVoxelCount(), original.activeVoxelCount() )
+
+		self.assertGreater( loaded.memoryUsage(), memoryUsage )
+		self.assertEqual( loaded, vdb )
+
+	def testHashOfLoadedObject( self ) :
+
+		vdb = IECoreVDB.VDBObject( os.path.join( self.dataDir, "smoke.vdb" ) )
+		fileName = os.path.join( self.tempDir, "vdb.cob" )
+		IECore.ObjectWriter( vdb, fileName ).write()
+
+		loaded1 = IECore.ObjectReader( fileName ).read()
+		loaded2 = IECore.ObjectReader( fileName ).read()
+
+		# Hashing must not require the grid data to be loaded.
+		memoryUsage = loaded1.memoryUsage()
+		self.assertEqual( loaded1.hash(), loaded2.hash() )
+		self.assertEqual( loaded1.memoryUsage(), memoryUsage )
+
+		# But the hash must change when the grid is modified.
+		h = loaded1.hash()
+		loaded1.findGrid( "density" ).mapAll( lambda value : value + 1 )
+		self.assertNotEqual( loaded1.hash(), h )
+		self.assertNotEqual( loaded1, loaded2 )
+
+		# And modifications must survive a round trip.
+		fileName2 = os.path.join( self.tempDir, "vdb2.cob" )
+		IECore.ObjectWriter( loaded1, fileName2 ).write()
+		loaded3 = IECore.ObjectReader( fileName2 ).read()
+		self.assertEqual( loaded3.hash(), loaded1.hash() )
+		self.assertEqual(
+			next( loaded3.findGrid( "density" ).citerAllValues() ).value,
+			next( loaded2.findGrid( "density" ).citerAllValues() ).value + 1
+		)
+
+	def testOverwriteSourceWithUnloadedGrids( self ) :
+
+		vdb = IECoreVDB.VDBObject( os.path.join( self.dataDir, "smoke.vdb" ) )
+		vdb.insertGrid( IECoreVDB.VDBObject( os.path.join( self.dataDir, "sphere.vdb" ) ).findGrid( "ls_sphere" ) )
+
+		fileName = os.path.join( self.tempDir, "vdb.cob" )
+		IECore.ObjectWriter( vdb, fileName ).write()
+
+		loaded = IECore.ObjectReader( fileName ).read()
+		self.assertEqual( loaded.findGrid( "density" ).leafCount(), vdb.findGrid( "density" ).leafCount() )
+
+		# Overwrite the source file while "ls_sphere" is still unloaded.
+		IECore.ObjectWriter( IECore.IntData( 1 ), fileName ).write()
+
+		# Grids and metadata that were already loaded remain valid.
+		self.assertEqual( loaded.findGrid( "density" ).leafCount(), vdb.findGrid( "density" ).leafCount() )
+		self.assertEqual( loaded.bound(), vdb.bound() )
+
+		# But the unloaded grid can no longer be read, and we must
+		# get an exception rather than garbage or a crash.
+		with self.assertRaisesRegex( RuntimeError, "has been modified" ) :
+			loaded.findGrid( "ls_sphere" )
+
+		# Loading all grids first makes it safe to save back
+		# to the source file.
+		IECore.ObjectWriter( vdb, fileName ).write()
+		loaded = IECore.ObjectReader( fileName ).read()
+		for name in loaded.gridNames() :
+			loaded.findGrid( name )
+		IECore.ObjectWriter( loaded, fileName ).write()
+		self.assertEqual( IECore.ObjectReader( fileName ).read(), vdb )
+
+	def testIdenticalGridsStoredOnce( self ) :
+
+		vdb = IECoreVDB.VDBObject( os.path.join( self.dataDir, "smoke.vdb" ) )
+
+		io = IECore.MemoryIndexedIO( IECore.CharVectorData(), [], IECore.IndexedIO.OpenMode.Write )
+		vdb.save( io, "a" )
+		size = len( io.buffer() )
+		vdb.save( io, "b" )
+
+		# The grid data is identical, so is only stored once.
+		self.assertLess( len( io.buffer() ) - size, size / 100 )
+
+		io = IECore.MemoryIndexedIO( io.buffer(), [], IECore.IndexedIO.OpenMode.Read )
+		self.assertEqual( IECore.Object.load( io, "a" ), vdb )
+		self.assertEqual( IECore.Object.load( io, "b" ), vdb )
+
+	def testSceneCache( self ) :
+
+		vdb = IECoreVDB.VDBObject( os.path.join( self.dataDir, "smoke.vdb" ) )
+
+		fileName = os.path.join( self.tempDir, "vdb.scc" )
+		scene = IECoreScene.SceneCache( fileName, IECore.IndexedIO.OpenMode.Write )
+		scene.createChild( "vdb" ).writeObject( vdb, 0.0 )
+		del scene
+
+		scene = IECoreScene.SceneCache( fileName, IECore.IndexedIO.OpenMode.Read )
+		loaded = scene.child( "vdb" ).readObject( 0.0 )
+		self.assertEqual( loaded, vdb )
+		self.assertEqual( loaded.findGrid( "density" ).leafCount(), 3117 )
+
 if __name__ == "__main__":
 	unittest.main()
 